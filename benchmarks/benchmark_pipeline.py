@@ -0,0 +1,435 @@
+'''
+Benchmark of the stages of the mesh generation pipeline
+on O-grid and Cartesian lattice collections from 10k to 50M cells.
+
+	python benchmarks/benchmark_pipeline.py --cases ogrid-10k lattice-10k
+	python benchmarks/benchmark_pipeline.py --max-cells 1000000 --update-baseline
+
+The timings of every case are compared against the baselines stored in
+benchmarks/baselines.json, and stages slower or using more memory than
+the baseline by more than the tolerance are reported as regressions.
+The peak memory is measured in a separate traced pass with --trace-memory,
+which is always run when updating the baselines.
+Baselines are specific to the machine they were recorded on.
+'''
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+from pyFOAM_hexBlockMesh.TransformedHexBlock import TransformedHexBlock, getReflectionMatrix
+from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter
+
+baseline_path = Path(__file__).parent / 'baselines.json'
+
+# Case name -> (topology, parameters)
+# O-grid parameters are (n_core, n_shell, n_z), 5 blocks of n_core x n_core x n_z cells
+# Lattice parameters are (blocks along each axis, cells of every block along each axis)
+cases = {
+	'ogrid-10k'	: ('ogrid',	(10, 10, 20)),
+	'ogrid-1M'	: ('ogrid',	(40, 40, 125)),
+	'ogrid-10M'	: ('ogrid',	(100, 100, 200)),
+	'ogrid-50M'	: ('ogrid',	(100, 100, 1000)),
+	'lattice-10k'	: ('lattice',	((5, 4, 4), (5, 5, 5))),
+	'lattice-1M'	: ('lattice',	((5, 5, 5), (20, 20, 20))),
+	'lattice-10M'	: ('lattice',	((10, 10, 10), (20, 20, 25))),
+	'lattice-50M'	: ('lattice',	((10, 10, 20), (25, 25, 40))),
+}
+
+# Relative increase over the baseline flagged as a regression
+default_tolerance = 0.25
+
+# Differences below these are noise, never flagged
+min_time_difference	= 0.05
+min_memory_difference	= 2**20
+
+def setUpOGrid(n_core:int, n_shell:int, n_z:int) -> ConnectedHexCollection :
+	'''
+	Set up the O-grid of a cylinder of radius 2 and length 1
+	with a square core block and 4 shell blocks.
+	3 shell blocks are reflections of the positive x block.
+	'''
+
+	center_block	= HexBlock(n_core, n_core, n_z)
+	px_block	= HexBlock(n_shell, n_core, n_z)
+
+	x = np.linspace(-1, 1, n_core + 1)
+	z = np.linspace(0, 1, n_z + 1)
+
+	center_block.setPointCoordinates(
+		np.stack(np.meshgrid(x, x, z, indexing='ij'), axis=-1)
+	)
+
+	surface_0 = center_block.getSurfacePointCoordinates((1, 2, 6, 5))
+
+	theta = np.linspace(-np.pi / 4, np.pi / 4, n_core + 1)
+
+	surface_1 = np.stack(np.broadcast_arrays(
+		2 * np.cos(theta)[:, np.newaxis],
+		2 * np.sin(theta)[:, np.newaxis],
+		z[np.newaxis, :]
+	), axis=-1)
+
+	px_block.setPointCoordinates(np.linspace(surface_0, surface_1, n_shell + 1))
+
+	py_block = TransformedHexBlock(
+		px_block, getReflectionMatrix((1, -1, 0)), axes=(1, 0, 2)
+	)
+	nx_block = TransformedHexBlock(
+		px_block, getReflectionMatrix((1, 0, 0)), reverse=(True, False, False)
+	)
+	ny_block = TransformedHexBlock(
+		py_block, getReflectionMatrix((0, 1, 0)), reverse=(False, True, False)
+	)
+
+	hex_collection = ConnectedHexCollection()
+
+	for hex_block in (center_block, px_block, py_block, nx_block, ny_block) :
+
+		hex_collection.addHexBlock(hex_block)
+
+	for connection in (
+		(0, 1, (1, 2, 6, 5), (0, 3, 7, 4)),
+		(0, 2, (3, 2, 6, 7), (0, 1, 5, 4)),
+		(1, 2, (3, 2, 6, 7), (1, 2, 6, 5)),
+		(0, 3, (0, 3, 7, 4), (1, 2, 6, 5)),
+		(2, 3, (0, 3, 7, 4), (2, 3, 7, 6)),
+		(0, 4, (0, 1, 5, 4), (3, 2, 6, 7)),
+		(3, 4, (0, 1, 5, 4), (0, 3, 7, 4)),
+		(1, 4, (0, 1, 5, 4), (2, 1, 5, 6)),
+	) :
+
+		hex_collection.connectHexBlocks(*connection)
+
+	return hex_collection
+
+def setUpLattice(
+	blocks:tuple[int, int, int],
+	cells:tuple[int, int, int]
+) -> ConnectedHexCollection :
+	'''
+	Set up a Cartesian lattice of blocks[0] x blocks[1] x blocks[2]
+	unit cube hex blocks of cells[0] x cells[1] x cells[2] cells
+	'''
+
+	hex_blocks = np.empty(blocks, dtype=object)
+
+	for index in np.ndindex(*blocks) :
+
+		hex_block = HexBlock(*cells)
+
+		axes_points = [
+			np.linspace(i, i + 1, n + 1) for i, n in zip(index, cells)
+		]
+
+		hex_block.setPointCoordinates(
+			np.stack(np.meshgrid(*axes_points, indexing='ij'), axis=-1)
+		)
+
+		hex_blocks[index] = hex_block
+
+	hex_collection = ConnectedHexCollection()
+	hex_collection.addHexBlockLattice(hex_blocks)
+
+	return hex_collection
+
+def setUpCase(name:str) -> ConnectedHexCollection :
+	'''
+	Set up the collection of the case
+	'''
+
+	topology, parameters = cases[name]
+
+	if topology == 'ogrid' : return setUpOGrid(*parameters)
+
+	return setUpLattice(*parameters)
+
+def getNumCells(name:str) -> int :
+	'''
+	Get the number of cells of the case without setting it up
+	'''
+
+	topology, parameters = cases[name]
+
+	if topology == 'ogrid' :
+
+		n_core, n_shell, n_z = parameters
+
+		return n_core * n_core * n_z + 4 * n_shell * n_core * n_z
+
+	blocks, cells = parameters
+
+	return int(np.prod(blocks) * np.prod(cells))
+
+def runCase(
+	name:str,
+	output_path:Path,
+	trace_memory:bool=False,
+	validation:str=Validation.STRICT
+) -> dict :
+	'''
+	Run the pipeline on the case with the validation policy
+	and return the wall time and CPU time of every stage,
+	and the peak memory if trace_memory is True.
+	Tracing the memory slows down the stages allocating many small objects,
+	e.g., the ASCII writers, by an order of magnitude.
+	'''
+
+	stages = {}
+
+	with Profiler.Profiler(trace_memory) as profiler :
+
+		with profiler.stage('setup') :
+
+			hex_collection = setUpCase(name)
+
+		hex_collection.validation = validation
+
+		with profiler.stage('assignCellIDs') :
+
+			hex_collection.assignCellIDs()
+
+		with profiler.stage('assignPointIDs') :
+
+			hex_collection.assignPointIDs()
+
+		with profiler.stage('getFaces') :
+
+			faces = hex_collection.getFaces()
+
+		with profiler.stage('getPoints') :
+
+			points = hex_collection.getPoints()
+
+		with profiler.stage('getCellCenters') :
+
+			cell_centers = hex_collection.getCellCenters()
+
+		with profiler.stage('checks') :
+
+			for face_collection in faces :
+
+				if face_collection.isBoundary() :
+
+					assert checkBoundaryFaces(face_collection, points, cell_centers), \
+					f'Face {face_collection.name} is invalid'
+
+				else :
+
+					assert checkInteriorFaces(face_collection, points, cell_centers), \
+					f'Face {face_collection.name} is invalid'
+
+		output_path.mkdir(parents=True, exist_ok=True)
+
+		with profiler.stage('writeASCII'), Validation.policy(validation) :
+
+			PointsWriter(output_path, overwrite=True).write(points)
+			FacesWriter(output_path, overwrite=True).write(faces)
+
+	summary = profiler.getSummary()
+
+	for stage_name in (
+		'setup', 'assignCellIDs', 'assignPointIDs', 'getFaces', 'getPoints',
+		'getCellCenters', 'checks', 'writeASCII', 'mergeFaceCollections'
+	) :
+
+		if stage_name not in summary : continue
+
+		stages[stage_name] = {
+			key : value for key, value in summary[stage_name].items()
+			if key in ('wall_time', 'cpu_time', 'peak_memory')
+		}
+
+	return {
+		'trace_memory'	: trace_memory,
+		'validation'	: validation,
+		'num_cells'	: hex_collection.num_cells,
+		'num_points'	: hex_collection.num_points,
+		'stages'	: stages,
+		'counters'	: profiler.counters,
+	}
+
+def measureCase(
+	name:str,
+	output_path:Path,
+	trace_memory:bool=False,
+	validation:str=Validation.STRICT
+) -> dict :
+	'''
+	Run the pipeline on the case and return the wall time and CPU time
+	of every stage, and if trace_memory is True, the peak memory of every stage
+	from a second pass tracing the memory, so that the timings are never
+	slowed down by the tracing. Refer to runCase.
+	'''
+
+	result = runCase(name, output_path, False, validation)
+
+	if trace_memory :
+
+		traced_result = runCase(name, output_path, True, validation)
+
+		for stage_name, stage in result['stages'].items() :
+
+			stage['peak_memory'] = traced_result['stages'][stage_name]['peak_memory']
+
+		result['trace_memory'] = True
+
+	return result
+
+def getRegressions(
+	results:dict,
+	baselines:dict,
+	tolerance:float=default_tolerance
+) -> list[str] :
+	'''
+	Get a description of every stage of every case
+	slower or using more memory than its baseline by more than tolerance
+	'''
+
+	regressions = []
+
+	for name, result in results.items() :
+
+		if name not in baselines : continue
+
+		# Timings with different validation policies are not comparable,
+		# the timings are always measured without tracing the memory
+		same_mode = result['validation'] == baselines[name].get('validation', Validation.STRICT)
+
+		for stage_name, stage in result['stages'].items() :
+
+			baseline = baselines[name]['stages'].get(stage_name)
+
+			if baseline is None : continue
+
+			for key, min_difference in (
+				('wall_time', min_time_difference),
+				('peak_memory', min_memory_difference),
+			) :
+
+				if key not in stage or key not in baseline : continue
+
+				if key == 'wall_time' and not same_mode : continue
+
+				difference = stage[key] - baseline[key]
+
+				if difference > min_difference and difference > tolerance * baseline[key] :
+
+					regressions.append(
+						f'{name} {stage_name} {key}: '
+						f'{stage[key]:.4g} vs baseline {baseline[key]:.4g}'
+					)
+
+	return regressions
+
+def main() -> int :
+
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+
+	parser.add_argument('--cases', nargs='+', choices=list(cases), default=None,
+	help='Cases to run, all cases up to --max-cells by default')
+	parser.add_argument('--max-cells', type=int, default=1_000_000,
+	help='Largest number of cells of the cases run by default')
+	parser.add_argument('--tolerance', type=float, default=default_tolerance,
+	help='Relative increase over the baseline flagged as a regression')
+	parser.add_argument('--trace-memory', action='store_true',
+	help='Measure the peak memory of every stage in a second, traced pass of every case')
+	parser.add_argument('--validation', choices=Validation.policies, default=Validation.STRICT,
+	help='Validation policy of the collections')
+	parser.add_argument('--update-baseline', action='store_true',
+	help='Store the results as the baselines of the cases')
+	parser.add_argument('--output', type=Path, default=None,
+	help='JSON file to write the results to')
+
+	args = parser.parse_args()
+
+	# Baselines always include the peak memory to compare against
+	if args.update_baseline : args.trace_memory = True
+
+	case_names = args.cases
+
+	if case_names is None :
+
+		case_names = [name for name in cases if getNumCells(name) <= args.max_cells]
+
+	results = {}
+
+	output_path = Path(tempfile.mkdtemp(prefix='pyFOAM_hexBlockMesh_benchmark_'))
+
+	try :
+
+		for name in case_names :
+
+			start_time = time.perf_counter()
+
+			results[name] = measureCase(name, output_path, args.trace_memory, args.validation)
+
+			print(f'{name}: {results[name]["num_cells"]} cells in '
+			f'{time.perf_counter() - start_time:.2f} s')
+
+			for stage_name, stage in results[name]['stages'].items() :
+
+				print(f'\t{stage_name:24s}{stage["wall_time"]:10.4f} s', end='')
+
+				if 'peak_memory' in stage :
+
+					print(f'{stage["peak_memory"] / 2**20:10.1f} MiB', end='')
+
+				print()
+
+	finally :
+
+		shutil.rmtree(output_path, ignore_errors=True)
+
+	if args.output is not None :
+
+		with open(args.output, 'w') as f :
+
+			json.dump(results, f, indent='\t')
+
+	baselines = {}
+
+	if baseline_path.is_file() :
+
+		with open(baseline_path, 'r') as f :
+
+			baselines = json.load(f)
+
+	if args.update_baseline :
+
+		baselines.update({
+			name : {
+				key : result[key] for key in ('trace_memory', 'validation', 'num_cells', 'stages')
+			}
+			for name, result in results.items()
+		})
+
+		with open(baseline_path, 'w') as f :
+
+			json.dump(baselines, f, indent='\t')
+
+		return 0
+
+	regressions = getRegressions(results, baselines, args.tolerance)
+
+	for regression in regressions :
+
+		print(f'REGRESSION {regression}')
+
+	return 1 if len(regressions) > 0 else 0
+
+if __name__ == '__main__' :
+
+	sys.exit(main())
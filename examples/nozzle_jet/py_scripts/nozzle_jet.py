@@ -6,6 +6,7 @@ from scipy.interpolate import CubicHermiteSpline
 
 from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
 from pyFOAM_hexBlockMesh.FaceCollection import checkBoundaryFaces, checkInteriorFaces
+from pyFOAM_hexBlockMesh.TransformedHexBlock import TransformedHexBlock, getReflectionMatrix
 from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter
 
 ###################################################################################################
@@ -60,9 +61,6 @@ axial_profile_r = spline(axial_profile_z)
 
 center_block	= HexBlock(n_core,	n_core,		n_z)
 px_block	= HexBlock(n_shell,	n_core,		n_z)
-py_block	= HexBlock(n_core,	n_shell,	n_z)
-nx_block	= HexBlock(n_core,	n_core,		n_z)
-ny_block	= HexBlock(n_core,	n_shell,	n_z)
 
 ###################################################################################################
 # Set Coordinates
@@ -97,39 +95,26 @@ volume_px = np.linspace(surface_0, surface_1, n_shell + 1)
 
 px_block.setPointCoordinates(volume_px)
 
-# Positive Y block
-volume_py = volume_px.copy()
-
-# Reflect (..., 3) shape ndarray containing the coordinates of points
-# about x = y plane
-volume_py[..., 0] = volume_px[..., 1]
-volume_py[..., 1] = volume_px[..., 0]
+# The remaining blocks only store a transform of the positive X block,
+# their coordinates are computed when they are needed
 
-volume_py = np.moveaxis(volume_py, [0, 1, 2], [1, 0, 2])
-
-py_block.setPointCoordinates(volume_py)
+# Positive Y block
+# Reflect about x = y plane, swapping axes 0 and 1
+py_block = TransformedHexBlock(
+	px_block, getReflectionMatrix((1, -1, 0)), axes=(1, 0, 2)
+)
 
 # Negative X block
-volume_nx = volume_px.copy()
-
-# Reflect (..., 3) shape ndarray containing the coordinates of points
-# about x = 0 plane
-volume_nx[..., 0] = -volume_nx[..., 0]
-
-volume_nx = volume_nx[::-1, ...]
-
-nx_block.setPointCoordinates(volume_nx)
+# Reflect about x = 0 plane, reversing axis 0
+nx_block = TransformedHexBlock(
+	px_block, getReflectionMatrix((1, 0, 0)), reverse=(True, False, False)
+)
 
 # Negative Y block
-volume_ny = volume_py.copy()
-
-# Reflect (..., 3) shape ndarray containing the coordinates of points
-# about y = 0 plane
-volume_ny[..., 1] = -volume_ny[..., 1]
-
-volume_ny = volume_ny[:, ::-1, ...]
-
-ny_block.setPointCoordinates(volume_ny)
+# Reflect the positive Y block about y = 0 plane, reversing axis 1
+ny_block = TransformedHexBlock(
+	py_block, getReflectionMatrix((0, 1, 0)), reverse=(False, True, False)
+)
 
 ###################################################################################################
 # Set up collection of hex blocks
@@ -0,0 +1,247 @@
+import shutil
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import checkBoundaryFaces, checkInteriorFaces
+from pyFOAM_hexBlockMesh.TopologyCache import TopologyCache
+from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter
+
+# Files written once by the parent process and copied into every case
+topology_file_names = ('faces', 'owner', 'neighbour', 'boundary')
+
+@dataclass
+class CaseResult :
+	'''
+	Outcome of generating a single case of a batch.
+	timings holds the wall time in seconds of every stage.
+	error holds the message of the exception raised
+	while generating the case, if any.
+	'''
+
+	case_path	: Path
+	parameters	: dict
+	timings		: dict = field(default_factory=dict)
+	error		: str | None = None
+
+# Topology shared by all the cases generated by a worker process
+# Set by _initializeWorker
+_worker_topology : dict | None = None
+
+def _initializeWorker(topology: dict) -> None :
+	'''
+	Store the topology shared by all the cases in the worker process
+	'''
+
+	global _worker_topology
+
+	_worker_topology = topology
+
+	pass
+
+def _generateCase(case_path: Path, parameters: dict) -> CaseResult :
+	'''
+	Generate the polyMesh of a single case in the worker process
+	'''
+
+	topology = _worker_topology
+
+	assert topology is not None, 'Worker is not initialized'
+
+	result = CaseResult(case_path, parameters)
+	timings = result.timings
+
+	start_time = time.perf_counter()
+
+	try :
+
+		# Coordinates of the points of every hex block
+		coordinates_list = topology['coordinates_function'](**parameters)
+
+		assert len(coordinates_list) == len(topology['shapes']), \
+		f'Expected coordinates of {len(topology["shapes"])} hex blocks, ' \
+		f'got {len(coordinates_list)}'
+
+		timings['coordinates'] = time.perf_counter() - start_time
+		stage_time = time.perf_counter()
+
+		hex_collection = ConnectedHexCollection(topology['validation'])
+
+		for shape, cell_ID, point_ID, coordinates in zip(
+			topology['shapes'],
+			topology['cell_IDs'],
+			topology['point_IDs'],
+			coordinates_list
+		) :
+
+			hex_block = HexBlock(*shape)
+			hex_block.setPointCoordinates(coordinates)
+
+			hex_block.cell_ID	= cell_ID
+			hex_block.point_ID	= point_ID
+
+			hex_collection.addHexBlock(hex_block)
+
+		# The connections are already validated for the topology,
+		# only the coordinates of the connected faces need to be checked
+		hex_collection.connect_infos = list(topology['connect_infos'])
+
+		for connect_info in hex_collection.connect_infos :
+
+			assert connect_info.isValid(hex_collection.hex_blocks), \
+			f'Connected faces do not match: {connect_info}'
+
+		hex_collection.num_cells	= topology['num_cells']
+		hex_collection.num_points	= topology['num_points']
+
+		points = hex_collection.getPoints()
+
+		if topology['check_faces'] :
+
+			cell_centers = hex_collection.getCellCenters()
+
+			for face in topology['faces'] :
+
+				if face.isBoundary() :
+
+					assert checkBoundaryFaces(face, points, cell_centers), \
+					f'Face {face.name} is invalid'
+
+				else :
+
+					assert checkInteriorFaces(face, points, cell_centers), \
+					f'Face {face.name} is invalid'
+
+		timings['checks'] = time.perf_counter() - stage_time
+		stage_time = time.perf_counter()
+
+		polyMesh_path = case_path / 'constant' / 'polyMesh'
+		polyMesh_path.mkdir(parents=True, exist_ok=True)
+
+		PointsWriter(polyMesh_path, overwrite=True).write(points)
+
+		template_path = topology['template_path']
+
+		if polyMesh_path.resolve() != template_path.resolve() :
+
+			for name in topology_file_names :
+
+				shutil.copyfile(template_path / name, polyMesh_path / name)
+
+		timings['write'] = time.perf_counter() - stage_time
+
+	except Exception as exception :
+
+		result.error = f'{type(exception).__name__}: {exception}'
+
+	timings['total'] = time.perf_counter() - start_time
+
+	return result
+
+def generateCases(
+	hex_collection: ConnectedHexCollection,
+	coordinates_function: Callable[..., list[np.ndarray]],
+	parameter_sets: list[dict],
+	output_path: Path,
+	case_names: list[str] | None = None,
+	max_workers: int | None = None,
+	check_faces: bool = True,
+	topology_cache: TopologyCache | None = None,
+) -> list[CaseResult] :
+	'''
+	Generate a polyMesh for every parameter set
+	sharing the topology of the hex collection.
+	The IDs and faces of the hex collection are assigned once,
+	and the faces, owner, neighbour and boundary files are written once.
+	coordinates_function is called with every parameter set as keyword
+	arguments and must return the point coordinates of every hex block
+	in the order of the hex collection.
+	It must be picklable, i.e., defined at the top level of a module.
+	The cases are generated in a pool of max_workers processes
+	and written to output_path / case_name / constant / polyMesh.
+	If max_workers is 1, the cases are generated in the calling process.
+	The cases are assembled with the validation policy of the hex collection.
+	Return the CaseResult of every case in the order of parameter_sets.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+	assert callable(coordinates_function), 'Invalid coordinates function'
+	assert isinstance(parameter_sets, list) and len(parameter_sets) > 0, \
+	'Invalid parameter sets'
+
+	if case_names is None :
+
+		case_names = [f'case_{i:04d}' for i in range(len(parameter_sets))]
+
+	assert len(case_names) == len(parameter_sets), \
+	'Number of case names does not match the number of parameter sets'
+
+	case_paths = [Path(output_path) / name for name in case_names]
+
+	if topology_cache is None :
+
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+		faces = hex_collection.getFaces()
+
+	else :
+
+		faces = topology_cache.getTopology(hex_collection)
+
+	# Write the topology files once into the first case
+	template_path = case_paths[0] / 'constant' / 'polyMesh'
+	template_path.mkdir(parents=True, exist_ok=True)
+
+	FacesWriter(template_path, overwrite=True).write(list(faces))
+
+	# Memory-mapped arrays from the topology cache are copied
+	# so that they can be sent to the worker processes
+	for face in faces :
+
+		face.owner	= np.ascontiguousarray(face.owner)
+		face.neighbour	= np.ascontiguousarray(face.neighbour)
+		face.vertices	= np.ascontiguousarray(face.vertices)
+
+	topology = {
+		'coordinates_function'	: coordinates_function,
+		'shapes'		: [hex_block.cell_ID.shape for hex_block in hex_collection.hex_blocks],
+		'cell_IDs'		: [np.ascontiguousarray(hex_block.cell_ID) for hex_block in hex_collection.hex_blocks],
+		'point_IDs'		: [np.ascontiguousarray(hex_block.point_ID) for hex_block in hex_collection.hex_blocks],
+		'connect_infos'		: list(hex_collection.connect_infos),
+		'num_cells'		: hex_collection.num_cells,
+		'num_points'		: hex_collection.num_points,
+		'faces'			: faces,
+		'check_faces'		: check_faces,
+		'validation'		: hex_collection.validation,
+		'template_path'		: template_path,
+	}
+
+	if max_workers == 1 :
+
+		_initializeWorker(topology)
+
+		results = [
+			_generateCase(case_path, parameters)
+			for case_path, parameters in zip(case_paths, parameter_sets)
+		]
+
+		_initializeWorker(None)
+
+	else :
+
+		with ProcessPoolExecutor(
+			max_workers=max_workers,
+			initializer=_initializeWorker,
+			initargs=(topology,)
+		) as executor :
+
+			results = list(executor.map(_generateCase, case_paths, parameter_sets))
+
+	return results
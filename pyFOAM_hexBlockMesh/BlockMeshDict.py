@@ -0,0 +1,346 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.Curves as Curves
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_connectivity, hex_face_vertices
+from pyFOAM_hexBlockMesh.writer_utils.FoamDictionary import readFoamDictionary
+
+# Name and type of the patch of the boundary faces
+# not in any patch, if the dictionary has no defaultPatch
+default_patch = ('defaultFaces', 'empty')
+
+def getVertices(block_mesh_dict:dict) -> np.ndarray :
+	'''
+	Get the (n, 3) scaled coordinates of the vertices
+	'''
+
+	vertices = np.array(block_mesh_dict['vertices'], dtype=float)
+
+	assert vertices.ndim == 2 and vertices.shape[1] == 3, \
+	'Vertices must be a list of (x y z) points'
+
+	return vertices * getScale(block_mesh_dict)
+
+def getScale(block_mesh_dict:dict) -> float :
+	'''
+	Get the factor scaling the coordinates, convertToMeters or scale
+	'''
+
+	return float(block_mesh_dict.get('convertToMeters', block_mesh_dict.get('scale', 1.0)))
+
+def getCurves(block_mesh_dict:dict) -> dict :
+	'''
+	Get the curved edges, mapping the vertex labels (a, b)
+	to a curve from vertex a to vertex b.
+	Refer to Curves for the arc, spline and polyLine edges.
+	'''
+
+	vertices	= getVertices(block_mesh_dict)
+	scale		= getScale(block_mesh_dict)
+
+	items = block_mesh_dict.get('edges', [])
+
+	curves = {}
+
+	i = 0
+
+	while i < len(items) :
+
+		edge_type = items[i]
+		a, b = items[i + 1], items[i + 2]
+
+		assert isinstance(a, int) and isinstance(b, int), \
+		f'Invalid vertex labels of {edge_type} edge {a} {b}'
+
+		start, end = vertices[a], vertices[b]
+
+		if edge_type == 'arc' and items[i + 3] == 'origin' :
+
+			assert isinstance(items[i + 4], list), \
+			f'Unsupported arc {a} {b} with an origin and a factor'
+
+			curve = Curves.getOriginArcCurve(
+				start, end, scale * np.array(items[i + 4], dtype=float)
+			)
+
+			i += 5
+
+		elif edge_type == 'arc' :
+
+			curve = Curves.getArcCurve(start, end, scale * np.array(items[i + 3], dtype=float))
+
+			i += 4
+
+		elif edge_type in ('spline', 'polyLine') :
+
+			points = np.concatenate((
+				[start], scale * np.array(items[i + 3], dtype=float).reshape((-1, 3)), [end]
+			))
+
+			if edge_type == 'spline' : curve = Curves.getSplineCurve(points)
+			else : curve = Curves.getPolyLineCurve(points)
+
+			i += 4
+
+		elif edge_type == 'line' :
+
+			i += 3
+			continue
+
+		else :
+
+			raise ValueError(f'Unsupported edge type {edge_type}')
+
+		assert (a, b) not in curves and (b, a) not in curves, \
+		f'Edge {a} {b} is defined more than once'
+
+		curves[(a, b)] = curve
+
+	return curves
+
+def getBlocks(block_mesh_dict:dict) -> list[tuple[list, tuple, list|float, str|None]] :
+	'''
+	Get the (8 vertex labels, 3 numbers of cells, grading, zone name) of every block.
+	The grading is in the layout of Grading.getEdgeGradings.
+	'''
+
+	items = block_mesh_dict['blocks']
+
+	blocks = []
+
+	i = 0
+
+	while i < len(items) :
+
+		assert items[i] == 'hex', f'Unsupported block shape {items[i]}'
+
+		labels = items[i + 1]
+
+		assert isinstance(labels, list) and len(labels) == 8 and len(set(labels)) == 8, \
+		f'Invalid vertex labels of block {len(blocks)} : {labels}'
+
+		i += 2
+
+		zone = None
+
+		if isinstance(items[i], str) :
+
+			zone = items[i]
+			i += 1
+
+		cells = items[i]
+
+		assert isinstance(cells, list) and len(cells) == 3 and \
+		all(isinstance(n, int) and n > 0 for n in cells), \
+		f'Invalid number of cells of block {len(blocks)} : {cells}'
+
+		i += 1
+
+		grading = 1.0
+
+		if i < len(items) and items[i] in ('simpleGrading', 'edgeGrading') :
+
+			grading = items[i + 1]
+
+			expected_length = 3 if items[i] == 'simpleGrading' else 12
+
+			assert np.isscalar(grading) or len(grading) == expected_length, \
+			f'{items[i]} of block {len(blocks)} must have {expected_length} entries'
+
+			i += 2
+
+		blocks.append((labels, tuple(cells), grading, zone))
+
+	return blocks
+
+def getBlockZones(block_mesh_dict:dict) -> dict[str, list[int]] :
+	'''
+	Get the indices of the blocks of every zone named in the blocks,
+	as consumed by Zones.writeZones
+	'''
+
+	zones = {}
+
+	for block_index, (_, _, _, zone) in enumerate(getBlocks(block_mesh_dict)) :
+
+		if zone is not None : zones.setdefault(zone, []).append(block_index)
+
+	return zones
+
+def getPatches(block_mesh_dict:dict) -> list[tuple[str, str, list]] :
+	'''
+	Get the (name, type, faces) of every patch
+	from the boundary or the older patches entry
+	'''
+
+	patches = []
+
+	if 'boundary' in block_mesh_dict :
+
+		items = block_mesh_dict['boundary']
+
+		for name, patch_dict in zip(items[0::2], items[1::2]) :
+
+			assert isinstance(patch_dict, dict), f'Invalid patch {name}'
+
+			patches.append((name, patch_dict.get('type', 'patch'), patch_dict.get('faces', [])))
+
+	elif 'patches' in block_mesh_dict :
+
+		items = block_mesh_dict['patches']
+
+		for patch_type, name, faces in zip(items[0::3], items[1::3], items[2::3]) :
+
+			patches.append((name, patch_type, faces))
+
+	return patches
+
+def _setBlockCoordinates(
+	block_index:int,
+	hex_block:HexBlock,
+	vertices:np.ndarray,
+	grading:list|float,
+	curves:dict
+) -> None :
+	'''
+	Set the graded coordinates of a block
+	'''
+
+	try :
+
+		hex_block.setGradedCoordinates(vertices, grading, curves)
+
+	except AssertionError as error :
+
+		raise AssertionError(f'Block {block_index} : {error}') from error
+
+	pass
+
+def getHexCollection(
+	block_mesh_dict:dict,
+	validation:str=Validation.STRICT,
+	max_workers:int|None=None
+) -> ConnectedHexCollection :
+	'''
+	Get the collection of the blocks of a parsed blockMeshDict.
+	The coordinates of the blocks are computed from the vertices,
+	the simpleGrading or edgeGrading and the arc, spline and polyLine edges
+	in a pool of max_workers threads.
+	Blocks sharing the 4 vertex labels of a face are connected,
+	and the faces of the patches are grouped into patches of the collection.
+	Boundary faces not in any patch form the defaultPatch.
+	Patches without faces are skipped.
+	Projections, mergePatchPairs and collapsed blocks are not supported.
+	'''
+
+	assert len(block_mesh_dict.get('mergePatchPairs', [])) == 0, \
+	'mergePatchPairs is not supported'
+
+	vertices	= getVertices(block_mesh_dict)
+	curves		= getCurves(block_mesh_dict)
+	blocks		= getBlocks(block_mesh_dict)
+
+	hex_collection = ConnectedHexCollection(validation)
+
+	block_arguments = []
+
+	for block_index, (labels, cells, grading, zone) in enumerate(blocks) :
+
+		hex_block = HexBlock(*cells)
+
+		# Curves of the edges of the block keyed by the local vertices
+		block_curves = {}
+
+		for v0, v1 in vertex_connectivity :
+
+			a, b = labels[v0], labels[v1]
+
+			if (a, b) in curves : block_curves[(v0, v1)] = curves[(a, b)]
+			elif (b, a) in curves : block_curves[(v1, v0)] = curves[(b, a)]
+
+		block_arguments.append((block_index, hex_block, vertices[labels], grading, block_curves))
+
+		hex_collection.addHexBlock(hex_block)
+
+	with ThreadPoolExecutor(max_workers=max_workers) as executor :
+
+		for future in [
+			Validation.submit(executor, validation, _setBlockCoordinates, *arguments)
+			for arguments in block_arguments
+		] :
+
+			future.result()
+
+	# Vertex labels of the face -> (block index, face vertices) of the blocks sharing it
+	block_faces = {}
+
+	for block_index, (labels, _, _, _) in enumerate(blocks) :
+
+		for face_vertices in hex_face_vertices :
+
+			key = frozenset(labels[v] for v in face_vertices)
+
+			block_faces.setdefault(key, []).append((block_index, face_vertices))
+
+	table = []
+
+	for key, shared_faces in block_faces.items() :
+
+		assert len(shared_faces) <= 2, \
+		f'Face with vertices {sorted(key)} is shared by more than 2 blocks'
+
+		if len(shared_faces) < 2 : continue
+
+		(block_index_0, face_vertices_0), (block_index_1, _) = shared_faces
+
+		labels_0 = blocks[block_index_0][0]
+		labels_1 = blocks[block_index_1][0]
+
+		face_vertices_1 = [labels_1.index(labels_0[v]) for v in face_vertices_0]
+
+		table.append([block_index_0, block_index_1, *face_vertices_0, *face_vertices_1])
+
+	hex_collection.connectHexBlockTable(np.array(table, dtype=int).reshape((-1, 10)))
+
+	for name, patch_type, faces in getPatches(block_mesh_dict) :
+
+		if len(faces) == 0 : continue
+
+		patch_faces = []
+
+		for face_labels in faces :
+
+			shared_faces = block_faces.get(frozenset(face_labels), [])
+
+			assert len(shared_faces) == 1, \
+			f'Face {face_labels} of patch {name} is not a boundary face of a block'
+
+			patch_faces.append(shared_faces[0])
+
+		hex_collection.addPatch(name, patch_faces, patch_type)
+
+	default_patch_dict = block_mesh_dict.get('defaultPatch', {})
+
+	hex_collection.setDefaultPatch(
+		default_patch_dict.get('name', default_patch[0]),
+		default_patch_dict.get('type', default_patch[1])
+	)
+
+	return hex_collection
+
+def readBlockMeshDict(
+	path:Path,
+	validation:str=Validation.STRICT,
+	max_workers:int|None=None
+) -> ConnectedHexCollection :
+	'''
+	Read a blockMeshDict file into a collection of blocks.
+	Refer to getHexCollection.
+	'''
+
+	return getHexCollection(readFoamDictionary(path), validation, max_workers)
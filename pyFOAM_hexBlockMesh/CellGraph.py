@@ -0,0 +1,280 @@
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
+
+# Number of faces or graph entries processed at a time
+graph_chunk_size = 2**22
+
+# Largest integer weight written to METIS graph files,
+# float weights are scaled to 1 ... metis_max_weight
+metis_max_weight = 1000
+
+# Powers of 10 of the digits of int64 values
+_powers_of_10 = 10 ** np.arange(19, dtype=np.int64)
+
+def getFaceAreas(vertices:np.ndarray, points:np.ndarray) -> np.ndarray :
+	'''
+	Get the areas of the (N, 4) quadrilateral faces,
+	half the norm of the cross product of the diagonals
+	'''
+
+	face_points = points[vertices]
+
+	return 0.5 * np.linalg.norm(np.cross(
+		face_points[:, 2] - face_points[:, 0],
+		face_points[:, 3] - face_points[:, 1]
+	), axis=-1)
+
+def _getInternalFaceChunks(face_list:list[FlatFaceCollection]) :
+	'''
+	Iterate over the (owner, neighbour, vertices) of the internal faces
+	in chunks of graph_chunk_size faces
+	'''
+
+	for faces in face_list :
+
+		if faces.isBoundary() : continue
+
+		for start in range(0, faces.neighbour.shape[0], graph_chunk_size) :
+
+			end = min(start + graph_chunk_size, faces.neighbour.shape[0])
+
+			yield faces.owner[start:end], faces.neighbour[start:end], faces.vertices[start:end]
+
+def _allocate(directory:Path|None, name:str, shape:tuple, dtype:np.dtype) -> np.ndarray :
+	'''
+	Allocate an array in memory, or memory-mapped to directory / name.npy
+	'''
+
+	if directory is None : return np.empty(shape, dtype=dtype)
+
+	return np.lib.format.open_memmap(directory / f'{name}.npy', mode='w+', dtype=dtype, shape=shape)
+
+@Profiler.profiled
+def getCellGraph(
+	face_list:list[FlatFaceCollection],
+	num_cells:int,
+	points:np.ndarray|None=None,
+	directory:Path|None=None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray|None] :
+	'''
+	Get the adjacency of the cells through the internal faces
+	in compressed sparse row (CSR) format :
+	the neighbours of cell i are adjncy[xadj[i]:xadj[i + 1]].
+	If points are provided, the edge weights adjwgt are the areas of the faces,
+	in the layout of adjncy, otherwise None.
+	The faces are processed in chunks of graph_chunk_size faces.
+	If directory is provided, the arrays are memory-mapped to
+	xadj.npy, adjncy.npy and adjwgt.npy in it, so that graphs larger
+	than the memory can be built.
+	'''
+
+	assert isinstance(face_list, list), 'Invalid face list'
+	assert isinstance(num_cells, int) and num_cells > 0, 'Invalid number of cells'
+
+	# Number of neighbours of every cell
+	degrees = np.zeros(num_cells, dtype=np.int64)
+
+	for owner, neighbour, _ in _getInternalFaceChunks(face_list) :
+
+		assert owner.max(initial=-1) < num_cells and neighbour.max(initial=-1) < num_cells, \
+		'Cell IDs exceed the number of cells'
+
+		degrees += np.bincount(owner, minlength=num_cells)
+		degrees += np.bincount(neighbour, minlength=num_cells)
+
+	xadj = _allocate(directory, 'xadj', (num_cells + 1,), np.int64)
+	xadj[0] = 0
+	np.cumsum(degrees, out=xadj[1:])
+
+	num_entries = int(xadj[-1])
+
+	adjncy = _allocate(directory, 'adjncy', (num_entries,), np.int64)
+	adjwgt = None if points is None else _allocate(directory, 'adjwgt', (num_entries,), float)
+
+	# Next free entry of every cell
+	next_entries = xadj[:-1].copy()
+
+	for owner, neighbour, vertices in _getInternalFaceChunks(face_list) :
+
+		# Every face is an edge in both directions
+		rows = np.concatenate((owner, neighbour))
+		cols = np.concatenate((neighbour, owner))
+
+		order = np.argsort(rows, kind='stable')
+		rows = rows[order]
+
+		# Rank of every entry among the entries of its row in the chunk
+		indices = np.arange(rows.shape[0])
+		is_first = np.ones(rows.shape[0], dtype=bool)
+		is_first[1:] = rows[1:] != rows[:-1]
+
+		first_indices = indices[is_first]
+		ranks = indices - np.repeat(first_indices, np.diff(np.append(first_indices, rows.shape[0])))
+
+		entries = next_entries[rows] + ranks
+
+		adjncy[entries] = cols[order]
+
+		if adjwgt is not None :
+
+			areas = getFaceAreas(vertices, points)
+
+			adjwgt[entries] = np.concatenate((areas, areas))[order]
+
+		next_entries[rows[is_first]] += np.diff(np.append(first_indices, rows.shape[0]))
+
+	assert np.all(next_entries == xadj[1:]), 'Corrupted cell graph'
+
+	if directory is not None :
+
+		for array in (xadj, adjncy, adjwgt) :
+
+			if array is not None : array.flush()
+
+	return xadj, adjncy, adjwgt
+
+def getIntegerWeights(weights:np.ndarray, max_weight:int=metis_max_weight) -> np.ndarray :
+	'''
+	Scale positive float weights to integers from 1 to max_weight,
+	integer weights are returned as they are
+	'''
+
+	if np.issubdtype(weights.dtype, np.integer) : return weights
+
+	assert np.all(weights > 0), 'Weights must be positive'
+
+	return np.maximum(1, np.rint(weights * (max_weight / weights.max()))).astype(np.int64)
+
+def _formatIntegers(values:np.ndarray, separators:np.ndarray, num_digits:np.ndarray) -> bytes :
+	'''
+	Format the non-negative integers as ASCII text,
+	every value preceded by its separator byte (none if 0)
+	and written with num_digits digits (none if 0)
+	'''
+
+	width = max(1, int(num_digits.max(initial=1)))
+
+	buffer = np.empty((values.shape[0], width + 1), dtype=np.uint8)
+
+	buffer[:, 0] = separators
+	buffer[:, 1:] = (values[:, None] // _powers_of_10[width - 1::-1]) % 10 + ord('0')
+
+	is_written = np.empty(buffer.shape, dtype=bool)
+
+	is_written[:, 0] = separators != 0
+	is_written[:, 1:] = np.arange(width) >= width - num_digits[:, None]
+
+	return buffer[is_written].tobytes()
+
+@Profiler.profiled
+def writeMETISGraph(
+	path:Path,
+	xadj:np.ndarray,
+	adjncy:np.ndarray,
+	vertex_weights:np.ndarray|None=None,
+	edge_weights:np.ndarray|None=None
+) -> None :
+	'''
+	Write the CSR graph to a METIS graph file, as read by gpmetis and Scotch,
+	a line of the number of cells, edges and the format, followed by
+	a line per cell of its weight and its one based neighbours,
+	each followed by the weight of the edge.
+	Float weights are scaled to integers, refer to getIntegerWeights.
+	The text is formatted with vectorized digit extraction
+	in chunks of about graph_chunk_size entries.
+	'''
+
+	num_cells = xadj.shape[0] - 1
+
+	assert adjncy.shape[0] == xadj[-1] and adjncy.shape[0] % 2 == 0, 'Invalid graph'
+	assert vertex_weights is None or vertex_weights.shape == (num_cells,), 'Invalid vertex weights'
+	assert edge_weights is None or edge_weights.shape == adjncy.shape, 'Invalid edge weights'
+
+	if vertex_weights is not None : vertex_weights = getIntegerWeights(vertex_weights)
+	if edge_weights is not None : edge_weights = getIntegerWeights(edge_weights)
+
+	has_vertex_weights	= int(vertex_weights is not None)
+	has_edge_weights	= int(edge_weights is not None)
+
+	header = f'{num_cells} {adjncy.shape[0] // 2}'
+
+	if has_vertex_weights or has_edge_weights :
+
+		header += f' 0{has_vertex_weights}{has_edge_weights}'
+
+	# Chunks of cells with about graph_chunk_size entries
+	chunk_starts = np.searchsorted(xadj, np.arange(0, xadj[-1], graph_chunk_size), side='right') - 1
+	chunk_bounds = np.unique(np.concatenate((chunk_starts, [0, num_cells])))
+
+	with open(path, 'wb') as f :
+
+		f.write(f'{header}\n'.encode())
+
+		for start, end in zip(chunk_bounds[:-1], chunk_bounds[1:]) :
+
+			degrees = np.diff(xadj[start:end + 1])
+
+			neighbours = adjncy[xadj[start]:xadj[end]] + 1
+
+			if has_edge_weights :
+
+				neighbours = np.stack((neighbours, edge_weights[xadj[start]:xadj[end]]), axis=-1).ravel()
+
+			# Tokens of every line, followed by a token ending the line
+			line_sizes = has_vertex_weights + (1 + has_edge_weights) * degrees + 1
+			line_ends = np.cumsum(line_sizes) - 1
+			line_starts = line_ends - line_sizes + 1
+
+			values		= np.zeros(line_ends[-1] + 1, dtype=np.int64)
+			separators	= np.full(values.shape[0], ord(' '), dtype=np.uint8)
+			is_value	= np.ones(values.shape[0], dtype=bool)
+
+			is_value[line_ends] = False
+			separators[line_starts] = 0
+			separators[line_ends] = ord('\n')
+
+			is_neighbour = is_value.copy()
+
+			if has_vertex_weights :
+
+				values[line_starts] = vertex_weights[start:end]
+				is_neighbour[line_starts] = False
+
+			values[is_neighbour] = neighbours
+
+			num_digits = np.maximum(1, np.searchsorted(_powers_of_10, values, side='right'))
+			num_digits[~is_value] = 0
+
+			f.write(_formatIntegers(values, separators, num_digits))
+
+	pass
+
+@Profiler.profiled
+def saveCellGraph(
+	directory:Path,
+	face_list:list[FlatFaceCollection],
+	num_cells:int,
+	points:np.ndarray|None=None,
+	vertex_weights:np.ndarray|None=None
+) -> None :
+	'''
+	Save the cell graph of the faces to directory as
+	xadj.npy, adjncy.npy, adjwgt.npy (if points are provided),
+	vwgt.npy (if vertex weights are provided) and the METIS graph file graph.metis.
+	Refer to getCellGraph and writeMETISGraph.
+	'''
+
+	directory.mkdir(parents=True, exist_ok=True)
+
+	xadj, adjncy, adjwgt = getCellGraph(face_list, num_cells, points, directory)
+
+	if vertex_weights is not None : np.save(directory / 'vwgt.npy', vertex_weights)
+
+	writeMETISGraph(directory / 'graph.metis', xadj, adjncy, vertex_weights, adjwgt)
+
+	pass
@@ -1,27 +1,144 @@
+import hashlib
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
 import numpy as np
 
 import pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap as HexBlockMap
+import pyFOAM_hexBlockMesh.geometry_utils.HexBlockVertices as HexBlockVertices
+import pyFOAM_hexBlockMesh.geometry_utils.Refinement as Refinement
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
 
 from pyFOAM_hexBlockMesh.HexBlock import HexBlock
-from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
-from pyFOAM_hexBlockMesh.connect_utils.ConnectInfo import ConnectInfo
+from pyFOAM_hexBlockMesh.TransformedHexBlock import TransformedHexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection, getFaceTopologyIssues
+from pyFOAM_hexBlockMesh.connect_utils.ConnectInfo import \
+ConnectInfo, verticesFormHexBlockFace, getOrderedHexFaceVertices
 from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import hex_face_vertices
 
+# Number of points of a hex block assigned at a time by getPoints
+points_chunk_size = 2**18
+
+def _getFaceMasks(face_vertices:np.ndarray) -> np.ndarray :
+	'''
+	Get the bit masks of the sets of vertices of the (..., 4) face vertices.
+	Faces formed by the same vertices in any order have the same mask.
+	'''
+
+	return np.left_shift(1, np.asarray(face_vertices, dtype=int)).sum(axis=-1)
+
+# Bit masks of the 6 faces of a hex block
+hex_face_masks = _getFaceMasks(hex_face_vertices)
+
+def _findRoot(parents:dict, node:tuple) -> tuple[tuple, int] :
+	'''
+	Get the representative of the class of equivalent nodes
+	and the parity of the orientation of the node relative to it.
+	parents maps every node that is not a representative
+	to its parent and its parity relative to the parent.
+	'''
+
+	path = []
+
+	root = node
+
+	while root in parents :
+
+		path.append(root)
+		root = parents[root][0]
+
+	# Compress the path, accumulating the parities towards the root
+	parity = 0
+
+	for path_node in reversed(path) :
+
+		parity ^= parents[path_node][1]
+		parents[path_node] = (root, parity)
+
+	if len(path) == 0 : return root, 0
+
+	return root, parents[node][1]
+
+def _joinNodes(parents:dict, node_0:tuple, node_1:tuple, parity:int=0) -> None :
+	'''
+	Join the classes of the equivalent nodes,
+	parity is the orientation of node_1 relative to node_0
+	'''
+
+	root_0, parity_0 = _findRoot(parents, node_0)
+	root_1, parity_1 = _findRoot(parents, node_1)
+
+	if root_0 == root_1 :
+
+		assert parity_0 ^ parity_1 == parity, \
+		f'Inconsistent orientations of {node_0} and {node_1}'
+
+	else :
+
+		parents[root_1] = (root_0, parity_0 ^ parity_1 ^ parity)
+
+	pass
+
+def _getResampledHexBlock(
+	hex_block:HexBlock,
+	factors:tuple[int, int, int],
+	resample:Callable[[np.ndarray, tuple[int, int, int]], np.ndarray]
+) -> HexBlock :
+	'''
+	Get a new hex block with the point coordinates of hex_block
+	resampled by the factors
+	'''
+
+	coordinates = resample(hex_block.getPointCoordinates(), factors)
+
+	resampled_hex_block = HexBlock(*(n - 1 for n in coordinates.shape[:3]))
+	resampled_hex_block.setPointCoordinates(coordinates)
+
+	return resampled_hex_block
+
 class ConnectedHexCollection :
 	'''
 	A collection of connected hex blocks
 	'''
 
-	def __init__(self) -> None :
+	def __init__(self, validation:str=Validation.STRICT) -> None :
 		'''
 		Initialize the collection
+		validation:	Policy of the checks while the mesh is assembled,
+				strict checks every call,
+				deferred checks the assembled faces once at the end of getFaces,
+				off skips the checks in hot paths.
+				Refer to Validation.
 		'''
+
+		assert validation in Validation.policies, \
+		f'Invalid validation policy {validation}, expected one of {Validation.policies}'
+
+		self.validation = validation
+
 		# List of hex blocks
 		self.hex_blocks:list[HexBlock]		= []
 		
 		# List of ConnectInfo
 		self.connect_infos:list[ConnectInfo]	= []
 
+		# Boundary patches, name -> (patch type, list of (hex block index, face vertices))
+		self.patches:dict[str, tuple[str, list]]	= {}
+
+		# Name and type of the patch of the boundary faces not in any patch
+		self.default_patch:tuple[str, str]|None	= None
+
+		# (hex block index, face vertices) -> name of the patch
+		self.__face_patches:dict[tuple, str]	= {}
+
+		# (hex block index, face mask) of the faces connected by
+		# the first __num_indexed_connections connect infos
+		self.__connected_faces:set[tuple[int, int]]	= set()
+		self.__num_indexed_connections:int		= 0
+
 		pass
 
 	def addHexBlock(self, hex_block:HexBlock) -> int :
@@ -45,20 +162,41 @@ class ConnectedHexCollection :
 		Check if the face is connected to another hex block
 		'''
 		
-		assert isinstance(hex_block_id, int), 'Invalid hex block id'
+		assert isinstance(hex_block_id, (int, np.integer)), 'Invalid hex block id'
 		assert isinstance(face_vertices, tuple), 'Invalid face vertices'
 		
-		flag = False
-
-		# Check if the face is connected to another hex block
-		for connect_info in self.connect_infos :
-			
-			if connect_info.isHexFaceConnected(hex_block_id, face_vertices) :
+		key = (int(hex_block_id), int(_getFaceMasks(face_vertices)))
 
-				flag = True
-				break
+		flag = key in self.__getConnectedFaces()
 			
 		return flag
+
+	def __getConnectedFaces(self) -> set[tuple[int, int]] :
+		'''
+		Get the set of (hex block index, face mask) of the connected faces,
+		indexing the connect infos appended since the last call
+		'''
+
+		# The connect infos were replaced
+		if len(self.connect_infos) < self.__num_indexed_connections :
+
+			self.__connected_faces.clear()
+			self.__num_indexed_connections = 0
+
+		for connect_info in self.connect_infos[self.__num_indexed_connections:] :
+
+			self.__connected_faces.add((
+				connect_info.hex_block_id_0,
+				int(_getFaceMasks(connect_info.face_vertices_0))
+			))
+			self.__connected_faces.add((
+				connect_info.hex_block_id_1,
+				int(_getFaceMasks(connect_info.face_vertices_1))
+			))
+
+		self.__num_indexed_connections = len(self.connect_infos)
+
+		return self.__connected_faces
 	
 	def connectHexBlocks(
 		self,
@@ -82,6 +220,10 @@ class ConnectedHexCollection :
 			'Hex block 1 is already connected to the face'
 		assert not self.isHexFaceConnected(hex_block_id_1, face_vertices_1), \
 			'Hex block 2 is already connected to the face'
+		assert self.getPatchName(hex_block_id_0, face_vertices_0) is None, \
+			'Face of hex block 1 is in a boundary patch'
+		assert self.getPatchName(hex_block_id_1, face_vertices_1) is None, \
+			'Face of hex block 2 is in a boundary patch'
 		
 		assert connect_info.isValid(self.hex_blocks), 'Invalid connect info'
 		
@@ -89,6 +231,270 @@ class ConnectedHexCollection :
 		
 		pass
 
+	def connectHexBlockTable(self, table:np.ndarray) -> None :
+		'''
+		Connect hex blocks from a (n, 10) table of rows
+		(hex block index 0, hex block index 1, 4 face vertices 0, 4 face vertices 1),
+		each equivalent to a call of connectHexBlocks.
+		All the rows are validated in a single pass before any connection is added,
+		and the invalid rows are reported together.
+		The rows are grouped by their face vertices, the slices and the shapes
+		of the faces being computed once per group. As every hex block
+		stores its own points, the points of every face are still gathered
+		as a view of its hex block, at a cost of a few microseconds per row.
+		'''
+
+		table = np.asarray(table)
+
+		assert table.ndim == 2 and table.shape[1] == 10, \
+		f'Table must have shape (n, 10), got {table.shape}'
+		assert np.issubdtype(table.dtype, np.integer), 'Table must be of integers'
+
+		num_rows = table.shape[0]
+
+		if num_rows == 0 : return
+
+		hex_block_ids	= table[:, :2]
+		face_vertices	= table[:, 2:].reshape((num_rows, 2, 4))
+
+		assert np.all((hex_block_ids >= 0) & (hex_block_ids < len(self.hex_blocks))), \
+		'Invalid hex block index'
+
+		invalid_rows = np.flatnonzero(hex_block_ids[:, 0] == hex_block_ids[:, 1])
+		assert invalid_rows.size == 0, f'Hex blocks are the same in rows {invalid_rows}'
+
+		invalid_rows = np.flatnonzero(np.any((face_vertices < 0) | (face_vertices > 7), axis=(1, 2)))
+		assert invalid_rows.size == 0, f'Invalid vertices in rows {invalid_rows}'
+
+		face_masks = _getFaceMasks(face_vertices)
+
+		invalid_rows = np.flatnonzero(~np.all(np.isin(face_masks, hex_face_masks), axis=1))
+		assert invalid_rows.size == 0, f'Vertices do not form a face in rows {invalid_rows}'
+
+		# Every face is connected at most once
+		keys = hex_block_ids * len(hex_face_masks) + np.searchsorted(
+			np.sort(hex_face_masks), face_masks
+		)
+		keys = keys.ravel()
+
+		unique_keys, counts = np.unique(keys, return_counts=True)
+
+		repeated_rows = np.unique(np.flatnonzero(
+			np.isin(keys, unique_keys[counts > 1])
+		) // 2)
+
+		assert repeated_rows.size == 0, \
+		f'Faces are connected more than once in rows {repeated_rows}'
+
+		connected_faces = self.__getConnectedFaces()
+
+		for row, ((hex_block_id_0, hex_block_id_1), (mask_0, mask_1)) in \
+		enumerate(zip(hex_block_ids.tolist(), face_masks.tolist())) :
+
+			assert (hex_block_id_0, mask_0) not in connected_faces and \
+			(hex_block_id_1, mask_1) not in connected_faces, \
+			f'Face in row {row} is already connected'
+
+		if len(self.patches) > 0 :
+
+			for row in range(num_rows) :
+
+				for side in range(2) :
+
+					assert self.getPatchName(
+						int(hex_block_ids[row, side]), tuple(face_vertices[row, side].tolist())
+					) is None, f'Face in row {row} is in a boundary patch'
+
+		connect_infos = [
+			ConnectInfo(hex_block_id_0, hex_block_id_1, tuple(vertices_0), tuple(vertices_1))
+			for (hex_block_id_0, hex_block_id_1), (vertices_0, vertices_1) in
+			zip(hex_block_ids.tolist(), face_vertices.tolist())
+		]
+
+		# Gather the points of all the connected faces
+		# to compare them at once
+		points_0	= [np.zeros((0, 3))] * num_rows
+		points_1	= [np.zeros((0, 3))] * num_rows
+		mismatched_rows	= []
+
+		point_shapes = np.array([hex_block.point_ID.shape for hex_block in self.hex_blocks])
+
+		patterns, pattern_indices = np.unique(table[:, 2:], axis=0, return_inverse=True)
+		pattern_indices = pattern_indices.ravel()
+
+		for pattern_index, pattern in enumerate(patterns.tolist()) :
+
+			rows = np.flatnonzero(pattern_indices == pattern_index)
+
+			slice_0 = HexBlockVertices.getSurfaceCompleteSlice(tuple(pattern[:4]))
+			slice_1 = HexBlockVertices.getSurfaceCompleteSlice(tuple(pattern[4:]))
+
+			# The faces span the point shapes along the first 2 axes of the slices
+			shapes_0 = point_shapes[hex_block_ids[rows, 0]][:, slice_0.axes[:2]]
+			shapes_1 = point_shapes[hex_block_ids[rows, 1]][:, slice_1.axes[:2]]
+
+			is_mismatched = np.any(shapes_0 != shapes_1, axis=1)
+
+			mismatched_rows.extend(rows[is_mismatched].tolist())
+
+			for row in rows[~is_mismatched].tolist() :
+
+				hex_block_id_0, hex_block_id_1 = hex_block_ids[row].tolist()
+
+				points_0[row] = self.hex_blocks[hex_block_id_0].getSlicePointCoordinates(slice_0).reshape((-1, 3))
+				points_1[row] = self.hex_blocks[hex_block_id_1].getSlicePointCoordinates(slice_1).reshape((-1, 3))
+
+		mismatched_rows.sort()
+
+		assert len(mismatched_rows) == 0, \
+		f'Faces have different number of points in rows {mismatched_rows}'
+
+		sizes = [face_points.shape[0] for face_points in points_0]
+
+		points_match = np.isclose(np.concatenate(points_0), np.concatenate(points_1)).all(axis=1)
+
+		mismatched_rows = np.unique(np.repeat(np.arange(num_rows), sizes)[~points_match])
+
+		assert mismatched_rows.size == 0, \
+		f'Points of the faces do not match in rows {mismatched_rows}'
+
+		self.connect_infos.extend(connect_infos)
+
+		pass
+
+	def addHexBlockLattice(self, hex_blocks:list|np.ndarray) -> np.ndarray :
+		'''
+		Add an N x M x K lattice of hex blocks and connect every hex block
+		to its neighbours, i.e., the end of axis 0 of hex_blocks[i][j][k]
+		to the start of axis 0 of hex_blocks[i+1][j][k], and so on along
+		axes 1 and 2. The axes of all the hex blocks must be aligned.
+		hex_blocks is a 3D nested list or an (N, M, K) array of hex blocks.
+		Return the (N, M, K) indices of the hex blocks in the collection.
+		'''
+
+		lattice = np.empty(np.shape(hex_blocks), dtype=object)
+		assert lattice.ndim == 3, 'Hex blocks must form a 3D lattice'
+
+		for index in np.ndindex(lattice.shape) :
+
+			lattice[index] = hex_blocks[index[0]][index[1]][index[2]]
+
+		start_index = len(self.hex_blocks)
+
+		for hex_block in lattice.ravel() :
+
+			self.addHexBlock(hex_block)
+
+		indices = np.arange(start_index, start_index + lattice.size).reshape(lattice.shape)
+
+		# Faces at the end and the start of every axis
+		axis_faces = (
+			((1, 2, 6, 5), (0, 3, 7, 4)),
+			((3, 2, 6, 7), (0, 1, 5, 4)),
+			((4, 5, 6, 7), (0, 1, 2, 3)),
+		)
+
+		tables = []
+
+		for axis, (face_vertices_0, face_vertices_1) in enumerate(axis_faces) :
+
+			indices_0 = np.delete(indices, -1, axis=axis).ravel()
+			indices_1 = np.delete(indices, 0, axis=axis).ravel()
+
+			table = np.empty((indices_0.size, 10), dtype=int)
+
+			table[:, 0]	= indices_0
+			table[:, 1]	= indices_1
+			table[:, 2:6]	= face_vertices_0
+			table[:, 6:]	= face_vertices_1
+
+			tables.append(table)
+
+		self.connectHexBlockTable(np.concatenate(tables))
+
+		return indices
+
+	def getPatchName(
+		self,
+		hex_block_id:int,
+		face_vertices:tuple[int, int, int, int]
+	) -> str|None :
+		'''
+		Get the name of the patch containing the face of the hex block,
+		None if the face is not in any patch
+		'''
+
+		face_vertices = getOrderedHexFaceVertices(tuple(face_vertices))
+
+		return self.__face_patches.get((hex_block_id, face_vertices))
+
+	def addPatch(
+		self,
+		name:str,
+		block_faces:list[tuple[int, tuple[int, int, int, int]]],
+		patch_type:str='patch'
+	) -> None :
+		'''
+		Group faces of the hex blocks into a boundary patch.
+		block_faces is a list of (hex block index, 4 face vertices).
+		The faces of a patch are contiguous in the output of getFaces,
+		in the order of block_faces.
+		Faces must not be connected to another hex block
+		or be in another patch.
+		'''
+
+		assert isinstance(name, str) and len(name) > 0, 'Invalid patch name'
+		assert name not in self.patches, f'Patch {name} is already defined'
+		assert self.default_patch is None or self.default_patch[0] != name, \
+		f'Patch {name} is the default patch'
+		assert len(block_faces) > 0, f'Patch {name} has no faces'
+
+		ordered_block_faces = []
+
+		for hex_block_id, face_vertices in block_faces :
+
+			face_vertices = tuple(face_vertices)
+
+			assert hex_block_id in range(len(self.hex_blocks)), \
+			f'Invalid hex block index {hex_block_id}'
+			assert verticesFormHexBlockFace(face_vertices), \
+			f'Vertices {face_vertices} do not form a face'
+
+			face_vertices = getOrderedHexFaceVertices(face_vertices)
+
+			assert not self.isHexFaceConnected(hex_block_id, face_vertices), \
+			f'Face {face_vertices} of hex block {hex_block_id} is connected'
+
+			assert self.getPatchName(hex_block_id, face_vertices) is None and \
+			(hex_block_id, face_vertices) not in ordered_block_faces, \
+			f'Face {face_vertices} of hex block {hex_block_id} is already in a patch'
+
+			ordered_block_faces.append((hex_block_id, face_vertices))
+
+		self.patches[name] = (patch_type, ordered_block_faces)
+
+		for block_face in ordered_block_faces :
+
+			self.__face_patches[block_face] = name
+
+		pass
+
+	def setDefaultPatch(self, name:str, patch_type:str='patch') -> None :
+		'''
+		Group the boundary faces not in any patch into a single patch.
+		Without a default patch, every such hex block face
+		is a separate patch named Hex_{i}_Face_{vertices}.
+		'''
+
+		assert isinstance(name, str) and len(name) > 0, 'Invalid patch name'
+		assert name not in self.patches, f'Patch {name} is already defined'
+
+		self.default_patch = (name, patch_type)
+
+		pass
+
+	@Profiler.profiled
+	@Validation.withPolicy
 	def assignCellIDs(self, start_ID:int=0) -> int :
 		'''
 		Assign cell IDs to cells in the hex blocks
@@ -105,7 +511,8 @@ class ConnectedHexCollection :
 			# Assign cell indices to the hex block
 			i = hex_block.setCellIDs(i)
 
-		self.num_cells = i - start_ID
+		self.num_cells		= i - start_ID
+		self.start_cell_ID	= start_ID
 
 		return i
 	
@@ -120,10 +527,36 @@ class ConnectedHexCollection :
 
 		ID = start_ID
 
-		# Loop over the vertices shared by 2 or more hex blocks
+		# Group the (hex block, vertex) shared by 2 or more hex blocks,
+		# so that the IDs do not depend on the order of the connections
+		parents = {}
+		nodes = {}
+
 		for connect_info in self.connect_infos :
-			
-			ID = connect_info.assignVertexPointIDs(self.hex_blocks, ID)
+
+			for j in range(4) :
+
+				node_0 = (connect_info.hex_block_id_0, connect_info.face_vertices_0[j])
+				node_1 = (connect_info.hex_block_id_1, connect_info.face_vertices_1[j])
+
+				_joinNodes(parents, node_0, node_1)
+
+				nodes.setdefault(node_0)
+				nodes.setdefault(node_1)
+
+		# Number the groups in the order they first appear
+		root_IDs = {}
+
+		for node in nodes :
+
+			root, _ = _findRoot(parents, node)
+
+			if root not in root_IDs :
+
+				root_IDs[root] = ID
+				ID += 1
+
+			self.hex_blocks[node[0]].setVertexPointID(node[1], root_IDs[root])
 
 		for hex_block in self.hex_blocks :
 
@@ -150,10 +583,67 @@ class ConnectedHexCollection :
 
 		ID = start_ID
 
-		# Loop over the edges shared by 2 or more hex blocks
+		# Group the (hex block, edge) shared by 2 or more hex blocks,
+		# the parity of a node is 1 if the edge is traversed
+		# against the order of the vertex pair in the vertex connectivity
+		parents = {}
+		nodes = {}
+
+		def getNode(hex_block_id:int, vertex_0:int, vertex_1:int) -> tuple[tuple, int] :
+
+			if (vertex_0, vertex_1) in HexBlockMap.vertex_connectivity :
+
+				return (hex_block_id, vertex_0, vertex_1), 0
+
+			return (hex_block_id, vertex_1, vertex_0), 1
+
 		for connect_info in self.connect_infos :
-			
-			ID = connect_info.assignEdgePointIDs(self.hex_blocks, ID)
+
+			for j0 in range(4) :
+
+				j1 = (j0 + 1) % 4
+
+				node_0, parity_0 = getNode(
+					connect_info.hex_block_id_0,
+					connect_info.face_vertices_0[j0],
+					connect_info.face_vertices_0[j1]
+				)
+				node_1, parity_1 = getNode(
+					connect_info.hex_block_id_1,
+					connect_info.face_vertices_1[j0],
+					connect_info.face_vertices_1[j1]
+				)
+
+				_joinNodes(parents, node_0, node_1, parity_0 ^ parity_1)
+
+				nodes.setdefault(node_0, parity_0)
+				nodes.setdefault(node_1, parity_1)
+
+		# Number the groups in the order they first appear,
+		# along the direction the edge is first traversed
+		root_IDs = {}
+
+		for node, traversal_parity in nodes.items() :
+
+			root, parity = _findRoot(parents, node)
+
+			if root not in root_IDs :
+
+				num_edge_points = \
+				self.hex_blocks[node[0]].getEdgePointIDs(node[1], node[2]).shape[0]
+
+				edge_IDs = np.arange(ID, ID + num_edge_points)
+
+				if traversal_parity ^ parity : edge_IDs = edge_IDs[::-1]
+
+				root_IDs[root] = edge_IDs
+				ID += num_edge_points
+
+			edge_IDs = root_IDs[root]
+
+			if parity : edge_IDs = edge_IDs[::-1]
+
+			self.hex_blocks[node[0]].setEdgePointIDs(node[1], node[2], edge_IDs.copy())
 
 		for hex_block in self.hex_blocks :
 
@@ -231,6 +721,8 @@ class ConnectedHexCollection :
 
 		return ID
 	
+	@Profiler.profiled
+	@Validation.withPolicy
 	def assignPointIDs(self, start_ID:int=0) -> int :
 		'''
 		Assign IDs to the points of hex blocks
@@ -250,10 +742,235 @@ class ConnectedHexCollection :
 
 			ID = hex_block.setInternalPointIDs(ID)
 
-		self.num_points = ID - start_ID
+		self.num_points		= ID - start_ID
+		self.start_point_ID	= start_ID
 
 		return ID
 	
+	def __getResampledCollection(
+		self,
+		factors:int|tuple[int, int, int]|list,
+		resample:Callable[[np.ndarray, tuple[int, int, int]], np.ndarray],
+		max_workers:int|None
+	) -> 'ConnectedHexCollection' :
+		'''
+		Get a new collection with the point coordinates of every hex block
+		resampled by resample, and the same connections.
+		The hex blocks are resampled in a pool of max_workers threads.
+		'''
+
+		if isinstance(factors, list) :
+
+			assert len(factors) == len(self.hex_blocks), \
+			f'Expected factors of {len(self.hex_blocks)} hex blocks, got {len(factors)}'
+
+			block_factors = [Refinement.getFactors(f) for f in factors]
+
+		else :
+
+			block_factors = [Refinement.getFactors(factors)] * len(self.hex_blocks)
+
+		# Hex blocks storing coordinates, resampled once per set of factors
+		# Transformed hex blocks are rebuilt from their resampled source
+		sources = {}
+		source_keys = []
+
+		for hex_block, hex_block_factors in zip(self.hex_blocks, block_factors) :
+
+			if isinstance(hex_block, TransformedHexBlock) :
+
+				source = hex_block.source
+				source_factors = tuple(
+					hex_block_factors[hex_block.axes.index(axis)] for axis in range(3)
+				)
+
+			else :
+
+				source = hex_block
+				source_factors = hex_block_factors
+
+			key = (id(source), source_factors)
+
+			sources[key] = source
+			source_keys.append(key)
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor :
+
+			futures = {
+				key : Validation.submit(executor, self.validation, _getResampledHexBlock, source, key[1], resample)
+				for key, source in sources.items()
+			}
+
+			resampled_sources = {key : future.result() for key, future in futures.items()}
+
+		hex_collection = ConnectedHexCollection(self.validation)
+
+		for hex_block, key in zip(self.hex_blocks, source_keys) :
+
+			if isinstance(hex_block, TransformedHexBlock) :
+
+				resampled_hex_block = TransformedHexBlock(
+					resampled_sources[key],
+					hex_block.matrix,
+					hex_block.translation,
+					hex_block.axes,
+					hex_block.reverse
+				)
+
+			else :
+
+				resampled_hex_block = resampled_sources[key]
+
+			hex_collection.addHexBlock(resampled_hex_block)
+
+		for name, (patch_type, block_faces) in self.patches.items() :
+
+			hex_collection.addPatch(name, block_faces, patch_type)
+
+		if self.default_patch is not None :
+
+			hex_collection.setDefaultPatch(*self.default_patch)
+
+		# The faces are checked to still be connected,
+		# which fails if connected faces are resampled by different factors
+		for connect_info in self.connect_infos :
+
+			hex_collection.connectHexBlocks(
+				connect_info.hex_block_id_0,
+				connect_info.hex_block_id_1,
+				connect_info.face_vertices_0,
+				connect_info.face_vertices_1
+			)
+
+		return hex_collection
+
+	def getRefinedCollection(
+		self,
+		factors:int|tuple[int, int, int]|list,
+		max_workers:int|None=None
+	) -> 'ConnectedHexCollection' :
+		'''
+		Get a new collection with every cell subdivided into
+		f0 x f1 x f2 cells along the axes of its hex block.
+		factors is a single factor, 3 factors applied to every hex block,
+		or a list of 3 factors for every hex block.
+		The new points are interpolated linearly in index space,
+		refer to Refinement.getRefinedCoordinates.
+		Connected faces must be refined by the same factors.
+		The IDs of the new collection are not assigned.
+		'''
+
+		return self.__getResampledCollection(
+			factors, Refinement.getRefinedCoordinates, max_workers
+		)
+
+	def getCoarsenedCollection(
+		self,
+		factors:int|tuple[int, int, int]|list,
+		max_workers:int|None=None
+	) -> 'ConnectedHexCollection' :
+		'''
+		Get a new collection with every f0 x f1 x f2 cells merged into one,
+		keeping every f-th point along the axes of every hex block.
+		Refer to getRefinedCollection for the factors.
+		'''
+
+		return self.__getResampledCollection(
+			factors, Refinement.getCoarsenedCoordinates, max_workers
+		)
+
+	def getTopologyFingerprint(self) -> str :
+		'''
+		Get a hash of the block dimensions and the connections.
+		Collections with the same fingerprint are assigned
+		the same cell and point IDs.
+		'''
+
+		topology = [
+			('HexBlock', hex_block.cell_ID.shape)
+			for hex_block in self.hex_blocks
+		]
+
+		topology += [
+			(
+				'ConnectInfo',
+				connect_info.hex_block_id_0,
+				connect_info.hex_block_id_1,
+				connect_info.face_vertices_0,
+				connect_info.face_vertices_1
+			)
+			for connect_info in self.connect_infos
+		]
+
+		# The patches only change the grouping of the faces
+		if len(self.patches) > 0 or self.default_patch is not None :
+
+			topology += [('Patches', self.patches, self.default_patch)]
+
+		fingerprint = hashlib.sha256(repr(topology).encode()).hexdigest()
+
+		return fingerprint
+
+	def saveTopology(self, path:Path) -> None :
+		'''
+		Save the fingerprint and the assigned cell and point IDs
+		of the hex blocks to a .npz file
+		'''
+
+		assert hasattr(self, 'num_cells') and hasattr(self, 'num_points'), \
+		'Cell and point IDs are not assigned'
+
+		arrays = {
+			'fingerprint'	: np.array(self.getTopologyFingerprint()),
+			'num_cells'	: np.array(self.num_cells),
+			'num_points'	: np.array(self.num_points),
+			'start_cell_ID'	: np.array(getattr(self, 'start_cell_ID', 0)),
+			'start_point_ID'	: np.array(getattr(self, 'start_point_ID', 0)),
+		}
+
+		for i, hex_block in enumerate(self.hex_blocks) :
+
+			arrays[f'cell_ID_{i}']	= hex_block.cell_ID
+			arrays[f'point_ID_{i}']	= hex_block.point_ID
+
+		with open(path, 'wb') as f :
+
+			np.savez(f, **arrays)
+
+		pass
+
+	def loadTopology(self, path:Path) -> bool :
+		'''
+		Load the cell and point IDs of the hex blocks from a .npz file
+		saved by saveTopology.
+		Return False without modifying the collection
+		if the file does not exist or the fingerprint does not match.
+		'''
+
+		if not Path(path).is_file() : return False
+
+		with np.load(path) as arrays :
+
+			if str(arrays['fingerprint']) != self.getTopologyFingerprint() :
+
+				return False
+
+			for i, hex_block in enumerate(self.hex_blocks) :
+
+				hex_block.cell_ID	= arrays[f'cell_ID_{i}']
+				hex_block.point_ID	= arrays[f'point_ID_{i}']
+
+			self.num_cells	= int(arrays['num_cells'])
+			self.num_points	= int(arrays['num_points'])
+
+			# Files saved before the start IDs were stored start from 0
+			self.start_cell_ID	= int(arrays['start_cell_ID']) if 'start_cell_ID' in arrays else 0
+			self.start_point_ID	= int(arrays['start_point_ID']) if 'start_point_ID' in arrays else 0
+
+		return True
+
+	@Profiler.profiled
+	@Validation.withPolicy
 	def getFaces(self) -> list[FlatFaceCollection] :
 		'''
 		Get the faces of the hex blocks
@@ -276,67 +993,196 @@ class ConnectedHexCollection :
 		# Collect the boundary faces
 		returned_faces = [interior_faces]
 
+		for name, (patch_type, block_faces) in self.getPatchBlockFaces().items() :
+
+			faces = FlatFaceCollection(name, patch_type)
+			faces.appendNDFaceCollections([
+				self.hex_blocks[i].getSurface(face_vertices)
+				for i, face_vertices in block_faces
+			])
+
+			returned_faces.append(faces)
+
+		if Validation.getPolicy() == Validation.DEFERRED :
+
+			issues = getFaceTopologyIssues(
+				returned_faces, self.num_cells, self.num_points,
+				getattr(self, 'start_cell_ID', 0), getattr(self, 'start_point_ID', 0)
+			)
+
+			assert len(issues) == 0, 'Invalid mesh :\n' + '\n'.join(issues)
+
+		return returned_faces
+
+	def getPatchBlockFaces(self) -> dict[str, tuple[str, list[tuple[int, tuple[int, int, int, int]]]]] :
+		'''
+		Get the type and the (hex block index, face vertices) of the faces
+		of every boundary patch, in the order of the patches returned by getFaces :
+		a patch Hex_{i}_Face_{vertices} per boundary face of the hex blocks
+		not in any patch if there is no default patch,
+		followed by the patches and the default patch
+		'''
+
+		patches = {}
+
+		# Boundary faces not in any patch
+		default_faces = []
+
 		for i, hex_block in enumerate(self.hex_blocks) :
 
 			for face_vertices in hex_face_vertices :
-				
-				if not self.isHexFaceConnected(i, face_vertices) :
-					
+
+				if self.isHexFaceConnected(i, face_vertices) : continue
+
+				if self.getPatchName(i, face_vertices) is not None : continue
+
+				if self.default_patch is not None :
+
+					default_faces.append((i, face_vertices))
+
+				else :
+
 					# Hex_1_Face_0123
-					name  = f'Hex_{i}_Face_{"".join(map(str, face_vertices))}'
+					patches[f'Hex_{i}_Face_{"".join(map(str, face_vertices))}'] = ('patch', [(i, face_vertices)])
 
-					faces = FlatFaceCollection(name=name)
-					faces.appendNDFaceCollection(
-						hex_block.getSurface(face_vertices)
-					)
+		for name, (patch_type, block_faces) in self.patches.items() :
 
-					returned_faces.append(faces)
+			patches[name] = (patch_type, block_faces)
 
-		return returned_faces
+		if len(default_faces) > 0 :
+
+			name, patch_type = self.default_patch
+
+			patches[name] = (patch_type, default_faces)
 
+		return patches
+
+	def getConnectionFaceRanges(self) -> np.ndarray :
+		'''
+		Get the (N, 2) start and end indices of the faces of every connection
+		in the interior faces returned by getFaces,
+		which begin with the faces of the connections in their order
+		'''
+
+		num_faces = []
+
+		for connect_info in self.connect_infos :
+
+			hex_block = self.hex_blocks[connect_info.hex_block_id_0]
+
+			indices = np.array([HexBlockMap.vertex_map[v] for v in connect_info.face_vertices_0])
+
+			# Axes in the plane of the face vary between its vertices
+			in_plane = np.any(indices != indices[0], axis=0)
+
+			num_faces.append(int(np.prod(np.array(hex_block.cell_ID.shape)[in_plane])))
+
+		ends = np.cumsum(num_faces, dtype=int)
+
+		return np.stack((ends - np.array(num_faces, dtype=int), ends), axis=-1).reshape((-1, 2))
+
+	@Profiler.profiled
+	@Validation.withPolicy
 	def getPoints(self) -> np.ndarray :
 		'''
-		Get the points of the hex blocks
+		Get the points of the hex blocks.
+		The points of every hex block are assigned in chunks of
+		about points_chunk_size points along axis 0, so that
+		the coordinates of transformed hex blocks are never
+		computed all at once.
 		'''
 
 		points = np.zeros((self.num_points, 3), dtype=float)
 		points.fill(np.nan)
 
-		for hex_block in self.hex_blocks :
+		for i, hex_block in enumerate(self.hex_blocks) :
 
-			points_view = points[hex_block.point_ID, :]
-			points_non_nan = ~np.isnan(points_view)
-			
-			# Assert that the points already assigned are the same
-			assert np.all(np.isclose(
-				points_view[points_non_nan],
-				hex_block.point_coordinates[points_non_nan]
-			)), 'Points already assigned are not the same!'
+			n0, n1, n2 = hex_block.point_ID.shape
+
+			chunk_layers = max(1, points_chunk_size // (n1 * n2))
+
+			with Profiler.stage('ConnectedHexCollection.getPoints.block', hex_block=i) :
+
+				for start in range(0, n0, chunk_layers) :
+
+					end = min(start + chunk_layers, n0)
+
+					point_IDs	= hex_block.point_ID[start:end]
+					coordinates	= hex_block.getPointCoordinateLayers(start, end)
+
+					if not Validation.isOff() :
+
+						points_view = points[point_IDs, :]
+						points_non_nan = ~np.isnan(points_view)
 
-			# Assign the points
-			points[hex_block.point_ID, :] = hex_block.point_coordinates
+						# Assert that the points already assigned are the same
+						assert np.all(np.isclose(
+							points_view[points_non_nan],
+							coordinates[points_non_nan]
+						)), 'Points already assigned are not the same!'
+
+					# Assign the points
+					points[point_IDs, :] = coordinates
 
 		return points
 	
-	def getCellCenters(self) -> np.ndarray :
+	@Profiler.profiled
+	@Validation.withPolicy
+	def getCellCenters(self, volume_weighted:bool=False) -> np.ndarray :
 		'''
-		Get the centers of the hex blocks
+		Get the centers of the cells of the hex blocks.
+		The centers of every hex block with consecutive cell IDs
+		varying fastest along axis 0, as assigned by assignCellIDs,
+		are written directly into its slice of the returned array,
+		and scattered to its cell IDs otherwise, e.g., after renumbering.
+		If volume_weighted is True, the volume weighted centroids
+		consistent with OpenFOAM are returned.
 		'''
 
-		cell_centers = np.zeros((self.num_cells, 3), dtype=float)
-		cell_centers.fill(np.nan)
+		cell_centers = np.empty((self.num_cells, 3), dtype=float)
 
-		for hex_block in self.hex_blocks :
+		# Cells whose centers are assigned
+		is_assigned = np.zeros(self.num_cells, dtype=bool)
 
-			cell_centers_view = cell_centers[hex_block.cell_ID, :]
-			
-			assert np.all(np.isnan(cell_centers_view)), \
-			'Cell centers already assigned! Possible overlapping cell IDs'
+		for i, hex_block in enumerate(self.hex_blocks) :
 
-			# Assign the cell centers
-			cell_centers[hex_block.cell_ID, :] = \
-			hex_block.getCellCenterCoordinates()
+			n0, n1, n2 = hex_block.cell_ID.shape
 
-		return cell_centers
+			start_ID	= int(hex_block.cell_ID[0, 0, 0])
+			end_ID		= start_ID + hex_block.cell_ID.size
 
-	
+			is_consecutive = 0 <= start_ID and end_ID <= self.num_cells and \
+			np.array_equal(hex_block.cell_ID.ravel(order='F'), np.arange(start_ID, end_ID))
+
+			with Profiler.stage('ConnectedHexCollection.getCellCenters.block', hex_block=i) :
+
+				if is_consecutive :
+
+					assert not is_assigned[start_ID:end_ID].any(), \
+					'Cell centers already assigned! Possible overlapping cell IDs'
+
+					# (n0, n1, n2, 3) view of the slice of the cell centers
+					cell_centers_view = cell_centers[start_ID:end_ID]. \
+					reshape((n2, n1, n0, 3)).transpose((2, 1, 0, 3))
+
+					hex_block.getCellCenterCoordinates(cell_centers_view, volume_weighted)
+
+					is_assigned[start_ID:end_ID] = True
+
+				else :
+
+					assert hex_block.cell_ID.min() >= 0 and hex_block.cell_ID.max() < self.num_cells, \
+					'Cell IDs are not assigned'
+
+					assert not is_assigned[hex_block.cell_ID].any(), \
+					'Cell centers already assigned! Possible overlapping cell IDs'
+
+					cell_centers[hex_block.cell_ID] = hex_block.getCellCenterCoordinates(volume_weighted=volume_weighted)
+
+					is_assigned[hex_block.cell_ID] = True
+
+		# Cell IDs repeated within a hex block
+		assert np.count_nonzero(is_assigned) == sum(hex_block.cell_ID.size for hex_block in self.hex_blocks), \
+		'Cell centers already assigned! Possible overlapping cell IDs'
+
+		return cell_centers
@@ -1,5 +1,8 @@
 import numpy as np
 
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
+
 def isValid(
 	owner:np.ndarray,
 	vertices:np.ndarray,
@@ -41,7 +44,8 @@ class NDFaceCollection :
 		assert isinstance(vertices, np.ndarray)
 		assert isinstance(neighbour, np.ndarray) or neighbour is None
 
-		assert isValid(owner, vertices, neighbour), 'Invalid input'
+		assert not Validation.isStrict() or isValid(owner, vertices, neighbour), \
+		'Invalid input'
 
 		self.owner = owner
 		self.vertices = vertices
@@ -107,16 +111,19 @@ class FlatFaceCollection :
 	1D Collection of quadrilateral faces
 	'''
 	
-	def __init__(self, name:str='Wall') -> None :
+	def __init__(self, name:str='Wall', patch_type:str='patch') -> None :
 		'''
 		Initialize the face
+		name:		Name of the patch if the faces are on the boundary
+		patch_type:	OpenFOAM type of the patch, e.g., patch, wall, empty
 		'''
 
 		self.owner	= np.zeros(0, dtype=int)
 		self.neighbour	= np.zeros(0, dtype=int)
 		self.vertices	= np.zeros((0, 4), dtype=int)
 
-		self.name = name
+		self.name	= name
+		self.patch_type	= patch_type
 
 		pass
 
@@ -157,7 +164,7 @@ class FlatFaceCollection :
 		Returns False even if the face collection is empty
 		'''
 
-		assert self.isValid(), 'Corrupted data'
+		assert not Validation.isStrict() or self.isValid(), 'Corrupted data'
 
 		flag = self.getSize() > 0 and self.neighbour.size == 0
 
@@ -169,8 +176,11 @@ class FlatFaceCollection :
 		'''
 
 		assert isinstance(faces, NDFaceCollection)
-		assert faces.isValid(), 'Invalid input'
-		assert self.isValid(), 'Corrupted data'
+
+		if Validation.isStrict() :
+
+			assert faces.isValid(), 'Invalid input'
+			assert self.isValid(), 'Corrupted data'
 
 		faces_flattened = faces.flatten()
 
@@ -188,6 +198,41 @@ class FlatFaceCollection :
 			
 			self.neighbour = np.append(self.neighbour, faces_flattened.neighbour)
 
+		# Every append copies the arrays
+		Profiler.count(
+			'FlatFaceCollection.appendNDFaceCollection',
+			self.owner.nbytes + self.vertices.nbytes + self.neighbour.nbytes
+		)
+
+		pass
+
+	def appendNDFaceCollections(self, faces_list:list[NDFaceCollection]) -> None :
+		'''
+		Append multiple boundary face collections at once,
+		concatenating the arrays only once
+		'''
+
+		assert all(isinstance(faces, NDFaceCollection) for faces in faces_list)
+		assert not Validation.isStrict() or all(faces.isValid() for faces in faces_list), \
+		'Invalid input'
+		assert all(faces.neighbour is None for faces in faces_list), \
+		'Only boundary faces can be appended at once'
+		assert self.neighbour.size == 0, 'Cannot append boundary faces to internal faces'
+
+		faces_flattened = [faces.flatten() for faces in faces_list]
+
+		self.owner = np.concatenate(
+			[self.owner] + [faces.owner for faces in faces_flattened]
+		)
+		self.vertices = np.concatenate(
+			[self.vertices] + [faces.vertices for faces in faces_flattened], axis=0
+		)
+
+		Profiler.count(
+			'FlatFaceCollection.appendNDFaceCollections',
+			self.owner.nbytes + self.vertices.nbytes
+		)
+
 		pass
 
 	def appendFlatFaceCollection(self, faces:'FlatFaceCollection') -> None :
@@ -196,8 +241,11 @@ class FlatFaceCollection :
 		'''
 
 		assert isinstance(faces, FlatFaceCollection)
-		assert faces.isValid(), 'Invalid input'
-		assert self.isValid(), 'Corrupted data'
+
+		if Validation.isStrict() :
+
+			assert faces.isValid(), 'Invalid input'
+			assert self.isValid(), 'Corrupted data'
 
 		if not faces.isBoundary() :
 
@@ -211,8 +259,15 @@ class FlatFaceCollection :
 		self.owner = np.append(self.owner, faces.owner)
 		self.vertices = np.append(self.vertices, faces.vertices, axis=0)
 
+		# Every append copies the arrays
+		Profiler.count(
+			'FlatFaceCollection.appendFlatFaceCollection',
+			self.owner.nbytes + self.vertices.nbytes + self.neighbour.nbytes
+		)
+
 		pass
 	
+@Profiler.profiled
 def mergeFaceCollections(face_collections:list[FlatFaceCollection]) -> FlatFaceCollection :
 	'''
 	Merge multiple face collections into one
@@ -227,12 +282,14 @@ def mergeFaceCollections(face_collections:list[FlatFaceCollection]) -> FlatFaceC
 	for face_collection in face_collections :
 
 		assert isinstance(face_collection, FlatFaceCollection), 'Invalid face collection'
-		assert face_collection.isValid(), 'Invalid face collection'
+		assert not Validation.isStrict() or face_collection.isValid(), \
+		'Invalid face collection'
 
 		merged_faces.appendFlatFaceCollection(face_collection)
 
 	return merged_faces
 
+@Profiler.profiled
 def checkInteriorFaces(
 	face_collection:FlatFaceCollection,
 	points:np.ndarray,
@@ -267,6 +324,7 @@ def checkInteriorFaces(
 
 	return bool(flag)
 
+@Profiler.profiled
 def checkBoundaryFaces(
 	face_collection:FlatFaceCollection,
 	points:np.ndarray,
@@ -300,3 +358,111 @@ def checkBoundaryFaces(
 	)
 
 	return bool(flag)
+
+@Profiler.profiled
+def getFaceTopologyIssues(
+	face_collections:list[FlatFaceCollection],
+	num_cells:int,
+	num_points:int,
+	start_cell_ID:int=0,
+	start_point_ID:int=0,
+) -> list[str] :
+	'''
+	Check the consistency of the faces of a mesh at once,
+	its cell IDs ranging from start_cell_ID to start_cell_ID + num_cells
+	and its point IDs from start_point_ID to start_point_ID + num_points.
+	Return the description of every problem found, empty if none.
+	'''
+
+	assert isinstance(face_collections, list), 'Invalid input'
+
+	issues = []
+
+	def describe(indices:np.ndarray) -> str :
+
+		# First few indices of the offending entries
+		text = ', '.join(map(str, indices[:10]))
+
+		if indices.size > 10 : text += f', ... ({indices.size} in total)'
+
+		return text
+
+	valid_collections = []
+	names = set()
+
+	for face_collection in face_collections :
+
+		name = face_collection.name
+
+		if not face_collection.isValid() :
+
+			issues.append(f'{name} : corrupted arrays')
+			continue
+
+		if face_collection.neighbour.size not in (0, face_collection.owner.size) :
+
+			issues.append(
+				f'{name} : {face_collection.neighbour.size} neighbours '
+				f'for {face_collection.owner.size} faces'
+			)
+			continue
+
+		if face_collection.neighbour.size == 0 :
+
+			if name in names : issues.append(f'{name} : patch is defined more than once')
+
+			names.add(name)
+
+		valid_collections.append(face_collection)
+
+	if len(valid_collections) == 0 : return issues
+
+	owner		= np.concatenate([faces.owner for faces in valid_collections])
+	neighbour	= np.concatenate([faces.neighbour for faces in valid_collections])
+	vertices	= np.concatenate([faces.vertices for faces in valid_collections], axis=0)
+
+	end_cell_ID	= start_cell_ID + num_cells
+	end_point_ID	= start_point_ID + num_points
+
+	invalid = np.flatnonzero((owner < start_cell_ID) | (owner >= end_cell_ID))
+	if invalid.size > 0 : issues.append(f'Owner cells out of range of faces {describe(invalid)}')
+
+	invalid = np.flatnonzero((neighbour < start_cell_ID) | (neighbour >= end_cell_ID))
+	if invalid.size > 0 : issues.append(f'Neighbour cells out of range of faces {describe(invalid)}')
+
+	invalid = np.flatnonzero(owner[:neighbour.size] == neighbour)
+	if invalid.size > 0 : issues.append(f'Owner and neighbour cells are the same of faces {describe(invalid)}')
+
+	invalid = np.flatnonzero(np.any((vertices < start_point_ID) | (vertices >= end_point_ID), axis=1))
+	if invalid.size > 0 : issues.append(f'Points out of range of faces {describe(invalid)}')
+
+	sorted_vertices = np.sort(vertices, axis=1)
+
+	invalid = np.flatnonzero(np.any(sorted_vertices[:, 1:] == sorted_vertices[:, :-1], axis=1))
+	if invalid.size > 0 : issues.append(f'Repeated points in faces {describe(invalid)}')
+
+	# Faces with the same points are adjacent once sorted
+	order = np.lexsort(sorted_vertices.T[::-1])
+
+	same_as_next = np.all(sorted_vertices[order[1:]] == sorted_vertices[order[:-1]], axis=1)
+
+	duplicate = np.zeros(order.size, dtype=bool)
+	duplicate[order[1:][same_as_next]] = True
+	duplicate[order[:-1][same_as_next]] = True
+
+	invalid = np.flatnonzero(duplicate)
+	if invalid.size > 0 : issues.append(f'Duplicate faces {describe(invalid)}')
+
+	# Every hexahedral cell is bounded by 6 faces
+	cells = np.concatenate([owner, neighbour])
+	cells = cells[(cells >= start_cell_ID) & (cells < end_cell_ID)] - start_cell_ID
+
+	invalid = np.flatnonzero(np.bincount(cells, minlength=num_cells) != 6) + start_cell_ID
+	if invalid.size > 0 : issues.append(f'Cells not bounded by 6 faces {describe(invalid)}')
+
+	points = vertices[(vertices >= start_point_ID) & (vertices < end_point_ID)] - start_point_ID
+
+	invalid = np.flatnonzero(np.bincount(points, minlength=num_points) == 0) + start_point_ID
+	if invalid.size > 0 : issues.append(f'Points not in any face {describe(invalid)}')
+
+	return issues
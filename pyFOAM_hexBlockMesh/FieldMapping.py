@@ -0,0 +1,191 @@
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+from pyFOAM_hexBlockMesh.Fields import readVolField, writeVolField
+
+def getAxisWeights(n_source:int, n_target:int) -> tuple[np.ndarray, np.ndarray, np.ndarray] :
+	'''
+	Get the linear interpolation of n_target cells from n_source cells
+	along an axis of a hex block, in the index space of the hex block.
+	The cell centers of the target lie at (i + 0.5) / n_target, and those
+	of the source at (i + 0.5) / n_source, of the length of the axis.
+	Return the indices of the lower and upper source cells and the weights
+	of the upper source cells. Target cells beyond the outermost
+	source cell centers take the values of the outermost source cells.
+	'''
+
+	assert n_source > 0 and n_target > 0, 'Invalid number of cells'
+
+	# Position of the target cell centers in source cell indices
+	positions = np.clip((np.arange(n_target) + 0.5) * (n_source / n_target) - 0.5, 0, n_source - 1)
+
+	lower = np.minimum(np.floor(positions).astype(np.int64), max(n_source - 2, 0))
+	upper = np.minimum(lower + 1, n_source - 1)
+
+	return lower, upper, positions - lower
+
+def _checkTopology(source_collection:ConnectedHexCollection, target_collection:ConnectedHexCollection) -> None :
+	'''
+	Check the hex collections have the same hex blocks and connections
+	'''
+
+	assert len(source_collection.hex_blocks) == len(target_collection.hex_blocks), \
+	'Hex collections have different numbers of hex blocks'
+
+	assert [
+		(c.hex_block_id_0, c.hex_block_id_1, c.face_vertices_0, c.face_vertices_1)
+		for c in source_collection.connect_infos
+	] == [
+		(c.hex_block_id_0, c.hex_block_id_1, c.face_vertices_0, c.face_vertices_1)
+		for c in target_collection.connect_infos
+	], 'Hex collections have different connections'
+
+	pass
+
+def _interpolate(values:np.ndarray, target_shape:tuple[int, ...]) -> np.ndarray :
+	'''
+	Interpolate the values of a structured grid of cells, e.g., (n0, n1, n2, ...)
+	values of a hex block or (m0, m1, ...) values of a surface of a hex block,
+	linearly along every axis of target_shape in turn
+	'''
+
+	for axis, n_target in enumerate(target_shape) :
+
+		lower, upper, weights = getAxisWeights(values.shape[axis], n_target)
+
+		weights = weights.reshape((-1,) + (1,) * (values.ndim - axis - 1))
+
+		values = np.take(values, lower, axis=axis) * (1 - weights) + np.take(values, upper, axis=axis) * weights
+
+	return values
+
+@Profiler.profiled
+def mapCellValues(
+	source_collection:ConnectedHexCollection,
+	target_collection:ConnectedHexCollection,
+	values:np.ndarray
+) -> np.ndarray :
+	'''
+	Map the (N,) or (N, ...) values of the cells of the source collection
+	to the cells of the target collection of the same block topology,
+	e.g., the same hex blocks at a different resolution.
+	The values of every target hex block are interpolated trilinearly
+	in the index space of the hex block from the source hex block,
+	refer to getAxisWeights. The cell IDs of both collections must be assigned.
+	'''
+
+	_checkTopology(source_collection, target_collection)
+
+	assert values.shape[0] == source_collection.num_cells, \
+	f'Expected values of {source_collection.num_cells} cells, got {values.shape[0]}'
+
+	mapped = np.empty((target_collection.num_cells,) + values.shape[1:], dtype=values.dtype)
+
+	for source_block, target_block in zip(source_collection.hex_blocks, target_collection.hex_blocks) :
+
+		# (n0, n1, n2, ...) values of the source hex block
+		mapped[target_block.cell_ID] = _interpolate(values[source_block.cell_ID], target_block.cell_ID.shape)
+
+	return mapped
+
+@Profiler.profiled
+def mapPatchValues(
+	source_collection:ConnectedHexCollection,
+	target_collection:ConnectedHexCollection,
+	patch_name:str,
+	values:np.ndarray
+) -> np.ndarray :
+	'''
+	Map the (N,) or (N, ...) values of the faces of the boundary patch
+	of the source collection, in the order of the faces returned by getFaces,
+	to the faces of the patch of the target collection of the same block topology.
+	The values of every surface of a hex block in the patch are interpolated
+	bilinearly in the index space of the surface, refer to getAxisWeights.
+	'''
+
+	_checkTopology(source_collection, target_collection)
+
+	source_patches = source_collection.getPatchBlockFaces()
+	target_patches = target_collection.getPatchBlockFaces()
+
+	assert patch_name in source_patches and patch_name in target_patches, \
+	f'Patch {patch_name} is not in both hex collections'
+
+	block_faces = source_patches[patch_name][1]
+
+	assert block_faces == target_patches[patch_name][1], \
+	f'Patch {patch_name} has different faces in the hex collections'
+
+	source_shapes = [source_collection.hex_blocks[i].getFaceShape(face_vertices) for i, face_vertices in block_faces]
+	target_shapes = [target_collection.hex_blocks[i].getFaceShape(face_vertices) for i, face_vertices in block_faces]
+
+	# Faces of every surface, flattened fastest along axis 0 of the surface
+	source_ends = np.cumsum([np.prod(shape, dtype=int) for shape in source_shapes])
+
+	assert values.shape[0] == source_ends[-1], \
+	f'Expected values of {source_ends[-1]} faces of patch {patch_name}, got {values.shape[0]}'
+
+	mapped = []
+
+	for source_shape, target_shape, end in zip(source_shapes, target_shapes, source_ends) :
+
+		surface_values = values[end - np.prod(source_shape, dtype=int):end]
+		surface_values = surface_values.reshape(source_shape + values.shape[1:], order='F')
+
+		mapped_values = _interpolate(surface_values, target_shape)
+
+		mapped.append(mapped_values.reshape((-1,) + values.shape[1:], order='F'))
+
+	return np.concatenate(mapped).astype(values.dtype, copy=False)
+
+@Profiler.profiled
+def mapVolField(
+	source_path:Path,
+	target_path:Path,
+	source_collection:ConnectedHexCollection,
+	target_collection:ConnectedHexCollection,
+	format:str='ascii',
+	target_faces:list|None=None
+) -> None :
+	'''
+	Map the volScalarField or volVectorField file of the source collection
+	to a file of the target collection, refer to mapCellValues.
+	Nonuniform patch entries, e.g., value, gradient or refValue lists,
+	are mapped from the faces of the patch, refer to mapPatchValues,
+	the other entries are copied as they are.
+	format of the target file is ascii or binary.
+	target_faces are those returned by getFaces of the target collection,
+	computed if not provided.
+	'''
+
+	if target_faces is None : target_faces = target_collection.getFaces()
+
+	dimensions, internal_field, boundary_field = readVolField(source_path)
+
+	# Nonuniform lists are read as (N,) scalars or (N, 3) vectors,
+	# and uniform values as floats or tuples
+	if isinstance(internal_field, np.ndarray) : is_scalar = internal_field.ndim == 1
+	else : is_scalar = not isinstance(internal_field, tuple)
+
+	if isinstance(internal_field, np.ndarray) :
+
+		internal_field = mapCellValues(source_collection, target_collection, internal_field)
+
+	for name, entries in boundary_field.items() :
+
+		for keyword, value in entries.items() :
+
+			if isinstance(value, np.ndarray) :
+
+				entries[keyword] = mapPatchValues(source_collection, target_collection, name, value)
+
+	writeVolField(
+		target_path, target_collection, internal_field, dimensions, boundary_field,
+		format=format, faces=target_faces, field_type='scalar' if is_scalar else 'vector'
+	)
+
+	pass
@@ -0,0 +1,413 @@
+import re
+
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.writer_utils.PolyMeshFile as PolyMeshFile
+import pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader as PolyMeshReader
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+
+# Number of cells or faces evaluated at a time
+field_chunk_size = 2**18
+
+# Sizes of the labels and scalars of binary field files
+binary_arch = '"LSB;label=32;scalar=64"'
+binary_dtype = np.dtype('<f8')
+
+# Field classes and value types of the number of components of the values
+field_types = {
+	1 : ('volScalarField', 'scalar'),
+	3 : ('volVectorField', 'vector'),
+}
+
+# Shapes of the items of the value types of nonuniform lists
+item_shapes = {
+	'scalar' : (),
+	'vector' : (3,),
+}
+
+# Keyword of an entry, and type of a nonuniform list
+keyword_pattern		= re.compile(rb'[^\s{};]+')
+nonuniform_pattern	= re.compile(rb'nonuniform\s+List<(\w+)>')
+
+def _isPerCenter(
+	value:float|tuple|np.ndarray|Callable,
+	centers:np.ndarray,
+	num_components:int|None=None
+) -> bool :
+	'''
+	Check if the value is an (N,) or (N, 3) array of values of the N centers,
+	rather than a constant. Floats, tuples and lists are always constants.
+	A (3,) array on 3 centers is a uniform vector if num_components is 3,
+	scalars of the centers if it is 1, and ambiguous if it is None.
+	'''
+
+	if not isinstance(value, np.ndarray) : return False
+
+	num_centers = centers.shape[0]
+
+	if value.shape == (3,) and num_centers == 3 :
+
+		assert num_components is not None, \
+		'Ambiguous (3,) array on 3 cells or faces, pass a tuple for a uniform vector ' \
+		'or the field_type of the field'
+
+		return num_components == 1
+
+	return value.shape in ((num_centers,), (num_centers, 3))
+
+def _getValueString(value:float|tuple) -> str :
+	'''
+	Get the OpenFOAM string of a scalar or vector value
+	'''
+
+	value = np.asarray(value, dtype=float)
+
+	if value.ndim == 0 : return f'{value:.16g}'
+
+	return '(' + ' '.join(f'{v:.16g}' for v in value) + ')'
+
+def _getNumComponents(
+	value:float|tuple|np.ndarray|Callable,
+	centers:np.ndarray,
+	num_components:int|None=None
+) -> int :
+	'''
+	Get the number of components of a constant value,
+	of an array of values of every center,
+	or of the values of a function on the first center.
+	num_components resolves ambiguous arrays, refer to _isPerCenter.
+	'''
+
+	if callable(value) : value = np.asarray(value(centers[:1]), dtype=float)[0]
+
+	elif _isPerCenter(value, centers, num_components) : value = value[0]
+
+	value = np.asarray(value, dtype=float)
+
+	assert value.shape in ((), (3,)), f'Values must be scalars or 3D vectors, got shape {value.shape}'
+
+	return 1 if value.ndim == 0 else 3
+
+def _writeValues(
+	f:BinaryIO,
+	keyword:str,
+	value:float|tuple|Callable,
+	centers:np.ndarray,
+	num_components:int|None,
+	binary:bool,
+	indent:str
+) -> None :
+	'''
+	Write the entry of a constant value as uniform,
+	or of an array of values of every center or of a function of the centers
+	as a nonuniform list, the function evaluated in chunks of centers.
+	The values must have num_components components,
+	or any number of components if None, e.g., for the scalar
+	valueFraction of a mixed patch of a vector field.
+	'''
+
+	is_per_center = _isPerCenter(value, centers, num_components)
+
+	value_num_components = _getNumComponents(value, centers, num_components)
+
+	assert num_components is None or value_num_components == num_components, \
+	f'Value of {keyword} does not match the field'
+
+	num_components = value_num_components
+
+	if not callable(value) and not is_per_center :
+
+		f.write(f'{indent}{keyword}\tuniform {_getValueString(value)};\n'.encode())
+
+		return
+
+	value_type = field_types[num_components][1]
+
+	num_values = centers.shape[0]
+
+	f.write(f'{indent}{keyword}\tnonuniform List<{value_type}>\n{num_values}\n('.encode())
+
+	if not binary : f.write(b'\n')
+
+	fmt = '%.16e' if num_components == 1 else '(%.16e %.16e %.16e)'
+
+	for start in range(0, num_values, field_chunk_size) :
+
+		if is_per_center :
+
+			chunk = np.asarray(value[start:start + field_chunk_size], dtype=float)
+
+		else :
+
+			chunk = np.asarray(value(centers[start:start + field_chunk_size]), dtype=float)
+
+		expected_shape = (min(field_chunk_size, num_values - start),) + ((3,) if num_components == 3 else ())
+
+		assert chunk.shape == expected_shape, \
+		f'Values of {keyword} must have shape {expected_shape}, got {chunk.shape}'
+
+		if binary :
+
+			f.write(memoryview(np.ascontiguousarray(chunk, dtype=binary_dtype)).cast('B'))
+
+		else :
+
+			np.savetxt(f, chunk.reshape((chunk.shape[0], -1)), fmt=fmt)
+
+	f.write(b')\n;\n' if not binary else b');\n')
+
+	pass
+
+@Profiler.profiled
+def writeVolField(
+	path:Path,
+	hex_collection:ConnectedHexCollection,
+	internal_field:float|tuple|Callable[[np.ndarray], np.ndarray],
+	dimensions:str|list[int],
+	boundary_field:dict[str, dict]|None=None,
+	format:str='ascii',
+	faces:list|None=None,
+	points:np.ndarray|None=None,
+	cell_centers:np.ndarray|None=None,
+	field_type:str|None=None
+) -> None :
+	'''
+	Write a volScalarField or volVectorField file, e.g., 0/U,
+	for the polyMesh written from the hex collection.
+	internal_field is a scalar or vector value of every cell,
+	an (N,) or (N, 3) array of the values of the N cells,
+	or a function mapping (N, 3) cell centers to (N,) or (N, 3) values,
+	evaluated in chunks of field_chunk_size cells.
+	field_type is scalar or vector, inferred from internal_field if None.
+	It must be given for a (3,) array on a mesh of 3 cells,
+	which is otherwise ambiguous, and vectors are best given as tuples.
+	dimensions are the 7 SI exponents, e.g., [0 1 -1 0 0 0 0].
+	boundary_field maps the names of the patches to their entries,
+	e.g., {'inlet' : {'type' : 'fixedValue', 'value' : function}},
+	where constant values, arrays of the values of the faces of the patch
+	and functions of the face centers of the patch are written
+	as the internal field, and strings as they are.
+	Patches not in boundary_field are empty for empty patches
+	and zeroGradient otherwise.
+	format is ascii or binary.
+	faces, points and cell_centers are those returned by getFaces,
+	getPoints and getCellCenters of the hex collection,
+	computed if not provided.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+	assert format in ('ascii', 'binary'), f'Invalid format {format}'
+
+	if faces is None : faces = hex_collection.getFaces()
+	if points is None : points = hex_collection.getPoints()
+	if cell_centers is None : cell_centers = hex_collection.getCellCenters()
+
+	if boundary_field is None : boundary_field = {}
+
+	if not isinstance(dimensions, str) :
+
+		assert len(dimensions) == 7, 'Dimensions must have 7 exponents'
+
+		dimensions = '[' + ' '.join(str(d) for d in dimensions) + ']'
+
+	patches = {face.name : face for face in faces if face.isBoundary()}
+
+	for name in boundary_field :
+
+		assert name in patches, f'Patch {name} is not in the mesh'
+
+	binary = format == 'binary'
+
+	if field_type is None :
+
+		num_components = _getNumComponents(internal_field, cell_centers)
+
+	else :
+
+		assert field_type in item_shapes, f'Invalid field type {field_type}'
+
+		num_components = 1 if field_type == 'scalar' else 3
+
+		assert _getNumComponents(internal_field, cell_centers, num_components) == num_components, \
+		f'Internal field is not a {field_type} field'
+
+	header = PolyMeshFile.getPolyMeshHeader(
+		class_name=field_types[num_components][0],
+		object_name=Path(path).name,
+		format=format,
+		location='"0"',
+		arch=binary_arch if binary else None,
+	)
+
+	with open(path, 'wb') as f :
+
+		f.write(header.encode())
+		f.write(f'dimensions\t{dimensions};\n\n'.encode())
+
+		_writeValues(f, 'internalField', internal_field, cell_centers, num_components, binary, '')
+
+		f.write(b'\nboundaryField\n{\n')
+
+		for name, patch_faces in patches.items() :
+
+			if name in boundary_field :
+
+				entries = boundary_field[name]
+
+			else :
+
+				entries = {'type' : 'empty' if patch_faces.patch_type == 'empty' else 'zeroGradient'}
+
+			f.write(f'\t{name}\n\t{{\n'.encode())
+
+			face_centers = None
+
+			for keyword, value in entries.items() :
+
+				if callable(value) or not isinstance(value, str) :
+
+					if face_centers is None :
+
+						face_centers = points[patch_faces.vertices].mean(axis=1)
+
+					# Values of the patch are of the type of the field
+					_writeValues(
+						f, keyword, value, face_centers,
+						num_components if keyword == 'value' else None, binary, '\t\t'
+					)
+
+				elif value.startswith('{') :
+
+					f.write(f'\t\t{keyword}\t{value}\n'.encode())
+
+				else :
+
+					f.write(f'\t\t{keyword}\t{value};\n'.encode())
+
+			f.write(b'\t}\n')
+
+		f.write(b'}\n\n')
+		f.write(f'{PolyMeshFile.file_EOF}\n'.encode())
+
+	pass
+
+def _readValue(data:bytes, i:int, binary:bool, scalar_dtype:np.dtype) -> tuple[float|tuple|np.ndarray|str, int] :
+	'''
+	Read the value of an entry starting at data[i], after whitespace and comments.
+	uniform values are read as floats or tuples, nonuniform lists as arrays,
+	sub-dictionaries and other values as their text.
+	Return the value and the index following the entry.
+	'''
+
+	i = PolyMeshReader.space_pattern.match(data, i).end()
+
+	match = nonuniform_pattern.match(data, i)
+
+	if match is not None :
+
+		value_type = match.group(1).decode()
+
+		assert value_type in item_shapes, f'Unsupported list of {value_type}'
+
+		values, end = PolyMeshReader.readList(data, match.end(), binary, scalar_dtype, item_shapes[value_type])
+
+		return values, data.index(b';', end) + 1
+
+	if data.startswith(b'{', i) :
+
+		# Matching closing brace of the sub-dictionary
+		depth = 0
+
+		for end in range(i, len(data)) :
+
+			depth += {ord('{') : 1, ord('}') : -1}.get(data[end], 0)
+
+			if depth == 0 : break
+
+		assert depth == 0, 'Expected } at the end of the sub-dictionary'
+
+		return data[i:end + 1].decode(), end + 1
+
+	end = data.index(b';', i)
+
+	text = data[i:end].decode().strip()
+
+	if text.startswith('uniform') :
+
+		value = np.fromstring(text[len('uniform'):].translate(str.maketrans('()', '  ')), dtype=float, sep=' ')
+
+		return float(value[0]) if value.size == 1 else tuple(value.tolist()), end + 1
+
+	return text, end + 1
+
+def _readEntries(data:bytes, i:int, binary:bool, scalar_dtype:np.dtype, depth:int=0) -> tuple[dict, int] :
+	'''
+	Read the entries from data[i] until the closing brace of the dictionary
+	or the end of the data. The boundaryField sub-dictionary (depth 0)
+	and its patches (depth 1) are read as dicts,
+	refer to _readValue for the other values.
+	Return the entries and the index following the dictionary.
+	'''
+
+	entries = {}
+
+	while True :
+
+		i = PolyMeshReader.space_pattern.match(data, i).end()
+
+		if i >= len(data) or data.startswith(b'}', i) : return entries, i + 1
+
+		match = keyword_pattern.match(data, i)
+
+		assert match is not None, f'Expected a keyword at {data[i:i + 20]}'
+
+		keyword = match.group().decode()
+
+		i = PolyMeshReader.space_pattern.match(data, match.end()).end()
+
+		is_dictionary = data.startswith(b'{', i) and (depth == 1 or (depth == 0 and keyword == 'boundaryField'))
+
+		if keyword.startswith('#') :
+
+			# Directives, e.g., #include, end with the line
+			end = data.find(b'\n', i)
+			end = len(data) if end < 0 else end
+
+			entries[keyword] = data[i:end].decode().strip()
+
+			i = end
+
+		elif is_dictionary :
+
+			entries[keyword], i = _readEntries(data, i + 1, binary, scalar_dtype, depth + 1)
+
+		else :
+
+			entries[keyword], i = _readValue(data, i, binary, scalar_dtype)
+
+@Profiler.profiled
+def readVolField(path:Path) -> tuple[str, float|tuple|np.ndarray, dict[str, dict]] :
+	'''
+	Read a volScalarField or volVectorField file, ASCII or binary.
+	Return the dimensions, the internal field and the boundary field,
+	as accepted by writeVolField : uniform values as floats or tuples,
+	nonuniform lists as (N,) or (N, 3) arrays and other entries as strings.
+	'''
+
+	header, data, start = PolyMeshReader.readFoamFile(path)
+
+	_, scalar_dtype = PolyMeshReader.getBinaryDtypes(header)
+
+	# Comments between the entries, e.g., the banner after the header, are skipped
+	entries, _ = _readEntries(data, start, header['format'] == 'binary', scalar_dtype)
+
+	for keyword in ('dimensions', 'internalField', 'boundaryField') :
+
+		assert keyword in entries, f'{path} has no {keyword}'
+
+	return entries['dimensions'], entries['internalField'], entries['boundaryField']
@@ -1,13 +1,19 @@
 import numpy as np
 
 import pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap as HexBlockMap
+import pyFOAM_hexBlockMesh.geometry_utils.Grading as Grading
+import pyFOAM_hexBlockMesh.geometry_utils.CellGeometry as CellGeometry
 import pyFOAM_hexBlockMesh.geometry_utils.HexBlockFaces as HexBlockFaces
 import pyFOAM_hexBlockMesh.geometry_utils.HexBlockVertices as HexBlockVertices
+import pyFOAM_hexBlockMesh.geometry_utils.TransfiniteInterpolation as TransfiniteInterpolation
 
-from pyFOAM_hexBlockMesh.geometry_utils.CoordinatesOrientation import checkCoordinatesOrientation
+from pyFOAM_hexBlockMesh.geometry_utils.CoordinatesOrientation import getCellJacobianInfo
 from pyFOAM_hexBlockMesh.FaceCollection import NDFaceCollection
 import warnings
 
+# Number of points checked at a time by arePointCoordinatesSet
+points_chunk_size = 2**18
+
 class HexBlock :
 
 	def __init__(self, n0:int, n1:int, n2:int) -> None :
@@ -22,20 +28,116 @@ class HexBlock :
 		cells_shape	= (n0, n1, n2)
 		points_shape	= (n0+1, n1+1, n2+1)
 
-		# Initialize arrays to store cell IDs, point IDs and point coordinates
+		# Initialize arrays to store cell IDs and point IDs
 		self.cell_ID		= np.zeros(cells_shape, dtype=int)
 		self.point_ID		= np.zeros(points_shape, dtype=int)
-		self.point_coordinates	= np.zeros(points_shape + (3,), dtype=float)
 
 		# Initialize the cell and point IDs to -1
 		self.cell_ID.fill(-1)
 		self.point_ID.fill(-1)
 
-		# Initialize the point coordinates to NaN
+		self._initializePointCoordinates(points_shape)
+
+		# Geometric quantities derived from the point coordinates
+		# Cleared whenever the point coordinates are set
+		self.__geometry_cache:dict = {}
+
+		# Incremented whenever the geometry cache is cleared
+		self.__coordinates_version:int = 0
+		self.__cache_version = self.getCoordinatesVersion()
+
+		pass
+
+	def _initializePointCoordinates(self, points_shape:tuple[int, int, int]) -> None :
+		'''
+		Allocate the point coordinates and initialize them to NaN
+		'''
+
+		self.point_coordinates = np.zeros(points_shape + (3,), dtype=float)
 		self.point_coordinates.fill(np.nan)
 
 		pass
 
+	def getPointCoordinates(self) -> np.ndarray :
+		'''
+		Get the (n0 + 1, n1 + 1, n2 + 1, 3) coordinates of all the points,
+		the array stored in the hex block
+		'''
+
+		return self.point_coordinates
+
+	def arePointCoordinatesSet(self) -> bool :
+		'''
+		Check none of the point coordinates are NaN,
+		in chunks of layers along axis 0 of the stored coordinates
+		'''
+
+		n0, n1, n2 = self.point_ID.shape
+
+		chunk_layers = max(1, points_chunk_size // (n1 * n2))
+
+		for start in range(0, n0, chunk_layers) :
+
+			if np.isnan(self.point_coordinates[start:start + chunk_layers]).any() : return False
+
+		return True
+
+	def getCoordinatesVersion(self) -> int|tuple :
+		'''
+		Get a value that changes whenever the point coordinates are set
+		through setPointCoordinates, or the geometry cache is cleared
+		'''
+
+		return self.__coordinates_version
+
+	def clearGeometryCache(self) -> None :
+		'''
+		Clear the cached geometric quantities.
+		Must be called if point_coordinates is modified in place
+		instead of through setPointCoordinates.
+		'''
+
+		self.__geometry_cache.clear()
+		self.__coordinates_version += 1
+
+		pass
+
+	def __getGeometryCache(self) -> dict :
+		'''
+		Get the cached geometric quantities,
+		discarding them if the coordinates have changed since they were cached
+		'''
+
+		version = self.getCoordinatesVersion()
+
+		if version != self.__cache_version :
+
+			self.__geometry_cache.clear()
+			self.__cache_version = version
+
+		return self.__geometry_cache
+
+	def __getCachedGeometry(self, key:tuple, compute) -> tuple|np.ndarray :
+		'''
+		Get the geometric quantity stored under key,
+		computing and caching it if it is not cached.
+		The cached arrays are made read-only.
+		'''
+
+		geometry_cache = self.__getGeometryCache()
+
+		if key not in geometry_cache :
+
+			value = compute()
+
+			for array in (value if isinstance(value, tuple) else (value,)) :
+
+				if isinstance(array, np.ndarray) : array.flags.writeable = False
+
+			geometry_cache[key] = value
+
+		return geometry_cache[key]
+
 	def setCellIDs(self, start_ID:int=0) -> int :
 		'''
 		Set the cell IDs
@@ -253,28 +355,180 @@ class HexBlock :
 		assert np.issubdtype(coordinates.dtype, np.floating), 'Invalid input'
 		assert coordinates.shape == self.point_coordinates.shape, 'Invalid input'
 
-		assert checkCoordinatesOrientation(coordinates), \
-		'Coordinates are not oriented correctly!'
+		self.__validateCoordinates(coordinates)
+
+		self.point_coordinates[:, :, :, :] = coordinates
+
+		pass
+
+	def __validateCoordinates(self, coordinates:np.ndarray) -> None :
+		'''
+		Check the cells formed by the coordinates are not inverted.
+		Cache the result of the check for the coordinates
+		'''
+
+		jacobian_info = getCellJacobianInfo(coordinates)
+		minimum_jacobian, inverted_cells = jacobian_info
+
+		assert inverted_cells.shape[0] == 0, \
+		f'Coordinates are not oriented correctly! ' \
+		f'{inverted_cells.shape[0]} inverted cells, ' \
+		f'first at {tuple(inverted_cells[0])}, ' \
+		f'minimum Jacobian {minimum_jacobian}'
+
+		self.clearGeometryCache()
+		self.__getCachedGeometry(('jacobian_info',), lambda : jacobian_info)
+
+		pass
+
+	def setTransfiniteCoordinates(
+		self,
+		vertices:np.ndarray,
+		edges:dict|None=None,
+		faces:dict|None=None
+	) -> None :
+		'''
+		Set the coordinates of the points by 3D transfinite interpolation
+		of the 8 vertices, and optionally the points along the 12 edges
+		and on the 6 faces.
+		The points are computed into a buffer copied into point_coordinates
+		once validated, so that rejected coordinates leave the block unchanged.
+		Refer to TransfiniteInterpolation.getTransfiniteInterpolation
+		for the layout of the inputs.
+		'''
+
+		coordinates = TransfiniteInterpolation.getTransfiniteInterpolation(
+			self.cell_ID.shape, vertices, edges, faces
+		)
+
+		self.__validateCoordinates(coordinates)
+
+		self.point_coordinates[:, :, :, :] = coordinates
+
+		pass
+
+	def setGradedCoordinates(
+		self,
+		vertices:np.ndarray,
+		grading:float|list|tuple=1.0,
+		curves:dict|None=None,
+		faces:dict|None=None
+	) -> None :
+		'''
+		Set the coordinates of the points by transfinite interpolation
+		of the 8 vertices and the 12 edges graded as in blockMesh.
+		Refer to Grading.getGradedEdges for the grading and curves,
+		and to setTransfiniteCoordinates for the faces.
+		'''
+
+		edges = Grading.getGradedEdges(self.cell_ID.shape, vertices, grading, curves)
 
-		self.point_coordinates[:, :, :, :] = coordinates.copy()
+		self.setTransfiniteCoordinates(vertices, edges, faces)
 
 		pass
 
-	def getCellCenterCoordinates(self) -> np.ndarray :
+	def getCellJacobianInfo(self) -> tuple[float, np.ndarray] :
+		'''
+		Get the minimum Jacobian over the corners of all cells
+		and the (N, 3) indices of the inverted cells.
+		'''
+
+		jacobian_info = self.__getCachedGeometry(
+			('jacobian_info',),
+			lambda : getCellJacobianInfo(self.getPointCoordinates())
+		)
+
+		return jacobian_info
+
+	def getFaceGeometry(self, axis:int) -> tuple[np.ndarray, np.ndarray] :
+		'''
+		Get the centers and area vectors of the faces normal to axis.
+		Refer to CellGeometry.getFaceCentersAndAreas for the layout.
+		'''
+
+		assert axis in range(3), 'Invalid axis'
+
+		face_geometry = self.__getCachedGeometry(
+			('face_geometry', axis),
+			lambda : CellGeometry.getFaceCentersAndAreas(self.getPointCoordinates(), axis)
+		)
+
+		return face_geometry
+
+	def __getCellVolumesAndCentroids(self) -> tuple[np.ndarray, np.ndarray] :
+		'''
+		Get the cached volumes and volume weighted centroids of the cells
+		'''
+
+		volumes_and_centroids = self.__getCachedGeometry(
+			('cell_volumes_and_centroids',),
+			lambda : CellGeometry.getCellVolumesAndCentroids(
+				self.getPointCoordinates(),
+				face_geometry=tuple(self.getFaceGeometry(axis) for axis in range(3))
+			)
+		)
+
+		return volumes_and_centroids
+
+	def getCellVolumes(self) -> np.ndarray :
+		'''
+		Get the volumes of the cells
+		'''
+
+		volumes, _ = self.__getCellVolumesAndCentroids()
+
+		return volumes
+
+	def getCellCenterCoordinates(
+		self,
+		out:np.ndarray|None=None,
+		volume_weighted:bool=False
+	) -> np.ndarray :
 		'''
-		Get the coordinates of the cell centers
+		Get the coordinates of the cell centers.
+		By default, the centers are the average of the 8 corner points.
+		If volume_weighted is True, the volume weighted centroids
+		consistent with OpenFOAM are returned.
+		The centers are cached and returned as a read-only array.
+		If out is provided, the centers are written into it instead,
+		which may be a view into a larger array.
+		Centers that are not cached are then computed directly into out
+		and are not cached.
 		'''
 
-		cell_centers = np.mean(np.stack((
-			self.point_coordinates[:-1, :-1, :-1, :],
-			self.point_coordinates[:-1, :-1, 1:, :],
-			self.point_coordinates[:-1, 1:, :-1, :],
-			self.point_coordinates[:-1, 1:, 1:, :],
-			self.point_coordinates[1:, :-1, :-1, :],
-			self.point_coordinates[1:, :-1, 1:, :],
-			self.point_coordinates[1:, 1:, :-1, :],
-			self.point_coordinates[1:, 1:, 1:, :]
-		), axis=-1), axis=-1)
+		if volume_weighted :
+
+			key = ('cell_volumes_and_centroids',)
+
+			if out is None or key in self.__getGeometryCache() :
+
+				_, cell_centers = self.__getCellVolumesAndCentroids()
+
+			else :
+
+				_, cell_centers = CellGeometry.getCellVolumesAndCentroids(
+					self.getPointCoordinates(), out
+				)
+
+		else :
+
+			key = ('cell_centers',)
+
+			if out is None or key in self.__getGeometryCache() :
+
+				cell_centers = self.__getCachedGeometry(
+					key,
+					lambda : CellGeometry.getCellCenters(self.getPointCoordinates())
+				)
+
+			else :
+
+				cell_centers = CellGeometry.getCellCenters(self.getPointCoordinates(), out)
+
+		if out is not None and cell_centers is not out :
+
+			np.copyto(out, cell_centers)
+			cell_centers = out
 
 		return cell_centers
 
@@ -292,7 +546,25 @@ class HexBlock :
 		assert len(vertices) == 4, 'Invalid input'
 
 		slice_3d = HexBlockVertices.getSurfaceCompleteSlice(vertices)
+
+		return self.getSlicePointCoordinates(slice_3d)
+
+	def getSlicePointCoordinates(self, slice_3d:HexBlockVertices.Slice3D) -> np.ndarray :
+		'''
+		Get the coordinates of the points in the slice,
+		e.g., of HexBlockVertices.getSurfaceCompleteSlice
+		'''
+
 		point_coordinates = slice_3d.getArrayView(self.point_coordinates)
 
 		return point_coordinates
+
+	def getPointCoordinateLayers(self, start:int, end:int, axis:int=0) -> np.ndarray :
+		'''
+		Get the coordinates of the points
+		from index start to end (exclusive) along the axis.
+		Used to process the points of large hex blocks in chunks.
+		'''
+
+		return self.point_coordinates[(slice(None),) * axis + (slice(start, end),)]
 	
\ No newline at end of file
@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+import uuid
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
+
+# Name of the file in the archive describing the stored arrays
+manifest_file_name = 'manifest.json'
+
+# Version of the layout of the archive
+archive_version = 1
+
+def _saveConcatenated(path:Path, arrays:list[np.ndarray], dtype:np.dtype) -> None :
+	'''
+	Save the concatenation of the arrays along axis 0 to a .npy file,
+	writing every array sequentially without concatenating them in memory
+	'''
+
+	dtype = np.dtype(dtype)
+
+	shape = (sum(array.shape[0] for array in arrays),) + arrays[0].shape[1:]
+
+	with open(path, 'wb') as f :
+
+		np.lib.format.write_array_header_1_0(f, {
+			'descr'		: np.lib.format.dtype_to_descr(dtype),
+			'fortran_order'	: False,
+			'shape'		: shape,
+		})
+
+		for array in arrays :
+
+			assert array.shape[1:] == shape[1:], 'Arrays have different shapes'
+
+			f.write(memoryview(np.ascontiguousarray(array, dtype=dtype)).cast('B'))
+
+	pass
+
+@Profiler.profiled
+def writeMeshArchive(
+	hex_collection:ConnectedHexCollection,
+	path:Path,
+	faces:list[FlatFaceCollection]|None=None,
+	points:np.ndarray|None=None
+) -> None :
+	'''
+	Write the mesh of the hex collection to an archive,
+	a directory of .npy arrays and a JSON manifest :
+		points.npy		(num_points, 3) coordinates
+		faces.npy		(num_faces, 4) point IDs of the faces
+		owner.npy		(num_faces,) owner cells
+		neighbour.npy		(num_internal_faces,) neighbour cells
+		cell_ID_{i}.npy		cell IDs of hex block i
+		point_ID_{i}.npy	point IDs of hex block i
+	The faces are ordered as in the polyMesh, internal faces first,
+	followed by the patches listed in the manifest.
+	The manifest also holds the shapes of the hex blocks,
+	their connections and patches.
+	faces and points are those returned by getFaces and getPoints
+	of the hex collection, computed if not provided.
+	The cell and point IDs must be assigned.
+	An existing archive at path is replaced.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+	assert hasattr(hex_collection, 'num_cells') and hasattr(hex_collection, 'num_points'), \
+	'Cell and point IDs are not assigned'
+
+	if faces is None : faces = hex_collection.getFaces()
+	if points is None : points = hex_collection.getPoints()
+
+	assert points.shape == (hex_collection.num_points, 3), 'Invalid points'
+
+	internal_faces	= [face for face in faces if not face.isBoundary()]
+	boundary_faces	= [face for face in faces if face.isBoundary()]
+
+	path = Path(path)
+
+	# Write to a temporary directory and rename it
+	# so that incomplete archives are never read
+	temporary_path = path.parent / f'.{path.name}.{uuid.uuid4().hex}'
+	temporary_path.mkdir(parents=True)
+
+	np.save(temporary_path / 'points.npy', np.asarray(points, dtype=float))
+
+	ordered_faces = internal_faces + boundary_faces
+
+	_saveConcatenated(temporary_path / 'faces.npy', [face.vertices for face in ordered_faces], int)
+	_saveConcatenated(temporary_path / 'owner.npy', [face.owner for face in ordered_faces], int)
+	_saveConcatenated(
+		temporary_path / 'neighbour.npy',
+		[np.zeros(0, dtype=int)] + [face.neighbour for face in internal_faces], int
+	)
+
+	for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+		np.save(temporary_path / f'cell_ID_{i}.npy', hex_block.cell_ID)
+		np.save(temporary_path / f'point_ID_{i}.npy', hex_block.point_ID)
+
+	num_internal_faces = sum(face.getSize() for face in internal_faces)
+
+	patches = []
+	start_face = num_internal_faces
+
+	for face in boundary_faces :
+
+		patches.append({
+			'name'		: face.name,
+			'type'		: face.patch_type,
+			'nFaces'	: face.getSize(),
+			'startFace'	: start_face,
+		})
+
+		start_face += face.getSize()
+
+	manifest = {
+		'version'		: archive_version,
+		'num_cells'		: int(hex_collection.num_cells),
+		'num_points'		: int(hex_collection.num_points),
+		'num_faces'		: start_face,
+		'num_internal_faces'	: num_internal_faces,
+		'patches'		: patches,
+		'validation'		: hex_collection.validation,
+		'blocks'		: [
+			list(hex_block.cell_ID.shape) for hex_block in hex_collection.hex_blocks
+		],
+		'connections'		: [
+			[
+				connect_info.hex_block_id_0, connect_info.hex_block_id_1,
+				*connect_info.face_vertices_0, *connect_info.face_vertices_1
+			]
+			for connect_info in hex_collection.connect_infos
+		],
+		'block_patches'		: [
+			{
+				'name'		: name,
+				'type'		: patch_type,
+				'faces'		: [[i, list(face_vertices)] for i, face_vertices in block_faces],
+			}
+			for name, (patch_type, block_faces) in hex_collection.patches.items()
+		],
+		'default_patch'		: hex_collection.default_patch,
+	}
+
+	with open(temporary_path / manifest_file_name, 'w') as f :
+
+		json.dump(manifest, f, indent='\t')
+
+	if path.exists() : shutil.rmtree(path)
+
+	os.replace(temporary_path, path)
+
+	pass
+
+class MeshArchive :
+	'''
+	Mesh read from an archive written by writeMeshArchive.
+	The arrays are read-only and memory-mapped,
+	so opening an archive reads only the manifest.
+	'''
+
+	def __init__(self, path:Path) -> None :
+		'''
+		Open the archive at path
+		'''
+
+		self.path = Path(path)
+
+		manifest_path = self.path / manifest_file_name
+
+		assert manifest_path.is_file(), f'{self.path} is not a mesh archive'
+
+		with open(manifest_path, 'r') as f :
+
+			self.manifest = json.load(f)
+
+		assert self.manifest['version'] == archive_version, \
+		f'Unsupported archive version {self.manifest["version"]}'
+
+		self.num_cells	= self.manifest['num_cells']
+		self.num_points	= self.manifest['num_points']
+		self.patches	= self.manifest['patches']
+
+		self.points	= self.__load('points')
+		self.faces	= self.__load('faces')
+		self.owner	= self.__load('owner')
+		self.neighbour	= self.__load('neighbour')
+
+		num_blocks = len(self.manifest['blocks'])
+
+		self.cell_IDs	= [self.__load(f'cell_ID_{i}') for i in range(num_blocks)]
+		self.point_IDs	= [self.__load(f'point_ID_{i}') for i in range(num_blocks)]
+
+		pass
+
+	def __load(self, name:str) -> np.ndarray :
+		'''
+		Memory-map the array
+		'''
+
+		return np.load(self.path / f'{name}.npy', mmap_mode='r')
+
+	def getFaceCollections(self) -> list[FlatFaceCollection] :
+		'''
+		Get the internal faces followed by the faces of every patch
+		as face collections of memory-mapped arrays
+		'''
+
+		num_internal_faces = self.manifest['num_internal_faces']
+
+		internal_faces = FlatFaceCollection(name='InteriorFaces')
+
+		internal_faces.owner		= self.owner[:num_internal_faces]
+		internal_faces.neighbour	= self.neighbour
+		internal_faces.vertices		= self.faces[:num_internal_faces]
+
+		face_collections = [internal_faces]
+
+		for patch in self.patches :
+
+			start, end = patch['startFace'], patch['startFace'] + patch['nFaces']
+
+			faces = FlatFaceCollection(patch['name'], patch['type'])
+
+			faces.owner	= self.owner[start:end]
+			faces.vertices	= self.faces[start:end]
+
+			face_collections.append(faces)
+
+		return face_collections
+
+	def getHexCollection(self) -> ConnectedHexCollection :
+		'''
+		Get the collection of hex blocks of the archive,
+		with their coordinates gathered from the points,
+		the memory-mapped cell and point IDs,
+		and the connections and patches of the archived collection.
+		Transformed hex blocks are restored as hex blocks.
+		'''
+
+		hex_collection = ConnectedHexCollection(self.manifest['validation'])
+
+		for shape, cell_ID, point_ID in zip(self.manifest['blocks'], self.cell_IDs, self.point_IDs) :
+
+			hex_block = HexBlock(*shape)
+			hex_block.setPointCoordinates(self.points[point_ID])
+
+			hex_block.cell_ID	= cell_ID
+			hex_block.point_ID	= point_ID
+
+			hex_collection.addHexBlock(hex_block)
+
+		hex_collection.connectHexBlockTable(
+			np.array(self.manifest['connections'], dtype=int).reshape((-1, 10))
+		)
+
+		for patch in self.manifest['block_patches'] :
+
+			hex_collection.addPatch(
+				patch['name'],
+				[(i, tuple(face_vertices)) for i, face_vertices in patch['faces']],
+				patch['type']
+			)
+
+		if self.manifest['default_patch'] is not None :
+
+			hex_collection.setDefaultPatch(*self.manifest['default_patch'])
+
+		hex_collection.num_cells	= self.num_cells
+		hex_collection.num_points	= self.num_points
+
+		# Archived IDs are those of the written mesh, assigned from 0
+		hex_collection.start_cell_ID	= 0
+		hex_collection.start_point_ID	= 0
+
+		return hex_collection
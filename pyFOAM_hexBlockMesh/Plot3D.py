@@ -0,0 +1,268 @@
+import json
+
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map
+
+# Multi-block, 3D, whole (no IBLANK) PLOT3D grid files
+# of little endian 4 byte integers and 8 byte reals
+integer_dtype	= np.dtype('<i4')
+real_dtype	= np.dtype('<f8')
+
+# Number of points of a hex block written at a time
+points_chunk_size = 2**18
+
+def getVertexIndex(hex_block:HexBlock, vertex:int) -> np.ndarray :
+	'''
+	Get the (3,) zero based point index of the vertex of the hex block
+	'''
+
+	points_shape = np.array(hex_block.point_ID.shape)
+
+	return np.array([
+		points_shape[axis] - 1 if vertex_map[vertex][axis] == -1 else 0
+		for axis in range(3)
+	])
+
+def getTransform(
+	face_vertices_0:tuple[int, int, int, int],
+	face_vertices_1:tuple[int, int, int, int]
+) -> list[int] :
+	'''
+	Get the transform of the connection of the faces of 2 hex blocks
+	as in CGNS 1-to-1 connectivity :
+	the index axis a of hex block 0 maps to the axis |transform[a]| - 1
+	of hex block 1, in the direction of the sign of transform[a].
+	face_vertices_1[j] coincides with face_vertices_0[j].
+	'''
+
+	def getCorner(vertex:int) -> np.ndarray :
+
+		return np.array([1 if index == -1 else 0 for index in vertex_map[vertex]])
+
+	corners_0 = [getCorner(v) for v in face_vertices_0]
+	corners_1 = [getCorner(v) for v in face_vertices_1]
+
+	transform = [0, 0, 0]
+
+	# Axes in the plane of the faces from the edges of the faces
+	for j in range(2) :
+
+		step_0 = corners_0[j + 1] - corners_0[j]
+		step_1 = corners_1[j + 1] - corners_1[j]
+
+		axis_0 = int(np.flatnonzero(step_0)[0])
+		axis_1 = int(np.flatnonzero(step_1)[0])
+
+		transform[axis_0] = int(step_0[axis_0] * step_1[axis_1]) * (axis_1 + 1)
+
+	# Axes normal to the faces
+	# Leaving hex block 0 through the face enters hex block 1
+	axis_0 = int(np.flatnonzero(np.all([c == corners_0[0] for c in corners_0], axis=0))[0])
+	axis_1 = int(np.flatnonzero(np.all([c == corners_1[0] for c in corners_1], axis=0))[0])
+
+	outward_0	= 1 if corners_0[0][axis_0] == 1 else -1
+	inward_1	= 1 if corners_1[0][axis_1] == 0 else -1
+
+	transform[axis_0] = outward_0 * inward_1 * (axis_1 + 1)
+
+	return transform
+
+def getConnectivity(hex_collection:ConnectedHexCollection) -> list[dict] :
+	'''
+	Get the connections of the hex blocks of the collection.
+	Every connection lists the one based hex block numbers,
+	the face vertices and the one based point index range of the face
+	of both hex blocks, the point index range of hex block 1 starting
+	at the point coinciding with the start of the range of hex block 0,
+	and the transform of the indices, refer to getTransform.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+
+	connectivity = []
+
+	for connect_info in hex_collection.connect_infos :
+
+		connection = {}
+
+		for side, hex_block_id, face_vertices in (
+			(0, connect_info.hex_block_id_0, connect_info.face_vertices_0),
+			(1, connect_info.hex_block_id_1, connect_info.face_vertices_1),
+		) :
+
+			hex_block = hex_collection.hex_blocks[hex_block_id]
+
+			connection[f'block_{side}']		= hex_block_id + 1
+			connection[f'face_vertices_{side}']	= list(face_vertices)
+			connection[f'range_{side}']		= [
+				(getVertexIndex(hex_block, face_vertices[j]) + 1).tolist()
+				for j in (0, 2)
+			]
+
+		connection['transform'] = getTransform(
+			connect_info.face_vertices_0, connect_info.face_vertices_1
+		)
+
+		connectivity.append(connection)
+
+	return connectivity
+
+def _writeRecord(f:BinaryIO, num_bytes:int, fortran_records:bool) -> None :
+	'''
+	Write the marker of a Fortran record of num_bytes bytes
+	'''
+
+	if not fortran_records : return
+
+	assert num_bytes < 2**31, 'Fortran records must be smaller than 2 GiB'
+
+	f.write(np.array(num_bytes, dtype=integer_dtype).tobytes())
+
+	pass
+
+@Profiler.profiled
+def writePlot3D(
+	hex_collection:ConnectedHexCollection,
+	path:Path,
+	connectivity_path:Path|None=None,
+	fortran_records:bool=True
+) -> None :
+	'''
+	Write the hex blocks of the collection to a multi-block, whole,
+	double precision PLOT3D grid file.
+	If fortran_records is True, the file is Fortran unformatted,
+	i.e., every record is enclosed by its size in bytes,
+	otherwise it is a C binary file.
+	The coordinates of every hex block are written in Fortran order
+	in chunks of layers along axis 2, so that the coordinates
+	of a TransformedHexBlock are computed one chunk at a time.
+	The connections of the hex blocks are written to the JSON file
+	at connectivity_path if provided, refer to getConnectivity.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+
+	hex_blocks = hex_collection.hex_blocks
+
+	shapes = np.array([hex_block.point_ID.shape for hex_block in hex_blocks], dtype=integer_dtype)
+
+	with open(path, 'wb') as f :
+
+		_writeRecord(f, integer_dtype.itemsize, fortran_records)
+		f.write(np.array(len(hex_blocks), dtype=integer_dtype).tobytes())
+		_writeRecord(f, integer_dtype.itemsize, fortran_records)
+
+		_writeRecord(f, shapes.nbytes, fortran_records)
+		f.write(shapes.tobytes())
+		_writeRecord(f, shapes.nbytes, fortran_records)
+
+		for i, hex_block in enumerate(hex_blocks) :
+
+			assert hex_block.arePointCoordinatesSet(), \
+			f'Point coordinates of hex block {i} are not set'
+
+			n0, n1, n2 = hex_block.point_ID.shape
+
+			chunk_layers = max(1, points_chunk_size // (n0 * n1))
+
+			num_bytes = 3 * n0 * n1 * n2 * real_dtype.itemsize
+
+			_writeRecord(f, num_bytes, fortran_records)
+
+			# All x, then all y, then all z, varying fastest along axis 0
+			for component in range(3) :
+
+				for start in range(0, n2, chunk_layers) :
+
+					layers = hex_block.getPointCoordinateLayers(start, start + chunk_layers, axis=2)
+
+					chunk = np.ascontiguousarray(layers[..., component].T, dtype=real_dtype)
+
+					f.write(memoryview(chunk).cast('B'))
+
+			_writeRecord(f, num_bytes, fortran_records)
+
+	if connectivity_path is not None :
+
+		with open(connectivity_path, 'w') as f :
+
+			json.dump(getConnectivity(hex_collection), f, indent='\t')
+
+	pass
+
+@Profiler.profiled
+def readPlot3D(
+	path:Path,
+	connectivity_path:Path|None=None,
+	fortran_records:bool=True
+) -> ConnectedHexCollection :
+	'''
+	Read a multi-block, whole, double precision PLOT3D grid file
+	written by writePlot3D into a collection of hex blocks,
+	connected as in the JSON file at connectivity_path if provided.
+	'''
+
+	data = np.memmap(path, dtype=np.uint8, mode='r')
+
+	# Offset of the data of the records
+	offset = integer_dtype.itemsize if fortran_records else 0
+	record_padding = 2 * offset
+
+	def readIntegers(start:int, count:int) -> np.ndarray :
+
+		return np.frombuffer(data, dtype=integer_dtype, count=count, offset=start)
+
+	num_blocks = int(readIntegers(offset, 1)[0])
+
+	start = integer_dtype.itemsize + record_padding
+
+	shapes = readIntegers(start + offset, 3 * num_blocks).reshape((num_blocks, 3))
+
+	start += shapes.nbytes + record_padding
+
+	hex_collection = ConnectedHexCollection()
+
+	for i, shape in enumerate(shapes.tolist()) :
+
+		num_points = int(np.prod(shape))
+
+		if fortran_records :
+
+			assert int(readIntegers(start, 1)[0]) == 3 * num_points * real_dtype.itemsize, \
+			f'Invalid record of hex block {i}'
+
+		coordinates = np.frombuffer(
+			data, dtype=real_dtype, count=3 * num_points, offset=start + offset
+		).reshape((3,) + tuple(shape[::-1]))
+
+		start += 3 * num_points * real_dtype.itemsize + record_padding
+
+		hex_block = HexBlock(*(n - 1 for n in shape))
+		hex_block.setPointCoordinates(coordinates.T)
+
+		hex_collection.addHexBlock(hex_block)
+
+	assert start == data.size, f'Unexpected size of {path}'
+
+	if connectivity_path is not None :
+
+		with open(connectivity_path, 'r') as f :
+
+			connectivity = json.load(f)
+
+		hex_collection.connectHexBlockTable(np.array([
+			[
+				connection['block_0'] - 1, connection['block_1'] - 1,
+				*connection['face_vertices_0'], *connection['face_vertices_1']
+			]
+			for connection in connectivity
+		], dtype=int).reshape((-1, 10)))
+
+	return hex_collection
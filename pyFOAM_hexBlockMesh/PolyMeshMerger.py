@@ -0,0 +1,456 @@
+import itertools
+import os
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
+from pyFOAM_hexBlockMesh.Writer import getOwnerNote, writeBoundary, topology_file_name
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshList import ListFile
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import readBoundary
+
+# Default tolerance for merging points relative to
+# the shortest edge of the faces of the stitched patch
+relative_tolerance = 1e-3
+
+def _getRowIDs(rows:np.ndarray) -> np.ndarray :
+	'''
+	Get the (N,) IDs of the distinct rows of the (N, M) integer array,
+	equal rows having equal IDs
+	'''
+
+	if rows.shape[0] == 0 : return np.zeros(0, dtype=int)
+
+	order = np.lexsort(rows.T[::-1])
+	sorted_rows = rows[order]
+
+	is_new = np.ones(rows.shape[0], dtype=bool)
+	is_new[1:] = np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1)
+
+	row_IDs = np.empty(rows.shape[0], dtype=int)
+	row_IDs[order] = np.cumsum(is_new) - 1
+
+	return row_IDs
+
+def _matchRows(rows_0:np.ndarray, rows_1:np.ndarray) -> np.ndarray :
+	'''
+	Get the index of the row of rows_0 equal to every row of rows_1,
+	-1 if there is none. The rows of rows_0 must be distinct.
+	'''
+
+	row_IDs = _getRowIDs(np.concatenate((rows_0, rows_1), axis=0))
+
+	IDs_0, IDs_1 = row_IDs[:rows_0.shape[0]], row_IDs[rows_0.shape[0]:]
+
+	assert np.unique(IDs_0).size == IDs_0.size, 'Rows are not distinct'
+
+	index_of_ID = np.full(row_IDs.max(initial=-1) + 1, -1, dtype=int)
+	index_of_ID[IDs_0] = np.arange(rows_0.shape[0])
+
+	return index_of_ID[IDs_1]
+
+@Profiler.profiled
+def getCoincidentPoints(
+	points_0:np.ndarray,
+	points_1:np.ndarray,
+	tolerance:float
+) -> np.ndarray :
+	'''
+	Get the index of the point of points_0 within tolerance of
+	every point of points_1, -1 if there is none.
+	The points are hashed into cubic bins of the size of the tolerance,
+	so only the 27 bins around every point of points_1 are searched.
+	The points of points_0 must be farther apart than
+	the diagonal of the bins, sqrt(3) times the tolerance.
+	'''
+
+	assert points_0.ndim == 2 and points_0.shape[1] == 3, 'Invalid points'
+	assert points_1.ndim == 2 and points_1.shape[1] == 3, 'Invalid points'
+	assert tolerance > 0, 'Tolerance must be positive'
+
+	bins_0 = np.floor(points_0 / tolerance).astype(np.int64)
+	bins_1 = np.floor(points_1 / tolerance).astype(np.int64)
+
+	assert np.unique(_getRowIDs(bins_0)).size == points_0.shape[0], \
+	'Points are too close to each other for the tolerance'
+
+	indices = np.full(points_1.shape[0], -1, dtype=int)
+
+	for offset in itertools.product((-1, 0, 1), repeat=3) :
+
+		candidates = _matchRows(bins_0, bins_1 + np.array(offset))
+
+		is_close = candidates >= 0
+		is_close[is_close] = np.linalg.norm(
+			points_0[candidates[is_close]] - points_1[is_close], axis=1
+		) <= tolerance
+
+		indices[is_close] = candidates[is_close]
+
+	return indices
+
+def _concatenateFaces(
+	face_collections:list[FlatFaceCollection],
+	name:str,
+	patch_type:str
+) -> FlatFaceCollection :
+	'''
+	Concatenate the face collections into one, copying the arrays once
+	'''
+
+	faces = FlatFaceCollection(name, patch_type)
+
+	faces.owner	= np.concatenate([f.owner for f in face_collections])
+	faces.neighbour	= np.concatenate([f.neighbour for f in face_collections])
+	faces.vertices	= np.concatenate([f.vertices for f in face_collections], axis=0)
+
+	return faces
+
+def _stitchPatch(
+	patch_owner:np.ndarray,
+	patch_vertices:np.ndarray,
+	patch_point_IDs:np.ndarray,
+	patch_points:np.ndarray,
+	num_points:int,
+	num_cells:int,
+	hex_collection:ConnectedHexCollection,
+	patch_name:str,
+	tolerance:float|None
+) -> tuple[np.ndarray, FlatFaceCollection, np.ndarray, list[FlatFaceCollection], list[FlatFaceCollection]] :
+	'''
+	Stitch the hex blocks of the collection to the patch of a polyMesh
+	of num_points points and num_cells cells, given by the owners and
+	point IDs of the faces of the patch and the sorted IDs and coordinates
+	of the points of the patch. Refer to stitchHexCollection.
+	Return the points of the hex collection not merged, the stitched faces,
+	the mask of the stitched faces of the patch, the internal faces
+	and the boundary faces not stitched of the hex collection.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+
+	if tolerance is None :
+
+		patch_face_points = patch_points[np.searchsorted(patch_point_IDs, patch_vertices)]
+
+		tolerance = relative_tolerance * np.min(np.linalg.norm(
+			patch_face_points - np.roll(patch_face_points, 1, axis=1), axis=2
+		))
+
+	# Cells of the hex collection are numbered after the cells of the polyMesh
+	hex_collection.assignCellIDs(num_cells)
+	hex_collection.assignPointIDs()
+
+	with Validation.policy(hex_collection.validation) :
+
+		new_points	= hex_collection.getPoints()
+		new_face_list	= hex_collection.getFaces()
+
+	# Merge the points of the hex collection coinciding with the points of the patch
+	coincident_points = getCoincidentPoints(patch_points, new_points, tolerance)
+
+	is_merged = coincident_points >= 0
+
+	point_map = np.empty(new_points.shape[0], dtype=int)
+	point_map[is_merged]	= patch_point_IDs[coincident_points[is_merged]]
+	point_map[~is_merged]	= num_points + np.arange(np.count_nonzero(~is_merged))
+
+	for faces in new_face_list :
+
+		faces.vertices = point_map[faces.vertices]
+
+	# Match the boundary faces of the hex collection to the faces of the patch
+	# by their sorted point IDs
+	new_boundary_faces = [faces for faces in new_face_list if faces.isBoundary()]
+
+	new_boundary_vertices = np.concatenate(
+		[faces.vertices for faces in new_boundary_faces] + [np.zeros((0, 4), dtype=int)], axis=0
+	)
+
+	matches = _matchRows(
+		np.sort(patch_vertices, axis=1),
+		np.sort(new_boundary_vertices, axis=1)
+	)
+
+	is_stitched_patch = np.zeros(patch_vertices.shape[0], dtype=bool)
+	is_stitched_patch[matches[matches >= 0]] = True
+
+	assert np.count_nonzero(is_stitched_patch) == np.count_nonzero(matches >= 0), \
+	f'Faces of patch {patch_name} coincide with multiple faces of the hex collection'
+
+	assert np.any(is_stitched_patch), \
+	f'No boundary faces of the hex collection coincide with patch {patch_name}'
+
+	new_owner = np.concatenate([faces.owner for faces in new_boundary_faces])
+
+	# Faces of the patch point out of the cells of the polyMesh,
+	# into the cells of the hex collection numbered after them
+	stitched_faces = FlatFaceCollection(name='StitchedFaces')
+
+	stitched_faces.owner		= patch_owner[matches[matches >= 0]]
+	stitched_faces.neighbour	= new_owner[matches >= 0]
+	stitched_faces.vertices		= patch_vertices[matches[matches >= 0]]
+
+	# Boundary faces of the hex collection not stitched
+	is_stitched_new = np.split(
+		matches >= 0, np.cumsum([faces.getSize() for faces in new_boundary_faces])[:-1]
+	)
+
+	remaining_new_faces = []
+
+	for faces, is_stitched in zip(new_boundary_faces, is_stitched_new) :
+
+		remaining_faces = FlatFaceCollection(faces.name, faces.patch_type)
+
+		remaining_faces.owner		= faces.owner[~is_stitched]
+		remaining_faces.vertices	= faces.vertices[~is_stitched]
+
+		remaining_new_faces.append(remaining_faces)
+
+	new_internal_faces = [faces for faces in new_face_list if not faces.isBoundary()]
+
+	return new_points[~is_merged], stitched_faces, is_stitched_patch, new_internal_faces, remaining_new_faces
+
+@Profiler.profiled
+def stitchHexCollection(
+	points:np.ndarray,
+	face_list:list[FlatFaceCollection],
+	hex_collection:ConnectedHexCollection,
+	patch_name:str,
+	tolerance:float|None=None
+) -> tuple[np.ndarray, list[FlatFaceCollection], int] :
+	'''
+	Stitch the hex blocks of the collection to the patch of a polyMesh,
+	given by its points and faces as returned by readPolyMesh.
+	The cells and points of the hex collection are numbered after those
+	of the polyMesh, except for the points coinciding with the points of
+	the patch within tolerance, which are merged. The boundary faces of
+	the hex collection coinciding with the faces of the patch are removed,
+	and the faces of the patch become internal faces owned by the cells
+	of the polyMesh. Only the points of the patch and the hex collection
+	are searched, the rest of the polyMesh is copied.
+	The patches of the hex collection are appended to the patches of the
+	polyMesh, faces of patches of the same name are grouped together.
+	Return the points and the faces of the merged mesh
+	and the number of stitched faces.
+	'''
+
+	patch_faces = [faces for faces in face_list if faces.name == patch_name and faces.isBoundary()]
+
+	assert len(patch_faces) == 1, f'Patch {patch_name} is not in the polyMesh'
+
+	patch_faces = patch_faces[0]
+
+	num_cells = int(max(
+		max(np.max(faces.owner, initial=-1), np.max(faces.neighbour, initial=-1)) for faces in face_list
+	)) + 1
+
+	patch_point_IDs = np.unique(patch_faces.vertices)
+
+	new_points, stitched_faces, is_stitched_patch, new_internal_faces, new_boundary_faces = _stitchPatch(
+		patch_faces.owner, patch_faces.vertices, patch_point_IDs, points[patch_point_IDs],
+		points.shape[0], num_cells, hex_collection, patch_name, tolerance
+	)
+
+	merged_points = np.concatenate((points, new_points), axis=0)
+
+	internal_faces = _concatenateFaces(
+		[faces for faces in face_list if not faces.isBoundary()] +
+		[stitched_faces] + new_internal_faces,
+		'InteriorFaces', 'patch'
+	)
+
+	# Faces of the patch not stitched
+	remaining_patch_faces = FlatFaceCollection(patch_faces.name, patch_faces.patch_type)
+
+	remaining_patch_faces.owner	= patch_faces.owner[~is_stitched_patch]
+	remaining_patch_faces.vertices	= patch_faces.vertices[~is_stitched_patch]
+
+	# Group the boundary faces by patch name, in the order of the patches of the polyMesh
+	patches = {}
+
+	for faces in face_list + new_boundary_faces :
+
+		if faces is patch_faces : faces = remaining_patch_faces
+
+		if not faces.isBoundary() : continue
+
+		patches.setdefault(faces.name, []).append(faces)
+
+	merged_face_list = [internal_faces] + [
+		_concatenateFaces(patch, name, patch[0].patch_type) for name, patch in patches.items()
+	]
+
+	return merged_points, merged_face_list, stitched_faces.getSize()
+
+@Profiler.profiled
+def mergeHexCollection(
+	polyMesh_path:Path,
+	hex_collection:ConnectedHexCollection,
+	patch_name:str,
+	output_path:Path|None=None,
+	tolerance:float|None=None
+) -> int :
+	'''
+	Stitch the hex blocks of the collection to the patch of the polyMesh
+	at polyMesh_path and write the merged polyMesh to output_path,
+	by default overwriting the polyMesh. Refer to stitchHexCollection.
+	Only the sizes of the polyMesh, its boundary file and the faces,
+	owners and points of the patch are read. The rest of the points,
+	faces, owner and neighbour files is copied without being parsed,
+	with the cells, faces and points of the hex collection appended
+	in the format of every file, so the work done is proportional to
+	the size of the hex collection and the patch. The number of cells
+	is read from the note of the owner file, as written by FacesWriter
+	and OpenFOAM, and counted from the owners and neighbours otherwise.
+	The merged files are written next to the files they replace and
+	renamed once all of them are written. The topology file of the
+	polyMesh, if any, is removed from output_path since the merged mesh
+	was not written by a single hex collection.
+	Return the number of stitched faces.
+	'''
+
+	if output_path is None : output_path = polyMesh_path
+
+	boundary = readBoundary(polyMesh_path / 'boundary')
+
+	assert patch_name in boundary, f'Patch {patch_name} is not in the polyMesh'
+
+	points_file	= ListFile(polyMesh_path / 'points')
+	faces_file	= ListFile(polyMesh_path / 'faces')
+	owner_file	= ListFile(polyMesh_path / 'owner')
+	neighbour_file	= ListFile(polyMesh_path / 'neighbour')
+
+	assert faces_file.size == owner_file.size, \
+	f'Number of faces {faces_file.size} does not match the number of owners {owner_file.size}'
+
+	num_points		= points_file.size
+	num_internal_faces	= neighbour_file.size
+
+	num_cells = owner_file.getNote().get('nCells')
+
+	if num_cells is None :
+
+		num_cells = max(
+			(int(np.max(labels, initial=-1)) for labels in itertools.chain(
+				owner_file.iterateItems(), neighbour_file.iterateItems()
+			)),
+			default=-1
+		) + 1
+
+	patch_ranges = {
+		name : (patch['startFace'], patch['startFace'] + patch['nFaces']) for name, patch in boundary.items()
+	}
+
+	for name, (start, end) in patch_ranges.items() :
+
+		assert num_internal_faces <= start and end <= faces_file.size, \
+		f'Faces of patch {name} are out of range'
+
+	# Locate the internal faces and the patches in one scan of the files
+	face_bounds = np.array([0, num_internal_faces] + list(itertools.chain(*patch_ranges.values())))
+
+	faces_file.locate(face_bounds)
+	owner_file.locate(face_bounds)
+
+	patch_owner	= owner_file.readItems(*patch_ranges[patch_name])
+	patch_vertices	= faces_file.readItems(*patch_ranges[patch_name])
+
+	patch_point_IDs = np.unique(patch_vertices)
+
+	points_file.locate(np.concatenate((patch_point_IDs, patch_point_IDs + 1, [0, num_points])))
+
+	new_points, stitched_faces, is_stitched_patch, new_internal_faces, new_boundary_faces = _stitchPatch(
+		patch_owner, patch_vertices, patch_point_IDs, points_file.readItemsAt(patch_point_IDs),
+		num_points, num_cells, hex_collection, patch_name, tolerance
+	)
+
+	# Internal faces of the polyMesh, the stitched faces and the internal faces of the hex collection
+	internal_faces = [stitched_faces] + new_internal_faces
+
+	face_pieces		= [(0, num_internal_faces)] + [faces.vertices for faces in internal_faces]
+	owner_pieces		= [(0, num_internal_faces)] + [faces.owner for faces in internal_faces]
+	neighbour_pieces	= [(0, num_internal_faces)] + [faces.neighbour for faces in internal_faces]
+
+	num_merged_internal_faces = num_internal_faces + sum(faces.getSize() for faces in internal_faces)
+
+	# Boundary faces of the polyMesh, the faces of the patch not stitched replacing the patch,
+	# followed by the boundary faces of the hex collection, every faces as
+	# the entries of their patch, their number and their piece of the faces and owner files
+	boundary_faces = []
+
+	for name, (start, end) in patch_ranges.items() :
+
+		entries = {key : value for key, value in boundary[name].items() if not isinstance(value, list)}
+
+		if name == patch_name :
+
+			boundary_faces.append((name, entries, np.count_nonzero(~is_stitched_patch),
+				patch_vertices[~is_stitched_patch], patch_owner[~is_stitched_patch]))
+
+		else :
+
+			boundary_faces.append((name, entries, end - start, (start, end), (start, end)))
+
+	for faces in new_boundary_faces :
+
+		boundary_faces.append((faces.name, {'type' : faces.patch_type}, faces.getSize(), faces.vertices, faces.owner))
+
+	# Group the boundary faces by patch name, in the order of the patches of the polyMesh.
+	# Entries of the patches other than lists, e.g., inGroups, are kept.
+	patches = {}
+
+	for name, entries, num_faces, vertices, owner in boundary_faces :
+
+		if num_faces == 0 : continue
+
+		patches.setdefault(name, (entries, []))[1].append((num_faces, vertices, owner))
+
+	merged_boundary = {}
+
+	num_merged_faces = num_merged_internal_faces
+
+	for name, (entries, pieces) in patches.items() :
+
+		num_faces = sum(num_faces for num_faces, _, _ in pieces)
+
+		face_pieces	+= [vertices for _, vertices, _ in pieces]
+		owner_pieces	+= [owner for _, _, owner in pieces]
+
+		merged_boundary[name] = dict(entries, nFaces=int(num_faces), startFace=int(num_merged_faces))
+
+		num_merged_faces += num_faces
+
+	output_path.mkdir(parents=True, exist_ok=True)
+
+	file_names = ('points', 'faces', 'owner', 'neighbour', 'boundary')
+
+	temporary_paths = {name : output_path / f'.{name}.merging' for name in file_names}
+
+	num_merged_points = points_file.write(temporary_paths['points'], [(0, num_points), new_points])
+
+	faces_file.write(temporary_paths['faces'], face_pieces)
+
+	owner_file.write(temporary_paths['owner'], owner_pieces, note=getOwnerNote(
+		num_points=num_merged_points,
+		num_cells=num_cells + hex_collection.num_cells,
+		num_faces=int(num_merged_faces),
+		num_internal_faces=int(num_merged_internal_faces),
+	))
+
+	neighbour_file.write(temporary_paths['neighbour'], neighbour_pieces)
+
+	writeBoundary(temporary_paths['boundary'], merged_boundary)
+
+	for name in file_names :
+
+		os.replace(temporary_paths[name], output_path / name)
+
+	(output_path / topology_file_name).unlink(missing_ok=True)
+
+	return stitched_faces.getSize()
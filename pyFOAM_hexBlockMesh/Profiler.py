@@ -0,0 +1,278 @@
+import contextvars
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# Profiler collecting the stages, set while a Profiler is entered.
+# Like the validation policy, every thread and task has its own, and
+# Validation.submit carries it into the worker threads of the pipeline.
+_active_profiler : contextvars.ContextVar['Profiler | None'] = \
+contextvars.ContextVar('active_profiler', default=None)
+
+# Stages being profiled in the current thread or task, innermost last.
+# A worker thread starts from the stages of the thread that submitted it,
+# so that its stages are nested in the stage running the workers.
+_stage_stack : contextvars.ContextVar[tuple] = contextvars.ContextVar('stage_stack', default=())
+
+class Profiler :
+	'''
+	Opt-in collector of the wall time, CPU time and memory of the stages
+	of the mesh generation pipeline, and of counters in hot paths.
+	The library reports to the profiler only while it is entered :
+
+		with Profiler() as profiler :
+			hex_collection.assignCellIDs()
+			...
+		profiler.saveJSON(path)
+
+	If trace_memory is True, the peak memory and the net memory allocated
+	by every stage are traced with tracemalloc, which slows down
+	the pipeline considerably. tracemalloc traces the whole process, so the
+	peak of stages running concurrently in worker threads includes the
+	memory of the other stages, an upper bound of their own.
+	Resetting the peak at the start of every stage needs Python 3.9.
+	'''
+
+	def __init__(self, trace_memory:bool=True) -> None :
+
+		self.trace_memory = trace_memory
+
+		# Record of every stage in the order the stages finished
+		self.records:list[dict] = []
+
+		# Counter name -> {'count', 'bytes'}
+		self.counters:dict[str, dict] = {}
+
+		# Stages being profiled in every thread, whose peaks are raised
+		# before the peak of tracemalloc is reset for a new stage
+		self.__running:list[dict] = []
+
+		# Guards the running stages and the counters across threads
+		self.__lock = threading.Lock()
+
+		self.__profiler_token = None
+		self.__stack_token = None
+		self.__started_tracing = False
+
+		pass
+
+	def __enter__(self) -> 'Profiler' :
+
+		self.__profiler_token	= _active_profiler.set(self)
+		self.__stack_token	= _stage_stack.set(())
+
+		if self.trace_memory and not tracemalloc.is_tracing() :
+
+			tracemalloc.start()
+			self.__started_tracing = True
+
+		return self
+
+	def __exit__(self, *exception_info) -> None :
+
+		_stage_stack.reset(self.__stack_token)
+		_active_profiler.reset(self.__profiler_token)
+
+		if self.__started_tracing :
+
+			tracemalloc.stop()
+			self.__started_tracing = False
+
+		pass
+
+	@contextmanager
+	def stage(self, name:str, **labels) :
+		'''
+		Context manager recording the stage
+		with the labels, e.g., the index of a hex block
+		'''
+
+		entry = {'peak' : 0}
+
+		if self.trace_memory and tracemalloc.is_tracing() :
+
+			with self.__lock :
+
+				current, peak = tracemalloc.get_traced_memory()
+
+				# The peak of every running stage up to here,
+				# including the stages of other threads
+				for running_entry in self.__running :
+
+					running_entry['peak'] = max(running_entry['peak'], peak)
+
+				tracemalloc.reset_peak()
+
+				entry['start_memory']	= current
+				entry['peak']		= current
+
+				self.__running.append(entry)
+
+		stack = _stage_stack.get()
+
+		stack_token = _stage_stack.set(stack + (entry,))
+
+		start_wall_time	= time.perf_counter()
+		start_cpu_time	= time.process_time()
+
+		try :
+
+			yield self
+
+		finally :
+
+			record = {
+				'stage'		: name,
+				'labels'	: labels,
+				'depth'		: len(stack),
+				'wall_time'	: time.perf_counter() - start_wall_time,
+				'cpu_time'	: time.process_time() - start_cpu_time,
+			}
+
+			_stage_stack.reset(stack_token)
+
+			if 'start_memory' in entry :
+
+				with self.__lock :
+
+					self.__running.remove(entry)
+
+					if tracemalloc.is_tracing() :
+
+						current, peak = tracemalloc.get_traced_memory()
+
+						peak = max(entry['peak'], peak)
+
+						record['peak_memory']		= peak - entry['start_memory']
+						record['allocated_memory']	= current - entry['start_memory']
+
+						for running_entry in self.__running :
+
+							running_entry['peak'] = max(running_entry['peak'], peak)
+
+			with self.__lock :
+
+				self.records.append(record)
+
+		pass
+
+	def count(self, name:str, nbytes:int=0) -> None :
+		'''
+		Increment the counter and the bytes counted under name
+		'''
+
+		with self.__lock :
+
+			counter = self.counters.setdefault(name, {'count' : 0, 'bytes' : 0})
+
+			counter['count'] += 1
+			counter['bytes'] += int(nbytes)
+
+		pass
+
+	def getSummary(self) -> dict :
+		'''
+		Get the number of calls, total wall and CPU times,
+		maximum peak memory and total allocated memory of every stage
+		'''
+
+		summary = {}
+
+		for record in self.records :
+
+			stage_summary = summary.setdefault(record['stage'], {
+				'calls'		: 0,
+				'wall_time'	: 0.0,
+				'cpu_time'	: 0.0,
+			})
+
+			stage_summary['calls']		+= 1
+			stage_summary['wall_time']	+= record['wall_time']
+			stage_summary['cpu_time']	+= record['cpu_time']
+
+			if 'peak_memory' in record :
+
+				stage_summary['peak_memory'] = max(
+					stage_summary.get('peak_memory', 0), record['peak_memory']
+				)
+				stage_summary['allocated_memory'] = \
+				stage_summary.get('allocated_memory', 0) + record['allocated_memory']
+
+		return summary
+
+	def toDict(self) -> dict :
+		'''
+		Get the summary, the records and the counters
+		'''
+
+		return {
+			'summary'	: self.getSummary(),
+			'records'	: self.records,
+			'counters'	: self.counters,
+		}
+
+	def saveJSON(self, path:Path) -> None :
+		'''
+		Save the summary, the records and the counters to a JSON file
+		'''
+
+		with open(path, 'w') as f :
+
+			json.dump(self.toDict(), f, indent='\t')
+
+		pass
+
+def getActiveProfiler() -> Profiler | None :
+	'''
+	Get the profiler that is entered, None if profiling is off
+	'''
+
+	return _active_profiler.get()
+
+def stage(name:str, **labels) :
+	'''
+	Context manager recording the stage in the active profiler.
+	Does nothing if profiling is off.
+	'''
+
+	profiler = _active_profiler.get()
+
+	if profiler is None : return nullcontext()
+
+	return profiler.stage(name, **labels)
+
+def count(name:str, nbytes:int=0) -> None :
+	'''
+	Increment the counter in the active profiler.
+	Does nothing if profiling is off.
+	'''
+
+	profiler = _active_profiler.get()
+
+	if profiler is not None : profiler.count(name, nbytes)
+
+	pass
+
+def profiled(function) :
+	'''
+	Decorator recording every call of the function as a stage
+	named by its qualified name
+	'''
+
+	@functools.wraps(function)
+	def wrapper(*args, **kwargs) :
+
+		profiler = _active_profiler.get()
+
+		if profiler is None : return function(*args, **kwargs)
+
+		with profiler.stage(function.__qualname__) :
+
+			return function(*args, **kwargs)
+
+	return wrapper
@@ -0,0 +1,332 @@
+import json
+import os
+import shutil
+import uuid
+
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
+
+# Name of the file in every cache entry describing the stored arrays
+manifest_file_name = 'manifest.json'
+
+def _getDirectorySize(path: Path) -> int :
+	'''
+	Get the total size of the files in the directory in bytes
+	'''
+
+	return sum(item.stat().st_size for item in path.iterdir())
+
+class TopologyCache :
+	'''
+	On-disk cache of the cell IDs, point IDs and faces
+	of ConnectedHexCollections, keyed by their topology fingerprint.
+	Every entry is a directory of .npy files loaded with memory-mapping.
+	The least recently used entries are evicted
+	when the total size exceeds max_size bytes.
+	Entries are renamed to hidden tombstones before they are deleted,
+	so that concurrent loads of an evicted entry miss instead of
+	reading a partially deleted entry.
+	'''
+
+	def __init__(self, cache_path: Path, max_size: int = 2**30) -> None :
+		'''
+		cache_path: Directory holding the cache entries
+		max_size: Maximum total size of the cache entries in bytes
+		'''
+
+		assert isinstance(max_size, int) and max_size > 0, 'Invalid maximum size'
+
+		self.path = Path(cache_path)
+		self.path.mkdir(parents=True, exist_ok=True)
+
+		self.max_size = max_size
+
+		pass
+
+	def getEntryPath(self, fingerprint: str) -> Path :
+		'''
+		Get the directory of the cache entry for the fingerprint
+		'''
+
+		return self.path / fingerprint
+
+	def __getEntries(self) -> list[Path] :
+		'''
+		Get the complete cache entries, skipping the hidden
+		temporary directories and tombstones
+		'''
+
+		entries = [
+			entry for entry in self.path.iterdir()
+			if not entry.name.startswith('.') and (entry / manifest_file_name).is_file()
+		]
+
+		return entries
+
+	def getSize(self) -> int :
+		'''
+		Get the total size of the cache entries in bytes
+		'''
+
+		size = 0
+
+		for entry in self.__getEntries() :
+
+			try :
+
+				size += _getDirectorySize(entry)
+
+			except FileNotFoundError :
+
+				# Evicted concurrently
+				continue
+
+		return size
+
+	def __remove(self, entry_path: Path) -> None :
+		'''
+		Rename the entry to a hidden tombstone and delete it
+		'''
+
+		tombstone_path = self.path / f'.{entry_path.name}.deleted.{uuid.uuid4().hex}'
+
+		try :
+
+			os.replace(entry_path, tombstone_path)
+
+		except OSError :
+
+			# Removed concurrently
+			return
+
+		shutil.rmtree(tombstone_path, ignore_errors=True)
+
+		pass
+
+	def __evict(self, stored_path: Path) -> None :
+		'''
+		Remove the least recently used entries other than the entry
+		just stored until the total size is within the maximum size
+		'''
+
+		entries = []
+
+		for entry in self.__getEntries() :
+
+			try :
+
+				# Loading an entry updates the modification time of its manifest
+				entries.append((
+					(entry / manifest_file_name).stat().st_mtime_ns,
+					_getDirectorySize(entry),
+					entry
+				))
+
+			except FileNotFoundError :
+
+				# Evicted concurrently
+				continue
+
+		entries.sort(key=lambda item: item[0])
+
+		size = sum(entry_size for _, entry_size, _ in entries)
+
+		for _, entry_size, entry in entries :
+
+			if size <= self.max_size : break
+
+			if entry == stored_path : continue
+
+			self.__remove(entry)
+			size -= entry_size
+
+		pass
+
+	def store(
+		self,
+		hex_collection: ConnectedHexCollection,
+		faces: list[FlatFaceCollection]
+	) -> bool :
+		'''
+		Store the assigned cell and point IDs of the hex collection
+		and the faces returned by its getFaces method.
+		Return False without storing the entry if it is larger
+		than the maximum size, True otherwise.
+		'''
+
+		assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+		assert isinstance(faces, list), 'Invalid faces'
+		assert all(isinstance(face, FlatFaceCollection) for face in faces), \
+		'Invalid faces'
+
+		fingerprint = hex_collection.getTopologyFingerprint()
+
+		# Write to a temporary directory and rename it
+		# so that incomplete entries are never loaded
+		temporary_path = self.path / f'.{fingerprint}.{uuid.uuid4().hex}'
+		temporary_path.mkdir()
+
+		for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+			np.save(temporary_path / f'cell_ID_{i}.npy', hex_block.cell_ID)
+			np.save(temporary_path / f'point_ID_{i}.npy', hex_block.point_ID)
+
+		np.save(temporary_path / 'owner.npy', np.concatenate([face.owner for face in faces]))
+		np.save(temporary_path / 'neighbour.npy', np.concatenate([face.neighbour for face in faces]))
+		np.save(temporary_path / 'vertices.npy', np.concatenate([face.vertices for face in faces]))
+
+		manifest = {
+			'fingerprint'	: fingerprint,
+			'num_cells'	: int(hex_collection.num_cells),
+			'num_points'	: int(hex_collection.num_points),
+			'num_blocks'	: len(hex_collection.hex_blocks),
+			'faces'		: [
+				{
+					'name'		: face.name,
+					'patch_type'	: face.patch_type,
+					'size'		: face.getSize(),
+					'num_neighbours': int(face.neighbour.size),
+				}
+				for face in faces
+			],
+		}
+
+		with open(temporary_path / manifest_file_name, 'w') as f :
+
+			json.dump(manifest, f, indent='\t')
+
+		if _getDirectorySize(temporary_path) > self.max_size :
+
+			shutil.rmtree(temporary_path, ignore_errors=True)
+
+			return False
+
+		entry_path = self.getEntryPath(fingerprint)
+
+		if entry_path.exists() : self.__remove(entry_path)
+
+		try :
+
+			os.replace(temporary_path, entry_path)
+
+		except OSError :
+
+			# Another process stored the same entry concurrently
+			shutil.rmtree(temporary_path, ignore_errors=True)
+
+		self.__evict(entry_path)
+
+		return True
+
+	def load(self, hex_collection: ConnectedHexCollection) -> list[FlatFaceCollection] | None :
+		'''
+		Load the cell and point IDs into the hex blocks of the collection
+		as read-only memory-mapped arrays,
+		and return the faces as FlatFaceCollections of memory-mapped arrays.
+		Return None, leaving the collection unchanged, if there is no entry
+		for the topology of the collection or it is evicted while loaded.
+		'''
+
+		assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+
+		fingerprint = hex_collection.getTopologyFingerprint()
+
+		entry_path = self.getEntryPath(fingerprint)
+		manifest_path = entry_path / manifest_file_name
+
+		try :
+
+			with open(manifest_path, 'r') as f :
+
+				manifest = json.load(f)
+
+			assert manifest['fingerprint'] == fingerprint, 'Corrupted cache entry'
+			assert manifest['num_blocks'] == len(hex_collection.hex_blocks), \
+			'Corrupted cache entry'
+
+			# Every array is mapped before the collection is modified,
+			# the mapped arrays stay valid if the entry is evicted afterwards
+			IDs = [
+				(
+					np.load(entry_path / f'cell_ID_{i}.npy', mmap_mode='r'),
+					np.load(entry_path / f'point_ID_{i}.npy', mmap_mode='r')
+				)
+				for i in range(len(hex_collection.hex_blocks))
+			]
+
+			owner		= np.load(entry_path / 'owner.npy', mmap_mode='r')
+			neighbour	= np.load(entry_path / 'neighbour.npy', mmap_mode='r')
+			vertices	= np.load(entry_path / 'vertices.npy', mmap_mode='r')
+
+		except FileNotFoundError :
+
+			# Evicted concurrently
+			return None
+
+		for hex_block, (cell_ID, point_ID) in zip(hex_collection.hex_blocks, IDs) :
+
+			hex_block.cell_ID	= cell_ID
+			hex_block.point_ID	= point_ID
+
+		hex_collection.num_cells	= manifest['num_cells']
+		hex_collection.num_points	= manifest['num_points']
+
+		# Cached IDs are assigned from 0
+		hex_collection.start_cell_ID	= 0
+		hex_collection.start_point_ID	= 0
+
+		faces = []
+		start = 0
+		start_neighbour = 0
+
+		for face_info in manifest['faces'] :
+
+			end = start + face_info['size']
+			end_neighbour = start_neighbour + face_info['num_neighbours']
+
+			face = FlatFaceCollection(face_info['name'], face_info['patch_type'])
+
+			face.owner	= owner[start:end]
+			face.vertices	= vertices[start:end]
+			face.neighbour	= neighbour[start_neighbour:end_neighbour]
+
+			faces.append(face)
+
+			start = end
+			start_neighbour = end_neighbour
+
+		try :
+
+			# Mark the entry as recently used
+			os.utime(manifest_path)
+
+		except FileNotFoundError :
+
+			pass
+
+		return faces
+
+	def getTopology(self, hex_collection: ConnectedHexCollection) -> list[FlatFaceCollection] :
+		'''
+		Load the topology of the hex collection from the cache if present.
+		Otherwise assign the cell and point IDs, get the faces
+		and store them in the cache.
+		Return the faces of the hex collection.
+		'''
+
+		faces = self.load(hex_collection)
+
+		if faces is None :
+
+			hex_collection.assignCellIDs()
+			hex_collection.assignPointIDs()
+
+			faces = hex_collection.getFaces()
+
+			self.store(hex_collection, faces)
+
+		return faces
@@ -0,0 +1,282 @@
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.HexBlockVertices as HexBlockVertices
+
+from pyFOAM_hexBlockMesh.HexBlock import HexBlock
+
+def _snapMatrix(matrix:np.ndarray) -> np.ndarray :
+	'''
+	Set the entries of the matrix within a few ULPs of 0 or +/-1 to
+	exactly 0 or +/-1, so that reflections about axis and diagonal planes
+	and rotations by multiples of 90 degrees are exact signed permutations
+	'''
+
+	for value in (0.0, 1.0, -1.0) :
+
+		matrix[np.abs(matrix - value) <= 4 * np.finfo(float).eps] = value
+
+	return matrix
+
+def getReflectionMatrix(normal:tuple[float, float, float]) -> np.ndarray :
+	'''
+	Get the (3, 3) matrix reflecting points about
+	the plane through the origin normal to normal
+	'''
+
+	normal = np.asarray(normal, dtype=float)
+
+	assert normal.shape == (3,) and np.linalg.norm(normal) > 0, 'Invalid normal'
+
+	normal = normal / np.linalg.norm(normal)
+
+	return _snapMatrix(np.eye(3) - 2 * np.outer(normal, normal))
+
+def getRotationMatrix(axis:tuple[float, float, float], angle:float) -> np.ndarray :
+	'''
+	Get the (3, 3) matrix rotating points by angle (radians)
+	about the axis through the origin, counter-clockwise
+	when viewed from the tip of axis
+	'''
+
+	axis = np.asarray(axis, dtype=float)
+
+	assert axis.shape == (3,) and np.linalg.norm(axis) > 0, 'Invalid axis'
+
+	axis = axis / np.linalg.norm(axis)
+
+	cross_matrix = np.array([
+		[ 0.0,		-axis[2],	 axis[1]],
+		[ axis[2],	 0.0,		-axis[0]],
+		[-axis[1],	 axis[0],	 0.0	]
+	])
+
+	# Rodrigues' rotation formula
+	return _snapMatrix(
+		np.eye(3) +
+		np.sin(angle) * cross_matrix +
+		(1 - np.cos(angle)) * cross_matrix @ cross_matrix
+	)
+
+class TransformedHexBlock(HexBlock) :
+	'''
+	A hex block whose points are a rigid transform of the points of
+	a source hex block, with its axes permuted and / or reversed.
+	Only the transform is stored, the point coordinates are computed
+	from the source hex block whenever they are accessed, and
+	in chunks by ConnectedHexCollection.getPoints.
+	The cell and point IDs are independent of the source hex block.
+	'''
+
+	def __init__(
+		self,
+		source:HexBlock,
+		matrix:np.ndarray|None=None,
+		translation:np.ndarray|None=None,
+		axes:tuple[int, int, int]=(0, 1, 2),
+		reverse:tuple[bool, bool, bool]=(False, False, False)
+	) -> None :
+		'''
+		source:		Hex block whose points are transformed
+		matrix:		(3, 3) orthogonal matrix applied to the source points,
+				i.e., a rotation and / or a reflection
+		translation:	(3,) vector added to the points after matrix
+		axes:		Axis i of this hex block is axis axes[i] of the source
+		reverse:	Axis i of this hex block is traversed in the opposite
+				direction of the source if reverse[i] is True
+		The axes must be permuted / reversed such that the cells
+		stay right handed, i.e., a reflection must be accompanied by
+		an odd permutation or an odd number of reversed axes.
+		'''
+
+		assert isinstance(source, HexBlock), 'Invalid source hex block'
+
+		matrix		= np.eye(3) if matrix is None else np.array(matrix, dtype=float)
+		translation	= np.zeros(3) if translation is None else np.array(translation, dtype=float)
+
+		assert matrix.shape == (3, 3), 'Invalid matrix'
+		assert np.allclose(matrix @ matrix.T, np.eye(3)), 'Matrix must be orthogonal'
+		assert translation.shape == (3,), 'Invalid translation'
+		assert sorted(axes) == [0, 1, 2], f'Invalid axes {axes}'
+		assert len(reverse) == 3, f'Invalid reverse {reverse}'
+
+		axes	= tuple(int(axis) for axis in axes)
+		reverse	= tuple(bool(flag) for flag in reverse)
+
+		# Handedness of the transformed cells relative to the source cells
+		orientation = (
+			np.linalg.det(matrix) *
+			np.linalg.det(np.eye(3)[list(axes)]) *
+			(-1) ** sum(reverse)
+		)
+
+		assert orientation > 0, \
+		'Transform inverts the cells, reverse an axis or swap two axes'
+
+		# Compose with the transform of a transformed source,
+		# so that the coordinates are always computed from a hex block
+		# storing them
+		if isinstance(source, TransformedHexBlock) :
+
+			reverse = tuple(
+				source.reverse[axes[i]] ^ reverse[i] for i in range(3)
+			)
+			axes = tuple(source.axes[axes[i]] for i in range(3))
+
+			translation	= matrix @ source.translation + translation
+			matrix		= matrix @ source.matrix
+
+			source = source.source
+
+		self.source	= source
+		self.matrix	= matrix
+		self.translation	= translation
+		self.axes	= axes
+		self.reverse	= reverse
+
+		# A signed permutation, e.g., a reflection about an axis or
+		# a diagonal plane, is applied exactly by swapping and negating
+		# the components instead of multiplying by the matrix
+		self.__is_permutation = bool(np.all((matrix == 0) | (np.abs(matrix) == 1))) and \
+		np.all(np.count_nonzero(matrix, axis=1) == 1)
+
+		self.__permutation	= np.argmax(np.abs(matrix), axis=1)
+		self.__signs		= matrix[np.arange(3), self.__permutation]
+
+		n0, n1, n2 = (source.cell_ID.shape[axis] for axis in axes)
+
+		super().__init__(n0, n1, n2)
+
+		pass
+
+	def _initializePointCoordinates(self, points_shape:tuple[int, int, int]) -> None :
+		'''
+		The point coordinates are computed from the source hex block,
+		and kept for the point_coordinates property only
+		'''
+
+		self.__coordinates		= None
+		self.__coordinates_version	= None
+
+		pass
+
+	def getCoordinatesVersion(self) -> tuple :
+		'''
+		Get a value that changes whenever the point coordinates
+		of this or the source hex block change
+		'''
+
+		return (super().getCoordinatesVersion(), self.source.getCoordinatesVersion())
+
+	def __getSourceView(self) -> np.ndarray :
+		'''
+		Get a view of the source point coordinates
+		with the axes permuted and reversed as in this hex block
+		'''
+
+		view = self.source.point_coordinates.transpose(self.axes + (3,))
+
+		view = view[tuple(slice(None, None, -1) if flag else slice(None) for flag in self.reverse)]
+
+		return view
+
+	def __transform(self, coordinates:np.ndarray) -> np.ndarray :
+		'''
+		Apply the rigid transform to the (..., 3) coordinates.
+		Return a new read-only array.
+		'''
+
+		if self.__is_permutation :
+
+			transformed = coordinates[..., self.__permutation] * self.__signs
+
+		else :
+
+			transformed = np.matmul(coordinates, self.matrix.T)
+
+		if np.any(self.translation != 0) : transformed += self.translation
+
+		transformed.flags.writeable = False
+
+		return transformed
+
+	def getPointCoordinates(self) -> np.ndarray :
+		'''
+		Get the coordinates of all the points, computed from
+		the source hex block on every call. Return a new read-only array.
+		'''
+
+		return self.__transform(self.__getSourceView())
+
+	def arePointCoordinatesSet(self) -> bool :
+		'''
+		NaN coordinates of the source stay NaN through the transform
+		'''
+
+		return self.source.arePointCoordinatesSet()
+
+	@property
+	def point_coordinates(self) -> np.ndarray :
+		'''
+		Coordinates of the points as a read-only array, computed from
+		the source hex block on the first access after the coordinates
+		change and kept until then, so that indexing the property
+		repeatedly does not transform all the points every time.
+		Use getPointCoordinates or getPointCoordinateLayers
+		to not keep a copy of the points in the hex block.
+		'''
+
+		version = self.getCoordinatesVersion()
+
+		if self.__coordinates is None or self.__coordinates_version != version :
+
+			self.__coordinates		= self.getPointCoordinates()
+			self.__coordinates_version	= version
+
+		return self.__coordinates
+
+	def setPointCoordinates(self, coordinates:np.ndarray) -> None :
+
+		assert False, 'Coordinates of a transformed hex block are set through its source'
+
+	def setTransfiniteCoordinates(
+		self,
+		vertices:np.ndarray,
+		edges:dict|None=None,
+		faces:dict|None=None
+	) -> None :
+
+		assert False, 'Coordinates of a transformed hex block are set through its source'
+
+	def getSurfacePointCoordinates(
+		self,
+		vertices:tuple[int, int, int, int]
+	) -> np.ndarray :
+		'''
+		Get the coordinates of the points on the face
+		formed by the 4 vertices.
+		Only the points on the face are transformed.
+		'''
+
+		# Check if the input is valid
+		assert len(vertices) == 4, 'Invalid input'
+
+		slice_3d = HexBlockVertices.getSurfaceCompleteSlice(vertices)
+
+		return self.getSlicePointCoordinates(slice_3d)
+
+	def getSlicePointCoordinates(self, slice_3d:HexBlockVertices.Slice3D) -> np.ndarray :
+		'''
+		Get the coordinates of the points in the slice.
+		Only the points in the slice are transformed.
+		'''
+
+		return self.__transform(slice_3d.getArrayView(self.__getSourceView()))
+
+	def getPointCoordinateLayers(self, start:int, end:int, axis:int=0) -> np.ndarray :
+		'''
+		Get the coordinates of the points
+		from index start to end (exclusive) along the axis.
+		Only the points in the layers are transformed.
+		'''
+
+		return self.__transform(self.__getSourceView()[(slice(None),) * axis + (slice(start, end),)])
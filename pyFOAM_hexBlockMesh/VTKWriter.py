@@ -0,0 +1,206 @@
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.writer_utils.VTKFile as VTKFile
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map
+from pyFOAM_hexBlockMesh.writer_utils.VTKFile import AppendedDataArray
+
+# VTK cell type of hexahedra
+# The vertices of VTK hexahedra are numbered as those of hex blocks
+vtk_hexahedron = 12
+
+# Number of points of a hex block converted at a time
+points_chunk_size = 2**18
+
+def getCellPointIDs(hex_block:HexBlock) -> np.ndarray :
+	'''
+	Get the (n0, n1, n2, 8) IDs of the 8 vertices of every cell
+	of the hex block, in the order of the vertices of the hex block
+	'''
+
+	point_ID = hex_block.point_ID
+
+	cell_point_IDs = np.stack([
+		point_ID[tuple(
+			slice(1, None) if index == -1 else slice(0, -1) for index in vertex
+		)]
+		for vertex in vertex_map
+	], axis=-1)
+
+	return cell_point_IDs
+
+@Profiler.profiled
+def writeStructuredGrid(hex_block:HexBlock, path:Path) -> None :
+	'''
+	Write the points of the hex block to a VTK structured grid (.vts) file,
+	with the cell IDs as cell data if they are assigned.
+	The points are streamed in chunks of layers along axis 2,
+	varying fastest along axis 0 as in VTK, so that the coordinates
+	of a TransformedHexBlock are computed one chunk at a time.
+	'''
+
+	assert isinstance(hex_block, HexBlock), 'Invalid hex block'
+
+	n0, n1, n2 = hex_block.cell_ID.shape
+
+	assert hex_block.arePointCoordinatesSet(), 'Point coordinates are not set'
+
+	chunk_layers = max(1, points_chunk_size // ((n0 + 1) * (n1 + 1)))
+
+	def getPointChunks() :
+
+		for start in range(0, n2 + 1, chunk_layers) :
+
+			yield hex_block.getPointCoordinateLayers(start, start + chunk_layers, axis=2).transpose((2, 1, 0, 3))
+
+	points = AppendedDataArray('Points', '<f8', 3, 3 * (n0 + 1) * (n1 + 1) * (n2 + 1), getPointChunks)
+
+	cell_arrays = []
+
+	if np.all(hex_block.cell_ID >= 0) :
+
+		cell_arrays.append(AppendedDataArray(
+			'cellID', '<i8', 1, hex_block.cell_ID.size,
+			VTKFile.getArrayChunks(hex_block.cell_ID.transpose((2, 1, 0)), '<i8')
+		))
+
+	extent = f'0 {n0} 0 {n1} 0 {n2}'
+
+	def getBody(offsets:list[int]) -> str :
+
+		body = f'<StructuredGrid WholeExtent="{extent}">\n'
+		body += f'<Piece Extent="{extent}">\n'
+		body += '<CellData>\n'
+
+		for array, offset in zip(cell_arrays, offsets[1:]) :
+
+			body += array.getXML(offset) + '\n'
+
+		body += '</CellData>\n'
+		body += '<Points>\n' + points.getXML(offsets[0]) + '\n</Points>\n'
+		body += '</Piece>\n'
+		body += '</StructuredGrid>\n'
+
+		return body
+
+	VTKFile.writeVTKFile(path, 'StructuredGrid', getBody, [points] + cell_arrays)
+
+	pass
+
+@Profiler.profiled
+def writeMultiBlock(hex_collection:ConnectedHexCollection, path:Path) -> list[Path] :
+	'''
+	Write every hex block of the collection to a .vts file
+	in the directory named as path without the suffix,
+	and the VTK multiblock (.vtm) file at path indexing them.
+	Return the paths of the .vts files.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+
+	path = Path(path)
+
+	assert path.suffix == '.vtm', f'Multiblock file {path} must have the suffix .vtm'
+
+	blocks_path = path.parent / path.stem
+	blocks_path.mkdir(parents=True, exist_ok=True)
+
+	block_paths = []
+
+	body = '<vtkMultiBlockDataSet>\n'
+
+	for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+		block_path = blocks_path / f'block_{i}.vts'
+
+		writeStructuredGrid(hex_block, block_path)
+
+		block_paths.append(block_path)
+
+		body += f'<DataSet index="{i}" name="block_{i}" ' \
+		f'file="{block_path.relative_to(path.parent).as_posix()}"/>\n'
+
+	body += '</vtkMultiBlockDataSet>\n'
+
+	VTKFile.writeVTKFile(path, 'vtkMultiBlockDataSet', lambda offsets : body, [])
+
+	return block_paths
+
+@Profiler.profiled
+def writeUnstructuredGrid(hex_collection:ConnectedHexCollection, path:Path) -> None :
+	'''
+	Write the collection to a VTK unstructured grid (.vtu) file of hexahedra,
+	numbered by the cell and point IDs of the collection,
+	with the index of the hex block of every cell as cell data.
+	The cell and point IDs must be assigned.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), 'Invalid hex collection'
+	assert hasattr(hex_collection, 'num_cells') and hasattr(hex_collection, 'num_points'), \
+	'Cell and point IDs are not assigned'
+
+	num_cells	= hex_collection.num_cells
+	num_points	= hex_collection.num_points
+
+	points = hex_collection.getPoints()
+
+	connectivity	= np.full((num_cells, 8), -1, dtype='<i8')
+	hex_block_index	= np.full(num_cells, -1, dtype='<i4')
+
+	for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+		cell_IDs = hex_block.cell_ID.ravel()
+
+		connectivity[cell_IDs]		= getCellPointIDs(hex_block).reshape((-1, 8))
+		hex_block_index[cell_IDs]	= i
+
+	assert np.all(hex_block_index >= 0), 'Cell IDs are not assigned to every cell'
+
+	points_array = AppendedDataArray(
+		'Points', '<f8', 3, points.size, VTKFile.getArrayChunks(points, '<f8')
+	)
+	cell_arrays = [
+		AppendedDataArray(
+			'connectivity', '<i8', 1, connectivity.size,
+			VTKFile.getArrayChunks(connectivity, '<i8')
+		),
+		AppendedDataArray(
+			'offsets', '<i8', 1, num_cells,
+			lambda : (np.arange(8, 8 * num_cells + 1, 8, dtype='<i8'),)
+		),
+		AppendedDataArray(
+			'types', 'u1', 1, num_cells,
+			lambda : (np.full(num_cells, vtk_hexahedron, dtype='u1'),)
+		),
+	]
+	cell_data_array = AppendedDataArray(
+		'hexBlock', '<i4', 1, num_cells, VTKFile.getArrayChunks(hex_block_index, '<i4')
+	)
+
+	arrays = [points_array] + cell_arrays + [cell_data_array]
+
+	def getBody(offsets:list[int]) -> str :
+
+		body = '<UnstructuredGrid>\n'
+		body += f'<Piece NumberOfPoints="{num_points}" NumberOfCells="{num_cells}">\n'
+		body += '<Points>\n' + points_array.getXML(offsets[0]) + '\n</Points>\n'
+		body += '<Cells>\n'
+
+		for array, offset in zip(cell_arrays, offsets[1:4]) :
+
+			body += array.getXML(offset) + '\n'
+
+		body += '</Cells>\n'
+		body += '<CellData>\n' + cell_data_array.getXML(offsets[4]) + '\n</CellData>\n'
+		body += '</Piece>\n'
+		body += '</UnstructuredGrid>\n'
+
+		return body
+
+	VTKFile.writeVTKFile(path, 'UnstructuredGrid', getBody, arrays)
+
+	pass
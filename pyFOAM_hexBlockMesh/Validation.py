@@ -0,0 +1,100 @@
+import contextvars
+import functools
+
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+
+# Every call checks its inputs and outputs with asserts
+STRICT		= 'strict'
+# Per-call checks in hot paths are skipped and a single consistency check
+# of the assembled mesh reports every problem at the end of the assembly
+DEFERRED	= 'deferred'
+# No checks in hot paths and no consistency check
+OFF		= 'off'
+
+policies = (STRICT, DEFERRED, OFF)
+
+# Validation policy in effect, set by the collection being assembled.
+# Every thread and task has its own, so that collections assembled
+# concurrently with different policies do not change each other's.
+_active_policy : contextvars.ContextVar[str] = contextvars.ContextVar('validation_policy', default=STRICT)
+
+def getPolicy() -> str :
+	'''
+	Get the validation policy in effect
+	'''
+
+	return _active_policy.get()
+
+def isStrict() -> bool :
+	'''
+	Check if the per-call checks in hot paths are to be run
+	'''
+
+	return _active_policy.get() == STRICT
+
+def isOff() -> bool :
+	'''
+	Check if all the checks are to be skipped
+	'''
+
+	return _active_policy.get() == OFF
+
+@contextmanager
+def policy(name:str) :
+	'''
+	Context manager setting the validation policy in effect
+	in the current thread or task
+	'''
+
+	assert name in policies, f'Invalid validation policy {name}, expected one of {policies}'
+
+	token = _active_policy.set(name)
+
+	try :
+
+		yield name
+
+	finally :
+
+		_active_policy.reset(token)
+
+	pass
+
+def _runWithPolicy(name:str, function, *args) :
+	'''
+	Run the function with the validation policy in effect
+	'''
+
+	with policy(name) :
+
+		return function(*args)
+
+def submit(executor:Executor, name:str, function, *args) -> Future :
+	'''
+	Submit the function to the executor, to run in the worker thread
+	with the validation policy name, e.g., that of the collection
+	whose hex blocks are generated, as worker threads
+	do not inherit the policy of the submitting thread.
+	The function runs in a copy of the context of the submitting thread,
+	so that it also reports to the profiler in effect. Refer to Profiler.
+	'''
+
+	context = contextvars.copy_context()
+
+	return executor.submit(context.run, _runWithPolicy, name, function, *args)
+
+def withPolicy(method) :
+	'''
+	Decorator running the method of an object with
+	the validation policy of the object, i.e., self.validation
+	'''
+
+	@functools.wraps(method)
+	def wrapper(self, *args, **kwargs) :
+
+		with policy(self.validation) :
+
+			return method(self, *args, **kwargs)
+
+	return wrapper
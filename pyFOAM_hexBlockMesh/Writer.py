@@ -3,22 +3,87 @@ from pathlib import Path
 import numpy as np
 
 import pyFOAM_hexBlockMesh.FaceCollection as FaceCollection
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
 import pyFOAM_hexBlockMesh.writer_utils.PolyMeshFile as PolyMeshFile
 
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+
+# File in the polyMesh directory storing the topology of the collection
+# that wrote the polyMesh. Refer to ConnectedHexCollection.saveTopology
+topology_file_name = 'topology.npz'
+
+def getOwnerNote(
+	num_points: int | None = None,
+	num_cells: int | None = None,
+	num_faces: int | None = None,
+	num_internal_faces: int | None = None,
+) -> str :
+	'''
+	Return the quoted note of an owner file stating the sizes of the mesh,
+	e.g., "nCells:8 nFaces:36 nInternalFaces:12", as written by OpenFOAM.
+	Sizes that are None are left out.
+	'''
+
+	sizes = {
+		'nPoints'		: num_points,
+		'nCells'		: num_cells,
+		'nFaces'		: num_faces,
+		'nInternalFaces'	: num_internal_faces,
+	}
+
+	return '"' + ' '.join(f'{key}:{value}' for key, value in sizes.items() if value is not None) + '"'
+
+def writeBoundary(path: Path, boundary: dict) -> None :
+	'''
+	Write the boundary file at path, boundary mapping the name
+	of every patch to its entries, e.g., type, nFaces and startFace
+	'''
+
+	assert isinstance(boundary, dict), \
+	f'Boundary must be a dictionary, got {type(boundary)}'
+
+	header = PolyMeshFile.getHeader('13')
+	header += 'FoamFile\n{\n'
+	header += PolyMeshFile.getDictionaryString({
+		'format'	: 'ascii',
+		'class'		: 'polyBoundaryMesh',
+		'location'	: '"constant/polyMesh"',
+		'object'	: 'boundary',
+	}, 1)
+	header += '}\n'
+	header += PolyMeshFile.file_separator + '\n\n\n'
+
+	boundary_string = f'{len(boundary)}\n(\n'
+
+	boundary_string += PolyMeshFile.getDictionaryString(boundary, 1)
+
+	boundary_string += ')\n\n'
+
+	with open(path, 'w') as f:
+		
+		f.write(header + boundary_string + PolyMeshFile.file_EOF + '\n')
+
+	assert path.exists(), \
+	f'Boundary file {path} was not created.'
+
+	pass
+
 class PointsWriter :
 
-	def __init__(self, polyMesh_path: Path) :
+	def __init__(self, polyMesh_path: Path, overwrite: bool = False) :
 
 		assert polyMesh_path.exists() and polyMesh_path.is_dir(), \
 		f'PolyMesh_path {polyMesh_path} does not exist or is not a directory'
 
 		self.path = polyMesh_path / 'points'
 
-		assert not self.path.exists(), \
+		assert overwrite or not self.path.exists(), \
 		f'Points file {self.path} already exists.'
 
 		pass
 
+	@Profiler.profiled
 	def write(self, points: np.ndarray) -> None :
 		'''
 		Write points to the points file.
@@ -55,7 +120,12 @@ class PointsWriter :
 
 class FacesWriter :
 
-	def __init__(self, polyMesh_path: Path) :
+	def __init__(self, polyMesh_path: Path, overwrite: bool = False, validation: str | None = None) :
+		'''
+		validation is the policy the faces are checked with while written,
+		e.g., the validation of the collection the faces are of,
+		or the policy in effect if None. Refer to Validation.
+		'''
 
 		assert polyMesh_path.exists() and polyMesh_path.is_dir(), \
 		f'PolyMesh_path {polyMesh_path} does not exist or is not a directory'
@@ -66,18 +136,23 @@ class FacesWriter :
 
 		self.path_boundary = polyMesh_path / 'boundary'
 
-		assert not self.path_faces.exists(), \
+		assert overwrite or not self.path_faces.exists(), \
 		f'Faces file {self.path_faces} already exists.'
 
-		assert not self.path_owner.exists(), \
+		assert overwrite or not self.path_owner.exists(), \
 		f'Owner file {self.path_owner} already exists.'
 
-		assert not self.path_neighbour.exists(), \
+		assert overwrite or not self.path_neighbour.exists(), \
 		f'Neighbour file {self.path_neighbour} already exists.'
 
-		assert not self.path_boundary.exists(), \
+		assert overwrite or not self.path_boundary.exists(), \
 		f'Boundary file {self.path_boundary} already exists.'
 
+		assert validation is None or validation in Validation.policies, \
+		f'Invalid validation policy {validation}, expected one of {Validation.policies}'
+
+		self.validation = validation
+
 		pass
 
 	def __writeFaces(self, faces: np.ndarray) -> None :
@@ -114,9 +189,9 @@ class FacesWriter :
 
 		pass
 
-	def __writeOwner(self, owner: np.ndarray) -> None :
+	def __writeOwner(self, owner: np.ndarray, note: str | None = None) -> None :
 		'''
-		Write owner to the owner file.
+		Write owner to the owner file, with the mesh sizes in its note.
 		'''
 
 		assert owner.ndim == 1, \
@@ -130,6 +205,7 @@ class FacesWriter :
 			object_name='owner',
 			format='ascii',
 			foam_version='13',
+			note=note,
 		)
 
 		header += f'{owner.shape[0]}\n'
@@ -187,32 +263,7 @@ class FacesWriter :
 		Write boundary to the boundary file.
 		'''
 
-		assert isinstance(boundary, dict), \
-		f'Boundary must be a dictionary, got {type(boundary)}'
-
-		header = PolyMeshFile.getHeader('13')
-		header += 'FoamFile\n{\n'
-		header += PolyMeshFile.getDictionaryString({
-			'format'	: 'ascii',
-			'class'		: 'polyBoundaryMesh',
-			'location'	: '"constant/polyMesh"',
-			'object'	: 'boundary',
-		}, 1)
-		header += '}\n'
-		header += PolyMeshFile.file_separator + '\n\n\n'
-
-		boundary_string = f'{len(boundary)}\n(\n'
-
-		boundary_string += PolyMeshFile.getDictionaryString(boundary, 1)
-
-		boundary_string += ')\n\n'
-
-		with open(self.path_boundary, 'w') as f:
-			
-			f.write(header + boundary_string + PolyMeshFile.file_EOF + '\n')
-
-		assert self.path_boundary.exists(), \
-		f'Boundary file {self.path_boundary} was not created.'
+		writeBoundary(self.path_boundary, boundary)
 
 		pass
 
@@ -230,7 +281,9 @@ class FacesWriter :
 		f'All elements in face_list must be FlatFaceCollection instances'
 
 		# Sort all faces such that boundary face collections are at the end
-		face_list.sort(key=lambda x: x.isBoundary())
+		is_boundary = {id(faces) : faces.isBoundary() for faces in face_list}
+
+		face_list.sort(key=lambda x: is_boundary[id(x)])
 
 		# Create a new FaceCollection to hold all faces
 		all_faces = FaceCollection.mergeFaceCollections(face_list)
@@ -240,7 +293,7 @@ class FacesWriter :
 
 		for face_collection in face_list :
 
-			if not face_collection.isBoundary() :
+			if not is_boundary[id(face_collection)] :
 
 				num_faces += face_collection.getSize()
 				continue
@@ -250,7 +303,7 @@ class FacesWriter :
 			f'Boundary {face_collection.name} is already defined'
 
 			boundary_dict[face_collection.name] = {
-				'type'		: 'patch',
+				'type'		: face_collection.patch_type,
 				'nFaces'	: face_collection.getSize(),
 				'startFace'	: num_faces,
 			}
@@ -264,6 +317,7 @@ class FacesWriter :
 		# Return the organized face collections
 		return all_faces, boundary_dict
 
+	@Profiler.profiled
 	def write(self, face_list: list[FaceCollection.FlatFaceCollection]) -> None :
 		'''
 		Write faces to the faces, owner, neighbour, and boundary files.
@@ -276,13 +330,178 @@ class FacesWriter :
 		all(isinstance(face, FaceCollection.FlatFaceCollection) for face in face_list), \
 		f'All elements in face_list must be FlatFaceCollection instances'
 
-		all_faces, boundary_dict = self.__organizeFaces(face_list)
+		validation = Validation.getPolicy() if self.validation is None else self.validation
+
+		with Validation.policy(validation) :
+
+			all_faces, boundary_dict = self.__organizeFaces(face_list)
 
-		self.__writeFaces(all_faces.vertices)
-		self.__writeOwner(all_faces.owner)
-		self.__writeNeighbour(all_faces.neighbour)
+			num_cells = max(
+				np.max(all_faces.owner, initial=-1), np.max(all_faces.neighbour, initial=-1)
+			) + 1
 
-		self.__writeBoundary(boundary_dict)
+			self.__writeFaces(all_faces.vertices)
+			self.__writeOwner(all_faces.owner, getOwnerNote(
+				num_cells=num_cells, num_faces=all_faces.getSize(), num_internal_faces=all_faces.neighbour.size
+			))
+			self.__writeNeighbour(all_faces.neighbour)
+
+			self.__writeBoundary(boundary_dict)
 
 		pass
-	
\ No newline at end of file
+
+class ZonesWriter :
+
+	def __init__(self, polyMesh_path: Path, overwrite: bool = False) :
+
+		assert polyMesh_path.exists() and polyMesh_path.is_dir(), \
+		f'PolyMesh_path {polyMesh_path} does not exist or is not a directory'
+
+		self.path_cellZones	= polyMesh_path / 'cellZones'
+		self.path_faceZones	= polyMesh_path / 'faceZones'
+		self.path_pointZones	= polyMesh_path / 'pointZones'
+
+		self.overwrite = overwrite
+
+		pass
+
+	def __writeZones(self, path: Path, zones: dict[str, list[tuple[str, str, np.ndarray]]]) -> None :
+		'''
+		Write zones to the zones file.
+		Every zone maps to its (keyword, type, values) lists,
+		e.g., ('cellLabels', 'List<label>', cell IDs).
+		'''
+
+		assert self.overwrite or not path.exists(), \
+		f'Zones file {path} already exists.'
+
+		header = PolyMeshFile.getPolyMeshHeader(
+			class_name='regIOobject',
+			object_name=path.name,
+			format='ascii',
+			foam_version='13',
+		)
+
+		with open(path, 'w') as f:
+
+			f.write(header)
+			f.write(f'{len(zones)}\n(\n')
+
+			for name, zone_lists in zones.items() :
+
+				f.write(f'{name}\n{{\n')
+				f.write(f'\ttype\t{path.name[:-1]};\n')
+
+				for keyword, list_type, values in zone_lists :
+
+					assert values.ndim == 1, \
+					f'{keyword} of zone {name} must be a 1D array, got {values.shape}'
+
+					f.write(f'{keyword}\t{list_type}\n{values.shape[0]}\n(\n')
+
+					np.savetxt(f, values, fmt='%d')
+
+					f.write(')\n;\n')
+
+				f.write('}\n')
+
+			f.write(')\n\n' + PolyMeshFile.file_EOF + '\n')
+
+		assert path.exists(), \
+		f'Zones file {path} was not created.'
+
+		pass
+
+	@Profiler.profiled
+	def writeCellZones(self, cell_zones: dict[str, np.ndarray]) -> None :
+		'''
+		Write the cell IDs of every zone to the cellZones file.
+		'''
+
+		self.__writeZones(self.path_cellZones, {
+			name : [('cellLabels', 'List<label>', cell_IDs)]
+			for name, cell_IDs in cell_zones.items()
+		})
+
+		pass
+
+	@Profiler.profiled
+	def writeFaceZones(self, face_zones: dict[str, tuple[np.ndarray, np.ndarray]]) -> None :
+		'''
+		Write the face IDs and the flip map of every zone to the faceZones file.
+		'''
+
+		for name, (face_IDs, flip_map) in face_zones.items() :
+
+			assert face_IDs.shape == flip_map.shape, \
+			f'Flip map of zone {name} does not match its faces'
+
+		self.__writeZones(self.path_faceZones, {
+			name : [
+				('faceLabels', 'List<label>', face_IDs),
+				('flipMap', 'List<bool>', flip_map.astype(int)),
+			]
+			for name, (face_IDs, flip_map) in face_zones.items()
+		})
+
+		pass
+
+	@Profiler.profiled
+	def writePointZones(self, point_zones: dict[str, np.ndarray]) -> None :
+		'''
+		Write the point IDs of every zone to the pointZones file.
+		'''
+
+		self.__writeZones(self.path_pointZones, {
+			name : [('pointLabels', 'List<label>', point_IDs)]
+			for name, point_IDs in point_zones.items()
+		})
+
+		pass
+
+def writePolyMesh(
+	hex_collection: ConnectedHexCollection,
+	polyMesh_path: Path,
+	incremental: bool = False,
+	topology_path: Path | None = None,
+) -> bool :
+	'''
+	Assign the cell and point IDs of the hex collection
+	and write the polyMesh along with its topology file.
+	If incremental is True and the topology file in the polyMesh directory
+	(or at topology_path) matches the topology fingerprint of the collection,
+	the stored cell and point IDs are reused
+	and only the points file is rewritten.
+	Return True if the topology was reused.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), \
+	f'Hex collection must be a ConnectedHexCollection, got {type(hex_collection)}'
+
+	assert polyMesh_path.exists() and polyMesh_path.is_dir(), \
+	f'PolyMesh_path {polyMesh_path} does not exist or is not a directory'
+
+	if topology_path is None : topology_path = polyMesh_path / topology_file_name
+
+	polyMesh_files = ('points', 'faces', 'owner', 'neighbour', 'boundary')
+
+	reuse_topology = incremental and \
+	all((polyMesh_path / name).exists() for name in polyMesh_files) and \
+	hex_collection.loadTopology(topology_path)
+
+	if not reuse_topology :
+
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+	points_writer = PointsWriter(polyMesh_path, overwrite=incremental)
+	points_writer.write(hex_collection.getPoints())
+
+	if not reuse_topology :
+
+		faces_writer = FacesWriter(polyMesh_path, overwrite=incremental, validation=hex_collection.validation)
+		faces_writer.write(hex_collection.getFaces())
+
+		hex_collection.saveTopology(topology_path)
+
+	return reuse_topology
@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection
+from pyFOAM_hexBlockMesh.Writer import ZonesWriter
+
+def _getBlockGroups(
+	hex_collection:ConnectedHexCollection,
+	block_groups:dict[str, list[int]]|None
+) -> dict[str, list[int]] :
+	'''
+	Get the hex block indices of every group, one group block_{i}
+	per hex block if block_groups is None
+	'''
+
+	if block_groups is None :
+
+		return {f'block_{i}' : [i] for i in range(len(hex_collection.hex_blocks))}
+
+	for name, hex_block_ids in block_groups.items() :
+
+		assert len(hex_block_ids) > 0, f'Zone {name} has no hex blocks'
+		assert all(i in range(len(hex_collection.hex_blocks)) for i in hex_block_ids), \
+		f'Invalid hex block indices of zone {name} : {hex_block_ids}'
+
+	return block_groups
+
+def getCellZones(
+	hex_collection:ConnectedHexCollection,
+	block_groups:dict[str, list[int]]|None=None
+) -> dict[str, np.ndarray] :
+	'''
+	Get the cell IDs of every group of hex blocks, by default
+	a zone block_{i} per hex block. The cell IDs must be assigned.
+	'''
+
+	return {
+		name : np.concatenate([
+			hex_collection.hex_blocks[i].cell_ID.ravel(order='F') for i in hex_block_ids
+		])
+		for name, hex_block_ids in _getBlockGroups(hex_collection, block_groups).items()
+	}
+
+def getPointZones(
+	hex_collection:ConnectedHexCollection,
+	block_groups:dict[str, list[int]]|None=None
+) -> dict[str, np.ndarray] :
+	'''
+	Get the sorted point IDs of every group of hex blocks, by default
+	a zone block_{i} per hex block. The point IDs must be assigned.
+	'''
+
+	return {
+		name : np.unique(np.concatenate([
+			hex_collection.hex_blocks[i].point_ID.ravel() for i in hex_block_ids
+		]))
+		for name, hex_block_ids in _getBlockGroups(hex_collection, block_groups).items()
+	}
+
+def getFaceZones(
+	hex_collection:ConnectedHexCollection,
+	interfaces:dict[str, list[tuple[int, int]]]
+) -> dict[str, tuple[np.ndarray, np.ndarray]] :
+	'''
+	Get the face IDs and the flip map of every zone of interfaces,
+	each a list of (hex block a, hex block b) pairs of connected hex blocks.
+	The face IDs index the faces written by FacesWriter from getFaces.
+	The flip map is False for faces pointing from hex block a into hex block b.
+	'''
+
+	face_ranges = hex_collection.getConnectionFaceRanges()
+
+	face_zones = {}
+
+	for name, block_pairs in interfaces.items() :
+
+		face_IDs	= []
+		flip_maps	= []
+
+		for hex_block_id_a, hex_block_id_b in block_pairs :
+
+			connections = [
+				(i, connect_info.hex_block_id_0 != hex_block_id_a)
+				for i, connect_info in enumerate(hex_collection.connect_infos)
+				if {connect_info.hex_block_id_0, connect_info.hex_block_id_1} == \
+				{hex_block_id_a, hex_block_id_b}
+			]
+
+			assert len(connections) > 0, \
+			f'Hex blocks {hex_block_id_a} and {hex_block_id_b} of zone {name} are not connected'
+
+			# Faces of a connection are owned by hex block 0 and point into hex block 1
+			for i, flip in connections :
+
+				start, end = face_ranges[i]
+
+				face_IDs.append(np.arange(start, end))
+				flip_maps.append(np.full(end - start, flip))
+
+		face_zones[name] = (np.concatenate(face_IDs), np.concatenate(flip_maps))
+
+	return face_zones
+
+def writeZones(
+	hex_collection:ConnectedHexCollection,
+	polyMesh_path:Path,
+	cell_zones:dict[str, list[int]]|None=None,
+	face_zones:dict[str, list[tuple[int, int]]]|None=None,
+	point_zones:dict[str, list[int]]|None=None,
+	overwrite:bool=False
+) -> None :
+	'''
+	Write the cellZones, faceZones and pointZones files of the polyMesh
+	written from the hex collection.
+	cell_zones and point_zones map the zone names to the hex block indices,
+	refer to getCellZones and getPointZones, and the cellZones file
+	is written with a zone per hex block if cell_zones is None.
+	face_zones maps the zone names to the pairs of connected hex blocks,
+	refer to getFaceZones. The faceZones and pointZones files are
+	written only if face_zones and point_zones are provided.
+	'''
+
+	assert isinstance(hex_collection, ConnectedHexCollection), \
+	f'Hex collection must be a ConnectedHexCollection, got {type(hex_collection)}'
+
+	zones_writer = ZonesWriter(polyMesh_path, overwrite)
+
+	zones_writer.writeCellZones(getCellZones(hex_collection, cell_zones))
+
+	if face_zones is not None :
+
+		zones_writer.writeFaceZones(getFaceZones(hex_collection, face_zones))
+
+	if point_zones is not None :
+
+		zones_writer.writePointZones(getPointZones(hex_collection, point_zones))
+
+	pass
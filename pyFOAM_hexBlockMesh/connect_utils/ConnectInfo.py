@@ -291,6 +291,9 @@ class ConnectInfo :
 		points_2 = \
 		hex_blocks[self.hex_block_id_1].getSurfacePointCoordinates(self.face_vertices_1)
 
+		# Faces with different number of points are not connected
+		if points_1.shape != points_2.shape : return False
+
 		return bool(np.isclose(points_1, points_2).all())
 	
 	def getFaces(self, hex_blocks:list[HexBlock]) -> NDFaceCollection :
@@ -0,0 +1,221 @@
+import numpy as np
+
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import face_axes
+
+def _checkCoordinates(coordinates:np.ndarray) -> None :
+	'''
+	Check if the (n0+1, n1+1, n2+1, 3) coordinates array is valid
+	'''
+
+	assert isinstance(coordinates, np.ndarray), 'Invalid input'
+	assert np.issubdtype(coordinates.dtype, np.floating), 'Invalid input'
+	assert coordinates.ndim == 4, 'Invalid input'
+	assert coordinates.shape[3] == 3, 'Invalid input'
+
+	pass
+
+def _getOutputArray(shape:tuple, out:np.ndarray|None) -> np.ndarray :
+	'''
+	Get an output array of the given shape,
+	reusing out if it is provided
+	'''
+
+	if out is None : return np.empty(shape, dtype=float)
+
+	assert isinstance(out, np.ndarray), 'Invalid output array'
+	assert out.dtype == float, 'Invalid output array'
+	assert out.shape == shape, \
+	f'Invalid output array shape. Expected {shape}, got {out.shape}'
+
+	return out
+
+def getCellCenters(
+	coordinates:np.ndarray,
+	out:np.ndarray|None=None
+) -> np.ndarray :
+	'''
+	Get the (n0, n1, n2, 3) average of the 8 corner points of every cell.
+	The corner views are accumulated in place into out,
+	which may be a view into a larger array.
+	'''
+
+	_checkCoordinates(coordinates)
+
+	cells_shape = tuple(n - 1 for n in coordinates.shape[:3])
+
+	cell_centers = _getOutputArray(cells_shape + (3,), out)
+
+	np.copyto(cell_centers, coordinates[:-1, :-1, :-1])
+
+	for corner in (
+		(slice(None, -1),	slice(None, -1),	slice(1, None)),
+		(slice(None, -1),	slice(1, None),		slice(None, -1)),
+		(slice(None, -1),	slice(1, None),		slice(1, None)),
+		(slice(1, None),	slice(None, -1),	slice(None, -1)),
+		(slice(1, None),	slice(None, -1),	slice(1, None)),
+		(slice(1, None),	slice(1, None),		slice(None, -1)),
+		(slice(1, None),	slice(1, None),		slice(1, None)),
+	) :
+
+		np.add(cell_centers, coordinates[corner], out=cell_centers)
+
+	cell_centers *= 0.125
+
+	return cell_centers
+
+def getFaceCentersAndAreas(
+	coordinates:np.ndarray,
+	axis:int
+) -> tuple[np.ndarray, np.ndarray] :
+	'''
+	Get the centers and area vectors of the faces normal to axis.
+	The arrays have the shape of the cells along the face axes
+	and the shape of the points along axis, e.g.,
+	(n0+1, n1, n2, 3) for axis 0.
+	The area vectors point along the positive axis
+	for right handed coordinates.
+	Follows the triangle decomposition used by OpenFOAM
+	in primitiveMesh::makeFaceCentresAndAreas.
+	'''
+
+	_checkCoordinates(coordinates)
+	assert axis in range(3), 'Invalid axis'
+
+	axis_0, axis_1 = face_axes[axis]
+
+	# View with the face normal axis first
+	points = np.moveaxis(coordinates, (axis, axis_0, axis_1), (0, 1, 2))
+
+	# Vertices of the faces ordered anti-clockwise
+	# about the positive axis
+	face_points = (
+		points[:, :-1, :-1],
+		points[:, 1:, :-1],
+		points[:, 1:, 1:],
+		points[:, :-1, 1:],
+	)
+
+	# Estimated face centers
+	face_centers_estimate = face_points[0] + face_points[1]
+	face_centers_estimate += face_points[2]
+	face_centers_estimate += face_points[3]
+	face_centers_estimate *= 0.25
+
+	sum_areas		= np.zeros(face_centers_estimate.shape[:3])
+	sum_area_vectors	= np.zeros_like(face_centers_estimate)
+	sum_area_centers	= np.zeros_like(face_centers_estimate)
+
+	for i in range(4) :
+
+		point_0 = face_points[i]
+		point_1 = face_points[(i + 1) % 4]
+
+		triangle_area_vectors = np.cross(
+			point_1 - point_0,
+			face_centers_estimate - point_0
+		)
+		triangle_areas = np.linalg.norm(triangle_area_vectors, axis=-1)
+
+		sum_area_vectors += triangle_area_vectors
+		sum_areas += triangle_areas
+
+		sum_area_centers += triangle_areas[..., np.newaxis] * \
+		(point_0 + point_1 + face_centers_estimate)
+
+	# Degenerate faces fall back on the estimated face centers
+	degenerate = sum_areas <= np.finfo(float).tiny
+
+	sum_areas[degenerate] = 1.0
+	sum_area_centers[degenerate] = 3.0 * face_centers_estimate[degenerate]
+
+	face_centers = sum_area_centers / (3.0 * sum_areas[..., np.newaxis])
+	face_areas = 0.5 * sum_area_vectors
+
+	face_centers	= np.moveaxis(face_centers, (0, 1, 2), (axis, axis_0, axis_1))
+	face_areas	= np.moveaxis(face_areas, (0, 1, 2), (axis, axis_0, axis_1))
+
+	return face_centers, face_areas
+
+def _getAxisSlices(axis:int) -> tuple[tuple, tuple] :
+	'''
+	Get the slices to obtain the lower and upper faces of cells
+	from an array of faces normal to axis
+	'''
+
+	lower = [slice(None)] * 3
+	upper = [slice(None)] * 3
+
+	lower[axis] = slice(None, -1)
+	upper[axis] = slice(1, None)
+
+	return tuple(lower), tuple(upper)
+
+def getCellVolumesAndCentroids(
+	coordinates:np.ndarray,
+	out:np.ndarray|None=None,
+	face_geometry:tuple|None=None
+) -> tuple[np.ndarray, np.ndarray] :
+	'''
+	Get the (n0, n1, n2) volumes and (n0, n1, n2, 3) volume weighted
+	centroids of the cells.
+	Follows the pyramid decomposition used by OpenFOAM
+	in primitiveMesh::makeCellCentresAndVols.
+	The centroids are written into out if it is provided.
+	face_geometry is an optional tuple of the 3 (centers, areas) pairs
+	returned by getFaceCentersAndAreas for the 3 axes.
+	'''
+
+	_checkCoordinates(coordinates)
+
+	cells_shape = tuple(n - 1 for n in coordinates.shape[:3])
+
+	centroids = _getOutputArray(cells_shape + (3,), out)
+
+	if face_geometry is None :
+
+		face_geometry = tuple(
+			getFaceCentersAndAreas(coordinates, axis) for axis in range(3)
+		)
+
+	assert len(face_geometry) == 3, 'Invalid face geometry'
+
+	# Estimated cell centers are the average of the face centers
+	centers_estimate = np.zeros(cells_shape + (3,))
+
+	for axis, (face_centers, _) in enumerate(face_geometry) :
+
+		lower, upper = _getAxisSlices(axis)
+
+		centers_estimate += face_centers[lower]
+		centers_estimate += face_centers[upper]
+
+	centers_estimate /= 6.0
+
+	# 3 times the volumes of the pyramids formed by the faces
+	# and the estimated cell centers
+	volumes = np.zeros(cells_shape)
+	centroids.fill(0.0)
+
+	for axis, (face_centers, face_areas) in enumerate(face_geometry) :
+
+		# Area vectors of the lower faces point into the cells
+		for face_slice, sign in zip(_getAxisSlices(axis), (-1.0, 1.0)) :
+
+			pyramid_volumes = np.sum(
+				face_areas[face_slice] * \
+				(face_centers[face_slice] - centers_estimate),
+				axis=-1
+			)
+			pyramid_volumes *= sign
+
+			volumes += pyramid_volumes
+
+			centroids += pyramid_volumes[..., np.newaxis] * face_centers[face_slice]
+
+	# Pyramid centroids are 3/4 of the way from the apex to the base
+	centroids *= 0.75 / volumes[..., np.newaxis]
+	centroids += 0.25 * centers_estimate
+
+	volumes /= 3.0
+
+	return volumes, centroids
@@ -1,29 +1,109 @@
 import numpy as np
 
-def checkCoordinatesOrientation(
-	coordinates:np.ndarray
-	) -> bool :
+# Maximum number of cells evaluated at once by getCellJacobianInfo
+# Bounds the size of the temporary arrays to a few tens of MB
+default_chunk_size = 2**18
+
+def _getTripleProduct(
+	a:np.ndarray,
+	b:np.ndarray,
+	c:np.ndarray
+) -> np.ndarray :
 	'''
-	Check if the coordinates are oriented correctly.
-	Coordinates are considered to have a right handed orientation
-	if the volume is positive.
+	Get the triple product a . (b x c) of (..., 3) arrays
+	written out component-wise
+	'''
+
+	triple_product	=  a[..., 0] * (b[..., 1] * c[..., 2] - b[..., 2] * c[..., 1])
+	triple_product	+= a[..., 1] * (b[..., 2] * c[..., 0] - b[..., 0] * c[..., 2])
+	triple_product	+= a[..., 2] * (b[..., 0] * c[..., 1] - b[..., 1] * c[..., 0])
+
+	return triple_product
+
+def _getChunkMinimumJacobians(coordinates:np.ndarray) -> np.ndarray :
+	'''
+	Get the minimum of the Jacobians at the 8 corners
+	of every cell in the (m0+1, m1+1, m2+1, 3) coordinates array.
+	Returns a (m0, m1, m2) array.
+	'''
+
+	# Edges along each axis
+	# At every corner of a cell, the 3 edges meeting at the corner
+	# oriented along the positive axes give the Jacobian at the corner
+	edges_0 = coordinates[1:, :, :] - coordinates[:-1, :, :]
+	edges_1 = coordinates[:, 1:, :] - coordinates[:, :-1, :]
+	edges_2 = coordinates[:, :, 1:] - coordinates[:, :, :-1]
+
+	m0, m1, m2 = edges_0.shape[0], edges_1.shape[1], edges_2.shape[2]
+
+	minimum_jacobians = np.full((m0, m1, m2), np.inf)
+
+	# (a, b, c) is the corner of the cell along axes 0, 1, 2
+	for a in range(2) :
+		for b in range(2) :
+			for c in range(2) :
+
+				jacobians = _getTripleProduct(
+					edges_0[:, b:b+m1, c:c+m2],
+					edges_1[a:a+m0, :, c:c+m2],
+					edges_2[a:a+m0, b:b+m1, :]
+				)
+
+				# np.minimum propagates NaN Jacobians
+				# so that they are reported as inverted
+				np.minimum(minimum_jacobians, jacobians, out=minimum_jacobians)
+
+	return minimum_jacobians
+
+def getCellJacobianInfo(
+	coordinates:np.ndarray,
+	chunk_size:int=default_chunk_size
+) -> tuple[float, np.ndarray] :
+	'''
+	Evaluate the Jacobian (triple product of the edges) at all 8 corners
+	of every cell, chunk_size cells at a time.
+	Return the minimum Jacobian and the (N, 3) indices of the inverted cells,
+	i.e., cells whose Jacobian is not positive at any of the corners.
 	'''
 
 	assert isinstance(coordinates, np.ndarray), 'Invalid input'
 	assert np.issubdtype(coordinates.dtype, np.floating), 'Invalid input'
 	assert coordinates.ndim == 4, 'Invalid input'
 	assert coordinates.shape[3] == 3, 'Invalid input'
+	assert isinstance(chunk_size, int) and chunk_size > 0, 'Invalid chunk size'
+
+	n0, n1, n2 = (n - 1 for n in coordinates.shape[:3])
+
+	# Number of layers of cells along axis 0 evaluated at once
+	chunk_layers = max(1, chunk_size // max(1, n1 * n2))
+
+	minimum_jacobian = np.inf
+	inverted_cells = [np.zeros((0, 3), dtype=int)]
+
+	for i in range(0, n0, chunk_layers) :
+
+		i_end = min(i + chunk_layers, n0)
+
+		minimum_jacobians = _getChunkMinimumJacobians(coordinates[i:i_end+1])
+
+		minimum_jacobian = np.minimum(minimum_jacobian, minimum_jacobians.min())
+
+		chunk_inverted_cells = np.argwhere(~(minimum_jacobians > 0))
+		chunk_inverted_cells[:, 0] += i
 
-	increments_x = coordinates[1:, :-1, :-1] - coordinates[:-1, :-1, :-1]
-	increments_y = coordinates[:-1, 1:, :-1] - coordinates[:-1, :-1, :-1]
-	increments_z = coordinates[:-1, :-1, 1:] - coordinates[:-1, :-1, :-1]
+		inverted_cells.append(chunk_inverted_cells)
+
+	return float(minimum_jacobian), np.concatenate(inverted_cells, axis=0)
+
+def checkCoordinatesOrientation(
+	coordinates:np.ndarray
+	) -> bool :
+	'''
+	Check if the coordinates are oriented correctly.
+	Coordinates are considered to have a right handed orientation
+	if the volume is positive at all 8 corners of every cell.
+	'''
 
-	volume_determinant = np.linalg.det(
-		np.stack((
-			increments_x,
-			increments_y,
-			increments_z
-		), axis=-1)
-	)
+	_, inverted_cells = getCellJacobianInfo(coordinates)
 
-	return bool(np.all(volume_determinant > 0))
+	return inverted_cells.shape[0] == 0
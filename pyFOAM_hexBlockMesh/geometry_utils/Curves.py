@@ -0,0 +1,176 @@
+from typing import Callable
+
+import numpy as np
+
+# Curves map (m,) parameters in [0, 1] to (m, 3) points,
+# the layout of the curves accepted by Grading.getGradedEdges
+Curve = Callable[[np.ndarray], np.ndarray]
+
+def _snapEnds(parameters:np.ndarray, points:np.ndarray, start:np.ndarray, end:np.ndarray) -> np.ndarray :
+	'''
+	Set the points at the parameters 0 and 1 exactly to the start and end
+	'''
+
+	points[parameters == 0.0] = start
+	points[parameters == 1.0] = end
+
+	return points
+
+def getArcCurve(start:np.ndarray, end:np.ndarray, point:np.ndarray) -> Curve :
+	'''
+	Get the circular arc from start to end through point,
+	parametrized uniformly by the angle
+	'''
+
+	start	= np.asarray(start, dtype=float)
+	end	= np.asarray(end, dtype=float)
+	point	= np.asarray(point, dtype=float)
+
+	a = start - point
+	b = end - point
+
+	a_cross_b = np.cross(a, b)
+	norm_squared = np.dot(a_cross_b, a_cross_b)
+
+	assert norm_squared > 1e-24 * np.dot(a, a) * np.dot(b, b), \
+	f'Points {start}, {point}, {end} of the arc are collinear'
+
+	# Circumcenter of the 3 points
+	center = point + np.cross(np.dot(a, a) * b - np.dot(b, b) * a, a_cross_b) / (2.0 * norm_squared)
+
+	radius = np.linalg.norm(start - center)
+
+	# The arc turns from start through point to end about the normal
+	normal = np.cross(point - start, end - point)
+	normal /= np.linalg.norm(normal)
+
+	e_1 = (start - center) / radius
+	e_2 = np.cross(normal, e_1)
+
+	end_angle = np.arctan2(np.dot(end - center, e_2), np.dot(end - center, e_1))
+
+	if end_angle <= 0.0 : end_angle += 2.0 * np.pi
+
+	def curve(parameters:np.ndarray) -> np.ndarray :
+
+		angles = np.asarray(parameters, dtype=float)[:, np.newaxis] * end_angle
+
+		points = center + radius * (np.cos(angles) * e_1 + np.sin(angles) * e_2)
+
+		return _snapEnds(np.asarray(parameters), points, start, end)
+
+	return curve
+
+def getOriginArcCurve(start:np.ndarray, end:np.ndarray, origin:np.ndarray) -> Curve :
+	'''
+	Get the arc from start to end about the origin, shorter than a half circle.
+	The radius varies linearly if start and end
+	are at different distances from the origin.
+	'''
+
+	start	= np.asarray(start, dtype=float)
+	end	= np.asarray(end, dtype=float)
+	origin	= np.asarray(origin, dtype=float)
+
+	radius_0 = np.linalg.norm(start - origin)
+	radius_1 = np.linalg.norm(end - origin)
+
+	assert radius_0 > 0 and radius_1 > 0, 'Arc ends at its origin'
+
+	e_1 = (start - origin) / radius_0
+	direction = (end - origin) / radius_1
+
+	normal = np.cross(e_1, direction)
+	normal_norm = np.linalg.norm(normal)
+
+	assert normal_norm > 1e-12, \
+	f'Arc from {start} to {end} about {origin} is not unique'
+
+	e_2 = np.cross(normal / normal_norm, e_1)
+
+	end_angle = np.arctan2(normal_norm, np.dot(e_1, direction))
+
+	def curve(parameters:np.ndarray) -> np.ndarray :
+
+		parameters = np.asarray(parameters, dtype=float)[:, np.newaxis]
+
+		angles = parameters * end_angle
+		radii = radius_0 + parameters * (radius_1 - radius_0)
+
+		points = origin + radii * (np.cos(angles) * e_1 + np.sin(angles) * e_2)
+
+		return _snapEnds(parameters[:, 0], points, start, end)
+
+	return curve
+
+def getSplineCurve(points:np.ndarray) -> Curve :
+	'''
+	Get the Catmull-Rom spline through the (k+1, 3) points,
+	with k segments of equal parameter length
+	'''
+
+	points = np.asarray(points, dtype=float)
+
+	assert points.ndim == 2 and points.shape[0] >= 2 and points.shape[1] == 3, \
+	'Invalid spline points'
+
+	num_segments = points.shape[0] - 1
+
+	# Points reflected across the ends give the tangents at the ends
+	extended_points = np.concatenate((
+		[2.0 * points[0] - points[1]],
+		points,
+		[2.0 * points[-1] - points[-2]]
+	))
+
+	def curve(parameters:np.ndarray) -> np.ndarray :
+
+		parameters = np.asarray(parameters, dtype=float)
+
+		segments = np.minimum((parameters * num_segments).astype(int), num_segments - 1)
+
+		u = (parameters * num_segments - segments)[:, np.newaxis]
+
+		p_0 = extended_points[segments]
+		p_1 = extended_points[segments + 1]
+		p_2 = extended_points[segments + 2]
+		p_3 = extended_points[segments + 3]
+
+		curve_points = 0.5 * (
+			2.0 * p_1 +
+			(p_2 - p_0) * u +
+			(2.0 * p_0 - 5.0 * p_1 + 4.0 * p_2 - p_3) * u**2 +
+			(3.0 * p_1 - p_0 - 3.0 * p_2 + p_3) * u**3
+		)
+
+		return _snapEnds(parameters, curve_points, points[0], points[-1])
+
+	return curve
+
+def getPolyLineCurve(points:np.ndarray) -> Curve :
+	'''
+	Get the polyline through the (k+1, 3) points parametrized by its length
+	'''
+
+	points = np.asarray(points, dtype=float)
+
+	assert points.ndim == 2 and points.shape[0] >= 2 and points.shape[1] == 3, \
+	'Invalid polyline points'
+
+	lengths = np.zeros(points.shape[0])
+	np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=-1), out=lengths[1:])
+
+	assert lengths[-1] > 0, 'Polyline has no length'
+
+	lengths /= lengths[-1]
+
+	def curve(parameters:np.ndarray) -> np.ndarray :
+
+		parameters = np.asarray(parameters, dtype=float)
+
+		return np.stack(
+			[np.interp(parameters, lengths, points[:, i]) for i in range(3)],
+			axis=-1
+		)
+
+	return curve
@@ -0,0 +1,225 @@
+from typing import Callable
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_connectivity
+
+# Number of samples per cell used to invert the arc length of curved edges
+curve_samples_per_cell = 16
+
+def getSectionDistribution(n:int, expansion_ratio:float) -> np.ndarray :
+	'''
+	Get the (n+1,) positions in [0, 1] of the points dividing [0, 1]
+	into n cells, with the ratio of the last to the first cell size
+	equal to expansion_ratio, as in blockMesh.
+	'''
+
+	assert isinstance(n, (int, np.integer)) and n > 0, 'Invalid number of cells'
+	assert expansion_ratio > 0, 'Expansion ratio must be positive'
+
+	# Ratio of the sizes of consecutive cells
+	log_cell_ratio = np.log(expansion_ratio) / (n - 1) if n > 1 else 0.0
+
+	if abs(log_cell_ratio) < 1e-12 : return np.linspace(0.0, 1.0, n + 1)
+
+	# (1 - r^i) / (1 - r^n) evaluated without cancellation
+	distribution = np.expm1(np.arange(n + 1) * log_cell_ratio)
+	distribution /= distribution[-1]
+
+	distribution[0] = 0.0
+	distribution[-1] = 1.0
+
+	return distribution
+
+def getGradingDistribution(n:int, grading:float|list) -> np.ndarray :
+	'''
+	Get the (n+1,) positions in [0, 1] of the points along an edge of n cells.
+	grading is either an expansion ratio, or a list of sections
+	(length fraction, cells fraction, expansion ratio) as in
+	the multi-grading of blockMesh. The fractions are normalized.
+	'''
+
+	if np.isscalar(grading) : return getSectionDistribution(n, float(grading))
+
+	sections = np.array(grading, dtype=float)
+
+	assert sections.ndim == 2 and sections.shape[1] == 3, \
+	f'Invalid grading {grading}'
+	assert np.all(sections[:, :2] > 0), f'Invalid grading {grading}'
+
+	length_fractions	= sections[:, 0] / sections[:, 0].sum()
+	cells_fractions		= sections[:, 1] / sections[:, 1].sum()
+
+	# Number of cells in every section, the last section takes the remainder
+	# Every section has at least 1 cell
+	section_cells = np.maximum(1, np.round(cells_fractions * n).astype(int))
+	section_cells[-1] = n - section_cells[:-1].sum()
+
+	assert section_cells[-1] > 0, \
+	f'Too few cells ({n}) for the {len(sections)} sections of the grading'
+
+	section_starts = np.concatenate(([0.0], np.cumsum(length_fractions)))
+
+	distribution = [np.zeros(1)]
+
+	for i in range(len(sections)) :
+
+		section_distribution = getSectionDistribution(int(section_cells[i]), sections[i, 2])
+
+		distribution.append(
+			section_starts[i] + length_fractions[i] * section_distribution[1:]
+		)
+
+	distribution = np.concatenate(distribution)
+	distribution[-1] = 1.0
+
+	return distribution
+
+def reverseGrading(grading:float|list) -> float|list :
+	'''
+	Get the grading of the edge traversed in the opposite direction
+	'''
+
+	if np.isscalar(grading) : return 1.0 / float(grading)
+
+	return [
+		(length_fraction, cells_fraction, 1.0 / expansion_ratio)
+		for length_fraction, cells_fraction, expansion_ratio in reversed(grading)
+	]
+
+def getEdgeGradings(grading:float|list|tuple) -> dict :
+	'''
+	Get the grading of every edge (v0, v1) in vertex_connectivity.
+	grading is either
+	a single grading for all the edges,
+	a sequence of 3 gradings along the 3 axes (simpleGrading), or
+	a sequence of 12 gradings in the order of vertex_connectivity (edgeGrading).
+	Every grading is an expansion ratio or a list of sections,
+	refer to getGradingDistribution.
+	'''
+
+	if np.isscalar(grading) :
+
+		return {edge : grading for edge in vertex_connectivity}
+
+	assert len(grading) in (3, 12), \
+	f'Grading must have 3 or 12 entries, got {len(grading)}'
+
+	if len(grading) == 3 :
+
+		return {edge : grading[axis] for edge, axis in vertex_connectivity.items()}
+
+	return {edge : grading[i] for i, edge in enumerate(vertex_connectivity)}
+
+def getCurvePoints(
+	curve:Callable[[np.ndarray], np.ndarray],
+	distribution:np.ndarray
+) -> np.ndarray :
+	'''
+	Get the points along a curve at the fractions of its arc length
+	given by distribution.
+	curve maps (m,) parameters in [0, 1] to (m, 3) points.
+	The arc length is inverted by linear interpolation of
+	curve_samples_per_cell samples per cell.
+	'''
+
+	num_samples = curve_samples_per_cell * (distribution.shape[0] - 1) + 1
+
+	parameters = np.linspace(0.0, 1.0, num_samples)
+	samples = np.asarray(curve(parameters), dtype=float)
+
+	assert samples.shape == (num_samples, 3), 'Invalid curve'
+
+	arc_lengths = np.zeros(num_samples)
+	np.cumsum(np.linalg.norm(np.diff(samples, axis=0), axis=-1), out=arc_lengths[1:])
+
+	if arc_lengths[-1] > 0 : arc_lengths /= arc_lengths[-1]
+	else : arc_lengths = parameters
+
+	curve_parameters = np.interp(distribution, arc_lengths, parameters)
+
+	points = np.asarray(curve(curve_parameters), dtype=float)
+
+	return points
+
+def getGradedEdges(
+	shape:tuple[int, int, int],
+	vertices:np.ndarray,
+	grading:float|list|tuple=1.0,
+	curves:dict|None=None
+) -> dict :
+	'''
+	Get the (n+1, 3) points along the 12 edges (v0, v1) of a block
+	of shape (n0, n1, n2) cells, in the layout accepted by
+	TransfiniteInterpolation.getTransfiniteInterpolation.
+	vertices:	(8, 3) coordinates of the vertices of the block
+	grading:	Refer to getEdgeGradings
+	curves:		Dictionary mapping (v0, v1) to a function mapping
+			(m,) parameters in [0, 1] to (m, 3) points from v0 to v1.
+			Edges without a curve are straight lines.
+	Straight edges are always evaluated from the vertex with the
+	lexicographically smaller coordinates, so that an edge shared by
+	hex blocks with the same physical grading has identical points
+	in all of them, whichever direction it is traversed in.
+	'''
+
+	vertices = np.asarray(vertices, dtype=float)
+	assert vertices.shape == (8, 3), 'Invalid vertices'
+
+	if curves is None : curves = {}
+
+	edge_gradings = getEdgeGradings(grading)
+
+	# Curves keyed by the edges along the positive axes
+	edge_curves = {}
+
+	for (v0, v1), curve in curves.items() :
+
+		if (v0, v1) in vertex_connectivity :
+
+			edge_curves[(v0, v1)] = curve
+
+		else :
+
+			assert (v1, v0) in vertex_connectivity, \
+			f'Vertices {v0} and {v1} are not connected'
+
+			edge_curves[(v1, v0)] = lambda t, curve=curve : curve(1.0 - t)
+
+	edges = {}
+
+	for (v0, v1), axis in vertex_connectivity.items() :
+
+		n = shape[axis]
+		edge_grading = edge_gradings[(v0, v1)]
+
+		if (v0, v1) in edge_curves :
+
+			distribution = getGradingDistribution(n, edge_grading)
+
+			edges[(v0, v1)] = getCurvePoints(edge_curves[(v0, v1)], distribution)
+
+			continue
+
+		start, end = vertices[v0], vertices[v1]
+
+		if tuple(end) < tuple(start) :
+
+			# Evaluate the reversed edge and flip it
+			distribution = getGradingDistribution(n, reverseGrading(edge_grading))
+
+			points = end + distribution[:, np.newaxis] * (start - end)
+			points[-1] = start
+
+			edges[(v0, v1)] = points[::-1]
+
+		else :
+
+			distribution = getGradingDistribution(n, edge_grading)
+
+			points = start + distribution[:, np.newaxis] * (end - start)
+			points[-1] = end
+
+			edges[(v0, v1)] = points
+
+	return edges
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 
 import numpy as np
 
+import pyFOAM_hexBlockMesh.Validation as Validation
+
 from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map, vertex_connectivity
 
 def verticesShareFaceAlongAxis(vertices:tuple[int, int, int, int], axis:int) -> bool :
@@ -62,7 +64,7 @@ class Slice3D :
 
 		# Check if the input is valid
 		assert isinstance(points, np.ndarray)
-		assert self.isValid(), 'Invalid slice'
+		assert not Validation.isStrict() or self.isValid(), 'Invalid slice'
 		assert points.ndim >= 3, 'Invalid input'
 
 		# Get the array view of the points array
@@ -0,0 +1,89 @@
+import numpy as np
+
+def getFactors(factors:int|tuple[int, int, int]) -> tuple[int, int, int] :
+	'''
+	Get the factors along the 3 axes from
+	a single factor or a sequence of 3 factors
+	'''
+
+	if np.isscalar(factors) : factors = (factors, factors, factors)
+
+	assert len(factors) == 3, f'Invalid factors {factors}'
+	assert all(isinstance(f, (int, np.integer)) and f > 0 for f in factors), \
+	f'Factors must be positive integers, got {factors}'
+
+	return tuple(int(f) for f in factors)
+
+def getRefinedCoordinates(
+	coordinates:np.ndarray,
+	factors:int|tuple[int, int, int]
+) -> np.ndarray :
+	'''
+	Get the (f0*n0+1, f1*n1+1, f2*n2+1, 3) coordinates of the points
+	of a hex block with every cell of the (n0+1, n1+1, n2+1, 3) coordinates
+	subdivided into f0 x f1 x f2 cells.
+	The new points are interpolated linearly in index space along every axis,
+	hence the points on a face depend only on the points on the face,
+	and the original points are retained.
+	'''
+
+	factors = getFactors(factors)
+
+	assert coordinates.ndim == 4 and coordinates.shape[-1] == 3, 'Invalid coordinates'
+
+	refined_coordinates = coordinates
+
+	for axis, factor in enumerate(factors) :
+
+		if factor == 1 : continue
+
+		n = refined_coordinates.shape[axis] - 1
+
+		# Index of the start point and the weight of the end point for every new point
+		# The original points have zero weight, so they are retained exactly
+		positions	= np.arange(factor * n + 1) / factor
+		indices		= positions.astype(int)
+		weights		= positions - indices
+
+		weights_shape = [1, 1, 1, 1]
+		weights_shape[axis] = -1
+		weights = weights.reshape(weights_shape)
+
+		start	= np.take(refined_coordinates, indices, axis=axis)
+		end	= np.take(refined_coordinates, np.minimum(indices + 1, n), axis=axis)
+
+		# start + w * (end - start), in place
+		end -= start
+		end *= weights
+		end += start
+
+		refined_coordinates = end
+
+	if refined_coordinates is coordinates : refined_coordinates = coordinates.copy()
+
+	return refined_coordinates
+
+def getCoarsenedCoordinates(
+	coordinates:np.ndarray,
+	factors:int|tuple[int, int, int]
+) -> np.ndarray :
+	'''
+	Get the (n0/f0+1, n1/f1+1, n2/f2+1, 3) coordinates of the points
+	of a hex block with every f0 x f1 x f2 cells of the (n0+1, n1+1, n2+1, 3)
+	coordinates merged into one cell.
+	The number of cells along every axis must be divisible by its factor.
+	'''
+
+	factors = getFactors(factors)
+
+	assert coordinates.ndim == 4 and coordinates.shape[-1] == 3, 'Invalid coordinates'
+
+	for axis, factor in enumerate(factors) :
+
+		assert (coordinates.shape[axis] - 1) % factor == 0, \
+		f'{coordinates.shape[axis] - 1} cells along axis {axis} ' \
+		f'are not divisible by {factor}'
+
+	f0, f1, f2 = factors
+
+	return coordinates[::f0, ::f1, ::f2].copy()
@@ -0,0 +1,427 @@
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.HexBlockVertices as HexBlockVertices
+
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import \
+vertex_map, vertex_connectivity, hex_face_vertices
+
+# Maximum number of points interpolated at once
+# Bounds the size of the temporary arrays
+default_chunk_size = 2**18
+
+def getCanonicalEdge(v0:int, v1:int) -> tuple[tuple[int, int], bool] :
+	'''
+	Get the key of the edge v0 -> v1 in vertex_connectivity,
+	i.e., the edge oriented along the positive axis,
+	and whether the edge v0 -> v1 is reversed with respect to it
+	'''
+
+	if (v0, v1) in vertex_connectivity : return (v0, v1), False
+	if (v1, v0) in vertex_connectivity : return (v1, v0), True
+
+	raise ValueError(f'Vertices {v0} and {v1} are not connected')
+
+def getEdgeParameters(edge_points:np.ndarray) -> np.ndarray :
+	'''
+	Get the normalized arc length of the (n+1, 3) points along an edge
+	'''
+
+	arc_lengths = np.zeros(edge_points.shape[0])
+	np.cumsum(
+		np.linalg.norm(np.diff(edge_points, axis=0), axis=-1),
+		out=arc_lengths[1:]
+	)
+
+	# Collapsed edges are parametrized uniformly
+	if arc_lengths[-1] <= 0 : return np.linspace(0.0, 1.0, edge_points.shape[0])
+
+	return arc_lengths / arc_lengths[-1]
+
+def _getIndexFractions(n:int) -> np.ndarray :
+	'''
+	Get the (2, n+1) linear weights of the start and end of an axis
+	'''
+
+	s = np.linspace(0.0, 1.0, n + 1)
+
+	return np.stack((1.0 - s, s))
+
+def _getVertexIndex(a:int, b:int, c:int) -> int :
+	'''
+	Get the vertex at the corner (a, b, c) of the block,
+	where a, b, c are 0 at the start and 1 at the end of the axes
+	'''
+
+	return vertex_map.index(tuple(-x for x in (a, b, c)))
+
+def _getAxisEdges(axis:int) -> dict :
+	'''
+	Get the edges along axis keyed by the corner (a, b, c)
+	of their start vertex, with the corner along axis set to 0
+	'''
+
+	edges = {}
+
+	for (v0, v1), edge_axis in vertex_connectivity.items() :
+
+		if edge_axis != axis : continue
+
+		corner = tuple(-x for x in vertex_map[v0])
+		edges[corner] = (v0, v1)
+
+	return edges
+
+def getTransfiniteInterpolation(
+	shape:tuple[int, int, int],
+	vertices:np.ndarray,
+	edges:dict|None=None,
+	faces:dict|None=None,
+	out:np.ndarray|None=None,
+	chunk_size:int=default_chunk_size
+) -> np.ndarray :
+	'''
+	Get the (n0+1, n1+1, n2+1, 3) coordinates of the points of a block
+	with shape (n0, n1, n2) cells by 3D transfinite interpolation.
+	vertices:	(8, 3) coordinates of the vertices of the block
+	edges:		Dictionary mapping (v0, v1) to the (n+1, 3) points
+			along the edge from v0 to v1, including the vertices
+	faces:		Dictionary mapping 4 face vertices to the points on the face,
+			including the edges, in the layout of
+			HexBlock.getSurfacePointCoordinates for the same vertices
+	Edges that are not given are taken from the given faces,
+	or are straight lines with uniformly distributed points.
+	Faces that are not given are interpolated from their edges.
+	The coordinates are written into out if it is provided,
+	chunk_size points at a time.
+	'''
+
+	assert len(shape) == 3 and all(isinstance(n, int) and n > 0 for n in shape), \
+	'Invalid shape'
+
+	vertices = np.asarray(vertices, dtype=float)
+	assert vertices.shape == (8, 3), 'Invalid vertices'
+
+	if edges is None : edges = {}
+	if faces is None : faces = {}
+
+	assert isinstance(edges, dict), 'Invalid edges'
+	assert isinstance(faces, dict), 'Invalid faces'
+	assert isinstance(chunk_size, int) and chunk_size > 0, 'Invalid chunk size'
+
+	points_shape = tuple(n + 1 for n in shape)
+
+	if out is None : out = np.empty(points_shape + (3,), dtype=float)
+
+	assert isinstance(out, np.ndarray) and out.dtype == float, 'Invalid output array'
+	assert out.shape == points_shape + (3,), 'Invalid output array shape'
+
+	# Write the given faces into the output array
+	# to reorder them along the positive axes
+	for face_vertices, face_points in faces.items() :
+
+		face_slice = HexBlockVertices.getSurfaceCompleteSlice(tuple(face_vertices))
+		face_view = face_slice.getArrayView(out)
+
+		assert face_view.shape == np.shape(face_points), \
+		f'Invalid shape of face {face_vertices}. ' \
+		f'Expected {face_view.shape}, got {np.shape(face_points)}'
+
+		face_view[...] = face_points
+
+	given_faces = [
+		tuple(hex_face_vertices[i]) for i in range(6)
+		if any(set(face_vertices) == set(hex_face_vertices[i]) for face_vertices in faces)
+	]
+
+	# Edges along the positive axes
+	edge_points = {}
+
+	for (v0, v1), points in edges.items() :
+
+		key, reversed_edge = getCanonicalEdge(v0, v1)
+
+		points = np.asarray(points, dtype=float)
+		if reversed_edge : points = points[::-1]
+
+		assert points.shape == (points_shape[vertex_connectivity[key]], 3), \
+		f'Invalid shape of edge {(v0, v1)}'
+
+		edge_points[key] = points
+
+	for key, axis in vertex_connectivity.items() :
+
+		if key in edge_points : continue
+
+		if any(set(key) <= set(face_vertices) for face_vertices in given_faces) :
+
+			# Take the edge from a given face
+			slice_3d = HexBlockVertices.getEdgeInteriorSlice(*key)
+			slice_3d.slices[0] = slice(None)
+
+			edge_points[key] = slice_3d.getArrayView(out).copy()
+
+		else :
+
+			edge_points[key] = np.linspace(
+				vertices[key[0]], vertices[key[1]], points_shape[axis]
+			)
+
+	for key, points in edge_points.items() :
+
+		assert np.allclose(points[0], vertices[key[0]]) and \
+		np.allclose(points[-1], vertices[key[1]]), \
+		f'Edge {key} does not end at its vertices'
+
+	# Edges and their parameters along each axis keyed by the corner
+	axis_edges = [
+		{
+			corner : edge_points[key]
+			for corner, key in _getAxisEdges(axis).items()
+		}
+		for axis in range(3)
+	]
+
+	axis_parameters = [
+		{
+			corner : getEdgeParameters(points)
+			for corner, points in axis_edges[axis].items()
+		}
+		for axis in range(3)
+	]
+
+	index_fractions = [_getIndexFractions(n) for n in shape]
+
+	# Faces normal to each axis at the start and end of the axis
+	# with the points ordered along the remaining axes in increasing order
+	axis_faces = []
+
+	for axis in range(3) :
+
+		axis_faces.append([])
+
+		for end in range(2) :
+
+			face_slice = [slice(None)] * 3
+			face_slice[axis] = -end
+
+			face_vertices = [
+				_getVertexIndex(*corner) for corner in
+				(
+					(a, b, c) for a in range(2) for b in range(2) for c in range(2)
+				)
+				if corner[axis] == end
+			]
+
+			if any(set(face_vertices) == set(f) for f in given_faces) :
+
+				face_points = out[tuple(face_slice)].copy()
+
+			else :
+
+				face_points = _getFaceInterpolation(
+					axis, end, points_shape, vertices, axis_edges, index_fractions
+				)
+
+			axis_faces[axis].append(face_points)
+
+	n1, n2 = points_shape[1], points_shape[2]
+	chunk_layers = max(1, chunk_size // (n1 * n2))
+
+	for i0 in range(0, points_shape[0], chunk_layers) :
+
+		i1 = min(i0 + chunk_layers, points_shape[0])
+
+		_interpolateChunk(
+			out[i0:i1], i0, i1, vertices,
+			axis_faces, axis_edges, axis_parameters, index_fractions
+		)
+
+	# Copy the faces and edges exactly, so that the points shared
+	# with other hex blocks do not depend on the rounding of the interpolation
+	for axis in range(3) :
+		for end in range(2) :
+
+			face_slice = [slice(None)] * 3
+			face_slice[axis] = -end
+
+			out[tuple(face_slice)] = axis_faces[axis][end]
+
+	for key, points in edge_points.items() :
+
+		slice_3d = HexBlockVertices.getEdgeInteriorSlice(*key)
+		slice_3d.slices[0] = slice(None)
+
+		slice_3d.getArrayView(out)[...] = points
+
+	return out
+
+def _getFaceInterpolation(
+	axis:int,
+	end:int,
+	points_shape:tuple,
+	vertices:np.ndarray,
+	axis_edges:list,
+	index_fractions:list
+) -> np.ndarray :
+	'''
+	Get the points on the face normal to axis at its start (end = 0)
+	or end (end = 1) by 2D transfinite interpolation of the 4 edges,
+	with the blending parameters of each point taken from the
+	normalized arc length of the 2 edges parallel to it
+	'''
+
+	axis_0, axis_1 = sorted({0, 1, 2} - {axis})
+
+	n_0, n_1 = points_shape[axis_0], points_shape[axis_1]
+
+	def getCorner(p:int, q:int) -> tuple :
+
+		corner = [0, 0, 0]
+		corner[axis] = end
+		corner[axis_0] = p
+		corner[axis_1] = q
+
+		return corner
+
+	def getEdge(edge_axis:int, p:int) -> np.ndarray :
+
+		corner = getCorner(0, 0)
+		other_axis = axis_1 if edge_axis == axis_0 else axis_0
+		corner[other_axis] = p
+		corner[edge_axis] = 0
+
+		return axis_edges[edge_axis][tuple(corner)]
+
+	# Edges along axis_0 at the start and end of axis_1 and vice versa
+	edges_0 = [getEdge(axis_0, q) for q in range(2)]
+	edges_1 = [getEdge(axis_1, p) for p in range(2)]
+
+	parameters_0 = [getEdgeParameters(edge) for edge in edges_0]
+	parameters_1 = [getEdgeParameters(edge) for edge in edges_1]
+
+	s_0 = index_fractions[axis_0]
+	s_1 = index_fractions[axis_1]
+
+	# Blending parameters
+	u = s_1[0][np.newaxis, :] * parameters_0[0][:, np.newaxis] + \
+	s_1[1][np.newaxis, :] * parameters_0[1][:, np.newaxis]
+
+	v = s_0[0][:, np.newaxis] * parameters_1[0][np.newaxis, :] + \
+	s_0[1][:, np.newaxis] * parameters_1[1][np.newaxis, :]
+
+	u = u[..., np.newaxis]
+	v = v[..., np.newaxis]
+
+	face_points = np.zeros((n_0, n_1, 3))
+
+	for q in range(2) :
+
+		weight = v if q == 1 else 1.0 - v
+		face_points += weight * edges_0[q][:, np.newaxis, :]
+
+	for p in range(2) :
+
+		weight = u if p == 1 else 1.0 - u
+		face_points += weight * edges_1[p][np.newaxis, :, :]
+
+	for p in range(2) :
+		for q in range(2) :
+
+			weight = (u if p == 1 else 1.0 - u) * (v if q == 1 else 1.0 - v)
+			face_points -= weight * vertices[_getVertexIndex(*getCorner(p, q))]
+
+	return face_points
+
+def _interpolateChunk(
+	out:np.ndarray,
+	i0:int,
+	i1:int,
+	vertices:np.ndarray,
+	axis_faces:list,
+	axis_edges:list,
+	axis_parameters:list,
+	index_fractions:list
+) -> None :
+	'''
+	Interpolate the points of the layers i0 to i1 along axis 0 into out
+	'''
+
+	# Views that broadcast arrays along each axis
+	# to the shape of the chunk
+	def alongAxis(array:np.ndarray, axis:int) -> np.ndarray :
+
+		shape = [1, 1, 1] + list(array.shape[1:])
+		shape[axis] = array.shape[0]
+
+		if axis == 0 : array = array[i0:i1]
+		shape[0] = i1 - i0 if axis == 0 else 1
+
+		return array.reshape(shape)
+
+	def onFace(array:np.ndarray, axis:int) -> np.ndarray :
+
+		axis_0, axis_1 = sorted({0, 1, 2} - {axis})
+
+		if axis_0 == 0 : array = array[i0:i1]
+
+		return np.expand_dims(array, axis)
+
+	# Blending parameters of the points along each axis
+	# from the arc length of the 4 edges parallel to the axis
+	parameters = []
+
+	for axis in range(3) :
+
+		axis_0, axis_1 = sorted({0, 1, 2} - {axis})
+
+		parameter = 0.0
+
+		for corner, edge_parameters in axis_parameters[axis].items() :
+
+			parameter = parameter + \
+			alongAxis(edge_parameters, axis) * \
+			alongAxis(index_fractions[axis_0][corner[axis_0]], axis_0) * \
+			alongAxis(index_fractions[axis_1][corner[axis_1]], axis_1)
+
+		parameters.append(parameter[..., np.newaxis])
+
+	weights = [(1.0 - parameter, parameter) for parameter in parameters]
+
+	temporary = np.empty_like(out)
+
+	out.fill(0.0)
+
+	# Faces
+	for axis in range(3) :
+		for end in range(2) :
+
+			np.multiply(weights[axis][end], onFace(axis_faces[axis][end], axis), out=temporary)
+			out += temporary
+
+	# Edges
+	for axis in range(3) :
+
+		axis_0, axis_1 = sorted({0, 1, 2} - {axis})
+
+		for corner, edge in axis_edges[axis].items() :
+
+			np.multiply(
+				weights[axis_0][corner[axis_0]] * weights[axis_1][corner[axis_1]],
+				alongAxis(edge, axis),
+				out=temporary
+			)
+			out -= temporary
+
+	# Vertices
+	for a in range(2) :
+		for b in range(2) :
+			for c in range(2) :
+
+				np.multiply(
+					weights[0][a] * weights[1][b] * weights[2][c],
+					vertices[_getVertexIndex(a, b, c)],
+					out=temporary
+				)
+				out += temporary
+
+	pass
@@ -0,0 +1,187 @@
+import re
+
+from pathlib import Path
+
+# Comments, strings, punctuation and words of an OpenFOAM dictionary
+token_pattern = re.compile(
+	r'//[^\n]*|/\*.*?\*/|"(?:[^"\\]|\\.)*"|[(){}\[\];]|[^\s(){}\[\];"]+',
+	re.DOTALL
+)
+
+def getTokens(text: str) -> list[str]:
+	'''
+	Split the text of an OpenFOAM dictionary into tokens, dropping the comments
+	'''
+
+	return [
+		token for token in token_pattern.findall(text)
+		if not token.startswith('//') and not token.startswith('/*')
+	]
+
+def getValue(token: str) -> int|float|str:
+	'''
+	Convert a token to an int, a float, or a string without quotes
+	'''
+
+	if token.startswith('"') : return token[1:-1]
+
+	try :
+
+		return int(token)
+
+	except ValueError :
+
+		pass
+
+	try :
+
+		return float(token)
+
+	except ValueError :
+
+		return token
+
+def _lookUp(name: str, scopes: list[dict]) -> object:
+	'''
+	Get the value of the variable from the innermost scope defining it
+	'''
+
+	for scope in reversed(scopes) :
+
+		if name in scope : return scope[name]
+
+	raise ValueError(f'Variable ${name} is not defined')
+
+def _parseItems(tokens: list[str], i: int, scopes: list[dict], end: str) -> tuple[list, int]:
+	'''
+	Parse the items from tokens[i] until the end token.
+	Return the items and the index of the end token.
+	'''
+
+	items = []
+
+	while True :
+
+		if i >= len(tokens) : raise ValueError(f'Expected {end} before the end of the file')
+
+		token = tokens[i]
+
+		if token == end : return items, i
+
+		if token in ('(', '[') :
+
+			sub_items, i = _parseItems(tokens, i + 1, scopes, ')' if token == '(' else ']')
+			items.append(sub_items)
+
+		elif token == '{' :
+
+			sub_dictionary, i = _parseEntries(tokens, i + 1, scopes, '}')
+			items.append(sub_dictionary)
+
+		elif token in (')', ']', '}', ';') :
+
+			raise ValueError(f'Unexpected {token} while expecting {end}')
+
+		elif token.startswith('$') :
+
+			items.append(_lookUp(token[1:], scopes))
+
+		elif token.startswith('#') :
+
+			raise ValueError(f'Unsupported directive {token}')
+
+		else :
+
+			items.append(getValue(token))
+
+		i += 1
+
+def _parseEntries(tokens: list[str], i: int, scopes: list[dict], end: str|None) -> tuple[dict, int]:
+	'''
+	Parse the keyword entries from tokens[i] until the end token,
+	or the end of the tokens if end is None.
+	Return the dictionary and the index of the end token.
+	'''
+
+	dictionary = {}
+	scopes = scopes + [dictionary]
+
+	while True :
+
+		if i >= len(tokens) :
+
+			if end is None : return dictionary, i
+
+			raise ValueError(f'Expected {end} before the end of the file')
+
+		keyword = tokens[i]
+
+		if keyword == end : return dictionary, i
+
+		if keyword.startswith('#') : raise ValueError(f'Unsupported directive {keyword}')
+
+		if keyword in ('(', ')', '[', ']', '{', '}', ';') :
+
+			raise ValueError(f'Unexpected {keyword} while expecting a keyword')
+
+		if i + 1 < len(tokens) and tokens[i + 1] == '{' :
+
+			value, i = _parseEntries(tokens, i + 2, scopes, '}')
+
+		else :
+
+			items, i = _parseItems(tokens, i + 1, scopes, ';')
+
+			value = items[0] if len(items) == 1 else items
+
+		dictionary[getValue(keyword)] = value
+
+		i += 1
+
+def parseFoamDictionary(text: str) -> dict:
+	'''
+	Parse the text of an OpenFOAM dictionary into nested Python objects :
+	sub-dictionaries into dicts, lists ( ... ) and dimensions [ ... ] into lists,
+	numbers into ints and floats, words and strings into strs.
+	An entry with a single value maps to the value,
+	an entry with multiple values to the list of the values.
+	$variable is replaced by the value of the variable
+	defined earlier in the enclosing dictionaries.
+	Directives such as #include are not supported.
+	'''
+
+	tokens = getTokens(text)
+
+	dictionary, _ = _parseEntries(tokens, 0, [], None)
+
+	return dictionary
+
+def parseFoamList(text: str) -> list:
+	'''
+	Parse the text of an OpenFOAM list, N ( ... ) with an optional size N,
+	into the list of its items. Refer to parseFoamDictionary.
+	'''
+
+	tokens = getTokens(text)
+
+	i = 1 if len(tokens) > 0 and isinstance(getValue(tokens[0]), int) else 0
+
+	if i >= len(tokens) or tokens[i] != '(' : raise ValueError('Expected ( at the start of the list')
+
+	items, i = _parseItems(tokens, i + 1, [], ')')
+
+	if i + 1 != len(tokens) : raise ValueError(f'Unexpected {tokens[i + 1]} after the list')
+
+	return items
+
+def readFoamDictionary(path: Path) -> dict:
+	'''
+	Read and parse an OpenFOAM dictionary file.
+	Refer to parseFoamDictionary.
+	'''
+
+	with open(path, 'r') as f :
+
+		text = f.read()
+
+	return parseFoamDictionary(text)
@@ -58,22 +58,37 @@ def getPolyMeshHeader(
 	format: str = 'ascii',
 	foam_version: str = '13',
 	file_version: str| None = None,
+	location: str = '"constant/polyMesh"',
+	arch: str | None = None,
+	note: str | None = None,
 ) -> str :
 	'''
 	Return the OpenFOAM PolyMesh header.
+	The location and the arch of binary files can be changed
+	for the files of other directories, e.g., fields in "0".
+	note is an optional quoted description, e.g., the mesh sizes of an owner file.
 	'''
 
 	file_dict = {
 		'format'	: format,
 		'class'		: class_name,
-		'location'	: '"constant/polyMesh"',
-		'object'	: object_name,
+		'location'	: location,
 	}
 
+	if note is not None :
+
+		file_dict['note'] = note
+
+	file_dict['object'] = object_name
+
 	if file_version is not None :
 		
 		file_dict['version'] = file_version
 
+	if arch is not None :
+
+		file_dict['arch'] = arch
+
 	header = getHeader(foam_version)
 	header += 'FoamFile\n{\n'
 	header += getDictionaryString(file_dict, 1)
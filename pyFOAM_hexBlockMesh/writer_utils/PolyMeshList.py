@@ -0,0 +1,380 @@
+import re
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.writer_utils.FoamDictionary as FoamDictionary
+import pyFOAM_hexBlockMesh.writer_utils.PolyMeshFile as PolyMeshFile
+
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import \
+space_pattern, list_start_pattern, brackets_table, getBinaryDtypes
+
+# Number of bytes at the start of a list file searched for
+# the FoamFile header and the start of the list
+head_size = 2**16
+
+# Number of bytes of a list scanned for line breaks or parsed at a time
+scan_chunk_size = 2**24
+
+# Sizes in the note of an owner file, e.g., nCells:8
+note_pattern = re.compile(r'(\w+):(\d+)')
+
+# Shape of the items of every class of list file, binary faces being
+# a faceCompactList of 4 point IDs per face and ASCII faces a faceList of 4(a b c d)
+item_shapes = {
+	('vectorField', False)		: (3,),
+	('vectorField', True)		: (3,),
+	('labelList', False)		: (),
+	('labelList', True)		: (),
+	('faceList', False)		: (5,),
+	('faceCompactList', True)	: (4,),
+}
+
+# Format of the items of every class of ASCII list file, as written by Writer
+item_formats = {
+	'vectorField'	: '\t(%.16e\t\t%.16e\t\t%.16e)',
+	'labelList'	: '\t%d',
+	'faceList'	: '\t4(%d\t\t%d\t\t%d\t\t%d)',
+}
+
+class ListFile :
+	'''
+	Points, faces, owner or neighbour file of a polyMesh
+	whose items are located, read and copied by their index
+	without reading the whole file. The file is memory mapped.
+	The items of ASCII lists must be written one per line,
+	as by Writer and OpenFOAM, and are located by counting line breaks.
+	The items of binary lists are located from their size.
+	'''
+
+	def __init__(self, path: Path) :
+
+		assert path.exists(), f'{path} does not exist'
+
+		self.path = path
+		self.data = np.memmap(path, dtype=np.uint8, mode='r')
+
+		head = self.data[:head_size].tobytes()
+
+		start = head.find(b'FoamFile')
+
+		assert start >= 0, f'{path} has no FoamFile header'
+
+		end = head.index(b'}', start) + 1
+
+		self.header = FoamDictionary.parseFoamDictionary(head[start:end].decode())['FoamFile']
+
+		self.class_name	= self.header['class']
+		self.binary	= self.header['format'] == 'binary'
+
+		assert (self.class_name, self.binary) in item_shapes, \
+		f'Unsupported {self.header["format"]} {self.class_name} {path}'
+
+		self.item_shape = item_shapes[(self.class_name, self.binary)]
+
+		label_dtype, scalar_dtype = getBinaryDtypes(self.header)
+
+		if self.binary :
+
+			self.dtype = scalar_dtype if self.class_name == 'vectorField' else label_dtype
+
+		else :
+
+			self.dtype = np.dtype(float) if self.class_name == 'vectorField' else np.dtype(int)
+
+		self.item_size = int(np.prod(self.item_shape, dtype=int)) * self.dtype.itemsize
+
+		match = list_start_pattern.match(head, space_pattern.match(head, end).end())
+
+		assert match is not None and match.group(2) == b'(', f'Expected a list in {path}'
+
+		self.size	= int(match.group(1))
+		self.start	= match.end()
+
+		if self.class_name == 'faceCompactList' :
+
+			# Skip the offsets of the faces to the list of their point IDs
+			offsets_end = self.start + self.size * label_dtype.itemsize
+
+			labels_head = self.data[offsets_end:offsets_end + 256].tobytes()
+
+			assert labels_head[:1] == b')', f'Expected ) after the offsets in {path}'
+
+			match = list_start_pattern.match(labels_head, space_pattern.match(labels_head, 1).end())
+
+			assert match is not None and int(match.group(1)) == 4 * (self.size - 1), \
+			'Only quadrilateral faces are supported'
+
+			self.size	-= 1
+			self.start	= offsets_end + match.end()
+
+		if not self.binary :
+
+			# Items start on the first line following the opening bracket
+			# that is not blank
+			first = self.start + len(head[self.start:]) - len(head[self.start:].lstrip())
+
+			line_start = head.rfind(b'\n', 0, first) + 1
+
+			assert line_start > self.start, \
+			f'Items of {path} must be written one per line'
+
+			self.start = line_start
+
+		# Sorted indices of the items located so far and their offsets
+		self.__indices = np.zeros(0, dtype=int)
+		self.__offsets = np.zeros(0, dtype=int)
+
+		pass
+
+	def getNote(self) -> dict[str, int] :
+		'''
+		Get the sizes in the note of the header, e.g., {'nCells' : 8},
+		empty if there is no note
+		'''
+
+		return {key : int(value) for key, value in note_pattern.findall(str(self.header.get('note', '')))}
+
+	def __scanLineBreaks(self, line_breaks:np.ndarray) -> np.ndarray :
+		'''
+		Get the offsets following the sorted line breaks of the list,
+		counted from the first item. Only the list up to the last
+		line break is scanned, chunk by chunk.
+		'''
+
+		offsets = np.empty(line_breaks.size, dtype=int)
+
+		num_found, num_scanned, position = 0, 0, self.start
+
+		while num_found < line_breaks.size :
+
+			assert position < self.data.size, \
+			f'{self.path} has fewer lines than items, items must be written one per line'
+
+			chunk = self.data[position:position + scan_chunk_size]
+
+			chunk_breaks = np.flatnonzero(chunk == ord('\n'))
+
+			end = np.searchsorted(line_breaks, num_scanned + chunk_breaks.size)
+
+			offsets[num_found:end] = position + chunk_breaks[line_breaks[num_found:end] - num_scanned] + 1
+
+			num_found	= end
+			num_scanned	+= chunk_breaks.size
+			position	+= chunk.size
+
+		return offsets
+
+	def locate(self, indices:np.ndarray) -> None :
+		'''
+		Locate the items of the indices, from 0 to size, size being
+		the end of the list, in one scan of the list. Locating all the
+		items a piece of work needs beforehand avoids scanning repeatedly.
+		'''
+
+		indices = np.setdiff1d(np.asarray(indices, dtype=int), self.__indices)
+
+		if indices.size == 0 or self.binary : return
+
+		assert indices[0] >= 0 and indices[-1] <= self.size, f'Items out of range in {self.path}'
+
+		offsets = np.empty(indices.size, dtype=int)
+
+		offsets[indices == 0] = self.start
+		offsets[indices > 0] = self.__scanLineBreaks(indices[indices > 0] - 1)
+
+		if indices[-1] == self.size :
+
+			closing = self.data[offsets[-1]:offsets[-1] + 64].tobytes()
+
+			assert closing.strip().startswith(b')'), \
+			f'{self.path} has more lines than items, items must be written one per line'
+
+		self.__offsets = np.concatenate((self.__offsets, offsets))[np.argsort(np.concatenate((self.__indices, indices)))]
+		self.__indices = np.sort(np.concatenate((self.__indices, indices)))
+
+		pass
+
+	def getOffsets(self, indices:np.ndarray) -> np.ndarray :
+		'''
+		Get the offsets in the file of the start of the items of the indices
+		'''
+
+		indices = np.asarray(indices, dtype=int)
+
+		if self.binary :
+
+			assert np.all((0 <= indices) & (indices <= self.size)), f'Items out of range in {self.path}'
+
+			return self.start + indices * self.item_size
+
+		self.locate(indices)
+
+		return self.__offsets[np.searchsorted(self.__indices, indices)]
+
+	def __parse(self, data:np.ndarray, size:int) -> np.ndarray :
+		'''
+		Convert the bytes of size items to an array
+		'''
+
+		if self.binary :
+
+			values = np.frombuffer(data.tobytes(), dtype=self.dtype)
+
+		else :
+
+			values = np.fromstring(data.tobytes().translate(brackets_table), dtype=self.dtype, sep=' ')
+
+		assert values.size == size * int(np.prod(self.item_shape, dtype=int)), \
+		f'Expected {size} items in {self.path}'
+
+		values = values.reshape((size,) + self.item_shape)
+
+		if self.class_name == 'faceList' :
+
+			assert np.all(values[:, 0] == 4), 'Only quadrilateral faces are supported'
+
+			values = values[:, 1:]
+
+		return values.astype(float if self.class_name == 'vectorField' else int)
+
+	def readItems(self, start:int, end:int) -> np.ndarray :
+		'''
+		Read the items from index start to end (exclusive)
+		'''
+
+		start_offset, end_offset = self.getOffsets([start, end])
+
+		return self.__parse(self.data[start_offset:end_offset], end - start)
+
+	def readItemsAt(self, indices:np.ndarray) -> np.ndarray :
+		'''
+		Read the items of the indices
+		'''
+
+		indices = np.asarray(indices, dtype=int)
+
+		starts	= self.getOffsets(indices)
+		lengths	= self.getOffsets(indices + 1) - starts
+
+		# Gather the bytes of the items at once
+		positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(np.sum(lengths))
+
+		return self.__parse(self.data[positions], indices.size)
+
+	def iterateItems(self) :
+		'''
+		Iterate over the items in chunks of about scan_chunk_size bytes
+		'''
+
+		position, end = self.getOffsets([0, self.size])
+
+		while position < end :
+
+			chunk_end = min(position + scan_chunk_size, end)
+
+			if self.binary :
+
+				chunk_end = position + (chunk_end - position) // self.item_size * self.item_size
+
+			elif chunk_end < end :
+
+				# Extend the chunk to the end of its last line
+				while self.data[chunk_end - 1] != ord('\n') :
+
+					is_break = self.data[chunk_end:chunk_end + scan_chunk_size] == ord('\n')
+
+					chunk_end += int(np.argmax(is_break)) + 1 if np.any(is_break) else is_break.size
+
+			size = (chunk_end - position) // self.item_size if self.binary else \
+			int(np.count_nonzero(self.data[position:chunk_end] == ord('\n')))
+
+			yield self.__parse(self.data[position:chunk_end], size)
+
+			position = chunk_end
+
+		pass
+
+	def __writeItems(self, f, values:np.ndarray) -> None :
+		'''
+		Write the items in the format of this file
+		'''
+
+		if self.binary :
+
+			f.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+
+		else :
+
+			np.savetxt(f, values, fmt=item_formats[self.class_name])
+
+		pass
+
+	def write(self, path:Path, pieces:list, note:str|None=None) -> int :
+		'''
+		Write a list file at path in the format of this file,
+		its items being the concatenation of the pieces, every piece
+		either a (start, end) range of the items of this file,
+		copied without parsing, or an array of new items.
+		note replaces the note of the header. Return the number of items.
+		'''
+
+		ranges = [piece for piece in pieces if isinstance(piece, tuple)]
+
+		self.locate(np.array(ranges, dtype=int).ravel())
+
+		size = sum(
+			piece[1] - piece[0] if isinstance(piece, tuple) else len(piece)
+			for piece in pieces
+		)
+
+		header = PolyMeshFile.getPolyMeshHeader(
+			class_name=self.class_name,
+			object_name=self.header['object'],
+			format=self.header['format'],
+			foam_version='13',
+			location=f'"{self.header.get("location", "constant/polyMesh")}"',
+			arch=f'"{self.header["arch"]}"' if 'arch' in self.header else None,
+			note=note if note is not None else (f'"{self.header["note"]}"' if 'note' in self.header else None),
+		)
+
+		if self.class_name == 'faceCompactList' :
+
+			offsets = np.arange(0, 4 * size + 1, 4)
+
+			header += f'{size + 1}\n('
+			header = header.encode() + np.ascontiguousarray(offsets, dtype=self.dtype).tobytes()
+			header += f')\n{4 * size}\n('.encode()
+
+		elif self.binary :
+
+			header = (header + f'{size}\n(').encode()
+
+		else :
+
+			header = (header + f'{size}\n(\n').encode()
+
+		footer = (')\n\n' + PolyMeshFile.file_EOF + '\n').encode()
+
+		with open(path, 'wb') as f :
+
+			f.write(header)
+
+			for piece in pieces :
+
+				if isinstance(piece, tuple) :
+
+					start, end = self.getOffsets(piece)
+
+					for chunk_start in range(start, end, scan_chunk_size) :
+
+						f.write(self.data[chunk_start:min(chunk_start + scan_chunk_size, end)].tobytes())
+
+				else :
+
+					self.__writeItems(f, piece)
+
+			f.write(footer)
+
+		return size
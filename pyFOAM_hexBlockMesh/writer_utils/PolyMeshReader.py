@@ -0,0 +1,255 @@
+import re
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.writer_utils.FoamDictionary as FoamDictionary
+
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
+
+# Whitespace and comments between the tokens of an OpenFOAM file
+space_pattern = re.compile(rb'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+
+# Size of a list followed by its opening bracket,
+# ( for a list of values or { for a uniform list
+list_start_pattern = re.compile(rb'(\d+)\s*([({])')
+
+# Brackets removed from the values of ASCII lists
+brackets_table = bytes.maketrans(b'()', b'  ')
+
+# Label and scalar sizes of binary files without an arch entry
+default_arch = 'LSB;label=32;scalar=64'
+
+def readFoamFile(path: Path) -> tuple[dict, bytes, int]:
+	'''
+	Read an OpenFOAM file.
+	Return the FoamFile header dictionary, the content of the file
+	and the index of the content following the header.
+	'''
+
+	with open(path, 'rb') as f :
+
+		data = f.read()
+
+	start = data.find(b'FoamFile')
+
+	assert start >= 0, f'{path} has no FoamFile header'
+
+	end = data.index(b'}', start) + 1
+
+	header = FoamDictionary.parseFoamDictionary(data[start:end].decode())['FoamFile']
+
+	assert header.get('format') in ('ascii', 'binary'), \
+	f'Unknown format {header.get("format")} of {path}'
+
+	return header, data, end
+
+def getBinaryDtypes(header: dict) -> tuple[np.dtype, np.dtype]:
+	'''
+	Get the label and scalar dtypes of a binary file
+	from the arch entry of its header, e.g., LSB;label=32;scalar=64
+	'''
+
+	arch = dict(
+		item.split('=') if '=' in item else (item, None)
+		for item in str(header.get('arch', default_arch)).split(';')
+	)
+
+	byte_order = '>' if 'MSB' in arch else '<'
+
+	label_dtype	= np.dtype(f'{byte_order}i{int(arch.get("label", 32)) // 8}')
+	scalar_dtype	= np.dtype(f'{byte_order}f{int(arch.get("scalar", 64)) // 8}')
+
+	return label_dtype, scalar_dtype
+
+def readList(
+	data: bytes,
+	start: int,
+	binary: bool,
+	dtype: np.dtype,
+	item_shape: tuple[int, ...] = (),
+) -> tuple[np.ndarray, int]:
+	'''
+	Read the list starting at data[start], after whitespace and comments.
+	Every item of the list is an array of item_shape, written in ASCII
+	as a value or a list of values, or in binary as raw values of dtype.
+	ASCII values are converted in bulk, ignoring the brackets of the items.
+	Return the (size,) + item_shape array and the index following the list.
+	'''
+
+	i = space_pattern.match(data, start).end()
+
+	match = list_start_pattern.match(data, i)
+
+	assert match is not None, f'Expected a list at {data[i:i + 20]}'
+
+	size		= int(match.group(1))
+	num_values	= size * int(np.prod(item_shape, dtype=int))
+	i		= match.end()
+
+	# Uniform list, size{value}
+	if match.group(2) == b'{' :
+
+		end = data.index(b'}', i)
+
+		value = np.fromstring(data[i:end].translate(brackets_table), dtype=dtype, sep=' ')
+
+		return np.broadcast_to(value.reshape(item_shape), (size,) + item_shape).copy(), end + 1
+
+	if binary :
+
+		values = np.frombuffer(data, dtype=dtype, count=num_values, offset=i)
+
+		end = i + values.nbytes
+
+		assert data[end:end + 1] == b')', 'Expected ) at the end of the binary list'
+
+	else :
+
+		# Every item of a list of lists closes a bracket
+		# before the closing bracket of the list
+		num_brackets = size + 1 if len(item_shape) > 0 else 1
+
+		closing_brackets = np.flatnonzero(np.frombuffer(data, dtype=np.uint8, offset=i) == ord(')'))
+
+		assert closing_brackets.size >= num_brackets, 'Expected ) at the end of the list'
+
+		end = i + int(closing_brackets[num_brackets - 1])
+
+		values = np.fromstring(data[i:end].translate(brackets_table), dtype=dtype, sep=' ')
+
+	assert values.size == num_values, \
+	f'Expected {num_values} values in the list, got {values.size}'
+
+	return values.reshape((size,) + item_shape), end + 1
+
+def readPoints(path: Path) -> np.ndarray:
+	'''
+	Read the (N, 3) coordinates of a points file
+	'''
+
+	header, data, start = readFoamFile(path)
+
+	binary = header['format'] == 'binary'
+
+	dtype = getBinaryDtypes(header)[1] if binary else np.dtype(float)
+
+	points, _ = readList(data, start, binary, dtype, (3,))
+
+	return points.astype(float, copy=False)
+
+def readLabels(path: Path) -> np.ndarray:
+	'''
+	Read the (N,) labels of a labelList file, e.g., owner or neighbour
+	'''
+
+	header, data, start = readFoamFile(path)
+
+	binary = header['format'] == 'binary'
+
+	dtype = getBinaryDtypes(header)[0] if binary else np.dtype(int)
+
+	labels, _ = readList(data, start, binary, dtype)
+
+	return labels.astype(int, copy=False)
+
+def readFaces(path: Path) -> np.ndarray:
+	'''
+	Read the (N, 4) point IDs of the quadrilateral faces of a faces file,
+	either a faceList, or a faceCompactList of the offsets of the faces
+	followed by their point IDs
+	'''
+
+	header, data, start = readFoamFile(path)
+
+	binary = header['format'] == 'binary'
+
+	dtype = getBinaryDtypes(header)[0] if binary else np.dtype(int)
+
+	if header['class'] == 'faceCompactList' :
+
+		offsets, end	= readList(data, start, binary, dtype)
+		labels, _	= readList(data, end, binary, dtype)
+
+		assert np.all(np.diff(offsets) == 4), 'Only quadrilateral faces are supported'
+
+		faces = labels.reshape((-1, 4))
+
+	else :
+
+		assert header['class'] == 'faceList', f'Unknown class {header["class"]} of {path}'
+		assert not binary, 'Binary faceList files are not supported'
+
+		# Every face is written as 4(a b c d)
+		faces, _ = readList(data, start, binary, dtype, (5,))
+
+		assert np.all(faces[:, 0] == 4), 'Only quadrilateral faces are supported'
+
+		faces = np.ascontiguousarray(faces[:, 1:])
+
+	return faces.astype(int, copy=False)
+
+def readBoundary(path: Path) -> dict:
+	'''
+	Read the patches of a boundary file into a dictionary
+	mapping the name of every patch to its entries,
+	as consumed by the boundary writer of FacesWriter
+	'''
+
+	_, data, start = readFoamFile(path)
+
+	items = FoamDictionary.parseFoamList(data[start:].decode())
+
+	assert len(items) % 2 == 0, 'Expected a dictionary for every patch'
+
+	return dict(zip(items[::2], items[1::2]))
+
+@Profiler.profiled
+def readPolyMesh(polyMesh_path: Path) -> tuple[np.ndarray, list[FlatFaceCollection]]:
+	'''
+	Read the points and the faces of a polyMesh directory,
+	ASCII or binary.
+	Return the points and the face collections as written by FacesWriter,
+	the internal faces followed by the faces of every patch.
+	'''
+
+	assert polyMesh_path.exists() and polyMesh_path.is_dir(), \
+	f'PolyMesh_path {polyMesh_path} does not exist or is not a directory'
+
+	points		= readPoints(polyMesh_path / 'points')
+	faces		= readFaces(polyMesh_path / 'faces')
+	owner		= readLabels(polyMesh_path / 'owner')
+	neighbour	= readLabels(polyMesh_path / 'neighbour')
+	boundary	= readBoundary(polyMesh_path / 'boundary')
+
+	assert faces.shape[0] == owner.shape[0], \
+	f'Number of faces {faces.shape[0]} does not match the number of owners {owner.shape[0]}'
+
+	num_internal_faces = neighbour.shape[0]
+
+	internal_faces = FlatFaceCollection(name='InteriorFaces')
+
+	internal_faces.owner		= owner[:num_internal_faces]
+	internal_faces.neighbour	= neighbour
+	internal_faces.vertices		= faces[:num_internal_faces]
+
+	face_list = [internal_faces]
+
+	for name, patch in boundary.items() :
+
+		start	= patch['startFace']
+		end	= start + patch['nFaces']
+
+		assert num_internal_faces <= start and end <= faces.shape[0], \
+		f'Faces of patch {name} are out of range'
+
+		patch_faces = FlatFaceCollection(name, patch['type'])
+
+		patch_faces.owner	= owner[start:end]
+		patch_faces.vertices	= faces[start:end]
+
+		face_list.append(patch_faces)
+
+	return points, face_list
@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable
+
+import numpy as np
+
+# Every appended array is preceded by its size in bytes
+header_dtype = np.dtype('<u8')
+
+# VTK names of the little endian types of the data arrays
+vtk_types = {
+	np.dtype('<f8')	: 'Float64',
+	np.dtype('<f4')	: 'Float32',
+	np.dtype('<i8')	: 'Int64',
+	np.dtype('<i4')	: 'Int32',
+	np.dtype('u1')	: 'UInt8',
+}
+
+@dataclass
+class AppendedDataArray :
+	'''
+	Data array stored in the raw appended data of a VTK XML file.
+	chunks returns the arrays of dtype written one after the other,
+	so that large arrays need not be copied at once.
+	'''
+
+	name		: str
+	dtype		: np.dtype
+	num_components	: int
+	num_values	: int
+	chunks		: Callable[[], Iterable[np.ndarray]]
+
+	def __init__(
+		self,
+		name:str,
+		dtype:np.dtype|str,
+		num_components:int,
+		num_values:int,
+		chunks:Callable[[], Iterable[np.ndarray]]
+	) -> None :
+		'''
+		Initialize the data array
+		num_values is the total number of values, i.e., tuples x components
+		'''
+
+		self.name		= name
+		self.dtype		= np.dtype(dtype)
+		self.num_components	= num_components
+		self.num_values		= num_values
+		self.chunks		= chunks
+
+		assert self.dtype in vtk_types, f'Unsupported type {self.dtype}'
+
+		pass
+
+	def getSize(self) -> int :
+		'''
+		Get the size of the data in bytes
+		'''
+
+		return self.num_values * self.dtype.itemsize
+
+	def getXML(self, offset:int) -> str :
+		'''
+		Get the DataArray element of the array at offset in the appended data
+		'''
+
+		return \
+		f'<DataArray type="{vtk_types[self.dtype]}" Name="{self.name}" ' \
+		f'NumberOfComponents="{self.num_components}" format="appended" offset="{offset}"/>'
+
+def getArrayChunks(array:np.ndarray, dtype:np.dtype|str) -> Callable[[], Iterable[np.ndarray]] :
+	'''
+	Get the chunks of an array written at once
+	'''
+
+	return lambda : (np.asarray(array, dtype=dtype),)
+
+def getOffsets(arrays:list[AppendedDataArray]) -> list[int] :
+	'''
+	Get the offsets of the arrays in the appended data
+	'''
+
+	offsets = np.cumsum([0] + [header_dtype.itemsize + array.getSize() for array in arrays])
+
+	return [int(offset) for offset in offsets[:-1]]
+
+def writeAppendedData(f:BinaryIO, arrays:list[AppendedDataArray]) -> None :
+	'''
+	Write the arrays in the raw appended data
+	'''
+
+	f.write(b'<AppendedData encoding="raw">\n_')
+
+	for array in arrays :
+
+		f.write(np.array(array.getSize(), dtype=header_dtype).tobytes())
+
+		num_bytes = 0
+
+		for chunk in array.chunks() :
+
+			chunk = np.ascontiguousarray(chunk, dtype=array.dtype)
+
+			f.write(memoryview(chunk).cast('B'))
+
+			num_bytes += chunk.nbytes
+
+		assert num_bytes == array.getSize(), \
+		f'Data array {array.name} has {num_bytes} bytes, expected {array.getSize()}'
+
+	f.write(b'\n</AppendedData>\n')
+
+	pass
+
+def writeVTKFile(
+	path:Path,
+	file_type:str,
+	get_body:Callable[[list[int]], str],
+	arrays:list[AppendedDataArray]
+) -> None :
+	'''
+	Write a VTK XML file of file_type with the arrays in the raw appended data.
+	get_body returns the XML of the dataset element
+	given the offsets of the arrays.
+	'''
+
+	header = \
+	f'<?xml version="1.0"?>\n' \
+	f'<VTKFile type="{file_type}" version="1.0" ' \
+	f'byte_order="LittleEndian" header_type="UInt64">\n'
+
+	with open(path, 'wb') as f :
+
+		f.write(header.encode())
+		f.write(get_body(getOffsets(arrays)).encode())
+
+		if len(arrays) > 0 : writeAppendedData(f, arrays)
+
+		f.write(b'</VTKFile>\n')
+
+	pass
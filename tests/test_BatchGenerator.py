@@ -0,0 +1,166 @@
+import shutil
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.BatchGenerator import generateCases
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+
+def getCoordinates(length:float=1.0, height:float=1.0) -> list[np.ndarray] :
+	'''
+	Get the coordinates of 2 hex blocks placed side by side along x
+	'''
+
+	y = np.linspace(0, height, 3)
+	z = np.linspace(0, 1, 3)
+
+	coordinates_list = []
+
+	for x in (np.linspace(0, length, 3), np.linspace(length, 2 * length, 3)) :
+
+		coordinates_list.append(np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1))
+
+	return coordinates_list
+
+def setUpCollection(validation:str=Validation.STRICT) -> ConnectedHexCollection :
+	'''
+	Set up the collection of the 2 hex blocks
+	'''
+
+	collection = ConnectedHexCollection(validation)
+
+	for coordinates in getCoordinates() :
+
+		hex_block = HexBlock(2, 2, 2)
+		hex_block.setPointCoordinates(coordinates)
+
+		collection.addHexBlock(hex_block)
+
+	collection.connectHexBlocks(0, 1, (1, 2, 6, 5), (0, 3, 7, 4))
+
+	return collection
+
+class TestBatchGenerator(unittest.TestCase) :
+
+	def setUp(self) -> None :
+
+		self.output_path = Path('test_batch')
+
+		if self.output_path.exists() : shutil.rmtree(self.output_path)
+
+		pass
+
+	def tearDown(self) -> None :
+
+		shutil.rmtree(self.output_path, ignore_errors=True)
+
+		pass
+
+	def test_generateCases(self) :
+		'''
+		Test every case is written with its own points
+		and the shared faces
+		'''
+
+		parameter_sets = [{'length' : 1.0}, {'length' : 2.0, 'height' : 0.5}]
+
+		for max_workers in (1, 2) :
+
+			results = generateCases(
+				setUpCollection(),
+				getCoordinates,
+				parameter_sets,
+				self.output_path / str(max_workers),
+				max_workers=max_workers
+			)
+
+			self.assertEqual(len(results), 2)
+
+			points_texts = []
+
+			for result in results :
+
+				self.assertIsNone(result.error)
+				self.assertIn('write', result.timings)
+
+				polyMesh_path = result.case_path / 'constant' / 'polyMesh'
+
+				for name in ('points', 'faces', 'owner', 'neighbour', 'boundary') :
+
+					self.assertTrue((polyMesh_path / name).exists())
+
+				points_texts.append((polyMesh_path / 'points').read_text())
+
+			self.assertNotEqual(points_texts[0], points_texts[1])
+
+			self.assertEqual(
+				(results[0].case_path / 'constant' / 'polyMesh' / 'faces').read_text(),
+				(results[1].case_path / 'constant' / 'polyMesh' / 'faces').read_text()
+			)
+
+		pass
+
+	def test_generateCases_error(self) :
+		'''
+		Test the error of an invalid case is reported
+		without stopping the other cases
+		'''
+
+		results = generateCases(
+			setUpCollection(),
+			getCoordinates,
+			[{'length' : -1.0}, {'length' : 1.0}],
+			self.output_path,
+			max_workers=1
+		)
+
+		self.assertIsNotNone(results[0].error)
+		self.assertIsNone(results[1].error)
+
+		pass
+
+	def test_generateCases_validation(self) :
+		'''
+		Test the cases are assembled with the validation policy
+		of the hex collection
+		'''
+
+		getPoints = ConnectedHexCollection.getPoints
+
+		policies = []
+
+		def getPointsWithPolicy(hex_collection:ConnectedHexCollection) :
+
+			policies.append(hex_collection.validation)
+
+			return getPoints(hex_collection)
+
+		for validation in Validation.policies :
+
+			policies.clear()
+
+			with mock.patch.object(
+				ConnectedHexCollection, 'getPoints', autospec=True, side_effect=getPointsWithPolicy
+			) :
+
+				results = generateCases(
+					setUpCollection(validation),
+					getCoordinates,
+					[{'length' : 1.0}, {'length' : 2.0}],
+					self.output_path,
+					max_workers=1
+				)
+
+			self.assertTrue(all(result.error is None for result in results))
+			self.assertEqual(policies, [validation, validation])
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,183 @@
+from pathlib import Path
+
+import unittest
+import numpy as np
+
+from pyFOAM_hexBlockMesh.BlockMeshDict import readBlockMeshDict, getHexCollection, getBlockZones
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+from pyFOAM_hexBlockMesh.writer_utils.FoamDictionary import parseFoamDictionary
+
+# 2 blocks side by side along x, the top edge of the first block is an arc
+block_mesh_dict_text = '''
+FoamFile
+{
+	format		ascii;
+	class		dictionary;
+	object		blockMeshDict;
+}
+
+convertToMeters 0.1;
+
+y1	10;
+
+vertices
+(
+	(0 0 0)		(10 0 0)	(20 0 0)
+	(0 $y1 0)	(10 $y1 0)	(20 $y1 0)
+	(0 0 1)		(10 0 1)	(20 0 1)
+	(0 $y1 1)	(10 $y1 1)	(20 $y1 1)
+);
+
+blocks
+(
+	hex (0 1 4 3 6 7 10 9) (10 8 1) simpleGrading (1 2 1)
+	hex (1 2 5 4 7 8 11 10) fluid (12 8 1) simpleGrading (1 2 1)
+);
+
+edges
+(
+	arc 3 4 (5 12 0)
+	arc 9 10 (5 12 1)
+);
+
+boundary
+(
+	inlet
+	{
+		type patch;
+		faces ((0 6 9 3));
+	}
+	outlet
+	{
+		type patch;
+		faces ((2 5 11 8));
+	}
+	walls
+	{
+		type wall;
+		faces
+		(
+			(3 9 10 4)
+			(4 10 11 5)
+			(0 1 7 6)
+			(1 2 8 7)
+		);
+	}
+	unused
+	{
+		type patch;
+		faces ();
+	}
+);
+
+defaultPatch
+{
+	name frontAndBack;
+	type empty;
+}
+
+mergePatchPairs
+(
+);
+'''
+
+class TestBlockMeshDict(unittest.TestCase) :
+
+	def test_readBlockMeshDict(self) :
+		'''
+		Test the blocks, connections and patches of a blockMeshDict
+		'''
+
+		test_path = Path('test_blockMeshDict')
+
+		with open(test_path, 'w') as f :
+
+			f.write(block_mesh_dict_text)
+
+		hex_collection = readBlockMeshDict(test_path)
+
+		test_path.unlink()
+
+		self.assertEqual(len(hex_collection.hex_blocks), 2)
+		self.assertEqual(len(hex_collection.connect_infos), 1)
+
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+		self.assertEqual(hex_collection.num_cells, 10 * 8 + 12 * 8)
+		self.assertEqual(hex_collection.num_points, (10 + 12 + 1) * 9 * 2)
+
+		faces = hex_collection.getFaces()
+		points = hex_collection.getPoints()
+		cell_centers = hex_collection.getCellCenters()
+
+		patch_sizes = {
+			face_collection.name : (face_collection.patch_type, face_collection.getSize())
+			for face_collection in faces if face_collection.isBoundary()
+		}
+
+		self.assertEqual(patch_sizes, {
+			'inlet'		: ('patch', 8),
+			'outlet'	: ('patch', 8),
+			'walls'		: ('wall', 2 * (10 + 12)),
+			'frontAndBack'	: ('empty', 2 * (10 + 12) * 8),
+		})
+
+		for face_collection in faces :
+
+			if face_collection.isBoundary() :
+
+				self.assertTrue(checkBoundaryFaces(face_collection, points, cell_centers))
+
+			else :
+
+				self.assertTrue(checkInteriorFaces(face_collection, points, cell_centers))
+
+		# Scaled coordinates
+		self.assertTrue(np.allclose(points.min(axis=0), (0, 0, 0)))
+		self.assertTrue(np.allclose(points.max(axis=0), (2, 1.2, 0.1)))
+
+		# Top points of the first block lie on the circle through
+		# (0, 1), (0.5, 1.2) and (1, 1) centered at (0.5, 0.475)
+		top_points = hex_collection.hex_blocks[0].point_coordinates[:, -1]
+
+		self.assertTrue(np.allclose(
+			np.linalg.norm(top_points[..., :2] - (0.5, 0.475), axis=-1), 0.725
+		))
+
+		# Grading along y, the last cell is twice the first cell
+		cell_sizes = np.diff(hex_collection.hex_blocks[1].point_coordinates[0, :, 0, 1])
+
+		self.assertAlmostEqual(cell_sizes[-1] / cell_sizes[0], 2.0)
+
+		self.assertEqual(getBlockZones(parseFoamDictionary(block_mesh_dict_text)), {'fluid' : [1]})
+
+		pass
+
+	def test_getHexCollection_errors(self) :
+		'''
+		Test the unsupported entries are reported
+		'''
+
+		block_mesh_dict = parseFoamDictionary(block_mesh_dict_text)
+
+		block_mesh_dict['edges'] = ['BSpline', 3, 4, [[5, 12, 0]]]
+
+		with self.assertRaisesRegex(ValueError, 'Unsupported edge type BSpline') :
+
+			getHexCollection(block_mesh_dict)
+
+		block_mesh_dict = parseFoamDictionary(block_mesh_dict_text)
+
+		# Face between the blocks
+		block_mesh_dict['boundary'][1]['faces'] = [[1, 7, 10, 4]]
+
+		with self.assertRaisesRegex(AssertionError, 'is not a boundary face') :
+
+			getHexCollection(block_mesh_dict)
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
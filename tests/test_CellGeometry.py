@@ -0,0 +1,146 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.CellGeometry as CellGeometry
+
+def getFrustumCoordinates() -> np.ndarray :
+	'''
+	Get the (2, 2, 2, 3) coordinates of a single cell
+	with a unit square base at z = 0 and a 0.5 x 0.5 square top at z = 1.
+	All the faces of the cell are planar.
+	'''
+
+	x = np.array([0., 1.])
+	y = np.array([0., 1.])
+	z = np.array([0., 1.])
+
+	coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+	coordinates[:, :, 1, :2] *= 0.5
+
+	return coordinates
+
+class TestCellGeometry(unittest.TestCase) :
+
+	def test_getCellCenters(self) :
+		'''
+		Test the cell centers of a uniform grid
+		'''
+
+		x = np.linspace(0, 3, 4)
+		y = np.linspace(0, 2, 3)
+		z = np.linspace(0, 1, 2)
+
+		coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+
+		cell_centers = CellGeometry.getCellCenters(coordinates)
+
+		expected_cell_centers = np.stack(np.meshgrid(
+			x[:-1] + 0.5, y[:-1] + 0.5, z[:-1] + 0.5, indexing='ij'
+		), axis=-1)
+
+		np.testing.assert_allclose(cell_centers, expected_cell_centers)
+
+		pass
+
+	def test_getCellCenters_out(self) :
+		'''
+		Test the cell centers are written into the output array
+		without allocating temporaries of the size of the cells
+		'''
+
+		x = np.linspace(0, 1, 33)
+
+		coordinates = np.stack(np.meshgrid(x, x, x, indexing='ij'), axis=-1)
+
+		cell_centers = np.empty((32, 32, 32, 3))
+
+		tracemalloc.start()
+
+		returned_cell_centers = CellGeometry.getCellCenters(coordinates, cell_centers)
+
+		_, peak_memory = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+		self.assertIs(returned_cell_centers, cell_centers)
+		self.assertLess(peak_memory, cell_centers.nbytes // 4)
+
+		np.testing.assert_allclose(
+			cell_centers,
+			0.5 * (coordinates[:-1, :-1, :-1] + coordinates[1:, 1:, 1:])
+		)
+
+		pass
+
+	def test_getFaceCentersAndAreas(self) :
+		'''
+		Test the face centers and area vectors of the frustum
+		'''
+
+		coordinates = getFrustumCoordinates()
+
+		face_centers, face_areas = CellGeometry.getFaceCentersAndAreas(coordinates, 2)
+
+		self.assertEqual(face_centers.shape, (1, 1, 2, 3))
+
+		np.testing.assert_allclose(face_centers[0, 0, 0], [0.5, 0.5, 0.0])
+		np.testing.assert_allclose(face_centers[0, 0, 1], [0.25, 0.25, 1.0])
+
+		np.testing.assert_allclose(face_areas[0, 0, 0], [0.0, 0.0, 1.0])
+		np.testing.assert_allclose(face_areas[0, 0, 1], [0.0, 0.0, 0.25])
+
+		face_centers, face_areas = CellGeometry.getFaceCentersAndAreas(coordinates, 0)
+
+		self.assertEqual(face_centers.shape, (2, 1, 1, 3))
+
+		# Area vectors point along the positive axis
+		self.assertGreater(face_areas[0, 0, 0, 0], 0)
+		self.assertGreater(face_areas[1, 0, 0, 0], 0)
+
+		pass
+
+	def test_getCellVolumesAndCentroids(self) :
+		'''
+		Test the volume and the volume weighted centroid of the frustum
+		'''
+
+		coordinates = getFrustumCoordinates()
+
+		volumes, centroids = CellGeometry.getCellVolumesAndCentroids(coordinates)
+
+		np.testing.assert_allclose(volumes, [[[7 / 12]]])
+		np.testing.assert_allclose(
+			centroids[0, 0, 0],
+			[0.234375 * 12 / 7, 0.234375 * 12 / 7, 11 / 28]
+		)
+
+		# The average of the corner points is different
+		cell_centers = CellGeometry.getCellCenters(coordinates)
+
+		self.assertAlmostEqual(cell_centers[0, 0, 0, 2], 0.5)
+
+		pass
+
+	def test_getCellVolumesAndCentroids_uniform(self) :
+		'''
+		Test the volume weighted centroids of a uniform grid
+		are the cell centers
+		'''
+
+		x = np.linspace(0, 1, 4)
+		y = np.linspace(0, 2, 3)
+		z = np.linspace(0, 3, 5)
+
+		coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+
+		volumes, centroids = CellGeometry.getCellVolumesAndCentroids(coordinates)
+
+		np.testing.assert_allclose(volumes, np.full((3, 2, 4), 0.75 / 3))
+		np.testing.assert_allclose(centroids, CellGeometry.getCellCenters(coordinates))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,119 @@
+import shutil
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.CellGraph as CellGraph
+
+from pyFOAM_hexBlockMesh.CellGraph import getCellGraph, writeMETISGraph, saveCellGraph
+
+from test_OGrid import setUpOGrid
+
+class TestCellGraph(unittest.TestCase) :
+
+	def test_getCellGraph(self) :
+		'''
+		Test the neighbours of every cell are the cells sharing its internal faces
+		'''
+
+		hex_collection = setUpOGrid()
+
+		faces = hex_collection.getFaces()
+		points = hex_collection.getPoints()
+
+		owner		= np.concatenate([f.owner for f in faces if not f.isBoundary()])
+		neighbour	= np.concatenate([f.neighbour for f in faces if not f.isBoundary()])
+
+		expected = [set() for _ in range(hex_collection.num_cells)]
+
+		for i, j in zip(owner, neighbour) :
+
+			expected[i].add(int(j))
+			expected[j].add(int(i))
+
+		# Chunks smaller than the faces
+		chunk_size = CellGraph.graph_chunk_size
+		CellGraph.graph_chunk_size = 7
+
+		xadj, adjncy, adjwgt = getCellGraph(faces, hex_collection.num_cells, points)
+
+		CellGraph.graph_chunk_size = chunk_size
+
+		self.assertEqual(xadj[-1], 2 * owner.shape[0])
+
+		for i in range(hex_collection.num_cells) :
+
+			self.assertEqual(sorted(adjncy[xadj[i]:xadj[i + 1]]), sorted(expected[i]))
+
+		# Areas of the faces between the cells
+		self.assertTrue(np.all(adjwgt > 0))
+		self.assertEqual(getCellGraph(faces, hex_collection.num_cells)[2], None)
+
+		pass
+
+	def test_writeMETISGraph(self) :
+		'''
+		Test the METIS graph file of a chain of 4 cells with an isolated cell
+		'''
+
+		xadj	= np.array([0, 1, 3, 5, 6, 6])
+		adjncy	= np.array([1, 0, 2, 1, 3, 2])
+
+		test_path = Path('test_graph.metis')
+
+		writeMETISGraph(test_path, xadj, adjncy)
+
+		self.assertEqual(test_path.read_text(), '5 3\n2\n1 3\n2 4\n3\n\n')
+
+		writeMETISGraph(
+			test_path, xadj, adjncy,
+			np.array([1, 2, 3, 4, 100]), np.array([10, 10, 25, 25, 3, 3])
+		)
+
+		self.assertEqual(
+			test_path.read_text(), '5 3 011\n1 2 10\n2 1 10 3 25\n3 2 25 4 3\n4 3 3\n100\n'
+		)
+
+		# Float weights are scaled to integers
+		writeMETISGraph(test_path, xadj, adjncy, edge_weights=np.array([0.5, 0.5, 1, 1, 1e-6, 1e-6]))
+
+		self.assertEqual(test_path.read_text(), '5 3 001\n2 500\n1 500 3 1000\n2 1000 4 1\n3 1\n\n')
+
+		test_path.unlink()
+
+		pass
+
+	def test_saveCellGraph(self) :
+		'''
+		Test the graph arrays are saved
+		'''
+
+		hex_collection = setUpOGrid()
+
+		faces = hex_collection.getFaces()
+
+		test_path = Path('test_cell_graph')
+
+		saveCellGraph(test_path, faces, hex_collection.num_cells, vertex_weights=np.ones(hex_collection.num_cells))
+
+		xadj, adjncy, _ = getCellGraph(faces, hex_collection.num_cells)
+
+		self.assertTrue(np.all(np.load(test_path / 'xadj.npy') == xadj))
+		self.assertTrue(np.all(np.load(test_path / 'adjncy.npy') == adjncy))
+		self.assertTrue(np.all(np.load(test_path / 'vwgt.npy') == 1))
+		self.assertFalse((test_path / 'adjwgt.npy').exists())
+
+		lines = (test_path / 'graph.metis').read_text().splitlines()
+
+		self.assertEqual(lines[0], f'{hex_collection.num_cells} {adjncy.shape[0] // 2} 010')
+		self.assertEqual(len(lines), hex_collection.num_cells + 1)
+
+		shutil.rmtree(test_path)
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
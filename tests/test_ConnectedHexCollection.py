@@ -1,7 +1,13 @@
 import unittest
+
+from pathlib import Path
+
 import numpy as np
 
 from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+
+from test_OGrid import setUpOGrid
 
 class TestConnectedHexCollection(unittest.TestCase) :
 
@@ -254,9 +260,365 @@ class TestConnectedHexCollection(unittest.TestCase) :
 
 		self.assertEqual(len(cell_centers), 16)
 
+		for hex_block in (hex_block1, hex_block2) :
+
+			np.testing.assert_array_equal(
+				cell_centers[hex_block.cell_ID],
+				hex_block.getCellCenterCoordinates()
+			)
+
+		cell_centroids = collection.getCellCenters(volume_weighted=True)
+
+		np.testing.assert_allclose(cell_centroids, cell_centers)
+
+		# Cell IDs of the first block with the first and last IDs in place,
+		# but not varying fastest along axis 0
+		hex_block1.cell_ID = hex_block1.cell_ID.transpose((2, 1, 0)).copy()
+
+		self.assertEqual(hex_block1.cell_ID[0, 0, 0], 0)
+		self.assertEqual(hex_block1.cell_ID[-1, -1, -1], 7)
+
+		cell_centers = collection.getCellCenters()
+
+		for hex_block in (hex_block1, hex_block2) :
+
+			np.testing.assert_array_equal(
+				cell_centers[hex_block.cell_ID],
+				hex_block.getCellCenterCoordinates()
+			)
+
+		# Overlapping cell IDs
+		hex_block2.cell_ID = hex_block1.cell_ID.copy()
+
+		with self.assertRaisesRegex(AssertionError, 'Possible overlapping cell IDs') :
+
+			collection.getCellCenters()
+
+		pass
+
+	def test_topology(self) :
+		'''
+		Test the topology fingerprint and saving and loading the IDs
+		'''
+
+		def setUpCollection() -> ConnectedHexCollection :
+
+			collection = ConnectedHexCollection()
+
+			hex_block1 = HexBlock(2, 2, 2)
+			hex_block2 = HexBlock(2, 2, 2)
+
+			x0 = np.array([0, 0.5, 1])
+			x1 = np.array([1, 1.5, 2])
+			y  = np.array([0, 0.5, 1])
+			z  = np.array([0, 0.5, 1])
+
+			volume = np.stack(np.meshgrid(x0, y, z, indexing='ij'), axis=-1)
+			hex_block1.setPointCoordinates(volume)
+
+			volume = np.stack(np.meshgrid(x1, y, z, indexing='ij'), axis=-1)
+			hex_block2.setPointCoordinates(volume)
+
+			index1 = collection.addHexBlock(hex_block1)
+			index2 = collection.addHexBlock(hex_block2)
+
+			collection.connectHexBlocks(index1, index2, (1, 2, 6, 5), (0, 3, 7, 4))
+
+			return collection
+
+		collection = setUpCollection()
+		collection.assignCellIDs()
+		collection.assignPointIDs()
+
+		other_collection = setUpCollection()
+
+		self.assertEqual(
+			collection.getTopologyFingerprint(),
+			other_collection.getTopologyFingerprint()
+		)
+
+		topology_path = Path('test_topology.npz')
+		collection.saveTopology(topology_path)
+
+		self.assertTrue(other_collection.loadTopology(topology_path))
+
+		for hex_block, other_hex_block in \
+		zip(collection.hex_blocks, other_collection.hex_blocks) :
+
+			np.testing.assert_array_equal(hex_block.cell_ID, other_hex_block.cell_ID)
+			np.testing.assert_array_equal(hex_block.point_ID, other_hex_block.point_ID)
+
+		np.testing.assert_array_equal(collection.getPoints(), other_collection.getPoints())
+
+		# Changing the dimensions changes the fingerprint
+		other_collection = ConnectedHexCollection()
+		other_collection.addHexBlock(HexBlock(2, 2, 3))
+		other_collection.addHexBlock(HexBlock(2, 2, 2))
+
+		self.assertNotEqual(
+			collection.getTopologyFingerprint(),
+			other_collection.getTopologyFingerprint()
+		)
+		self.assertFalse(other_collection.loadTopology(topology_path))
+
+		topology_path.unlink()
+
+		pass
+
+	def test_refinement(self) :
+		'''
+		Test refining and coarsening the O-grid
+		'''
+
+		hex_collection = setUpOGrid()
+
+		for refined_collection in (
+			hex_collection.getRefinedCollection(2, max_workers=2),
+			hex_collection.getRefinedCollection([(1, 1, 3)] * 5),
+		) :
+
+			refined_collection.assignCellIDs()
+			refined_collection.assignPointIDs()
+
+			points = refined_collection.getPoints()
+			cell_centers = refined_collection.getCellCenters()
+
+			for face_collection in refined_collection.getFaces() :
+
+				if face_collection.isBoundary() :
+
+					self.assertTrue(checkBoundaryFaces(face_collection, points, cell_centers))
+
+				else :
+
+					self.assertTrue(checkInteriorFaces(face_collection, points, cell_centers))
+
+			# The volume is unchanged
+			self.assertAlmostEqual(
+				sum(hex_block.getCellVolumes().sum() for hex_block in refined_collection.hex_blocks),
+				sum(hex_block.getCellVolumes().sum() for hex_block in hex_collection.hex_blocks)
+			)
+
+		refined_collection = hex_collection.getRefinedCollection((2, 2, 4))
+
+		self.assertEqual(refined_collection.hex_blocks[0].cell_ID.shape, (4, 4, 8))
+
+		# Coarsening recovers the original points exactly
+		coarsened_collection = refined_collection.getCoarsenedCollection((2, 2, 4))
+
+		for hex_block, coarsened_hex_block in \
+		zip(hex_collection.hex_blocks, coarsened_collection.hex_blocks) :
+
+			np.testing.assert_array_equal(
+				hex_block.point_coordinates, coarsened_hex_block.point_coordinates
+			)
+
+		# Axis 0 of the positive x block is connected to
+		# axis 1 of the positive y block
+		with self.assertRaises(AssertionError) :
+
+			hex_collection.getRefinedCollection((2, 3, 1))
+
+		with self.assertRaises(AssertionError) :
+
+			hex_collection.getCoarsenedCollection(3)
+
+		pass
+
+	def test_patches(self) :
+		'''
+		Test grouping the boundary faces into patches
+		'''
+
+		hex_collection = setUpOGrid()
+
+		hex_collection.addPatch(
+			'outer',
+			[(1, (1, 2, 6, 5)), (2, (3, 2, 6, 7)), (3, (0, 3, 7, 4)), (4, (2, 3, 7, 6))],
+			'wall'
+		)
+
+		hex_collection.addPatch(
+			'bottom',
+			[(i, (0, 1, 2, 3)) for i in range(5)]
+		)
+
+		faces = hex_collection.getFaces()
+
+		# 5 top faces are separate patches without a default patch
+		self.assertEqual(
+			[face.name for face in faces[1:]],
+			[f'Hex_{i}_Face_4567' for i in range(5)] + ['outer', 'bottom']
+		)
+
+		self.assertEqual(faces[-2].patch_type, 'wall')
+		self.assertEqual(faces[-2].getSize(), 4 * 4)
+
+		# Faces of the patch are in the order of the hex block faces
+		np.testing.assert_array_equal(
+			faces[-2].vertices[:4],
+			hex_collection.hex_blocks[1].getSurface((1, 2, 6, 5)).flatten().vertices
+		)
+
+		fingerprint = hex_collection.getTopologyFingerprint()
+
+		hex_collection.setDefaultPatch('top', 'symmetry')
+
+		self.assertNotEqual(hex_collection.getTopologyFingerprint(), fingerprint)
+
+		faces = hex_collection.getFaces()
+
+		self.assertEqual([face.name for face in faces[1:]], ['outer', 'bottom', 'top'])
+		self.assertEqual(faces[-1].getSize(), 5 * 4)
+
+		with self.assertRaises(AssertionError) :
+
+			# Connected face
+			hex_collection.addPatch('center', [(0, (1, 2, 6, 5))])
+
+		with self.assertRaises(AssertionError) :
+
+			# Face already in a patch
+			hex_collection.addPatch('other', [(1, (2, 1, 5, 6))])
+
+		pass
+
+	def test_addHexBlockLattice(self) :
+		'''
+		Test a lattice of hex blocks is connected along the 3 axes
+		'''
+
+		def getHexBlock(index:tuple[int, int, int]) -> HexBlock :
+
+			hex_block = HexBlock(2, 1, 3)
+
+			hex_block.setPointCoordinates(np.stack(np.meshgrid(
+				*(np.linspace(i, i + 1, n + 1) for i, n in zip(index, (2, 1, 3))),
+				indexing='ij'
+			), axis=-1))
+
+			return hex_block
+
+		lattice_shape = (3, 2, 4)
+
+		hex_collection = ConnectedHexCollection()
+		hex_collection.addHexBlock(getHexBlock((-1, 0, 0)))
+
+		indices = hex_collection.addHexBlockLattice([
+			[[getHexBlock((i, j, k)) for k in range(4)] for j in range(2)] for i in range(3)
+		])
+
+		np.testing.assert_array_equal(indices, np.arange(1, 25).reshape(lattice_shape))
+
+		# Interfaces along each axis
+		self.assertEqual(len(hex_collection.connect_infos), 2 * 2 * 4 + 3 * 1 * 4 + 3 * 2 * 3)
+
+		self.assertTrue(hex_collection.isHexFaceConnected(int(indices[0, 0, 0]), (1, 2, 6, 5)))
+		self.assertFalse(hex_collection.isHexFaceConnected(int(indices[0, 0, 0]), (0, 3, 7, 4)))
+
+		# The block outside the lattice is connected to the lattice
+		hex_collection.connectHexBlocks(0, int(indices[0, 0, 0]), (1, 2, 6, 5), (0, 3, 7, 4))
+
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+		self.assertEqual(hex_collection.num_cells, 25 * 6)
+		self.assertEqual(hex_collection.num_points, (3 * 2 + 1) * (2 * 1 + 1) * (4 * 3 + 1) + 3 * 2 * 4 - 2 * 4)
+
+		points = hex_collection.getPoints()
+		cell_centers = hex_collection.getCellCenters()
+
+		for face_collection in hex_collection.getFaces() :
+
+			if face_collection.isBoundary() :
+
+				self.assertTrue(checkBoundaryFaces(face_collection, points, cell_centers))
+
+			else :
+
+				self.assertTrue(checkInteriorFaces(face_collection, points, cell_centers))
+
+		pass
+
+	def test_connectHexBlockTable(self) :
+		'''
+		Test the rows of the table are validated together
+		'''
+
+		reference_collection = setUpOGrid()
+
+		table = np.array([
+			(connect_info.hex_block_id_0, connect_info.hex_block_id_1) +
+			connect_info.face_vertices_0 + connect_info.face_vertices_1
+			for connect_info in reference_collection.connect_infos
+		])
+
+		def setUpCollection() -> ConnectedHexCollection :
+
+			hex_collection = ConnectedHexCollection()
+
+			for hex_block in reference_collection.hex_blocks :
+
+				hex_collection.addHexBlock(hex_block)
+
+			return hex_collection
+
+		# Swapped faces do not match
+		invalid_table = table.copy()
+		invalid_table[[1, 4], 2:6] = invalid_table[[1, 4], 2:6][:, [1, 0, 3, 2]]
+
+		hex_collection = setUpCollection()
+
+		with self.assertRaisesRegex(AssertionError, r'rows \[1 4\]') :
+
+			hex_collection.connectHexBlockTable(invalid_table)
+
+		self.assertEqual(len(hex_collection.connect_infos), 0)
+
+		# Repeated face
+		with self.assertRaisesRegex(AssertionError, 'more than once') :
+
+			hex_collection.connectHexBlockTable(np.concatenate((table, table[:1])))
+
+		hex_collection.connectHexBlockTable(table)
+
+		for connect_info, reference_connect_info in \
+		zip(hex_collection.connect_infos, reference_collection.connect_infos) :
+
+			self.assertEqual(connect_info, reference_connect_info)
+
+		with self.assertRaisesRegex(AssertionError, 'already connected') :
+
+			hex_collection.connectHexBlockTable(table[:1])
+
+		pass
+
+	def test_connectHexBlockTable_shapes(self) :
+		'''
+		Test the rows of faces with different number of points
+		are reported together across the face vertices of the rows
+		'''
+
+		hex_collection = ConnectedHexCollection()
+
+		for shape in ((2, 2, 2), (2, 2, 3), (2, 2, 2), (2, 3, 2)) :
+
+			hex_collection.addHexBlock(HexBlock(*shape))
+
+		table = np.array([
+			(0, 1, 3, 2, 6, 7, 0, 1, 5, 4),
+			(0, 2, 0, 3, 7, 4, 1, 2, 6, 5),
+			(0, 3, 1, 2, 6, 5, 0, 3, 7, 4),
+		])
+
+		with self.assertRaisesRegex(AssertionError, r'different number of points in rows \[0, 2\]') :
+
+			hex_collection.connectHexBlockTable(table)
+
+		self.assertEqual(len(hex_collection.connect_infos), 0)
+
 		pass
 
 if __name__ == '__main__' :
-	
+
 	unittest.main()
-		
\ No newline at end of file
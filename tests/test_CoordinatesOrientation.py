@@ -1,7 +1,8 @@
 import unittest
 import numpy as np
 
-from pyFOAM_hexBlockMesh.geometry_utils.CoordinatesOrientation import checkCoordinatesOrientation
+from pyFOAM_hexBlockMesh.geometry_utils.CoordinatesOrientation import \
+checkCoordinatesOrientation, getCellJacobianInfo
 
 class TestCoordinatesOrientation(unittest.TestCase) :
 
@@ -48,6 +49,46 @@ class TestCoordinatesOrientation(unittest.TestCase) :
 		
 		self.assertTrue(result, 'Simple cube should have positive orientation')
 
+	def test_checkCoordinatesOrientation_inverted_corner(self) :
+		'''
+		Test a cell that is only inverted at the corner opposite to the origin.
+		'''
+		x = np.array([0., 1.])
+		y = np.array([0., 1.])
+		z = np.array([0., 1.])
+
+		coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+		coordinates[1, 1, 1] = (0.1, 0.1, 0.1)
+
+		result = checkCoordinatesOrientation(coordinates)
+
+		self.assertFalse(result, 'Cell is inverted at the corner (1, 1, 1)')
+
+	def test_getCellJacobianInfo(self) :
+		'''
+		Test the minimum Jacobian and the inverted cells
+		are independent of the chunk size.
+		'''
+		x = np.linspace(0, 4, 5, dtype=float)
+		y = np.linspace(0, 3, 4, dtype=float)
+		z = np.linspace(0, 2, 3, dtype=float)
+
+		coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+		coordinates[2, 1, 1] = (1.2, 0.2, 0.2)
+
+		for chunk_size in (1, 5, 100) :
+
+			minimum_jacobian, inverted_cells = \
+			getCellJacobianInfo(coordinates, chunk_size)
+
+			self.assertLess(minimum_jacobian, 0)
+			np.testing.assert_array_equal(
+				inverted_cells,
+				np.array([[1, 0, 0]])
+			)
+
+		pass
+
 
 if __name__ == '__main__' :
 
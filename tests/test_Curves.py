@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.Curves as Curves
+
+class TestCurves(unittest.TestCase) :
+
+	def test_arcs(self) :
+		'''
+		Test the arcs lie on their circles and end at their ends
+		'''
+
+		parameters = np.linspace(0.0, 1.0, 11)
+
+		# Three quarters of the unit circle in the xy plane
+		start	= np.array([1.0, 0.0, 0.0])
+		end	= np.array([0.0, -1.0, 0.0])
+		point	= np.array([-1.0, 0.0, 0.0])
+
+		points = Curves.getArcCurve(start, end, point)(parameters)
+
+		self.assertTrue(np.allclose(np.linalg.norm(points, axis=-1), 1.0))
+		self.assertTrue(np.all(points[0] == start))
+		self.assertTrue(np.all(points[-1] == end))
+		self.assertTrue(np.allclose(points[5], (-np.sqrt(0.5), np.sqrt(0.5), 0.0)))
+
+		# Quarter circle with the radius growing from 1 to 2
+		points = Curves.getOriginArcCurve(start, 2.0 * np.array([0.0, 0.0, 1.0]), np.zeros(3))(parameters)
+
+		self.assertTrue(np.allclose(np.linalg.norm(points, axis=-1), 1.0 + parameters))
+		self.assertTrue(np.allclose(points[:, 1], 0.0))
+
+		with self.assertRaises(AssertionError) :
+
+			Curves.getArcCurve(start, -start, np.zeros(3))
+
+		pass
+
+	def test_splines(self) :
+		'''
+		Test the spline and the polyline pass through their points
+		'''
+
+		points = np.array([[0, 0, 0], [1, 1, 0], [2, 0, 0], [4, 0, 0]], dtype=float)
+
+		spline = Curves.getSplineCurve(points)
+
+		self.assertTrue(np.allclose(spline(np.linspace(0.0, 1.0, 4)), points))
+
+		polyline = Curves.getPolyLineCurve(points)
+
+		lengths = np.array([0.0, np.sqrt(2), 2 * np.sqrt(2), 2 * np.sqrt(2) + 2])
+
+		self.assertTrue(np.allclose(polyline(lengths / lengths[-1]), points))
+		self.assertTrue(np.allclose(polyline(np.array([1.0 - 1.0 / lengths[-1]])), [[3, 0, 0]]))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,221 @@
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FieldMapping import getAxisWeights, mapCellValues, mapPatchValues, mapVolField
+from pyFOAM_hexBlockMesh.Fields import readVolField, writeVolField
+
+def setUpTwoBoxes(n0:int, n1:int, n2:int) -> ConnectedHexCollection :
+	'''
+	Set up 2 connected n0 x n1 x n2 hex blocks of unit cubes along x
+	with a bottom patch at z = 0 and assigned IDs
+	'''
+
+	collection = ConnectedHexCollection()
+
+	for x_start in (0, 1) :
+
+		x = np.linspace(x_start, x_start + 1, n0 + 1)
+		y = np.linspace(0, 1, n1 + 1)
+		z = np.linspace(0, 1, n2 + 1)
+
+		hex_block = HexBlock(n0, n1, n2)
+		hex_block.setPointCoordinates(np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1))
+
+		collection.addHexBlock(hex_block)
+
+	collection.connectHexBlocks(0, 1, (1, 2, 6, 5), (0, 3, 7, 4))
+	collection.addPatch('bottom', [(0, (0, 3, 2, 1)), (1, (0, 3, 2, 1))], 'wall')
+
+	collection.assignCellIDs()
+	collection.assignPointIDs()
+
+	return collection
+
+def linearField(x:np.ndarray) -> np.ndarray :
+	'''
+	Vector field varying linearly with the coordinates
+	'''
+
+	return np.stack((x[:, 0] + 2 * x[:, 1], 3 * x[:, 2] - x[:, 0], np.ones(x.shape[0])), axis=-1)
+
+class TestFieldMapping(unittest.TestCase) :
+
+	def test_getAxisWeights(self) :
+		'''
+		Test the interpolation of the cells along an axis
+		'''
+
+		lower, upper, weights = getAxisWeights(2, 4)
+
+		self.assertTrue(np.all(lower == 0))
+		self.assertTrue(np.all(upper == 1))
+		self.assertTrue(np.allclose(weights, [0, 0.25, 0.75, 1]))
+
+		# Coarsening takes the averages of the pairs of cells
+		lower, upper, weights = getAxisWeights(4, 2)
+
+		self.assertTrue(np.all(lower == [0, 2]))
+		self.assertTrue(np.all(upper == [1, 3]))
+		self.assertTrue(np.allclose(weights, 0.5))
+
+		# A single cell
+		lower, upper, weights = getAxisWeights(1, 3)
+
+		self.assertTrue(np.all(lower == 0) and np.all(upper == 0))
+
+		pass
+
+	def test_mapCellValues(self) :
+		'''
+		Test a linear field is reproduced between the outermost source cell centers
+		'''
+
+		source_collection = setUpTwoBoxes(2, 3, 4)
+		target_collection = setUpTwoBoxes(5, 4, 8)
+
+		values = linearField(source_collection.getCellCenters())
+
+		mapped = mapCellValues(source_collection, target_collection, values)
+
+		target_centers = target_collection.getCellCenters()
+
+		# Target cell centers clipped to the outermost source cell centers of their hex block
+		half_cells = 0.5 / np.array([2, 3, 4])
+
+		block_starts = np.where(target_centers[:, 0] < 1, 0, 1)[:, None] * np.array([1, 0, 0])
+
+		clipped = np.clip(target_centers, block_starts + half_cells, block_starts + 1 - half_cells)
+
+		self.assertEqual(mapped.shape, (target_collection.num_cells, 3))
+		self.assertTrue(np.allclose(mapped, linearField(clipped)))
+
+		# Mapping back to the same resolution is the identity
+		self.assertTrue(np.allclose(mapCellValues(source_collection, source_collection, values), values))
+
+		with self.assertRaisesRegex(AssertionError, 'different numbers of hex blocks') :
+
+			other_collection = ConnectedHexCollection()
+			other_collection.addHexBlock(source_collection.hex_blocks[0])
+
+			mapCellValues(source_collection, other_collection, values)
+
+		pass
+
+	def getFaceCenters(self, hex_collection:ConnectedHexCollection, patch_name:str) -> np.ndarray :
+		'''
+		Get the centers of the faces of the patch
+		'''
+
+		faces = next(faces for faces in hex_collection.getFaces() if faces.name == patch_name)
+
+		return hex_collection.getPoints()[faces.vertices].mean(axis=1)
+
+	def test_mapPatchValues(self) :
+		'''
+		Test a linear field is reproduced on the patch between the outermost
+		source face centers of every hex block
+		'''
+
+		source_collection = setUpTwoBoxes(2, 3, 4)
+		target_collection = setUpTwoBoxes(5, 4, 8)
+
+		values = linearField(self.getFaceCenters(source_collection, 'bottom'))
+
+		mapped = mapPatchValues(source_collection, target_collection, 'bottom', values)
+
+		target_centers = self.getFaceCenters(target_collection, 'bottom')
+
+		# Target face centers clipped in the plane of the patch
+		half_faces = 0.5 / np.array([2, 3, 1e9])
+
+		block_starts = np.where(target_centers[:, 0] < 1, 0, 1)[:, None] * np.array([1, 0, 0])
+
+		clipped = np.clip(target_centers, block_starts + half_faces, block_starts + 1 - half_faces)
+
+		self.assertEqual(mapped.shape, (2 * 5 * 4, 3))
+		self.assertTrue(np.allclose(mapped, linearField(clipped)))
+
+		# Mapping back to the same resolution is the identity
+		self.assertTrue(np.allclose(mapPatchValues(source_collection, source_collection, 'bottom', values), values))
+
+		with self.assertRaisesRegex(AssertionError, 'Patch top is not in both hex collections') :
+
+			mapPatchValues(source_collection, target_collection, 'top', values)
+
+		pass
+
+	def test_mapVolField(self) :
+		'''
+		Test the field file of the source mesh is mapped to the target mesh
+		'''
+
+		source_collection = setUpTwoBoxes(2, 2, 2)
+		target_collection = setUpTwoBoxes(4, 3, 2)
+
+		target_faces = target_collection.getFaces()
+
+		patch_names = [faces.name for faces in target_faces if faces.isBoundary()]
+
+		source_path = Path('U_source')
+		target_path = Path('U_target')
+
+		source_faces = source_collection.getFaces()
+		source_points = source_collection.getPoints()
+
+		bottom_faces = next(faces for faces in source_faces if faces.name == 'bottom')
+
+		writeVolField(
+			source_path, source_collection, linearField, [0, 1, -1, 0, 0, 0, 0],
+			{
+				'bottom' : {
+					'type' : 'mixed',
+					'refValue' : linearField,
+					'refGradient' : (0, 0, 1),
+					'valueFraction' : 'uniform 1',
+					'value' : np.ones((bottom_faces.owner.shape[0], 3)),
+				},
+				patch_names[1] : {'type' : 'fixedValue', 'value' : (1, 0, 0)},
+			},
+			format='binary', faces=source_faces, points=source_points
+		)
+
+		mapVolField(source_path, target_path, source_collection, target_collection, target_faces=target_faces)
+
+		dimensions, internal_field, boundary_field = readVolField(target_path)
+
+		source_path.unlink()
+		target_path.unlink()
+
+		expected = mapCellValues(source_collection, target_collection, linearField(source_collection.getCellCenters()))
+
+		expected_ref_values = mapPatchValues(
+			source_collection, target_collection, 'bottom',
+			linearField(source_points[bottom_faces.vertices].mean(axis=1))
+		)
+
+		self.assertEqual(dimensions, '[0 1 -1 0 0 0 0]')
+		self.assertTrue(np.allclose(internal_field, expected))
+		self.assertEqual(list(boundary_field), patch_names)
+
+		# The patch values are mapped, not replaced by the values of the cells
+		bottom = boundary_field['bottom']
+
+		self.assertEqual(bottom['type'], 'mixed')
+		self.assertTrue(np.allclose(bottom['refValue'], expected_ref_values))
+		self.assertTrue(np.allclose(bottom['value'], 1))
+		self.assertEqual(bottom['value'].shape, (2 * 4 * 3, 3))
+		self.assertEqual(bottom['refGradient'], (0, 0, 1))
+		self.assertEqual(bottom['valueFraction'], 1)
+
+		self.assertEqual(boundary_field[patch_names[1]]['value'], (1, 0, 0))
+		self.assertEqual(boundary_field[patch_names[2]], {'type' : 'zeroGradient'})
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,204 @@
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Fields as Fields
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.Fields import writeVolField, readVolField
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import readFoamFile, getBinaryDtypes, readList
+
+from test_OGrid import setUpOGrid
+
+def readEntry(data:bytes, start:int, keyword:bytes, header:dict, item_shape:tuple) -> np.ndarray :
+	'''
+	Read the nonuniform list of the first keyword entry after start
+	'''
+
+	start = data.index(keyword, start) + len(keyword)
+	start = data.index(b'>', start) + 1
+
+	_, scalar_dtype = getBinaryDtypes(header)
+
+	return readList(data, start, header['format'] == 'binary', scalar_dtype, item_shape)[0]
+
+class TestFields(unittest.TestCase) :
+
+	def test_writeVolField(self) :
+		'''
+		Test the values of functions of the cell and face centers are written
+		'''
+
+		hex_collection = setUpOGrid()
+
+		faces = hex_collection.getFaces()
+		points = hex_collection.getPoints()
+		cell_centers = hex_collection.getCellCenters()
+
+		patch_name = next(f.name for f in faces if f.isBoundary())
+		patch_faces = next(f for f in faces if f.name == patch_name)
+		face_centers = points[patch_faces.vertices].mean(axis=1)
+
+		velocity = lambda x : np.stack((x[:, 1], -x[:, 0], np.ones(x.shape[0])), axis=-1)
+
+		test_path = Path('U')
+
+		# Chunks smaller than the cells
+		chunk_size = Fields.field_chunk_size
+		Fields.field_chunk_size = 7
+
+		for format in ('ascii', 'binary') :
+
+			writeVolField(
+				test_path, hex_collection, velocity, [0, 1, -1, 0, 0, 0, 0],
+				{patch_name : {'type' : 'fixedValue', 'value' : velocity}},
+				format=format, faces=faces, points=points, cell_centers=cell_centers
+			)
+
+			header, data, start = readFoamFile(test_path)
+
+			self.assertEqual(header['class'], 'volVectorField')
+			self.assertEqual(header['format'], format)
+
+			self.assertTrue(np.allclose(readEntry(data, start, b'internalField', header, (3,)), velocity(cell_centers)))
+			self.assertTrue(np.allclose(readEntry(data, start, b'\tvalue', header, (3,)), velocity(face_centers)))
+
+			text = data.decode(errors='ignore')
+
+			self.assertIn('dimensions\t[0 1 -1 0 0 0 0];', text)
+
+			for faces_i in faces :
+
+				if faces_i.isBoundary() : self.assertIn(f'\t{faces_i.name}\n', text)
+
+		Fields.field_chunk_size = chunk_size
+
+		# Uniform scalar field
+		writeVolField(test_path, hex_collection, 1.5, '[0 2 -2 0 0 0 0]', {patch_name : {'type' : 'fixedValue', 'value' : 2}})
+
+		header, data, _ = readFoamFile(test_path)
+
+		self.assertEqual(header['class'], 'volScalarField')
+		self.assertIn(b'internalField\tuniform 1.5;', data)
+		self.assertIn(b'\t\tvalue\tuniform 2;', data)
+		self.assertIn(b'\t\ttype\tzeroGradient;', data)
+
+		with self.assertRaisesRegex(AssertionError, 'Value of value does not match the field') :
+
+			writeVolField(test_path, hex_collection, 1.5, '[0 2 -2 0 0 0 0]', {patch_name : {'value' : (1, 2, 3)}})
+
+		with self.assertRaisesRegex(AssertionError, 'Patch missing is not in the mesh') :
+
+			writeVolField(test_path, hex_collection, 1.5, '[0 2 -2 0 0 0 0]', {'missing' : {'type' : 'zeroGradient'}})
+
+		test_path.unlink()
+
+		pass
+
+	def test_readVolField(self) :
+		'''
+		Test the entries of the written field files are read back
+		'''
+
+		hex_collection = setUpOGrid()
+
+		cell_centers = hex_collection.getCellCenters()
+
+		patch_names = [f.name for f in hex_collection.getFaces() if f.isBoundary()]
+
+		test_path = Path('T')
+
+		for format in ('ascii', 'binary') :
+
+			writeVolField(
+				test_path, hex_collection, cell_centers[:, 0], [0, 0, 0, 1, 0, 0, 0],
+				{
+					patch_names[0] : {'type' : 'fixedValue', 'value' : lambda x : x[:, 1]},
+					patch_names[1] : {'type' : 'inletOutlet', 'inletValue' : 300, 'value' : 'uniform 300'},
+				},
+				format=format
+			)
+
+			dimensions, internal_field, boundary_field = readVolField(test_path)
+
+			self.assertEqual(dimensions, '[0 0 0 1 0 0 0]')
+			self.assertTrue(np.allclose(internal_field, cell_centers[:, 0]))
+			self.assertEqual(list(boundary_field), patch_names)
+
+			self.assertEqual(boundary_field[patch_names[0]]['type'], 'fixedValue')
+			self.assertEqual(boundary_field[patch_names[0]]['value'].shape, (4,))
+			self.assertEqual(boundary_field[patch_names[1]], {'type' : 'inletOutlet', 'inletValue' : 300, 'value' : 300})
+			self.assertEqual(boundary_field[patch_names[2]], {'type' : 'zeroGradient'})
+
+		test_path.unlink()
+
+		pass
+
+	def test_ambiguousValues(self) :
+		'''
+		Test (3,) arrays on 3 cells and 3 faces are uniform vectors of vector fields
+		and values of the cells of scalar fields
+		'''
+
+		hex_block = HexBlock(3, 1, 1)
+		hex_block.setPointCoordinates(np.stack(np.meshgrid(
+			np.linspace(0, 3, 4), np.array([0., 1.]), np.array([0., 1.]), indexing='ij'
+		), axis=-1))
+
+		hex_collection = ConnectedHexCollection()
+		hex_collection.addHexBlock(hex_block)
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+		# Patch of the 3 faces at z = 0
+		patch_name = 'Hex_0_Face_0321'
+
+		value = np.array([1., 0., 0.])
+
+		test_path = Path('U')
+
+		writeVolField(
+			test_path, hex_collection, value, [0, 1, -1, 0, 0, 0, 0],
+			{patch_name : {'type' : 'fixedValue', 'value' : value}}, field_type='vector'
+		)
+
+		header, data, _ = readFoamFile(test_path)
+
+		self.assertEqual(header['class'], 'volVectorField')
+		self.assertIn(b'internalField\tuniform (1 0 0);', data)
+		self.assertIn(b'\t\tvalue\tuniform (1 0 0);', data)
+
+		writeVolField(
+			test_path, hex_collection, value, [0, 2, -2, 0, 0, 0, 0],
+			{patch_name : {'type' : 'fixedValue', 'value' : value}}, field_type='scalar'
+		)
+
+		header, _, _ = readFoamFile(test_path)
+		_, internal_field, boundary_field = readVolField(test_path)
+
+		self.assertEqual(header['class'], 'volScalarField')
+		self.assertTrue(np.array_equal(internal_field, value))
+		self.assertTrue(np.array_equal(boundary_field[patch_name]['value'], value))
+
+		# Tuples are always uniform
+		writeVolField(test_path, hex_collection, (1, 0, 0), [0, 1, -1, 0, 0, 0, 0])
+
+		self.assertEqual(readFoamFile(test_path)[0]['class'], 'volVectorField')
+
+		with self.assertRaisesRegex(AssertionError, 'Ambiguous') :
+
+			writeVolField(test_path, hex_collection, value, [0, 1, -1, 0, 0, 0, 0])
+
+		with self.assertRaisesRegex(AssertionError, 'Internal field is not a scalar field') :
+
+			writeVolField(test_path, hex_collection, np.ones((3, 3)), [0, 1, -1, 0, 0, 0, 0], field_type='scalar')
+
+		test_path.unlink()
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from pyFOAM_hexBlockMesh.writer_utils.FoamDictionary import parseFoamDictionary, parseFoamList
+
+class TestFoamDictionary(unittest.TestCase) :
+
+	def test_parseFoamDictionary(self) :
+		'''
+		Test the entries, lists, sub-dictionaries, comments and variables are parsed
+		'''
+
+		dictionary = parseFoamDictionary('''
+		FoamFile
+		{
+			format	ascii; // Comment
+			object	"blockMeshDict";
+		}
+		/* Multi-line
+		comment ; { */
+		x0	-1.5e-1;
+		n	10;
+		point	(0 $x0 1);
+		blocks	( hex (0 1 2 3 4 5 6 7) ($n 20 1) simpleGrading (1 ((0.2 0.3 4) (0.8 0.7 1)) 1) );
+		boundary
+		(
+			inlet { type patch; faces ((0 4 7 3)); }
+		);
+		nu	[0 2 -1 0 0 0 0] 1e-05;
+		''')
+
+		self.assertEqual(dictionary['FoamFile'], {'format' : 'ascii', 'object' : 'blockMeshDict'})
+		self.assertEqual(dictionary['x0'], -0.15)
+		self.assertEqual(dictionary['point'], [0, -0.15, 1])
+		self.assertEqual(dictionary['blocks'], [
+			'hex', [0, 1, 2, 3, 4, 5, 6, 7], [10, 20, 1],
+			'simpleGrading', [1, [[0.2, 0.3, 4], [0.8, 0.7, 1]], 1]
+		])
+		self.assertEqual(dictionary['boundary'], [
+			'inlet', {'type' : 'patch', 'faces' : [[0, 4, 7, 3]]}
+		])
+		self.assertEqual(dictionary['nu'], [[0, 2, -1, 0, 0, 0, 0], 1e-05])
+
+		self.assertIsInstance(dictionary['n'], int)
+
+		with self.assertRaisesRegex(ValueError, 'Variable \\$y is not defined') :
+
+			parseFoamDictionary('x $y;')
+
+		with self.assertRaisesRegex(ValueError, 'Unsupported directive #include') :
+
+			parseFoamDictionary('#include "file"')
+
+		with self.assertRaisesRegex(ValueError, 'Unexpected ; while expecting \\)') :
+
+			parseFoamDictionary('x (1 2;')
+
+		pass
+
+	def test_parseFoamList(self) :
+		'''
+		Test a list with a size, as in a boundary file, is parsed
+		'''
+
+		items = parseFoamList('''
+		2
+		(
+			inlet { type patch; nFaces 4; startFace 10; }
+			walls { type wall; inGroups List<word> 1(wall); nFaces 8; startFace 14; }
+		)
+		''')
+
+		self.assertEqual(items, [
+			'inlet', {'type' : 'patch', 'nFaces' : 4, 'startFace' : 10},
+			'walls', {'type' : 'wall', 'inGroups' : ['List<word>', 1, ['wall']], 'nFaces' : 8, 'startFace' : 14},
+		])
+
+		self.assertEqual(parseFoamList('(1 2)'), [1, 2])
+
+		with self.assertRaisesRegex(ValueError, 'Unexpected 3 after the list') :
+
+			parseFoamList('(1 2) 3')
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.geometry_utils.Grading as Grading
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map
+
+def getBoxVertices(
+	start:tuple[float, float, float],
+	end:tuple[float, float, float]
+) -> np.ndarray :
+	'''
+	Get the (8, 3) vertices of a box from start to end
+	'''
+
+	vertices = np.array([
+		[e if index == -1 else s for index, s, e in zip(vertex, start, end)]
+		for vertex in vertex_map
+	], dtype=float)
+
+	return vertices
+
+class TestGrading(unittest.TestCase) :
+
+	def test_getSectionDistribution(self) :
+		'''
+		Test the ratio of the last to the first cell size is the expansion ratio
+		'''
+
+		for expansion_ratio in (0.1, 1.0, 5.0) :
+
+			distribution = Grading.getSectionDistribution(10, expansion_ratio)
+			cell_sizes = np.diff(distribution)
+
+			self.assertEqual(distribution[0], 0.0)
+			self.assertEqual(distribution[-1], 1.0)
+			self.assertAlmostEqual(cell_sizes[-1] / cell_sizes[0], expansion_ratio)
+
+			# Constant ratio of consecutive cell sizes
+			np.testing.assert_allclose(
+				cell_sizes[1:] / cell_sizes[:-1],
+				np.full(9, expansion_ratio ** (1 / 9))
+			)
+
+		distribution = Grading.getSectionDistribution(2_000_000, 1e3)
+
+		self.assertEqual(distribution.shape, (2_000_001,))
+		self.assertTrue(np.all(np.diff(distribution) > 0))
+
+		pass
+
+	def test_getGradingDistribution_multiGrading(self) :
+		'''
+		Test the multi-grading sections of blockMesh
+		'''
+
+		grading = [(0.2, 0.3, 4.0), (0.6, 0.4, 1.0), (0.2, 0.3, 0.25)]
+
+		distribution = Grading.getGradingDistribution(20, grading)
+
+		self.assertEqual(distribution.shape, (21,))
+
+		np.testing.assert_allclose(distribution[[0, 6, 14, 20]], [0.0, 0.2, 0.8, 1.0])
+		np.testing.assert_allclose(np.diff(distribution[6:15]), np.full(8, 0.6 / 8))
+
+		# The grading is symmetric
+		np.testing.assert_allclose(distribution, 1.0 - distribution[::-1], atol=1e-15)
+
+		reversed_distribution = Grading.getGradingDistribution(
+			20, Grading.reverseGrading([(0.5, 0.5, 2.0), (0.5, 0.5, 3.0)])
+		)
+		distribution = Grading.getGradingDistribution(20, [(0.5, 0.5, 2.0), (0.5, 0.5, 3.0)])
+
+		np.testing.assert_allclose(reversed_distribution, 1.0 - distribution[::-1], atol=1e-15)
+
+		pass
+
+	def test_getGradedEdges(self) :
+		'''
+		Test simpleGrading and curved edges
+		'''
+
+		vertices = getBoxVertices((0, 0, 0), (1, 1, 1))
+
+		edges = Grading.getGradedEdges((4, 2, 2), vertices, (2.0, 1.0, 1.0))
+
+		for edge in ((0, 1), (3, 2), (7, 6), (4, 5)) :
+
+			cell_sizes = np.diff(edges[edge][:, 0])
+
+			self.assertAlmostEqual(cell_sizes[-1] / cell_sizes[0], 2.0)
+
+		np.testing.assert_allclose(edges[(0, 3)][:, 1], [0.0, 0.5, 1.0])
+
+		# Half circle from vertex 2 to vertex 1, i.e., in the reversed direction
+		def circle(t:np.ndarray) -> np.ndarray :
+
+			angle = 0.5 * np.pi * np.asarray(t)
+
+			# From (1, 1, 0) to (1, 0, 0) bulging towards positive x
+			return np.stack((
+				1 + 0.5 * np.sin(2 * angle),
+				0.5 + 0.5 * np.cos(2 * angle),
+				np.zeros_like(angle)
+			), axis=-1)
+
+		edges = Grading.getGradedEdges((4, 4, 2), vertices, 1.0, {(2, 1) : circle})
+
+		points = edges[(1, 2)]
+
+		np.testing.assert_allclose(points[0], vertices[1], atol=1e-12)
+		np.testing.assert_allclose(points[-1], vertices[2], atol=1e-12)
+		np.testing.assert_allclose(np.linalg.norm(points - [1, 0.5, 0], axis=-1), 0.5)
+
+		# Points are uniformly distributed along the arc length
+		arc_lengths = np.linalg.norm(np.diff(points, axis=0), axis=-1)
+		np.testing.assert_allclose(arc_lengths, arc_lengths[0], rtol=1e-3)
+
+		pass
+
+	def test_sharedEdges(self) :
+		'''
+		Test the points on the faces shared by graded hex blocks are identical
+		'''
+
+		block_0 = HexBlock(4, 3, 2)
+		block_1 = HexBlock(5, 3, 2)
+
+		# Grading along y is 3 in block 0 and
+		# its reverse in block 1, which is traversed in the opposite direction
+		block_0.setGradedCoordinates(
+			getBoxVertices((0, 0, 0), (1, 1, 1)), (2.0, 3.0, 1.0)
+		)
+
+		vertices_1 = getBoxVertices((1, 0, 0), (2, 1, 1))
+
+		# Rotate block 1 by 180 degrees about the z axis through (1.5, 0.5)
+		vertices_1 = vertices_1[[2, 3, 0, 1, 6, 7, 4, 5]]
+
+		block_1.setGradedCoordinates(vertices_1, (0.5, 1.0 / 3.0, 1.0))
+
+		collection = ConnectedHexCollection()
+
+		collection.addHexBlock(block_0)
+		collection.addHexBlock(block_1)
+
+		collection.connectHexBlocks(0, 1, (1, 2, 6, 5), (2, 1, 5, 6))
+
+		# Edge from (1, 0, 0) to (1, 1, 0)
+		np.testing.assert_array_equal(
+			block_0.point_coordinates[-1, :, 0],
+			block_1.point_coordinates[-1, ::-1, 0]
+		)
+
+		np.testing.assert_allclose(
+			block_0.getSurfacePointCoordinates((1, 2, 6, 5)),
+			block_1.getSurfacePointCoordinates((2, 1, 5, 6)),
+			atol=1e-15
+		)
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -588,6 +588,53 @@ class TestHexBlock(unittest.TestCase) :
 
 		pass
 
+	def test_geometryCache(self) :
+		'''
+		Test the derived geometry is cached
+		and invalidated when the point coordinates are set
+		'''
+		block = HexBlock.HexBlock(2, 3, 4)
+
+		x = np.linspace(0, 1, 3)
+		y = np.linspace(0, 1, 4)
+		z = np.linspace(0, 1, 5)
+
+		volume_coordinates = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+
+		block.setPointCoordinates(volume_coordinates)
+
+		cell_centers	= block.getCellCenterCoordinates()
+		cell_volumes	= block.getCellVolumes()
+		face_geometry	= block.getFaceGeometry(0)
+
+		self.assertIs(block.getCellCenterCoordinates(), cell_centers)
+		self.assertIs(block.getCellVolumes(), cell_volumes)
+		self.assertIs(block.getFaceGeometry(0), face_geometry)
+
+		self.assertFalse(cell_centers.flags.writeable)
+
+		np.testing.assert_allclose(cell_volumes, np.full((2, 3, 4), 1 / 24))
+
+		out = np.empty((2, 3, 4, 3))
+		block.getCellCenterCoordinates(out)
+
+		np.testing.assert_array_equal(out, cell_centers)
+
+		minimum_jacobian, inverted_cells = block.getCellJacobianInfo()
+
+		self.assertGreater(minimum_jacobian, 0)
+		self.assertEqual(inverted_cells.shape, (0, 3))
+
+		# Setting the point coordinates invalidates the cache
+		block.setPointCoordinates(2 * volume_coordinates)
+
+		self.assertIsNot(block.getCellCenterCoordinates(), cell_centers)
+
+		np.testing.assert_allclose(block.getCellCenterCoordinates(), 2 * cell_centers)
+		np.testing.assert_allclose(block.getCellVolumes(), 8 * cell_volumes)
+
+		pass
+
 
 if __name__ == '__main__' :
 	
@@ -0,0 +1,95 @@
+import shutil
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+from pyFOAM_hexBlockMesh.MeshArchive import writeMeshArchive, MeshArchive
+
+from test_OGrid import setUpOGrid
+
+class TestMeshArchive(unittest.TestCase) :
+
+	def test_writeMeshArchive(self) :
+		'''
+		Test the mesh is read back from the archive
+		'''
+
+		hex_collection = setUpOGrid()
+		hex_collection.addPatch('inlet', [(0, (0, 1, 2, 3)), (1, (0, 1, 2, 3))], 'patch')
+		hex_collection.setDefaultPatch('walls', 'wall')
+
+		faces = hex_collection.getFaces()
+		points = hex_collection.getPoints()
+
+		archive_path = Path('test_mesh_archive')
+
+		writeMeshArchive(hex_collection, archive_path)
+
+		# An existing archive is replaced
+		writeMeshArchive(hex_collection, archive_path, faces, points)
+
+		archive = MeshArchive(archive_path)
+
+		self.assertIsInstance(archive.points, np.memmap)
+		self.assertTrue(np.all(archive.points == points))
+
+		self.assertEqual(archive.num_cells, hex_collection.num_cells)
+		self.assertEqual(archive.num_points, hex_collection.num_points)
+
+		num_internal_faces = faces[0].getSize()
+
+		self.assertEqual(archive.patches, [
+			{'name' : 'inlet', 'type' : 'patch', 'nFaces' : 8, 'startFace' : num_internal_faces},
+			{
+				'name' : 'walls', 'type' : 'wall',
+				'nFaces' : archive.faces.shape[0] - num_internal_faces - 8,
+				'startFace' : num_internal_faces + 8
+			},
+		])
+
+		read_faces = archive.getFaceCollections()
+
+		self.assertEqual(len(read_faces), len(faces))
+
+		for face, read_face in zip(faces, read_faces) :
+
+			self.assertEqual((face.name, face.patch_type), (read_face.name, read_face.patch_type))
+			self.assertTrue(np.all(face.owner == read_face.owner))
+			self.assertTrue(np.all(face.neighbour == read_face.neighbour))
+			self.assertTrue(np.all(face.vertices == read_face.vertices))
+
+		read_collection = archive.getHexCollection()
+
+		self.assertEqual(read_collection.connect_infos, hex_collection.connect_infos)
+		self.assertEqual(read_collection.patches, hex_collection.patches)
+		self.assertEqual(read_collection.default_patch, hex_collection.default_patch)
+
+		for hex_block, read_hex_block in zip(hex_collection.hex_blocks, read_collection.hex_blocks) :
+
+			self.assertTrue(np.all(hex_block.cell_ID == read_hex_block.cell_ID))
+			self.assertTrue(np.all(hex_block.point_ID == read_hex_block.point_ID))
+			self.assertTrue(np.all(hex_block.point_coordinates == read_hex_block.point_coordinates))
+
+		read_points = read_collection.getPoints()
+		cell_centers = read_collection.getCellCenters()
+
+		for face in read_collection.getFaces() :
+
+			if face.isBoundary() :
+
+				self.assertTrue(checkBoundaryFaces(face, read_points, cell_centers))
+
+			else :
+
+				self.assertTrue(checkInteriorFaces(face, read_points, cell_centers))
+
+		shutil.rmtree(archive_path)
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
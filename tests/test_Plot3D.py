@@ -0,0 +1,177 @@
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Plot3D as Plot3D
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.Plot3D import writePlot3D, readPlot3D, getConnectivity
+from pyFOAM_hexBlockMesh.TransformedHexBlock import TransformedHexBlock, getReflectionMatrix
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map
+
+from test_OGrid import setUpOGrid
+
+def setUpRotatedBlocks() -> ConnectedHexCollection :
+	'''
+	Set up a hex block connected to its reflection with axes 0 and 1 swapped
+	'''
+
+	hex_block = HexBlock(2, 3, 4)
+
+	hex_block.setPointCoordinates(np.stack(np.meshgrid(
+		np.linspace(0, 1, 3) ** 2, np.linspace(0, 1, 4), np.linspace(0, 2, 5), indexing='ij'
+	), axis=-1))
+
+	reflected_block = TransformedHexBlock(
+		hex_block, getReflectionMatrix((1, 0, 0)), (2, 0, 0), axes=(1, 0, 2)
+	)
+
+	hex_collection = ConnectedHexCollection()
+	hex_collection.addHexBlock(hex_block)
+	hex_collection.addHexBlock(reflected_block)
+
+	# Vertices of the reflected block coinciding with the face x = 1
+	face_vertices = (1, 2, 6, 5)
+
+	reflected_vertices = [
+		next(
+			w for w in range(8)
+			if np.allclose(
+				reflected_block.point_coordinates[vertex_map[w]],
+				hex_block.point_coordinates[vertex_map[v]]
+			)
+		)
+		for v in face_vertices
+	]
+
+	hex_collection.connectHexBlocks(0, 1, face_vertices, tuple(reflected_vertices))
+
+	return hex_collection
+
+class TestPlot3D(unittest.TestCase) :
+
+	def test_writePlot3D(self) :
+		'''
+		Test the hex blocks and connections are read back
+		'''
+
+		for hex_collection in (setUpOGrid(), setUpRotatedBlocks()) :
+
+			for fortran_records in (True, False) :
+
+				grid_path		= Path('test_grid.xyz')
+				connectivity_path	= Path('test_grid.json')
+
+				writePlot3D(hex_collection, grid_path, connectivity_path, fortran_records)
+
+				read_collection = readPlot3D(grid_path, connectivity_path, fortran_records)
+
+				grid_size = grid_path.stat().st_size
+
+				grid_path.unlink()
+				connectivity_path.unlink()
+
+				num_points = sum(hex_block.point_ID.size for hex_block in hex_collection.hex_blocks)
+				num_blocks = len(hex_collection.hex_blocks)
+
+				self.assertEqual(
+					grid_size,
+					4 * (1 + 3 * num_blocks) + 8 * 3 * num_points + fortran_records * 8 * (2 + num_blocks)
+				)
+
+				self.assertEqual(len(read_collection.hex_blocks), num_blocks)
+
+				for hex_block, read_hex_block in zip(hex_collection.hex_blocks, read_collection.hex_blocks) :
+
+					self.assertTrue(np.all(hex_block.point_coordinates == read_hex_block.point_coordinates))
+
+				self.assertEqual(read_collection.connect_infos, hex_collection.connect_infos)
+
+		pass
+
+	def test_writePlot3D_transformed(self) :
+		'''
+		Test the points of a transformed hex block are streamed in chunks
+		without computing all its coordinates at once
+		'''
+
+		hex_collection = setUpRotatedBlocks()
+
+		coordinates = [hex_block.point_coordinates for hex_block in hex_collection.hex_blocks]
+
+		grid_path = Path('test_grid.xyz')
+
+		# Chunks of a single layer
+		chunk_size = Plot3D.points_chunk_size
+		Plot3D.points_chunk_size = 1
+
+		with mock.patch.object(
+			TransformedHexBlock, 'point_coordinates', new_callable=mock.PropertyMock,
+			side_effect=AssertionError('All the coordinates are computed')
+		) :
+
+			writePlot3D(hex_collection, grid_path)
+
+		Plot3D.points_chunk_size = chunk_size
+
+		read_collection = readPlot3D(grid_path)
+
+		grid_path.unlink()
+
+		for point_coordinates, read_hex_block in zip(coordinates, read_collection.hex_blocks) :
+
+			np.testing.assert_array_equal(read_hex_block.point_coordinates, point_coordinates)
+
+		pass
+
+	def test_getConnectivity(self) :
+		'''
+		Test the transform maps the points of the faces of hex block 0
+		to the coinciding points of hex block 1
+		'''
+
+		for hex_collection in (setUpOGrid(), setUpRotatedBlocks()) :
+
+			for connection in getConnectivity(hex_collection) :
+
+				hex_block_0 = hex_collection.hex_blocks[connection['block_0'] - 1]
+				hex_block_1 = hex_collection.hex_blocks[connection['block_1'] - 1]
+
+				transform = np.zeros((3, 3), dtype=int)
+
+				for axis, value in enumerate(connection['transform']) :
+
+					transform[abs(value) - 1, axis] = np.sign(value)
+
+				start_0 = np.array(connection['range_0'][0]) - 1
+				start_1 = np.array(connection['range_1'][0]) - 1
+				end_0	= np.array(connection['range_0'][1]) - 1
+
+				indices_0 = np.stack(np.meshgrid(*(
+					np.arange(min(s, e), max(s, e) + 1) for s, e in zip(start_0, end_0)
+				), indexing='ij'), axis=-1).reshape((-1, 3))
+
+				indices_1 = start_1 + (indices_0 - start_0) @ transform.T
+
+				self.assertTrue(np.all(
+					hex_block_0.point_coordinates[tuple(indices_0.T)] ==
+					hex_block_1.point_coordinates[tuple(indices_1.T)]
+				))
+
+				# Points inside hex block 0 map outside hex block 1
+				normal_axis = int(np.flatnonzero(start_0 == end_0)[0])
+				inward_0 = np.zeros(3, dtype=int)
+				inward_0[normal_axis] = 1 if start_0[normal_axis] == 0 else -1
+
+				index_1 = start_1 + transform @ inward_0
+
+				self.assertTrue(np.any((index_1 < 0) | (index_1 >= hex_block_1.point_ID.shape)))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,202 @@
+import shutil
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import \
+checkInteriorFaces, checkBoundaryFaces, getFaceTopologyIssues
+from pyFOAM_hexBlockMesh.PolyMeshMerger import mergeHexCollection, getCoincidentPoints
+from pyFOAM_hexBlockMesh.Writer import writePolyMesh, topology_file_name
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshList import ListFile
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import readPolyMesh
+
+from test_PolyMeshReader import writeBinaryFile
+from test_Writer import setUpTwoBlocks
+
+def setUpPlenum() -> ConnectedHexCollection :
+	'''
+	Set up a 3x2x2 hex block attached to the face x = 2 of setUpTwoBlocks
+	'''
+
+	hex_block = HexBlock(3, 2, 2)
+	hex_block.setPointCoordinates(np.stack(np.meshgrid(
+		np.linspace(2, 3.5, 4), np.linspace(0, 1, 3), np.linspace(0, 1, 3), indexing='ij'
+	), axis=-1))
+
+	hex_collection = ConnectedHexCollection()
+	hex_collection.addHexBlock(hex_block)
+	hex_collection.addPatch('outlet', [(0, (1, 2, 6, 5))], 'patch')
+	hex_collection.setDefaultPatch('walls', 'wall')
+
+	return hex_collection
+
+class TestPolyMeshMerger(unittest.TestCase) :
+
+	def test_mergeHexCollection(self) :
+		'''
+		Test the plenum is stitched to the outlet of the existing polyMesh
+		'''
+
+		hex_collection = setUpTwoBlocks()
+		hex_collection.addPatch('outlet', [(1, (1, 2, 6, 5))], 'patch')
+		hex_collection.setDefaultPatch('walls', 'wall')
+
+		test_path = Path('test_polyMesh_merger')
+		test_path.mkdir(exist_ok=True)
+
+		writePolyMesh(hex_collection, test_path, incremental=True)
+
+		cell_centers = hex_collection.getCellCenters()
+
+		plenum = setUpPlenum()
+
+		self.assertEqual(mergeHexCollection(test_path, plenum, 'outlet'), 4)
+
+		points, face_list = readPolyMesh(test_path)
+
+		self.assertFalse((test_path / topology_file_name).exists())
+
+		shutil.rmtree(test_path)
+
+		# The points of the outlet are shared
+		self.assertEqual(points.shape[0], hex_collection.num_points + plenum.num_points - 9)
+		self.assertTrue(np.all(points[:hex_collection.num_points] == hex_collection.getPoints()))
+
+		num_cells = hex_collection.num_cells + plenum.num_cells
+
+		self.assertEqual(getFaceTopologyIssues(face_list, num_cells, points.shape[0]), [])
+
+		self.assertEqual(
+			[(faces.name, faces.patch_type, faces.getSize()) for faces in face_list[1:]],
+			[('walls', 'wall', 36 + 24), ('outlet', 'patch', 4)]
+		)
+
+		self.assertEqual(face_list[0].getSize(), 2 * 12 + 4 + 4 + 20)
+
+		# Cell centers of the plenum numbered from 0
+		numbered_plenum = setUpPlenum()
+		numbered_plenum.assignCellIDs()
+
+		cell_centers = np.concatenate((cell_centers, numbered_plenum.getCellCenters()), axis=0)
+
+		self.assertTrue(checkInteriorFaces(face_list[0], points, cell_centers))
+
+		for faces in face_list[1:] :
+
+			self.assertTrue(checkBoundaryFaces(faces, points, cell_centers))
+
+		pass
+
+	def test_mergeDeferred(self) :
+		'''
+		Test a collection checked once its faces are assembled is merged,
+		its cells being numbered after the cells of the polyMesh
+		'''
+
+		hex_collection = setUpTwoBlocks()
+		hex_collection.addPatch('outlet', [(1, (1, 2, 6, 5))], 'patch')
+		hex_collection.setDefaultPatch('walls', 'wall')
+
+		test_path = Path('test_polyMesh_merger_deferred')
+		test_path.mkdir(exist_ok=True)
+
+		writePolyMesh(hex_collection, test_path, incremental=True)
+
+		plenum = setUpPlenum()
+		plenum.validation = Validation.DEFERRED
+
+		self.assertEqual(mergeHexCollection(test_path, plenum, 'outlet'), 4)
+
+		points, face_list = readPolyMesh(test_path)
+
+		shutil.rmtree(test_path)
+
+		self.assertEqual(
+			getFaceTopologyIssues(face_list, hex_collection.num_cells + plenum.num_cells, points.shape[0]), []
+		)
+
+		pass
+
+	def test_mergeBinaryPolyMesh(self) :
+		'''
+		Test a binary polyMesh without the sizes in the note of its owner file
+		is merged as the ASCII polyMesh, parsing only the faces of the patch
+		'''
+
+		hex_collection = setUpTwoBlocks()
+		hex_collection.addPatch('outlet', [(1, (1, 2, 6, 5))], 'patch')
+		hex_collection.setDefaultPatch('walls', 'wall')
+
+		test_path = Path('test_polyMesh_merger_binary')
+		test_path.mkdir(exist_ok=True)
+
+		writePolyMesh(hex_collection, test_path, incremental=True)
+
+		# Faces of the outlet, after the internal faces
+		outlet_range = (28, 28 + 4)
+
+		with mock.patch.object(ListFile, 'readItems', autospec=True, side_effect=ListFile.readItems) as readItems :
+
+			mergeHexCollection(test_path, setUpPlenum(), 'outlet', test_path / 'ascii')
+
+		self.assertEqual([call.args[1:] for call in readItems.call_args_list], [outlet_range] * 2)
+
+		points, face_list = readPolyMesh(test_path)
+
+		writeBinaryFile(test_path / 'points', 'vectorField', [points])
+		writeBinaryFile(test_path / 'owner', 'labelList', [np.concatenate([faces.owner for faces in face_list])])
+		writeBinaryFile(test_path / 'neighbour', 'labelList', [face_list[0].neighbour])
+		writeBinaryFile(test_path / 'faces', 'faceCompactList', [
+			4 * np.arange(sum(faces.getSize() for faces in face_list) + 1),
+			np.concatenate([faces.vertices for faces in face_list]).ravel()
+		])
+
+		self.assertEqual(mergeHexCollection(test_path, setUpPlenum(), 'outlet', test_path / 'binary'), 4)
+
+		self.assertIn(b'binary', (test_path / 'binary' / 'faces').read_bytes()[:1000])
+		self.assertEqual(ListFile(test_path / 'binary' / 'owner').getNote()['nCells'], 16 + 12)
+
+		ascii_points, ascii_face_list = readPolyMesh(test_path / 'ascii')
+		binary_points, binary_face_list = readPolyMesh(test_path / 'binary')
+
+		shutil.rmtree(test_path)
+
+		self.assertTrue(np.all(ascii_points == binary_points))
+		self.assertEqual(len(ascii_face_list), len(binary_face_list))
+
+		for ascii_faces, binary_faces in zip(ascii_face_list, binary_face_list) :
+
+			self.assertEqual(ascii_faces.name, binary_faces.name)
+			self.assertTrue(np.all(ascii_faces.owner == binary_faces.owner))
+			self.assertTrue(np.all(ascii_faces.neighbour == binary_faces.neighbour))
+			self.assertTrue(np.all(ascii_faces.vertices == binary_faces.vertices))
+
+		pass
+
+	def test_getCoincidentPoints(self) :
+		'''
+		Test points are matched across the boundaries of the bins
+		'''
+
+		points_0 = np.array([[0, 0, 0], [1, 1, 1], [-2.5, 3, 0.5]], dtype=float)
+
+		points_1 = np.array([
+			[1 + 1e-9, 1 - 1e-9, 1],
+			[0.5, 0.5, 0.5],
+			[-1e-9, 1e-9, -1e-9],
+			[-2.5, 3, 0.5],
+		])
+
+		self.assertEqual(getCoincidentPoints(points_0, points_1, 1e-6).tolist(), [1, -1, 0, 2])
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,122 @@
+import shutil
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.writer_utils.PolyMeshFile as PolyMeshFile
+
+from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import \
+readPolyMesh, readPoints, readFaces, readLabels, readList
+
+from test_OGrid import setUpOGrid
+
+def writeBinaryFile(path:Path, class_name:str, lists:list[np.ndarray]) -> None :
+	'''
+	Write the lists to a binary OpenFOAM file of 32 bit labels and 64 bit scalars
+	'''
+
+	header = PolyMeshFile.getPolyMeshHeader(class_name, path.name, 'binary')
+	header = header.replace('\tformat', '\tarch\t"LSB;label=32;scalar=64";\n\tformat')
+
+	with open(path, 'wb') as f :
+
+		f.write(header.encode())
+
+		for array in lists :
+
+			dtype = '<f8' if array.dtype == float else '<i4'
+
+			f.write(f'{array.shape[0]}\n('.encode())
+			f.write(array.astype(dtype).tobytes())
+			f.write(b')\n\n')
+
+		f.write((PolyMeshFile.file_EOF + '\n').encode())
+
+	pass
+
+class TestPolyMeshReader(unittest.TestCase) :
+
+	def test_readPolyMesh(self) :
+		'''
+		Test the written polyMesh is read back
+		'''
+
+		hex_collection = setUpOGrid()
+		hex_collection.addPatch('inlet', [(0, (0, 1, 2, 3)), (1, (0, 1, 2, 3))], 'patch')
+		hex_collection.setDefaultPatch('walls', 'wall')
+
+		test_path = Path('test_polyMesh_reader')
+		test_path.mkdir(exist_ok=True)
+
+		faces = hex_collection.getFaces()
+
+		PointsWriter(test_path, overwrite=True).write(hex_collection.getPoints())
+		FacesWriter(test_path, overwrite=True).write(faces)
+
+		points, face_list = readPolyMesh(test_path)
+
+		self.assertTrue(np.all(points == hex_collection.getPoints()))
+
+		# FacesWriter sorts the boundary faces to the end
+		faces.sort(key=lambda x: x.isBoundary())
+
+		self.assertEqual(len(face_list), len(faces))
+
+		for face, read_face in zip(faces, face_list) :
+
+			if face.isBoundary() :
+
+				self.assertEqual((face.name, face.patch_type), (read_face.name, read_face.patch_type))
+
+			self.assertTrue(read_face.isValid())
+			self.assertTrue(np.all(face.owner == read_face.owner))
+			self.assertTrue(np.all(face.neighbour == read_face.neighbour))
+			self.assertTrue(np.all(face.vertices == read_face.vertices))
+
+		# Binary files of the same mesh
+		writeBinaryFile(test_path / 'points', 'vectorField', [points])
+		writeBinaryFile(test_path / 'owner', 'labelList', [face_list[0].owner])
+		writeBinaryFile(test_path / 'faces', 'faceCompactList', [
+			4 * np.arange(len(face_list[0].owner) + 1), face_list[0].vertices.ravel()
+		])
+
+		self.assertTrue(np.all(readPoints(test_path / 'points') == points))
+		self.assertTrue(np.all(readLabels(test_path / 'owner') == face_list[0].owner))
+		self.assertTrue(np.all(readFaces(test_path / 'faces') == face_list[0].vertices))
+
+		shutil.rmtree(test_path)
+
+		pass
+
+	def test_readList(self) :
+		'''
+		Test empty, uniform and nested ASCII lists
+		'''
+
+		data = b'// Comment\n0()\n3{(1 2 3)}\n2\n(\n\t(1 2.5 -3e-2)\n\t(4 5 6)\n)\n'
+
+		labels, end = readList(data, 0, False, np.dtype(int))
+
+		self.assertEqual(labels.shape, (0,))
+
+		uniform, end = readList(data, end, False, np.dtype(float), (3,))
+
+		self.assertTrue(np.all(uniform == [[1, 2, 3]] * 3))
+
+		vectors, end = readList(data, end, False, np.dtype(float), (3,))
+
+		self.assertTrue(np.all(vectors == [[1, 2.5, -3e-2], [4, 5, 6]]))
+		self.assertEqual(data[end:], b'\n')
+
+		with self.assertRaises(AssertionError) :
+
+			readList(b'2(1 2 3)', 0, False, np.dtype(int))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,174 @@
+import json
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Profiler as Profiler
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+
+from test_OGrid import setUpOGrid
+
+class TestProfiler(unittest.TestCase) :
+
+	def test_pipeline(self) :
+		'''
+		Test the stages of the pipeline are recorded
+		'''
+
+		hex_collection = setUpOGrid()
+
+		with Profiler.Profiler() as profiler :
+
+			self.assertIs(Profiler.getActiveProfiler(), profiler)
+
+			hex_collection.assignCellIDs()
+
+			faces = hex_collection.getFaces()
+			points = hex_collection.getPoints()
+			cell_centers = hex_collection.getCellCenters()
+
+			for face_collection in faces :
+
+				if face_collection.isBoundary() :
+
+					checkBoundaryFaces(face_collection, points, cell_centers)
+
+				else :
+
+					checkInteriorFaces(face_collection, points, cell_centers)
+
+			with profiler.stage('allocate') :
+
+				with profiler.stage('allocate.inner') :
+
+					array = np.ones(2**20)
+
+				del array
+
+		self.assertIsNone(Profiler.getActiveProfiler())
+
+		summary = profiler.getSummary()
+
+		for name in (
+			'ConnectedHexCollection.assignCellIDs',
+			'ConnectedHexCollection.getFaces',
+			'ConnectedHexCollection.getPoints',
+			'ConnectedHexCollection.getCellCenters',
+			'checkInteriorFaces',
+			'checkBoundaryFaces',
+		) :
+
+			self.assertIn(name, summary)
+			self.assertGreaterEqual(summary[name]['wall_time'], 0.0)
+
+		self.assertEqual(summary['ConnectedHexCollection.getPoints.block']['calls'], 5)
+		self.assertEqual(
+			[record['labels'] for record in profiler.records
+			if record['stage'] == 'ConnectedHexCollection.getPoints.block'],
+			[{'hex_block' : i} for i in range(5)]
+		)
+
+		# The peak of the inner stage is included in the outer stage
+		self.assertGreaterEqual(summary['allocate.inner']['peak_memory'], 8 * 2**20)
+		self.assertGreaterEqual(summary['allocate']['peak_memory'], 8 * 2**20)
+		self.assertGreaterEqual(summary['allocate.inner']['allocated_memory'], 8 * 2**20)
+		self.assertLess(summary['allocate']['allocated_memory'], 2**20)
+
+		counter = profiler.counters['FlatFaceCollection.appendNDFaceCollection']
+
+		self.assertGreater(counter['count'], 0)
+		self.assertGreater(counter['bytes'], 0)
+
+		json_path = Path('test_profile.json')
+		profiler.saveJSON(json_path)
+
+		with open(json_path, 'r') as f :
+
+			self.assertEqual(json.load(f)['summary'].keys(), summary.keys())
+
+		json_path.unlink()
+
+		# Nothing is recorded outside the profiler
+		num_records = len(profiler.records)
+
+		hex_collection.getPoints()
+
+		self.assertEqual(len(profiler.records), num_records)
+
+		pass
+
+	def test_concurrent(self) :
+		'''
+		Test the stages of worker threads running concurrently
+		are nested in the submitting stage and keep their own peaks
+		'''
+
+		barrier = threading.Barrier(2)
+
+		def work(i:int) -> None :
+
+			with Profiler.stage('work', worker=i) :
+
+				# Both workers start their inner stage before either allocates
+				barrier.wait()
+
+				with Profiler.stage('work.inner', worker=i) :
+
+					barrier.wait()
+
+					array = np.ones(2**20)
+
+					barrier.wait()
+
+					del array
+
+				barrier.wait()
+
+			pass
+
+		with Profiler.Profiler() as profiler :
+
+			with profiler.stage('workers') :
+
+				with ThreadPoolExecutor(max_workers=2) as executor :
+
+					futures = [Validation.submit(executor, Validation.STRICT, work, i) for i in range(2)]
+
+					for future in futures : future.result()
+
+		records = {(record['stage'], record['labels'].get('worker')) : record for record in profiler.records}
+
+		for i in range(2) :
+
+			self.assertEqual(records[('work', i)]['depth'], 1)
+			self.assertEqual(records[('work.inner', i)]['depth'], 2)
+
+			# The peak of a stage is not lost when another thread starts a stage
+			self.assertGreaterEqual(records[('work.inner', i)]['peak_memory'], 8 * 2**20)
+			self.assertGreaterEqual(records[('work', i)]['peak_memory'], 8 * 2**20)
+
+		self.assertEqual(records[('workers', None)]['depth'], 0)
+		self.assertGreaterEqual(records[('workers', None)]['peak_memory'], 16 * 2**20)
+
+		# Threads not started through Validation.submit do not report to the profiler
+		active_profilers = []
+
+		with Profiler.Profiler() as profiler :
+
+			thread = threading.Thread(target=lambda : active_profilers.append(Profiler.getActiveProfiler()))
+			thread.start()
+			thread.join()
+
+		self.assertEqual(active_profilers, [None])
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
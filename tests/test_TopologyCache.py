@@ -0,0 +1,190 @@
+import shutil
+import time
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.TopologyCache import TopologyCache
+
+def setUpCollection(n2:int=2) -> ConnectedHexCollection :
+	'''
+	Set up 2 connected hex blocks without assigning IDs
+	'''
+
+	collection = ConnectedHexCollection()
+
+	for x in (np.array([0, 0.5, 1]), np.array([1, 1.5, 2])) :
+
+		y = np.array([0, 0.5, 1])
+		z = np.linspace(0, 1, n2 + 1)
+
+		hex_block = HexBlock(2, 2, n2)
+		hex_block.setPointCoordinates(
+			np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+		)
+
+		collection.addHexBlock(hex_block)
+
+	collection.connectHexBlocks(0, 1, (1, 2, 6, 5), (0, 3, 7, 4))
+
+	return collection
+
+class TestTopologyCache(unittest.TestCase) :
+
+	def setUp(self) -> None :
+
+		self.cache_path = Path('test_topology_cache')
+
+		if self.cache_path.exists() : shutil.rmtree(self.cache_path)
+
+		pass
+
+	def tearDown(self) -> None :
+
+		shutil.rmtree(self.cache_path, ignore_errors=True)
+
+		pass
+
+	def test_getTopology(self) :
+		'''
+		Test the topology loaded from the cache
+		is the same as the assigned topology
+		'''
+
+		cache = TopologyCache(self.cache_path)
+
+		collection = setUpCollection()
+
+		self.assertIsNone(cache.load(collection))
+
+		faces = cache.getTopology(collection)
+
+		other_collection = setUpCollection()
+		other_faces = cache.load(other_collection)
+
+		self.assertIsNotNone(other_faces)
+		self.assertEqual(len(faces), len(other_faces))
+
+		for face, other_face in zip(faces, other_faces) :
+
+			self.assertEqual(face.name, other_face.name)
+			self.assertEqual(face.isBoundary(), other_face.isBoundary())
+
+			np.testing.assert_array_equal(face.owner, other_face.owner)
+			np.testing.assert_array_equal(face.neighbour, other_face.neighbour)
+			np.testing.assert_array_equal(face.vertices, other_face.vertices)
+
+		for hex_block, other_hex_block in \
+		zip(collection.hex_blocks, other_collection.hex_blocks) :
+
+			self.assertIsInstance(other_hex_block.point_ID, np.memmap)
+
+			np.testing.assert_array_equal(hex_block.cell_ID, other_hex_block.cell_ID)
+			np.testing.assert_array_equal(hex_block.point_ID, other_hex_block.point_ID)
+
+		np.testing.assert_array_equal(collection.getPoints(), other_collection.getPoints())
+
+		pass
+
+	def test_eviction(self) :
+		'''
+		Test the least recently used entries are evicted
+		'''
+
+		cache = TopologyCache(self.cache_path)
+
+		collections = [setUpCollection(n2) for n2 in (3, 2, 1)]
+		fingerprints = [collection.getTopologyFingerprint() for collection in collections]
+
+		for collection in collections[:2] :
+
+			cache.getTopology(collection)
+			time.sleep(0.05)
+
+		# Use the first entry so that the second one is the least recently used
+		cache.load(setUpCollection(3))
+		time.sleep(0.05)
+
+		cache.max_size = cache.getSize()
+		cache.getTopology(collections[2])
+
+		self.assertTrue(cache.getEntryPath(fingerprints[0]).exists())
+		self.assertFalse(cache.getEntryPath(fingerprints[1]).exists())
+		self.assertTrue(cache.getEntryPath(fingerprints[2]).exists())
+		self.assertLessEqual(cache.getSize(), cache.max_size)
+
+		pass
+
+	def test_evictionSize(self) :
+		'''
+		Test the entry just stored is never evicted
+		and entries larger than the maximum size are rejected
+		'''
+
+		cache = TopologyCache(self.cache_path)
+
+		collections = [setUpCollection(n2) for n2 in (3, 2)]
+		fingerprints = [collection.getTopologyFingerprint() for collection in collections]
+
+		cache.getTopology(collections[0])
+
+		faces = cache.load(setUpCollection(3))
+
+		# Room for a single entry
+		cache.max_size = cache.getSize() + 1
+
+		cache.getTopology(collections[1])
+
+		self.assertFalse(cache.getEntryPath(fingerprints[0]).exists())
+		self.assertIsNotNone(cache.load(setUpCollection(2)))
+
+		# The arrays of the evicted entry are still mapped
+		self.assertEqual(faces[0].owner.shape[0], faces[0].neighbour.shape[0])
+		self.assertTrue(np.all(faces[0].owner >= 0))
+
+		# No tombstones are left
+		self.assertEqual([path.name for path in self.cache_path.iterdir()], [fingerprints[1]])
+
+		cache.max_size = 1
+
+		collection = setUpCollection(4)
+		faces = cache.getTopology(collection)
+
+		self.assertFalse(cache.store(collection, faces))
+		self.assertIsNone(cache.load(setUpCollection(4)))
+		self.assertTrue(cache.getEntryPath(fingerprints[1]).exists())
+
+		pass
+
+	def test_concurrentEviction(self) :
+		'''
+		Test a load of an entry evicted while loaded misses
+		and leaves the collection unchanged
+		'''
+
+		cache = TopologyCache(self.cache_path)
+
+		cache.getTopology(setUpCollection())
+
+		collection = setUpCollection()
+
+		# Entry evicted after its manifest is written
+		(cache.getEntryPath(collection.getTopologyFingerprint()) / 'owner.npy').unlink()
+
+		self.assertIsNone(cache.load(collection))
+
+		for hex_block in collection.hex_blocks :
+
+			self.assertTrue(np.all(hex_block.point_ID == -1))
+
+		# The topology is assigned again
+		self.assertIsNotNone(cache.getTopology(collection))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.HexBlock import HexBlock
+from pyFOAM_hexBlockMesh.geometry_utils.HexBlockMap import vertex_map
+from pyFOAM_hexBlockMesh.geometry_utils.TransfiniteInterpolation import \
+getTransfiniteInterpolation
+
+def getBoxVertices(lengths:tuple[float, float, float]) -> np.ndarray :
+	'''
+	Get the (8, 3) vertices of a box with a corner at the origin
+	'''
+
+	vertices = np.array([
+		[length if index == -1 else 0.0 for index, length in zip(vertex, lengths)]
+		for vertex in vertex_map
+	])
+
+	return vertices
+
+class TestTransfiniteInterpolation(unittest.TestCase) :
+
+	def test_box(self) :
+		'''
+		Test straight edges of a box give a uniform grid
+		'''
+
+		coordinates = getTransfiniteInterpolation((4, 3, 2), getBoxVertices((4., 3., 2.)))
+
+		expected_coordinates = np.stack(np.meshgrid(
+			np.linspace(0, 4, 5),
+			np.linspace(0, 3, 4),
+			np.linspace(0, 2, 3),
+			indexing='ij'
+		), axis=-1)
+
+		np.testing.assert_allclose(coordinates, expected_coordinates, atol=1e-12)
+
+		pass
+
+	def test_gradedEdges(self) :
+		'''
+		Test identical graded distributions on the 4 parallel edges
+		are reproduced in the interior
+		'''
+
+		x = np.array([0.0, 0.1, 0.3, 0.6, 1.0])
+
+		edges = {}
+
+		for v0, v1 in ((0, 1), (3, 2), (7, 6), (4, 5)) :
+
+			start = getBoxVertices((1., 1., 1.))[v0]
+
+			edge = np.tile(start, (5, 1))
+			edge[:, 0] = x
+
+			edges[(v0, v1)] = edge
+
+		# Reversed edges are accepted
+		edges[(6, 7)] = edges.pop((7, 6))[::-1]
+
+		coordinates = getTransfiniteInterpolation(
+			(4, 2, 2), getBoxVertices((1., 1., 1.)), edges
+		)
+
+		expected_coordinates = np.stack(np.meshgrid(
+			x, np.linspace(0, 1, 3), np.linspace(0, 1, 3), indexing='ij'
+		), axis=-1)
+
+		np.testing.assert_allclose(coordinates, expected_coordinates, atol=1e-12)
+
+		pass
+
+	def test_curvedFace(self) :
+		'''
+		Test a block with a cylindrical face reproduces the face and its edges,
+		independent of the chunk size
+		'''
+
+		n0, n1, n2 = 4, 6, 3
+
+		theta = np.linspace(-np.pi / 4, np.pi / 4, n1 + 1)
+		z = np.linspace(0, 1, n2 + 1)
+
+		# Face (1, 2, 6, 5) at the end of axis 0
+		# Points ordered from 1 -> 2 along axis 1, then 2 -> 6 along axis 2
+		face = np.stack(np.broadcast_arrays(
+			2 * np.cos(theta)[:, np.newaxis],
+			2 * np.sin(theta)[:, np.newaxis],
+			z[np.newaxis, :]
+		), axis=-1)
+
+		side = np.sqrt(2) / 2
+
+		vertices = np.array([
+			[0.0, -side, 0.0], [2 * side, -2 * side, 0.0],
+			[2 * side, 2 * side, 0.0], [0.0, side, 0.0],
+			[0.0, -side, 1.0], [2 * side, -2 * side, 1.0],
+			[2 * side, 2 * side, 1.0], [0.0, side, 1.0],
+		])
+
+		block = HexBlock(n0, n1, n2)
+		block.setTransfiniteCoordinates(vertices, faces={(1, 2, 6, 5) : face})
+
+		np.testing.assert_allclose(
+			block.getSurfacePointCoordinates((1, 2, 6, 5)), face, atol=1e-12
+		)
+
+		# Straight edge from vertex 0 to 3
+		np.testing.assert_allclose(
+			block.point_coordinates[0, :, 0],
+			np.linspace(vertices[0], vertices[3], n1 + 1),
+			atol=1e-12
+		)
+
+		coordinates = getTransfiniteInterpolation(
+			(n0, n1, n2), vertices, faces={(5, 6, 2, 1) : face[:, ::-1]}, chunk_size=7
+		)
+
+		np.testing.assert_allclose(coordinates, block.point_coordinates, atol=1e-12)
+
+		pass
+
+	def test_invalidCoordinates(self) :
+		'''
+		Test inverted coordinates are rejected, leaving the block unchanged
+		'''
+
+		vertices = getBoxVertices((1., 1., 1.))
+
+		block = HexBlock(2, 2, 2)
+		block.setTransfiniteCoordinates(vertices)
+
+		coordinates = block.point_coordinates.copy()
+		volumes = block.getCellVolumes().copy()
+
+		vertices[[0, 1]] = vertices[[1, 0]]
+
+		with self.assertRaises(AssertionError) :
+
+			block.setTransfiniteCoordinates(vertices)
+
+		self.assertTrue(np.array_equal(block.point_coordinates, coordinates))
+		self.assertTrue(np.allclose(block.getCellVolumes(), volumes))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
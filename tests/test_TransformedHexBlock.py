@@ -0,0 +1,211 @@
+import unittest
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.ConnectedHexCollection as ConnectedHexCollectionModule
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import checkInteriorFaces, checkBoundaryFaces
+from pyFOAM_hexBlockMesh.TransformedHexBlock import \
+TransformedHexBlock, getReflectionMatrix, getRotationMatrix
+
+from test_OGrid import setUpOGrid
+
+class TestTransformedHexBlock(unittest.TestCase) :
+
+	def test_OGrid(self) :
+		'''
+		Test the O-grid built from transformed hex blocks
+		matches the O-grid built from copies
+		'''
+
+		reference_collection = setUpOGrid()
+
+		center_block, pos_x_block, pos_y_block, neg_x_block, neg_y_block = \
+		reference_collection.hex_blocks
+
+		# Reflect about x = 0 plane
+		transformed_neg_x_block = TransformedHexBlock(
+			pos_x_block, getReflectionMatrix((1, 0, 0)), reverse=(True, False, False)
+		)
+
+		# Reflect about y = 0 plane
+		transformed_neg_y_block = TransformedHexBlock(
+			pos_y_block, getReflectionMatrix((0, 1, 0)), reverse=(True, False, False)
+		)
+
+		np.testing.assert_array_equal(
+			transformed_neg_x_block.point_coordinates, neg_x_block.point_coordinates
+		)
+		np.testing.assert_array_equal(
+			transformed_neg_y_block.point_coordinates, neg_y_block.point_coordinates
+		)
+
+		hex_collection = ConnectedHexCollection()
+
+		for hex_block in (
+			center_block, pos_x_block, pos_y_block,
+			transformed_neg_x_block, transformed_neg_y_block
+		) :
+
+			hex_block.cell_ID.fill(-1)
+			hex_block.point_ID.fill(-1)
+
+			hex_collection.addHexBlock(hex_block)
+
+		for connect_info in reference_collection.connect_infos :
+
+			hex_collection.connectHexBlocks(
+				connect_info.hex_block_id_0, connect_info.hex_block_id_1,
+				connect_info.face_vertices_0, connect_info.face_vertices_1
+			)
+
+		hex_collection.assignCellIDs()
+		hex_collection.assignPointIDs()
+
+		chunk_size = ConnectedHexCollectionModule.points_chunk_size
+
+		try :
+
+			# Assign the points one layer at a time
+			ConnectedHexCollectionModule.points_chunk_size = 1
+
+			points = hex_collection.getPoints()
+
+		finally :
+
+			ConnectedHexCollectionModule.points_chunk_size = chunk_size
+
+		np.testing.assert_array_equal(points, hex_collection.getPoints())
+
+		cell_centers = hex_collection.getCellCenters()
+
+		for face_collection in hex_collection.getFaces() :
+
+			if face_collection.isBoundary() :
+
+				self.assertTrue(checkBoundaryFaces(face_collection, points, cell_centers))
+
+			else :
+
+				self.assertTrue(checkInteriorFaces(face_collection, points, cell_centers))
+
+		pass
+
+	def test_composition(self) :
+		'''
+		Test a transform of a transformed hex block,
+		and the coordinates follow the source hex block
+		'''
+
+		source = HexBlock(2, 3, 4)
+
+		coordinates = np.stack(np.meshgrid(
+			np.linspace(1, 2, 3), np.linspace(0, 1, 4), np.linspace(0, 1, 5), indexing='ij'
+		), axis=-1)
+
+		source.setPointCoordinates(coordinates)
+
+		# Reflect about x = y plane and swap axes 0 and 1
+		swapped = TransformedHexBlock(
+			source, getReflectionMatrix((1, -1, 0)), axes=(1, 0, 2)
+		)
+
+		self.assertEqual(swapped.cell_ID.shape, (3, 2, 4))
+
+		# Rotate by 90 degrees about z axis and shift along z
+		rotated = TransformedHexBlock(
+			swapped, getRotationMatrix((0, 0, 1), np.pi / 2), (0, 0, 1)
+		)
+
+		self.assertIs(rotated.source, source)
+
+		expected_coordinates = np.moveaxis(coordinates, 0, 1)[..., [1, 0, 2]]
+		expected_coordinates = expected_coordinates @ getRotationMatrix((0, 0, 1), np.pi / 2).T
+		expected_coordinates[..., 2] += 1
+
+		np.testing.assert_allclose(rotated.point_coordinates, expected_coordinates, atol=1e-15)
+
+		np.testing.assert_allclose(
+			rotated.getSurfacePointCoordinates((1, 2, 6, 5)),
+			expected_coordinates[-1],
+			atol=1e-15
+		)
+
+		volumes = rotated.getCellVolumes()
+
+		np.testing.assert_allclose(volumes, np.moveaxis(source.getCellVolumes(), 0, 1))
+
+		# Moving the source moves the transformed hex block
+		# The property keeps the coordinates until the source changes,
+		# getPointCoordinates computes them on every call
+		point_coordinates = rotated.point_coordinates
+
+		self.assertIs(rotated.point_coordinates, point_coordinates)
+		self.assertIsNot(rotated.getPointCoordinates(), rotated.getPointCoordinates())
+
+		source.setPointCoordinates(2 * coordinates)
+
+		np.testing.assert_allclose(rotated.getCellVolumes(), 8 * volumes)
+
+		self.assertIsNot(rotated.point_coordinates, point_coordinates)
+		np.testing.assert_allclose(rotated.point_coordinates, rotated.getPointCoordinates())
+
+		self.assertTrue(rotated.arePointCoordinatesSet())
+		self.assertFalse(TransformedHexBlock(HexBlock(2, 3, 4)).arePointCoordinatesSet())
+
+		with self.assertRaises(AssertionError) :
+
+			rotated.setPointCoordinates(expected_coordinates)
+
+		with self.assertRaises(AssertionError) :
+
+			# Reflection without reversing an axis inverts the cells
+			TransformedHexBlock(source, getReflectionMatrix((0, 0, 1)))
+
+		pass
+
+	def test_exactReflection(self) :
+		'''
+		Test reflections about axis and diagonal planes give exactly
+		the coordinates of swapping and negating the components
+		'''
+
+		self.assertTrue(np.array_equal(getReflectionMatrix((1, -1, 0)), [[0, 1, 0], [1, 0, 0], [0, 0, 1]]))
+		self.assertTrue(np.array_equal(getRotationMatrix((0, 0, 1), np.pi / 2), [[0, -1, 0], [1, 0, 0], [0, 0, 1]]))
+
+		source = HexBlock(3, 2, 2)
+
+		theta = np.linspace(-np.pi / 4, np.pi / 4, 3)
+
+		coordinates = np.stack(np.meshgrid(
+			np.linspace(0.3, 1, 4), theta, np.linspace(0, 1, 3), indexing='ij'
+		), axis=-1)
+
+		coordinates = np.stack((
+			coordinates[..., 0] * np.cos(coordinates[..., 1]),
+			coordinates[..., 0] * np.sin(coordinates[..., 1]),
+			coordinates[..., 2]
+		), axis=-1)
+
+		source.setPointCoordinates(coordinates)
+
+		swapped = TransformedHexBlock(source, getReflectionMatrix((1, -1, 0)), axes=(1, 0, 2))
+		negated = TransformedHexBlock(swapped, getReflectionMatrix((0, 1, 0)), reverse=(False, True, False))
+
+		expected_coordinates = np.moveaxis(coordinates[..., [1, 0, 2]], 0, 1)
+
+		self.assertTrue(np.array_equal(swapped.point_coordinates, expected_coordinates))
+
+		expected_coordinates = expected_coordinates * [1, -1, 1]
+		expected_coordinates = expected_coordinates[:, ::-1]
+
+		# Negated zeros included
+		self.assertTrue(np.array_equal(negated.point_coordinates, expected_coordinates))
+		self.assertTrue(np.array_equal(np.signbit(negated.point_coordinates), np.signbit(expected_coordinates)))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,210 @@
+import re
+import shutil
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.VTKWriter as VTKWriter
+
+from pyFOAM_hexBlockMesh.VTKWriter import \
+writeStructuredGrid, writeMultiBlock, writeUnstructuredGrid, getCellPointIDs
+
+from pyFOAM_hexBlockMesh.TransformedHexBlock import TransformedHexBlock, getReflectionMatrix
+
+from test_OGrid import setUpOGrid
+
+vtk_dtypes = {'Float64' : '<f8', 'Int64' : '<i8', 'Int32' : '<i4', 'UInt8' : 'u1'}
+
+def readVTKFile(path:Path) -> tuple[str, dict] :
+	'''
+	Read the XML and the arrays in the raw appended data of a VTK XML file
+	'''
+
+	with open(path, 'rb') as f :
+
+		content = f.read()
+
+	xml, _, data = content.partition(b'<AppendedData encoding="raw">\n_')
+	xml = xml.decode()
+
+	arrays = {}
+
+	for vtk_type, name, num_components, offset in re.findall(
+		r'<DataArray type="(\w+)" Name="(\w+)" NumberOfComponents="(\d+)" '
+		r'format="appended" offset="(\d+)"/>', xml
+	) :
+
+		offset = int(offset)
+		num_bytes = int(np.frombuffer(data, dtype='<u8', count=1, offset=offset)[0])
+
+		array = np.frombuffer(
+			data, dtype=vtk_dtypes[vtk_type],
+			count=num_bytes // np.dtype(vtk_dtypes[vtk_type]).itemsize, offset=offset + 8
+		)
+
+		arrays[name] = array.reshape((-1, int(num_components)))
+
+	return xml, arrays
+
+class TestVTKWriter(unittest.TestCase) :
+
+	def test_writeMultiBlock(self) :
+		'''
+		Test the points and cell IDs of every hex block are written
+		'''
+
+		hex_collection = setUpOGrid()
+		hex_collection.assignCellIDs()
+
+		test_path = Path('test_vtk')
+		test_path.mkdir(exist_ok=True)
+
+		block_paths = writeMultiBlock(hex_collection, test_path / 'mesh.vtm')
+
+		with open(test_path / 'mesh.vtm', 'r') as f :
+
+			multiblock_xml = f.read()
+
+		self.assertEqual(len(block_paths), len(hex_collection.hex_blocks))
+
+		for i, (hex_block, block_path) in enumerate(zip(hex_collection.hex_blocks, block_paths)) :
+
+			self.assertIn(f'file="mesh/block_{i}.vts"', multiblock_xml)
+
+			xml, arrays = readVTKFile(block_path)
+
+			n0, n1, n2 = hex_block.cell_ID.shape
+
+			self.assertIn(f'WholeExtent="0 {n0} 0 {n1} 0 {n2}"', xml)
+
+			# Points vary fastest along axis 0
+			self.assertTrue(np.all(
+				arrays['Points'] ==
+				hex_block.point_coordinates.transpose((2, 1, 0, 3)).reshape((-1, 3))
+			))
+			self.assertTrue(np.all(
+				arrays['cellID'][:, 0] == hex_block.cell_ID.ravel(order='F')
+			))
+
+		shutil.rmtree(test_path)
+
+		pass
+
+	def test_writeUnstructuredGrid(self) :
+		'''
+		Test the hexahedra are numbered by the cell and point IDs
+		'''
+
+		hex_collection = setUpOGrid()
+		hex_collection.assignCellIDs()
+
+		test_path = Path('test_mesh.vtu')
+
+		writeUnstructuredGrid(hex_collection, test_path)
+
+		xml, arrays = readVTKFile(test_path)
+
+		test_path.unlink()
+
+		num_cells = hex_collection.num_cells
+
+		self.assertIn(
+			f'NumberOfPoints="{hex_collection.num_points}" NumberOfCells="{num_cells}"', xml
+		)
+
+		points = hex_collection.getPoints()
+
+		self.assertTrue(np.all(arrays['Points'] == points))
+		self.assertTrue(np.all(arrays['offsets'][:, 0] == 8 * np.arange(1, num_cells + 1)))
+		self.assertTrue(np.all(arrays['types'] == 12))
+
+		connectivity = arrays['connectivity'].reshape((num_cells, 8))
+
+		for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+			cell_IDs = hex_block.cell_ID.ravel()
+
+			self.assertTrue(np.all(arrays['hexBlock'][cell_IDs, 0] == i))
+			self.assertTrue(np.all(
+				connectivity[cell_IDs] == getCellPointIDs(hex_block).reshape((-1, 8))
+			))
+
+		# The hexahedra have positive volumes, i.e., the vertices are in VTK order
+		cell_points = points[connectivity]
+
+		volumes = np.einsum(
+			'ij,ij->i',
+			cell_points[:, 1] - cell_points[:, 0],
+			np.cross(cell_points[:, 3] - cell_points[:, 0], cell_points[:, 4] - cell_points[:, 0])
+		)
+
+		self.assertTrue(np.all(volumes > 0))
+
+		pass
+
+	def test_writeStructuredGrid_unassigned(self) :
+		'''
+		Test the cell IDs are not written before they are assigned
+		'''
+
+		hex_collection = setUpOGrid()
+		hex_block = hex_collection.hex_blocks[0]
+
+		hex_block.cell_ID.fill(-1)
+
+		test_path = Path('test_block.vts')
+
+		writeStructuredGrid(hex_block, test_path)
+
+		xml, arrays = readVTKFile(test_path)
+
+		test_path.unlink()
+
+		self.assertEqual(set(arrays), {'Points'})
+
+		pass
+
+	def test_writeStructuredGrid_transformed(self) :
+		'''
+		Test the points of a transformed hex block are streamed in chunks
+		without computing all its coordinates at once
+		'''
+
+		hex_collection = setUpOGrid()
+
+		hex_block = TransformedHexBlock(
+			hex_collection.hex_blocks[1], getReflectionMatrix((0, 0, 1)), np.array([0., 0., 5.]),
+			reverse=(False, False, True)
+		)
+
+		coordinates = hex_block.point_coordinates
+
+		test_path = Path('test_block.vts')
+
+		# Chunks of a single layer
+		chunk_size = VTKWriter.points_chunk_size
+		VTKWriter.points_chunk_size = 1
+
+		with mock.patch.object(
+			TransformedHexBlock, 'point_coordinates', new_callable=mock.PropertyMock,
+			side_effect=AssertionError('All the coordinates are computed')
+		) :
+
+			writeStructuredGrid(hex_block, test_path)
+
+		VTKWriter.points_chunk_size = chunk_size
+
+		_, arrays = readVTKFile(test_path)
+
+		test_path.unlink()
+
+		np.testing.assert_array_equal(arrays['Points'], coordinates.transpose((2, 1, 0, 3)).reshape((-1, 3)))
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
@@ -0,0 +1,258 @@
+import shutil
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import pyFOAM_hexBlockMesh.Validation as Validation
+
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
+from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection, getFaceTopologyIssues
+from pyFOAM_hexBlockMesh.Writer import FacesWriter
+
+from test_OGrid import setUpOGrid
+
+class TestValidation(unittest.TestCase) :
+
+	def test_policy(self) :
+		'''
+		Test the policy is set and restored
+		'''
+
+		self.assertEqual(Validation.getPolicy(), Validation.STRICT)
+
+		with Validation.policy(Validation.DEFERRED) :
+
+			self.assertFalse(Validation.isStrict())
+			self.assertFalse(Validation.isOff())
+
+			with Validation.policy(Validation.OFF) :
+
+				self.assertTrue(Validation.isOff())
+
+			self.assertEqual(Validation.getPolicy(), Validation.DEFERRED)
+
+		self.assertTrue(Validation.isStrict())
+
+		with self.assertRaises(AssertionError) :
+
+			with Validation.policy('lazy') : pass
+
+		self.assertTrue(Validation.isStrict())
+
+		# Corrupted face collection
+		faces = FlatFaceCollection()
+		faces.owner = np.zeros(2, dtype=int)
+
+		with self.assertRaises(AssertionError) :
+
+			faces.isBoundary()
+
+		with Validation.policy(Validation.OFF) :
+
+			self.assertTrue(faces.isBoundary())
+
+		pass
+
+	def test_deferred(self) :
+		'''
+		Test the faces assembled with every policy are the same
+		and the deferred check reports the problems
+		'''
+
+		hex_collection = setUpOGrid()
+
+		strict_faces = hex_collection.getFaces()
+
+		self.assertEqual(
+			getFaceTopologyIssues(strict_faces, hex_collection.num_cells, hex_collection.num_points),
+			[]
+		)
+
+		for validation in (Validation.DEFERRED, Validation.OFF) :
+
+			hex_collection.validation = validation
+
+			faces = hex_collection.getFaces()
+
+			self.assertEqual(len(faces), len(strict_faces))
+
+			for face_collection, strict_face_collection in zip(faces, strict_faces) :
+
+				self.assertEqual(face_collection.name, strict_face_collection.name)
+				self.assertTrue(np.all(face_collection.owner == strict_face_collection.owner))
+				self.assertTrue(np.all(face_collection.neighbour == strict_face_collection.neighbour))
+				self.assertTrue(np.all(face_collection.vertices == strict_face_collection.vertices))
+
+			self.assertEqual(Validation.getPolicy(), Validation.STRICT)
+
+		# The check runs only when deferred
+		hex_collection.num_points -= 1
+
+		hex_collection.getFaces()
+
+		hex_collection.validation = Validation.DEFERRED
+
+		with self.assertRaisesRegex(AssertionError, 'Points out of range') :
+
+			hex_collection.getFaces()
+
+		hex_collection.num_points += 1
+
+		pass
+
+	def test_deferredStartIDs(self) :
+		'''
+		Test the deferred check of a collection numbered from nonzero IDs
+		'''
+
+		hex_block = HexBlock(2, 2, 2)
+		hex_block.setPointCoordinates(np.stack(np.meshgrid(
+			np.linspace(0, 1, 3), np.linspace(0, 1, 3), np.linspace(0, 1, 3), indexing='ij'
+		), axis=-1))
+
+		hex_collection = ConnectedHexCollection(Validation.DEFERRED)
+		hex_collection.addHexBlock(hex_block)
+
+		hex_collection.assignCellIDs(10)
+		hex_collection.assignPointIDs(5)
+
+		faces = hex_collection.getFaces()
+
+		self.assertEqual(getFaceTopologyIssues(faces, 8, 27, 10, 5), [])
+
+		# IDs below the start are out of range
+		faces[0].owner[0] = 9
+
+		self.assertTrue(any(
+			'Owner cells out of range of faces 0' in issue for issue in getFaceTopologyIssues(faces, 8, 27, 10, 5)
+		))
+
+		pass
+
+	def test_concurrent(self) :
+		'''
+		Test collections assembled concurrently keep their own policies
+		'''
+
+		barrier = threading.Barrier(2)
+
+		def getPolicies(name:str) -> tuple[str, str] :
+
+			with Validation.policy(name) :
+
+				# Both threads have set their policies
+				barrier.wait()
+				policy = Validation.getPolicy()
+				barrier.wait()
+
+			return policy, Validation.getPolicy()
+
+		with ThreadPoolExecutor(max_workers=2) as executor :
+
+			results = list(executor.map(getPolicies, (Validation.OFF, Validation.DEFERRED)))
+
+			# Worker threads run with the submitted policy
+			self.assertEqual(
+				Validation.submit(executor, Validation.OFF, Validation.getPolicy).result(), Validation.OFF
+			)
+
+		self.assertEqual(results, [(Validation.OFF, Validation.STRICT), (Validation.DEFERRED, Validation.STRICT)])
+		self.assertEqual(Validation.getPolicy(), Validation.STRICT)
+
+		# Points out of range are reported by the deferred check only
+		strict_collection	= setUpOGrid()
+		deferred_collection	= setUpOGrid()
+
+		deferred_collection.validation = Validation.DEFERRED
+
+		for hex_collection in (strict_collection, deferred_collection) :
+
+			hex_collection.num_points -= 1
+
+		def getFaces(hex_collection) -> bool :
+
+			try :
+
+				hex_collection.getFaces()
+
+			except AssertionError :
+
+				return False
+
+			return True
+
+		with ThreadPoolExecutor(max_workers=4) as executor :
+
+			results = list(executor.map(getFaces, [strict_collection, deferred_collection] * 8))
+
+		self.assertEqual(results, [True, False] * 8)
+
+		pass
+
+	def test_facesWriter(self) :
+		'''
+		Test the faces are written with the policy of the writer
+		'''
+
+		hex_collection = setUpOGrid()
+
+		faces = hex_collection.getFaces()
+
+		# Corrupted face collection
+		faces[-1].owner = faces[-1].owner[:-1]
+
+		test_path = Path('test_polyMesh_validation')
+		test_path.mkdir(exist_ok=True)
+
+		with Validation.policy(Validation.OFF) :
+
+			with self.assertRaises(AssertionError) :
+
+				FacesWriter(test_path, overwrite=True, validation=Validation.STRICT).write(faces)
+
+		shutil.rmtree(test_path)
+
+		pass
+
+	def test_getFaceTopologyIssues(self) :
+		'''
+		Test every problem is reported at once
+		'''
+
+		hex_collection = setUpOGrid()
+
+		faces = hex_collection.getFaces()
+
+		num_cells	= hex_collection.num_cells
+		num_points	= hex_collection.num_points
+
+		interior_faces = faces[0]
+
+		interior_faces.neighbour[0] = num_cells
+		interior_faces.vertices[1] = interior_faces.vertices[2]
+
+		# Boundary patch defined twice
+		faces.append(faces[-1])
+
+		issues = getFaceTopologyIssues(faces, num_cells, num_points)
+
+		self.assertEqual(len(issues), 4)
+
+		for issue in (
+			'patch is defined more than once',
+			'Neighbour cells out of range of faces 0',
+			'Duplicate faces 1, 2',
+			'Cells not bounded by 6 faces',
+		) :
+
+			self.assertTrue(any(issue in text for text in issues), issue)
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()
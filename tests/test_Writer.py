@@ -3,8 +3,32 @@ from pathlib import Path
 import unittest
 import numpy as np
 
+from pyFOAM_hexBlockMesh.ConnectedHexCollection import ConnectedHexCollection, HexBlock
 from pyFOAM_hexBlockMesh.FaceCollection import FlatFaceCollection
-from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter
+from pyFOAM_hexBlockMesh.Writer import PointsWriter, FacesWriter, writePolyMesh
+
+def setUpTwoBlocks(scale:float=1.0) -> ConnectedHexCollection :
+	'''
+	Set up 2 connected 2x2x2 hex blocks without assigning IDs
+	'''
+
+	collection = ConnectedHexCollection()
+
+	for x in (np.array([0, 0.5, 1]), np.array([1, 1.5, 2])) :
+
+		y = np.array([0, 0.5, 1])
+		z = np.array([0, 0.5, 1])
+
+		hex_block = HexBlock(2, 2, 2)
+		hex_block.setPointCoordinates(
+			scale * np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
+		)
+
+		collection.addHexBlock(hex_block)
+
+	collection.connectHexBlocks(0, 1, (1, 2, 6, 5), (0, 3, 7, 4))
+
+	return collection
 
 class TestWriter(unittest.TestCase) :
 
@@ -66,6 +90,77 @@ class TestWriter(unittest.TestCase) :
 
 		pass
 
+	def test_writePolyMesh_incremental(self) :
+		'''
+		Test only the points are rewritten when the topology is unchanged
+		'''
+
+		test_path = Path('test_polyMesh_incremental')
+		if test_path.exists():
+			for item in test_path.iterdir():
+				item.unlink()
+			test_path.rmdir()
+		test_path.mkdir(parents=True, exist_ok=True)
+
+		self.assertFalse(writePolyMesh(setUpTwoBlocks(), test_path, incremental=True))
+
+		faces_mtime = (test_path / 'faces').stat().st_mtime_ns
+		points_text = (test_path / 'points').read_text()
+
+		self.assertTrue(writePolyMesh(setUpTwoBlocks(2.0), test_path, incremental=True))
+
+		self.assertEqual((test_path / 'faces').stat().st_mtime_ns, faces_mtime)
+		self.assertNotEqual((test_path / 'points').read_text(), points_text)
+
+		# A different topology rebuilds the polyMesh
+		collection = setUpTwoBlocks()
+		collection.addHexBlock(HexBlock(1, 1, 1))
+		collection.hex_blocks[-1].setPointCoordinates(np.stack(np.meshgrid(
+			[5., 6.], [5., 6.], [5., 6.], indexing='ij'
+		), axis=-1))
+
+		self.assertFalse(writePolyMesh(collection, test_path, incremental=True))
+
+		pass
+
+	def test_facesWriter_patches(self) :
+		'''
+		Test the boundary file has one entry per patch
+		'''
+
+		test_path = Path('test_polyMesh_patches')
+		if test_path.exists():
+			for item in test_path.iterdir():
+				item.unlink()
+			test_path.rmdir()
+		test_path.mkdir(parents=True, exist_ok=True)
+
+		collection = setUpTwoBlocks()
+
+		collection.addPatch('inlet', [(0, (0, 3, 7, 4))])
+		collection.addPatch('outlet', [(1, (1, 2, 6, 5))])
+		collection.setDefaultPatch('walls', 'wall')
+
+		writePolyMesh(collection, test_path)
+
+		boundary = (test_path / 'boundary').read_text()
+
+		self.assertIn('\n3\n(\n', boundary)
+
+		tokens = boundary.split()
+
+		for name, patch_type, num_faces in (
+			('inlet', 'patch', 4), ('outlet', 'patch', 4), ('walls', 'wall', 32)
+		) :
+
+			i = tokens.index(name)
+
+			self.assertEqual(tokens[i + 2 : i + 6], ['type', f'{patch_type};', 'nFaces', f'{num_faces};'])
+
+		self.assertNotIn('Hex_', boundary)
+
+		pass
+
 if __name__ == '__main__' :
 	
 	unittest.main()
\ No newline at end of file
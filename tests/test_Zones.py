@@ -0,0 +1,111 @@
+import shutil
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from pyFOAM_hexBlockMesh.Writer import FacesWriter
+from pyFOAM_hexBlockMesh.Zones import writeZones, getFaceZones
+from pyFOAM_hexBlockMesh.writer_utils.FoamDictionary import parseFoamList
+from pyFOAM_hexBlockMesh.writer_utils.PolyMeshReader import readFoamFile, readLabels
+
+from test_OGrid import setUpOGrid
+
+def readZones(path:Path) -> dict :
+	'''
+	Read the lists of every zone of a zones file
+	'''
+
+	_, data, start = readFoamFile(path)
+
+	items = parseFoamList(data[start:].decode())
+
+	return {
+		name : {
+			keyword : np.array(value[-1]) if isinstance(value, list) else value
+			for keyword, value in zone.items()
+		}
+		for name, zone in zip(items[::2], items[1::2])
+	}
+
+class TestZones(unittest.TestCase) :
+
+	def test_writeZones(self) :
+		'''
+		Test the zones of the cells, points and faces of the hex blocks
+		'''
+
+		hex_collection = setUpOGrid()
+
+		test_path = Path('test_polyMesh_zones')
+		test_path.mkdir(exist_ok=True)
+
+		FacesWriter(test_path, overwrite=True).write(hex_collection.getFaces())
+
+		writeZones(
+			hex_collection, test_path,
+			face_zones={'center' : [(0, 1), (0, 2), (0, 3), (0, 4)], 'shell' : [(2, 1), (1, 4)]},
+			point_zones={'shell' : [1, 2, 3, 4]},
+			overwrite=True
+		)
+
+		cell_zones	= readZones(test_path / 'cellZones')
+		face_zones	= readZones(test_path / 'faceZones')
+		point_zones	= readZones(test_path / 'pointZones')
+
+		owner		= readLabels(test_path / 'owner')
+		neighbour	= readLabels(test_path / 'neighbour')
+
+		shutil.rmtree(test_path)
+
+		self.assertEqual(list(cell_zones), [f'block_{i}' for i in range(5)])
+
+		for i, hex_block in enumerate(hex_collection.hex_blocks) :
+
+			self.assertEqual(cell_zones[f'block_{i}']['type'], 'cellZone')
+			self.assertEqual(
+				sorted(cell_zones[f'block_{i}']['cellLabels']), sorted(hex_block.cell_ID.ravel())
+			)
+
+		# Points of the shell blocks, all but the points inside the center block
+		center_points = hex_collection.hex_blocks[0].point_ID[1:-1, 1:-1]
+
+		self.assertEqual(point_zones['shell']['type'], 'pointZone')
+		self.assertEqual(
+			sorted(point_zones['shell']['pointLabels']),
+			sorted(set(range(hex_collection.num_points)) - set(center_points.ravel()))
+		)
+
+		# Faces pointing from hex block a into hex block b
+		for name, block_pairs, num_faces in (
+			('center', [(0, 1), (0, 2), (0, 3), (0, 4)], 4 * 2 * 2),
+			('shell', [(2, 1), (1, 4)], 2 * 2 * 2),
+		) :
+
+			face_IDs	= face_zones[name]['faceLabels']
+			flip_map	= face_zones[name]['flipMap'].astype(bool)
+
+			self.assertEqual(face_zones[name]['type'], 'faceZone')
+			self.assertEqual(face_IDs.size, num_faces)
+
+			cells_a = np.where(flip_map, neighbour[face_IDs], owner[face_IDs])
+			cells_b = np.where(flip_map, owner[face_IDs], neighbour[face_IDs])
+
+			cell_IDs_a = np.concatenate([hex_collection.hex_blocks[a].cell_ID.ravel() for a, _ in block_pairs])
+			cell_IDs_b = np.concatenate([hex_collection.hex_blocks[b].cell_ID.ravel() for _, b in block_pairs])
+
+			self.assertTrue(np.all(np.isin(cells_a, cell_IDs_a)))
+			self.assertTrue(np.all(np.isin(cells_b, cell_IDs_b)))
+
+			self.assertTrue(np.any(flip_map) == (name == 'shell'))
+
+		with self.assertRaisesRegex(AssertionError, 'Hex blocks 1 and 3 of zone center are not connected') :
+
+			getFaceZones(hex_collection, {'center' : [(1, 3)]})
+
+		pass
+
+if __name__ == '__main__' :
+
+	unittest.main()